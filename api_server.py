@@ -104,10 +104,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import uuid
 
+# Shared connection pool
+from app.shared.db_pool import get_db, close_pool
+
 # Brain Resolver imports
 from app.brain.contracts import (
     CONTRACT_VERSION,
@@ -157,7 +158,7 @@ from app.catalog.override import router as override_router
 from app.brain.constraint_admin import router as constraint_router
 
 # Telemetry Emitter imports (v3.17.0 - Issue #9 Stage 2)
-from app.telemetry import get_emitter, derive_run_summary, derive_events
+from app.telemetry import get_emitter, derive_run_summary, derive_events, start_rollup_worker, stop_rollup_worker
 
 # Bloodwork Handoff imports (v3.29.0 - orchestrate/v2 bloodwork_input support)
 from app.brain.orchestrate_v2_bloodwork import (
@@ -225,6 +226,26 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 # Initialize telemetry emitter (v3.17.0)
 _telemetry = get_emitter()
 
+
+@app.on_event("startup")
+def _start_telemetry():
+    """Start the telemetry flusher (creates tables before its first write)."""
+    _telemetry.start()
+    start_rollup_worker()
+
+
+@app.on_event("shutdown")
+def _flush_telemetry():
+    """Write queued telemetry before the DB pool closes."""
+    stop_rollup_worker()
+    _telemetry.shutdown()
+
+
+@app.on_event("shutdown")
+def _close_db_pool():
+    """Release pooled database connections on shutdown."""
+    close_pool()
+
 SUPPLIER_STATUS_ACTIVE = "ACTIVE"
 SUPPLIER_STATUS_UNKNOWN = "UNKNOWN"
 SUPPLIER_STATUS_DISCONTINUING = "DISCONTINUING_SOON"
@@ -233,15 +254,6 @@ SUPPLIER_STATUS_STRICT = [SUPPLIER_STATUS_ACTIVE, SUPPLIER_STATUS_UNKNOWN]
 SUPPLIER_STATUS_FALLBACK = [SUPPLIER_STATUS_ACTIVE, SUPPLIER_STATUS_UNKNOWN, SUPPLIER_STATUS_DISCONTINUING]
 
 
-def get_db():
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 def parse_jsonb(value: Any) -> Any:
     if value is None:
         return None
@@ -586,6 +598,63 @@ def build_module_query(os_env: str, must_have_tags: List[str], blocked_ingredien
     return " ".join(query_parts), tuple(params)
 
 
+# Batched routing (one round trip for all intents instead of one query per intent)
+BRAIN_ROUTE_BATCHED = os.getenv("BRAIN_ROUTE_BATCHED", "true").lower() == "true"
+
+ROUTE_MODULE_COLUMNS = "module_code, product_name, os_layer, biological_domain, shopify_store, shopify_handle"
+ROUTE_MODULE_ORDER = "ORDER BY CASE os_layer WHEN 'Core' THEN 1 WHEN 'Adaptive' THEN 2 ELSE 3 END, module_code"
+
+
+def build_route_patterns(must_have_tags: List[str], blocked_ingredients: List[str]) -> tuple:
+    must_patterns = [f"%{tag}%" for tag in must_have_tags] if must_have_tags else ["%__match_all__%"]
+    blocked_patterns = [f"%{ing}%" for ing in blocked_ingredients] if blocked_ingredients else ["%__never_match__%"]
+    return must_patterns, blocked_patterns
+
+
+def select_route_module(cur, os_env: str, must_patterns: List[str], blocked_patterns: List[str]) -> Optional[Dict[str, Any]]:
+    """First matching module for a single intent (Core > Adaptive > other, then module_code)."""
+    cur.execute(
+        f"SELECT {ROUTE_MODULE_COLUMNS} FROM os_modules WHERE os_environment = %s AND ingredient_tags ILIKE ANY(%s) AND NOT (ingredient_tags ILIKE ANY(%s)) {ROUTE_MODULE_ORDER} LIMIT 1",
+        (os_env, must_patterns, blocked_patterns),
+    )
+    return cur.fetchone()
+
+
+def select_route_modules_batched(cur, os_env: str, must_patterns_list: List[List[str]], blocked_patterns: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    First matching module for every intent in one query.
+
+    Intents are sent as a JSON array of pattern lists and unnested WITH
+    ORDINALITY; a LATERAL subquery applies exactly the per-intent
+    select_route_module() predicate, ordering and LIMIT 1. Returns one entry
+    per input (None where nothing matched), in input order.
+    """
+    if not must_patterns_list:
+        return []
+    cur.execute(
+        f"""
+        SELECT i.ord, m.*
+        FROM jsonb_array_elements(%s::jsonb) WITH ORDINALITY AS i(patterns, ord)
+        LEFT JOIN LATERAL (
+            SELECT {ROUTE_MODULE_COLUMNS}
+            FROM os_modules
+            WHERE os_environment = %s
+              AND ingredient_tags ILIKE ANY(ARRAY(SELECT jsonb_array_elements_text(i.patterns)))
+              AND NOT (ingredient_tags ILIKE ANY(%s))
+            {ROUTE_MODULE_ORDER}
+            LIMIT 1
+        ) m ON TRUE
+        ORDER BY i.ord
+        """,
+        (json.dumps(must_patterns_list), os_env, blocked_patterns),
+    )
+    rows: List[Optional[Dict[str, Any]]] = [None] * len(must_patterns_list)
+    for row in cur.fetchall():
+        if row.get("module_code") is not None:
+            rows[int(row["ord"]) - 1] = row
+    return rows
+
+
 def derive_routing_constraints(markers: Dict[str, float]) -> List[Dict[str, Any]]:
     constraints = []
     for marker, value in markers.items():
@@ -714,46 +783,13 @@ def _emit_telemetry_for_phase(
     Telemetry errors never break requests (fail-safe).
     """
     try:
-        # Derive summary from request/response
+        # Derive summary and events from request/response
         summary = derive_run_summary(request_dict, response_dict, phase)
-        
-        # Extract sex and age from assessment context
-        ctx = response_dict.get("assessment_context") or request_dict.get("assessment_context") or {}
-        if hasattr(ctx, "model_dump"):
-            ctx = ctx.model_dump()
-        sex = ctx.get("sex") or ctx.get("gender")
-        age = ctx.get("age")
-        
-        # Start telemetry run
-        _telemetry.start_run(
-            run_id=run_id,
-            sex=sex,
-            age=age,
-            has_bloodwork=has_bloodwork or summary.has_bloodwork,
-            api_version=API_VERSION,
-        )
-        
-        # Complete run with aggregates
-        _telemetry.complete_run(
-            run_id=run_id,
-            intents_count=summary.intents_count,
-            matched_items_count=summary.matched_items_count,
-            unmatched_intents_count=summary.unmatched_intents_count,
-            blocked_skus_count=summary.blocked_skus_count,
-            auto_blocked_skus_count=summary.auto_blocked_skus_count,
-            caution_flags_count=summary.caution_flags_count,
-            confidence_level=summary.confidence_level,
-        )
-        
-        # Derive and emit events
+        summary.has_bloodwork = has_bloodwork or summary.has_bloodwork
         events = derive_events(response_dict, phase)
-        for event in events:
-            if event.event_type == "ROUTING_BLOCK":
-                _telemetry.emit_routing_block(run_id, event.code, event.count)
-            elif event.event_type == "MATCHING_UNMATCHED_INTENT":
-                _telemetry.emit_unmatched_intent(run_id, event.code, event.count)
-            elif event.event_type == "LOW_CONFIDENCE":
-                _telemetry.emit_low_confidence(run_id, event.code, event.count)
+        
+        # Run row (upserted per run_id + phase) and events in one write
+        _telemetry.record_run(summary, events, run_id=run_id, api_version=API_VERSION)
     except Exception as e:
         # Telemetry must never break the request
         print(f"[Telemetry] Emission error in {phase}: {e}")
@@ -991,10 +1027,16 @@ def brain_resolve(request: ResolveRequest):
     return response_dict
 
 
-@app.post("/api/v1/brain/orchestrate/v2", response_model=OrchestrateOutputV2)
-def brain_orchestrate_v2(request: OrchestrateInputV2) -> OrchestrateOutputV2:
+def orchestrate_v2(request: OrchestrateInputV2) -> OrchestrateOutputV2:
     """
-    Orchestrate V2 endpoint with dual mode support:
+    Orchestrate V2 service API (in-process).
+    
+    Shared by the HTTP endpoint and internal callers such as the webhook
+    queue workers, which call this directly instead of POSTing back to
+    their own server. Errors are raised as HTTPException so the endpoint
+    keeps its status codes; internal callers read status_code/detail.
+    
+    Dual mode support:
     1. bloodwork_input (RECOMMENDED): Raw markers sent to Bloodwork Engine for processing
     2. bloodwork_signal (LEGACY): Pre-computed BloodworkSignalV1
     
@@ -1228,6 +1270,14 @@ def brain_orchestrate_v2(request: OrchestrateInputV2) -> OrchestrateOutputV2:
     return response
 
 
+@app.post("/api/v1/brain/orchestrate/v2", response_model=OrchestrateOutputV2)
+def brain_orchestrate_v2(request: OrchestrateInputV2) -> OrchestrateOutputV2:
+    """
+    Orchestrate V2 endpoint for external clients. See orchestrate_v2().
+    """
+    return orchestrate_v2(request)
+
+
 @app.post("/api/v1/brain/orchestrate")
 def brain_orchestrate_legacy(request: OrchestrateRequest):
     run_id = str(uuid.uuid4())
@@ -1382,21 +1432,36 @@ def brain_route(request: RouteRequest):
         sku_items = []
         skipped_intents = []
         used_modules = set()
+        # Pass 1: catalog/target checks (no DB) - keeps skipped_intents order
+        routable = []
         for intent in supplement_intents:
             intent_id = intent.get("intent_id")
-            target_id = intent.get("target_id", intent_id)
             intent_spec = INTENT_CATALOG.get(intent_id)
             if not intent_spec:
-                skipped_intents.append({"intent_id": intent_id, "reason": "INTENT_NOT_IN_CATALOG"})
+                routable.append((intent, None, "INTENT_NOT_IN_CATALOG"))
                 continue
             if is_blocked_by_target(intent_spec, blocked_targets):
-                skipped_intents.append({"intent_id": intent_id, "reason": "BLOCKED_BY_TARGET"})
+                routable.append((intent, None, "BLOCKED_BY_TARGET"))
+                continue
+            routable.append((intent, intent_spec, None))
+        # Pass 2: module selection - one round trip for all intents
+        _, blocked_patterns = build_route_patterns([], blocked_ingredients)
+        must_patterns_list = [
+            build_route_patterns(spec.get("must_have_tags", []), [])[0]
+            for _, spec, skip in routable if skip is None
+        ]
+        if BRAIN_ROUTE_BATCHED:
+            selected = iter(select_route_modules_batched(cur, os_env, must_patterns_list, blocked_patterns))
+        else:
+            selected = iter([select_route_module(cur, os_env, p, blocked_patterns) for p in must_patterns_list])
+        # Pass 3: first-match + used_modules dedupe in intent order
+        for intent, intent_spec, skip_reason in routable:
+            intent_id = intent.get("intent_id")
+            target_id = intent.get("target_id", intent_id)
+            if skip_reason:
+                skipped_intents.append({"intent_id": intent_id, "reason": skip_reason})
                 continue
-            must_have_tags = intent_spec.get("must_have_tags", [])
-            must_patterns = [f"%{tag}%" for tag in must_have_tags] if must_have_tags else ["%__match_all__%"]
-            blocked_patterns = [f"%{ing}%" for ing in blocked_ingredients] if blocked_ingredients else ["%__never_match__%"]
-            cur.execute("SELECT module_code, product_name, os_layer, biological_domain, shopify_store, shopify_handle FROM os_modules WHERE os_environment = %s AND ingredient_tags ILIKE ANY(%s) AND NOT (ingredient_tags ILIKE ANY(%s)) ORDER BY CASE os_layer WHEN 'Core' THEN 1 WHEN 'Adaptive' THEN 2 ELSE 3 END, module_code LIMIT 1", (os_env, must_patterns, blocked_patterns))
-            row = cur.fetchone()
+            row = next(selected)
             if not row:
                 skipped_intents.append({"intent_id": intent_id, "reason": "NO_MATCHING_MODULE"})
                 continue
@@ -608,7 +608,8 @@ async def compose_only(request: ComposeOnlyRequest):
         "painpoints_applied": result.painpoints_applied,
         "lifestyle_rules_applied": result.lifestyle_rules_applied,
         "confidence_adjustments": result.confidence_adjustments,
-        "audit_log": result.audit_log
+        "audit_log": result.audit_log,
+        "config_versions": result.config_versions
     }
 
 
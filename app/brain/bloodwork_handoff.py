@@ -9,11 +9,14 @@ STRICT MODE: Blood does not negotiate.
 - Incomplete panel = proceed with BLOODWORK_INCOMPLETE_PANEL flag
 """
 
+import os
+import re
 import json
+import threading
 import httpx
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -33,11 +36,18 @@ from app.shared.hashing import canonicalize_and_hash
 
 # FIXED: Was incorrectly pointing to PostgreSQL URL (web-production-97b74)
 # Correct API URL is web-production-7110
-BLOODWORK_BASE_URL = "https://web-production-7110.up.railway.app"
+BLOODWORK_BASE_URL = os.getenv("BLOODWORK_BASE_URL", "https://web-production-7110.up.railway.app")
 BLOODWORK_ENDPOINT = "/api/v1/bloodwork/process"
 BLOODWORK_TIMEOUT_SECONDS = 30.0
 ENGINE_VERSION = "1.0.0"
 
+# Transport to the Bloodwork Engine:
+# - in_process: call BloodworkEngineV2 directly (engine ships in this service)
+# - http: POST to BLOODWORK_BASE_URL (opt-in, for a remote engine deployment)
+TRANSPORT_IN_PROCESS = "in_process"
+TRANSPORT_HTTP = "http"
+BLOODWORK_TRANSPORT = os.getenv("BLOODWORK_HANDOFF_TRANSPORT", TRANSPORT_IN_PROCESS)
+
 # Minimum markers to NOT flag as incomplete
 MINIMUM_PANEL_SIZE = 3
 
@@ -51,6 +61,7 @@ class BloodworkHandoffError(Enum):
     BLOODWORK_INVALID_HANDOFF = "BLOODWORK_INVALID_HANDOFF"
     BLOODWORK_TIMEOUT = "BLOODWORK_TIMEOUT"
     BLOODWORK_API_ERROR = "BLOODWORK_API_ERROR"
+    BLOODWORK_CONFIG_ERROR = "BLOODWORK_CONFIG_ERROR"
 
 
 class BloodworkHandoffException(Exception):
@@ -134,10 +145,219 @@ def load_handoff_schema() -> Dict:
     return _schema_cache
 
 
+# ---- Compiled fast path ----
+#
+# The handoff schema only uses a small draft-07 subset, so it is compiled
+# once into nested closures that answer "valid?" without building error
+# objects. The fast path is conservative: anything it rejects is re-checked
+# by the full jsonschema validator, which also produces the diagnostics.
+# Schemas using keywords outside the subset get no fast path.
+
+_ANNOTATION_KEYWORDS = frozenset([
+    "$schema", "$id", "title", "description", "format",  # format is not asserted by default
+])
+
+
+class UnsupportedSchemaError(Exception):
+    """Schema uses a keyword the fast-path compiler does not handle."""
+    pass
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": _is_number,
+    "integer": _is_integer,
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """JSON equality: booleans never equal numbers."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    return a == b
+
+
+def compile_schema_validator(schema: Dict[str, Any]) -> Callable[[Any], bool]:
+    """
+    Compile a draft-07 schema into a boolean validator.
+    
+    Supports type, const, enum, required, properties, additionalProperties
+    (boolean), items (single schema), minItems, uniqueItems, pattern,
+    minimum and maximum.
+    
+    Raises:
+        UnsupportedSchemaError: If the schema uses any other keyword
+    """
+    checks: List[Callable[[Any], bool]] = []
+    
+    for keyword in schema:
+        if keyword not in _ANNOTATION_KEYWORDS and keyword not in (
+            "type", "const", "enum", "required", "properties", "additionalProperties",
+            "items", "minItems", "uniqueItems", "pattern", "minimum", "maximum",
+        ):
+            raise UnsupportedSchemaError(keyword)
+    
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        type_checks = tuple(_TYPE_CHECKS[t] for t in types)
+        checks.append(lambda v: any(check(v) for check in type_checks))
+    
+    if "const" in schema:
+        const = schema["const"]
+        checks.append(lambda v: _json_equal(v, const))
+    
+    if "enum" in schema:
+        enum = tuple(schema["enum"])
+        checks.append(lambda v: any(_json_equal(v, option) for option in enum))
+    
+    required = tuple(schema.get("required", ()))
+    properties = tuple(
+        (name, compile_schema_validator(subschema))
+        for name, subschema in schema.get("properties", {}).items()
+    )
+    additional = schema.get("additionalProperties", True)
+    if not isinstance(additional, bool):
+        raise UnsupportedSchemaError("additionalProperties")
+    if required or properties or not additional:
+        known = frozenset(name for name, _ in properties)
+        
+        def check_object(v: Any) -> bool:
+            if not isinstance(v, dict):
+                return True
+            for name in required:
+                if name not in v:
+                    return False
+            for name, validate in properties:
+                if name in v and not validate(v[name]):
+                    return False
+            return additional or known.issuperset(v)
+        checks.append(check_object)
+    
+    if "items" in schema:
+        if not isinstance(schema["items"], dict):
+            raise UnsupportedSchemaError("items")
+        validate_item = compile_schema_validator(schema["items"])
+        checks.append(lambda v: not isinstance(v, list) or all(validate_item(item) for item in v))
+    
+    if "minItems" in schema:
+        min_items = schema["minItems"]
+        checks.append(lambda v: not isinstance(v, list) or len(v) >= min_items)
+    
+    if schema.get("uniqueItems"):
+        def check_unique(v: Any) -> bool:
+            if not isinstance(v, list):
+                return True
+            # Only decide for string arrays; anything else goes to jsonschema
+            return all(isinstance(item, str) for item in v) and len(set(v)) == len(v)
+        checks.append(check_unique)
+    
+    if "pattern" in schema:
+        search = re.compile(schema["pattern"]).search
+        checks.append(lambda v: not isinstance(v, str) or search(v) is not None)
+    
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+        checks.append(lambda v: not _is_number(v) or v >= minimum)
+    
+    if "maximum" in schema:
+        maximum = schema["maximum"]
+        checks.append(lambda v: not _is_number(v) or v <= maximum)
+    
+    checks = tuple(checks)
+    
+    def validate(value: Any) -> bool:
+        for check in checks:
+            if not check(value):
+                return False
+        return True
+    return validate
+
+
+@dataclass(frozen=True)
+class HandoffSchemaValidator:
+    """Prebuilt validators for one handoff schema version."""
+    schema_id: str
+    validator: Any  # jsonschema validator, None when jsonschema is unavailable
+    fast_path: Optional[Callable[[Any], bool]]
+
+
+_validators: Dict[str, HandoffSchemaValidator] = {}
+_validators_lock = threading.Lock()
+
+
+def get_handoff_validator(schema: Optional[Dict[str, Any]] = None) -> HandoffSchemaValidator:
+    """
+    Get the validator for a handoff schema, built once per schema version.
+    
+    The meta-schema check runs once here rather than on every validation.
+    """
+    schema = schema if schema is not None else load_handoff_schema()
+    schema_id = schema.get("$id", "bloodwork_handoff.schema.v1")
+    
+    cached = _validators.get(schema_id)
+    if cached is not None:
+        return cached
+    
+    with _validators_lock:
+        cached = _validators.get(schema_id)
+        if cached is not None:
+            return cached
+        
+        validator = None
+        if JSONSCHEMA_AVAILABLE:
+            validator_cls = jsonschema.validators.validator_for(schema)
+            validator_cls.check_schema(schema)
+            validator = validator_cls(schema)
+        try:
+            fast_path = compile_schema_validator(schema)
+        except UnsupportedSchemaError:
+            fast_path = None
+        
+        cached = HandoffSchemaValidator(schema_id=schema_id, validator=validator, fast_path=fast_path)
+        _validators[schema_id] = cached
+        return cached
+
+
+def collect_handoff_errors(handoff: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    All schema violations in one pass, for diagnostics.
+    
+    Returns: [{"message", "path", "validator"}] ordered by path
+    """
+    validator = get_handoff_validator().validator
+    if validator is None:
+        is_valid, error_msg = _basic_validate(handoff)
+        return [] if is_valid else [{"message": error_msg, "path": [], "validator": "basic"}]
+    
+    errors = sorted(validator.iter_errors(handoff), key=lambda e: [str(p) for p in e.path])
+    return [
+        {"message": e.message, "path": list(e.path), "validator": e.validator}
+        for e in errors
+    ]
+
+
 def validate_handoff_schema(handoff: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
     """
     Validate handoff object against JSON Schema.
     
+    Valid handoffs are accepted by the compiled fast path; everything else
+    is run through the cached jsonschema validator and every error is
+    reported.
+    
     Returns: (is_valid, error_message)
     """
     if not JSONSCHEMA_AVAILABLE:
@@ -145,11 +365,17 @@ def validate_handoff_schema(handoff: Dict[str, Any]) -> Tuple[bool, Optional[str
         return _basic_validate(handoff)
     
     try:
-        schema = load_handoff_schema()
-        jsonschema.validate(instance=handoff, schema=schema)
-        return True, None
-    except jsonschema.ValidationError as e:
-        return False, f"Schema validation failed: {e.message} at path {list(e.path)}"
+        compiled = get_handoff_validator()
+        if compiled.fast_path is not None and compiled.fast_path(handoff):
+            return True, None
+        
+        errors = collect_handoff_errors(handoff)
+        if not errors:
+            return True, None
+        details = "; ".join(f"{e['message']} at path {e['path']}" for e in errors)
+        if len(errors) == 1:
+            return False, f"Schema validation failed: {details}"
+        return False, f"Schema validation failed ({len(errors)} errors): {details}"
     except Exception as e:
         return False, f"Schema validation error: {str(e)}"
 
@@ -195,15 +421,75 @@ def _basic_validate(handoff: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
 # BLOODWORK ENGINE CLIENT
 # ============================================
 
+def _resolve_transport(transport: Optional[str]) -> str:
+    """Resolve the handoff transport; an unknown value is a 500 BLOODWORK_CONFIG_ERROR."""
+    transport = transport or BLOODWORK_TRANSPORT
+    if transport not in (TRANSPORT_IN_PROCESS, TRANSPORT_HTTP):
+        raise BloodworkHandoffException(
+            BloodworkHandoffError.BLOODWORK_CONFIG_ERROR,
+            f"Unknown bloodwork transport: {transport!r} "
+            f"(BLOODWORK_HANDOFF_TRANSPORT must be {TRANSPORT_IN_PROCESS!r} or {TRANSPORT_HTTP!r})",
+            http_code=500
+        )
+    return transport
+
+
+def _fetch_in_process(request_payload: Dict[str, Any]) -> BloodworkHandoffV1:
+    """
+    Run the Bloodwork Engine in this process and build the handoff from its result.
+    
+    Error mapping mirrors the HTTP transport: engine missing = 503
+    BLOODWORK_UNAVAILABLE, engine failure = 502 BLOODWORK_API_ERROR.
+    """
+    try:
+        from bloodwork_engine.api import serialize_result
+        from bloodwork_engine.engine_v2 import get_engine
+    except ImportError as e:
+        raise BloodworkHandoffException(
+            BloodworkHandoffError.BLOODWORK_UNAVAILABLE,
+            f"Bloodwork Engine not available in process: {str(e)}",
+            http_code=503
+        )
+    
+    try:
+        engine = get_engine(lab_profile=request_payload["lab_profile"])
+        result = engine.process_markers(
+            markers=request_payload["markers"],
+            sex=request_payload["sex"],
+            age=request_payload["age"]
+        )
+    except Exception as e:
+        raise BloodworkHandoffException(
+            BloodworkHandoffError.BLOODWORK_API_ERROR,
+            f"Bloodwork Engine failed: {type(e).__name__}: {str(e)}",
+            http_code=502
+        )
+    
+    # Same serializer as the /process endpoint, so both transports build
+    # the handoff from identical responses
+    return _build_handoff_from_response(
+        serialize_result(result),
+        request_payload,
+        source={
+            "service": "bloodwork_engine",
+            "endpoint": BLOODWORK_ENDPOINT,
+            "engine_version": ENGINE_VERSION
+        }
+    )
+
+
 async def fetch_bloodwork_handoff_async(
     markers: List[Dict[str, Any]],
     lab_profile: str = "GLOBAL_CONSERVATIVE",
     sex: Optional[str] = None,
-    age: Optional[int] = None
+    age: Optional[int] = None,
+    transport: Optional[str] = None
 ) -> BloodworkHandoffV1:
     """
     Fetch bloodwork processing result from Bloodwork Engine (async).
     
+    transport defaults to BLOODWORK_HANDOFF_TRANSPORT (in_process).
+    
     STRICT MODE: Raises BloodworkHandoffException on failure.
     """
     request_payload = {
@@ -213,6 +499,10 @@ async def fetch_bloodwork_handoff_async(
         "age": age
     }
     
+    if _resolve_transport(transport) == TRANSPORT_IN_PROCESS:
+        # Sub-millisecond CPU work; no need to leave the event loop
+        return _fetch_in_process(request_payload)
+    
     try:
         async with httpx.AsyncClient(timeout=BLOODWORK_TIMEOUT_SECONDS) as client:
             response = await client.post(
@@ -255,11 +545,14 @@ def fetch_bloodwork_handoff(
     markers: List[Dict[str, Any]],
     lab_profile: str = "GLOBAL_CONSERVATIVE",
     sex: Optional[str] = None,
-    age: Optional[int] = None
+    age: Optional[int] = None,
+    transport: Optional[str] = None
 ) -> BloodworkHandoffV1:
     """
     Fetch bloodwork processing result from Bloodwork Engine (sync).
     
+    transport defaults to BLOODWORK_HANDOFF_TRANSPORT (in_process).
+    
     STRICT MODE: Raises BloodworkHandoffException on failure.
     """
     request_payload = {
@@ -269,6 +562,9 @@ def fetch_bloodwork_handoff(
         "age": age
     }
     
+    if _resolve_transport(transport) == TRANSPORT_IN_PROCESS:
+        return _fetch_in_process(request_payload)
+    
     try:
         with httpx.Client(timeout=BLOODWORK_TIMEOUT_SECONDS) as client:
             response = client.post(
@@ -309,12 +605,14 @@ def fetch_bloodwork_handoff(
 
 def _build_handoff_from_response(
     api_response: Dict[str, Any],
-    request_payload: Dict[str, Any]
+    request_payload: Dict[str, Any],
+    source: Optional[Dict[str, str]] = None
 ) -> BloodworkHandoffV1:
     """
     Build canonical BloodworkHandoffV1 object from API response.
     
-    Maps Bloodwork Engine response format to handoff schema.
+    Maps Bloodwork Engine response format to handoff schema. source defaults
+    to the HTTP endpoint description.
     """
     # Extract routing constraints from API response
     routing_constraints_raw = api_response.get("routing_constraints", [])
@@ -431,7 +729,7 @@ def _build_handoff_from_response(
     # Bloodwork Engine returns short hashes, but schema requires 'sha256:[a-f0-9]{64}'
     handoff_dict = {
         "handoff_version": "bloodwork_handoff.v1",
-        "source": {
+        "source": source or {
             "service": "bloodwork_engine",
             "base_url": BLOODWORK_BASE_URL,
             "endpoint": BLOODWORK_ENDPOINT,
@@ -12,13 +12,15 @@ SCOPE RULES:
 - Blood constraints ALWAYS override everything
 """
 
-import json
-import os
-from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from app.brain.config_registry import (
+    ConfigSnapshot,
+    get_config_registry,
+)
+
 
 # ---------------------------------------------------------------------------
 # Data Models
@@ -62,35 +64,23 @@ class ComposeResult:
     lifestyle_rules_applied: List[str]
     confidence_adjustments: Dict[str, float]
     audit_log: List[str]
+    config_versions: Dict[str, str] = field(default_factory=dict)
 
 
 # ---------------------------------------------------------------------------
 # Config Loaders
 # ---------------------------------------------------------------------------
-
-def get_config_path(filename: str) -> Path:
-    """Get absolute path to config file."""
-    # Try relative to this file first
-    base = Path(__file__).parent.parent.parent / "config"
-    if (base / filename).exists():
-        return base / filename
-    # Fall back to project root
-    return Path(os.getcwd()) / "config" / filename
-
+# Served from the process-wide ConfigRegistry (cached, hot-reloaded); the
+# returned structures are shared, so callers must not mutate them.
 
 def load_painpoints_dictionary() -> Dict[str, Any]:
     """Load painpoints dictionary config."""
-    path = get_config_path("painpoints/painpoints_dictionary.v1.json")
-    with open(path, 'r') as f:
-        data = json.load(f)
-    return data.get("painpoints", {})
+    return get_config_registry().get("painpoints").data.get("painpoints", {})
 
 
 def load_lifestyle_ruleset() -> Tuple[List[Dict], Dict[str, Any]]:
     """Load lifestyle ruleset config. Returns (rules, constraints)."""
-    path = get_config_path("lifestyle/lifestyle_ruleset.v1.json")
-    with open(path, 'r') as f:
-        data = json.load(f)
+    data = get_config_registry().get("lifestyle").data
     return data.get("rules", []), data.get("global_constraints", {})
 
 
@@ -99,7 +89,8 @@ def load_lifestyle_ruleset() -> Tuple[List[Dict], Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 def generate_intents_from_painpoints(
-    painpoints: List[PainpointInput]
+    painpoints: List[PainpointInput],
+    config: Optional[ConfigSnapshot] = None
 ) -> Tuple[List[Intent], List[str]]:
     """
     Map painpoints to intents with base priority.
@@ -109,7 +100,7 @@ def generate_intents_from_painpoints(
     
     Returns: (intents, audit_log)
     """
-    dictionary = load_painpoints_dictionary()
+    dictionary = (config or get_config_registry().get("painpoints")).compiled
     intents: Dict[str, Intent] = {}
     audit_log: List[str] = []
     applied: List[str] = []
@@ -119,11 +110,10 @@ def generate_intents_from_painpoints(
             audit_log.append(f"[WARN] Unknown painpoint: {pp.id}")
             continue
             
-        config = dictionary[pp.id]
-        max_cap = config.get("max_priority_cap", 0.85)
-        mapped_intents = config.get("mapped_intents", {})
+        compiled = dictionary[pp.id]
+        max_cap = compiled.max_priority_cap
         
-        for intent_id, weight in mapped_intents.items():
+        for intent_id, weight in compiled.mapped_intents:
             # Calculate priority: severity × weight
             raw_priority = pp.severity * weight
             capped_priority = min(raw_priority, max_cap)
@@ -162,7 +152,12 @@ def evaluate_rule_condition(
     condition: Dict[str, Any],
     lifestyle: LifestyleInput
 ) -> bool:
-    """Check if a single rule condition matches the lifestyle input."""
+    """
+    Check if a single rule condition matches the lifestyle input.
+    
+    Interpreted form; compose evaluates the predicates compiled by
+    config_registry.compile_rule_condition, which must agree with this.
+    """
     for field, check in condition.items():
         value = getattr(lifestyle, field, None)
         if value is None:
@@ -183,7 +178,8 @@ def evaluate_rule_condition(
 
 def apply_lifestyle_modifiers(
     intents: List[Intent],
-    lifestyle: LifestyleInput
+    lifestyle: LifestyleInput,
+    config: Optional[ConfigSnapshot] = None
 ) -> Tuple[List[Intent], List[str], Dict[str, float], List[str]]:
     """
     Apply lifestyle rules to modify intent priorities.
@@ -193,32 +189,23 @@ def apply_lifestyle_modifiers(
     
     Returns: (modified_intents, applied_rules, confidence_adjustments, audit_log)
     """
-    rules, constraints = load_lifestyle_ruleset()
+    ruleset = (config or get_config_registry().get("lifestyle")).compiled
     audit_log: List[str] = []
     applied_rules: List[str] = []
     confidence_adjustments: Dict[str, float] = {}
     
-    max_modifier = constraints.get("max_modifier_value", 1.0)
-    min_modifier = constraints.get("min_modifier_value", -1.0)
-    
     # Build intent lookup
     intent_map = {i.id: i for i in intents}
     
-    for rule in rules:
-        conditions = rule.get("input_conditions", {})
-        
-        if not evaluate_rule_condition(conditions, lifestyle):
+    for rule in ruleset.rules:
+        if not rule.matches(lifestyle):
             continue
             
-        rule_id = rule.get("id", "unknown")
-        effects = rule.get("effects", {})
+        rule_id = rule.id
         applied_rules.append(rule_id)
         
-        # Apply intent modifiers
-        for intent_id, modifier in effects.get("intent_modifiers", {}).items():
-            # Clamp modifier
-            modifier = max(min_modifier, min(max_modifier, modifier))
-            
+        # Apply intent modifiers (clamped at compile time)
+        for intent_id, modifier in rule.intent_modifiers:
             if intent_id in intent_map:
                 intent = intent_map[intent_id]
                 old_priority = intent.priority
@@ -242,7 +229,7 @@ def apply_lifestyle_modifiers(
                 )
         
         # Apply confidence penalty
-        penalty = effects.get("confidence_penalty", 0.0)
+        penalty = rule.confidence_penalty
         if penalty > 0:
             for intent in intents:
                 intent.confidence *= (1 - penalty)
@@ -325,10 +312,16 @@ def compose(
     painpoints_applied: List[str] = []
     lifestyle_rules_applied: List[str] = []
     confidence_adjustments: Dict[str, float] = {}
+    config_versions: Dict[str, str] = {}
+    registry = get_config_registry()
     
     # Step 1: Painpoints → Intents
     if painpoints_input:
-        pp_intents, pp_applied, pp_audit = generate_intents_from_painpoints(painpoints_input)
+        painpoints_config = registry.get("painpoints")
+        config_versions["painpoints"] = painpoints_config.version
+        pp_intents, pp_applied, pp_audit = generate_intents_from_painpoints(
+            painpoints_input, painpoints_config
+        )
         all_intents.extend(pp_intents)
         painpoints_applied = pp_applied
         full_audit.extend(pp_audit)
@@ -352,8 +345,10 @@ def compose(
     
     # Step 3: Lifestyle → Priority modifiers
     if lifestyle_input and all_intents:
+        lifestyle_config = registry.get("lifestyle")
+        config_versions["lifestyle"] = lifestyle_config.version
         all_intents, ls_applied, conf_adj, ls_audit = apply_lifestyle_modifiers(
-            all_intents, lifestyle_input
+            all_intents, lifestyle_input, lifestyle_config
         )
         lifestyle_rules_applied = ls_applied
         confidence_adjustments = conf_adj
@@ -372,7 +367,8 @@ def compose(
         painpoints_applied=painpoints_applied,
         lifestyle_rules_applied=lifestyle_rules_applied,
         confidence_adjustments=confidence_adjustments,
-        audit_log=full_audit
+        audit_log=full_audit,
+        config_versions=config_versions
     )
 
 
@@ -397,5 +393,6 @@ def compose_result_to_dict(result: ComposeResult) -> Dict[str, Any]:
         "painpoints_applied": result.painpoints_applied,
         "lifestyle_rules_applied": result.lifestyle_rules_applied,
         "confidence_adjustments": result.confidence_adjustments,
-        "audit_log": result.audit_log
+        "audit_log": result.audit_log,
+        "config_versions": result.config_versions
     }
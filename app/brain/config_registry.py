@@ -0,0 +1,309 @@
+"""
+GenoMAX² Brain Config Registry
+
+Loads the Compose phase JSON configs (painpoints dictionary, lifestyle
+ruleset) once per process and serves them as immutable snapshots with a
+precompiled form next to the parsed data:
+
+- painpoints: painpoint id → CompiledPainpoint (cap + (intent, weight) pairs)
+- lifestyle: CompiledLifestyleRuleset, each rule's input_conditions compiled
+  into a predicate closure with its fields and comparisons resolved, and its
+  intent modifiers pre-clamped to the global constraints
+
+Files are re-checked at most every BRAIN_CONFIG_RELOAD_CHECK_S seconds. A
+changed mtime/size triggers a re-read; the snapshot is only rebuilt when the
+content hash differs. A reload that fails to parse or compile keeps serving
+the previous snapshot.
+
+Each snapshot carries a version id ("<config version>+<content hash prefix>")
+that Compose records in its audit.
+"""
+
+import json
+import logging
+import operator
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from app.shared.hashing import canonicalize_and_hash
+
+logger = logging.getLogger(__name__)
+
+BRAIN_CONFIG_RELOAD_CHECK_S = float(os.getenv("BRAIN_CONFIG_RELOAD_CHECK_S", "2"))
+
+PAINPOINTS_CONFIG = "painpoints/painpoints_dictionary.v1.json"
+LIFESTYLE_CONFIG = "lifestyle/lifestyle_ruleset.v1.json"
+
+
+class ConfigRegistryError(Exception):
+    """Raised when a config cannot be loaded and no previous snapshot exists."""
+    pass
+
+
+def get_config_path(filename: str) -> Path:
+    """Get absolute path to config file."""
+    # Try relative to this file first
+    base = Path(__file__).parent.parent.parent / "config"
+    if (base / filename).exists():
+        return base / filename
+    # Fall back to project root
+    return Path(os.getcwd()) / "config" / filename
+
+
+# ---------------------------------------------------------------------------
+# Compiled Forms
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class CompiledPainpoint:
+    """Painpoint mapping ready for intent generation."""
+    max_priority_cap: float
+    mapped_intents: Tuple[Tuple[str, float], ...]
+
+
+@dataclass(frozen=True)
+class CompiledLifestyleRule:
+    """Lifestyle rule with its condition compiled to a predicate."""
+    id: str
+    matches: Callable[[Any], bool]
+    intent_modifiers: Tuple[Tuple[str, float], ...]  # Clamped
+    confidence_penalty: float
+
+
+@dataclass(frozen=True)
+class CompiledLifestyleRuleset:
+    rules: Tuple[CompiledLifestyleRule, ...]
+    constraints: Mapping[str, Any]
+
+
+# A term fails when fails(value, operand) is true
+_FAILS = {
+    "min": operator.lt,
+    "max": operator.gt,
+    "equals": operator.ne,
+}
+
+
+def compile_rule_condition(condition: Dict[str, Any]) -> Callable[[Any], bool]:
+    """
+    Compile a rule's input_conditions into a predicate over LifestyleInput.
+
+    Same semantics as compose.evaluate_rule_condition: every field must be
+    present (not None) and pass each of its min/max/equals checks; a bare
+    value is an equality check.
+    """
+    terms = []
+    for field_name, check in condition.items():
+        if isinstance(check, dict):
+            tests = tuple((_FAILS[key], check[key]) for key in ("min", "max", "equals") if key in check)
+        else:
+            tests = ((operator.ne, check),)
+        terms.append((field_name, tests))
+
+    if len(terms) == 1 and len(terms[0][1]) == 1:
+        # Every shipped rule is a single comparison
+        (field_name, ((fails, operand),)), = terms
+
+        def matches(lifestyle: Any) -> bool:
+            value = getattr(lifestyle, field_name, None)
+            return value is not None and not fails(value, operand)
+        return matches
+
+    terms = tuple(terms)
+
+    def matches(lifestyle: Any) -> bool:
+        for field_name, tests in terms:
+            value = getattr(lifestyle, field_name, None)
+            if value is None:
+                return False
+            for fails, operand in tests:
+                if fails(value, operand):
+                    return False
+        return True
+    return matches
+
+
+def compile_painpoints(data: Dict[str, Any]) -> Mapping[str, CompiledPainpoint]:
+    """Compile painpoints_dictionary JSON."""
+    return MappingProxyType({
+        painpoint_id: CompiledPainpoint(
+            max_priority_cap=config.get("max_priority_cap", 0.85),
+            mapped_intents=tuple(config.get("mapped_intents", {}).items()),
+        )
+        for painpoint_id, config in data.get("painpoints", {}).items()
+    })
+
+
+def compile_lifestyle_ruleset(data: Dict[str, Any]) -> CompiledLifestyleRuleset:
+    """Compile lifestyle_ruleset JSON."""
+    constraints = data.get("global_constraints", {})
+    max_modifier = constraints.get("max_modifier_value", 1.0)
+    min_modifier = constraints.get("min_modifier_value", -1.0)
+
+    rules = []
+    for rule in data.get("rules", []):
+        effects = rule.get("effects", {})
+        rules.append(CompiledLifestyleRule(
+            id=rule.get("id", "unknown"),
+            matches=compile_rule_condition(rule.get("input_conditions", {})),
+            intent_modifiers=tuple(
+                (intent_id, max(min_modifier, min(max_modifier, modifier)))
+                for intent_id, modifier in effects.get("intent_modifiers", {}).items()
+            ),
+            confidence_penalty=effects.get("confidence_penalty", 0.0),
+        ))
+    return CompiledLifestyleRuleset(rules=tuple(rules), constraints=MappingProxyType(dict(constraints)))
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    One loaded version of a config file.
+
+    `data` is the parsed JSON shared by every caller; treat it as read-only.
+    """
+    name: str
+    path: Path
+    data: Dict[str, Any]
+    compiled: Any
+    version: str
+    content_hash: str
+    mtime_ns: int
+    size: int
+    loaded_at: datetime
+
+
+class ConfigRegistry:
+    """Cached, hot-reloading config snapshots by name."""
+
+    def __init__(self, reload_check_s: float = BRAIN_CONFIG_RELOAD_CHECK_S):
+        self.reload_check_s = reload_check_s
+        self._sources: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Any]]] = {}
+        self._snapshots: Dict[str, ConfigSnapshot] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._loads: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, filename: str, compiler: Callable[[Dict[str, Any]], Any]):
+        """Register a config file (relative to config/) and its compiler."""
+        with self._lock:
+            self._sources[name] = (filename, compiler)
+            self._snapshots.pop(name, None)
+            self._checked_at.pop(name, None)
+
+    def get(self, name: str) -> ConfigSnapshot:
+        """
+        Current snapshot for a config, reloading it if the file changed.
+
+        Raises:
+            ConfigRegistryError: If the config is unknown or was never loaded
+        """
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None and time.monotonic() - self._checked_at[name] < self.reload_check_s:
+            return snapshot
+
+        with self._lock:
+            return self._refresh(name)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Force the next get() to re-read the file(s) and rebuild."""
+        with self._lock:
+            for key in [name] if name else list(self._snapshots):
+                self._snapshots.pop(key, None)
+                self._checked_at.pop(key, None)
+
+    def versions(self) -> Dict[str, str]:
+        """Version ids of the currently loaded configs."""
+        return {name: snapshot.version for name, snapshot in self._snapshots.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "version": snapshot.version,
+                "content_hash": snapshot.content_hash,
+                "loaded_at": snapshot.loaded_at.isoformat(),
+                "loads": self._loads.get(name, 0),
+                "last_error": self._errors.get(name),
+            }
+            for name, snapshot in self._snapshots.items()
+        }
+
+    def _refresh(self, name: str) -> ConfigSnapshot:
+        """Stat the file and rebuild the snapshot if needed. Caller holds _lock."""
+        if name not in self._sources:
+            raise ConfigRegistryError(f"Unknown config: {name}")
+        filename, compiler = self._sources[name]
+        current = self._snapshots.get(name)
+        now = time.monotonic()
+
+        # Another thread may have refreshed while we waited for the lock
+        if current is not None and now - self._checked_at[name] < self.reload_check_s:
+            return current
+
+        path = get_config_path(filename)
+        try:
+            stat = path.stat()
+            if current is not None and (stat.st_mtime_ns, stat.st_size) == (current.mtime_ns, current.size):
+                self._checked_at[name] = now
+                return current
+
+            raw = path.read_bytes()
+            data = json.loads(raw)
+            content_hash = canonicalize_and_hash(data, exclude_volatile=False)
+            if current is not None and content_hash == current.content_hash:
+                # Touched but unchanged
+                snapshot = replace(current, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            else:
+                snapshot = ConfigSnapshot(
+                    name=name,
+                    path=path,
+                    data=data,
+                    compiled=compiler(data),
+                    version=f"{data.get('version', 'unversioned')}+{content_hash[len('sha256:'):][:12]}",
+                    content_hash=content_hash,
+                    mtime_ns=stat.st_mtime_ns,
+                    size=stat.st_size,
+                    loaded_at=datetime.now(timezone.utc),
+                )
+                self._loads[name] = self._loads.get(name, 0) + 1
+                logger.info(f"Loaded {name} config {snapshot.version} from {path}")
+        except Exception as e:
+            self._errors[name] = f"{type(e).__name__}: {e}"
+            if current is None:
+                raise ConfigRegistryError(f"Cannot load {name} config from {path}: {e}") from e
+            logger.error(f"Reload of {name} config failed, keeping {current.version}: {e}")
+            self._checked_at[name] = now
+            return current
+
+        self._snapshots[name] = snapshot
+        self._checked_at[name] = now
+        self._errors.pop(name, None)
+        return snapshot
+
+
+_registry: Optional[ConfigRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_config_registry() -> ConfigRegistry:
+    """Get the process-wide registry with the Compose configs registered."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = ConfigRegistry()
+                registry.register("painpoints", PAINPOINTS_CONFIG, compile_painpoints)
+                registry.register("lifestyle", LIFESTYLE_CONFIG, compile_lifestyle_ruleset)
+                _registry = registry
+    return _registry
@@ -291,7 +291,8 @@ def run_brain_pipeline(
         "intents_generated": len(compose_result.intents),
         "painpoints_applied": compose_result.painpoints_applied,
         "lifestyle_rules_applied": compose_result.lifestyle_rules_applied,
-        "audit_entries": len(compose_result.audit_log)
+        "audit_entries": len(compose_result.audit_log),
+        "config_versions": compose_result.config_versions
     }
     
     # Store compose audit in detail
@@ -372,7 +373,8 @@ def _persist_compose_run(
         json.dumps({
             "intents_count": len(compose_result.intents),
             "painpoints_applied": compose_result.painpoints_applied,
-            "lifestyle_rules_applied": compose_result.lifestyle_rules_applied
+            "lifestyle_rules_applied": compose_result.lifestyle_rules_applied,
+            "config_versions": compose_result.config_versions
         })
     ))
     
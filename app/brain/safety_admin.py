@@ -13,9 +13,8 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
+from app.shared.db_pool import get_db
 from app.brain.safety_gate import (
     SAFETY_GATE_VERSION,
     get_safety_blocked_ingredients,
@@ -31,16 +30,6 @@ router = APIRouter(prefix="/api/v1/safety", tags=["safety-gate"])
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-def get_db():
-    """Get database connection."""
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 # =============================================================================
 # REQUEST/RESPONSE MODELS
 # =============================================================================
@@ -32,12 +32,14 @@ from .mapper import CatalogMapper
 # Catalog Wiring (Issue #15)
 from .wiring import (
     get_catalog,
+    get_catalog_snapshot,
     ensure_catalog_available,
     filter_to_catalog,
     get_catalog_health,
     CatalogWiring,
     CatalogWiringError,
     CatalogProduct,
+    CatalogSnapshot,
     CatalogStatus,
     CATALOG_WIRING_VERSION,
 )
@@ -56,12 +58,14 @@ __all__ = [
     "CatalogMapper",
     # Wiring (Issue #15)
     "get_catalog",
+    "get_catalog_snapshot",
     "ensure_catalog_available",
     "filter_to_catalog",
     "get_catalog_health",
     "CatalogWiring",
     "CatalogWiringError",
     "CatalogProduct",
+    "CatalogSnapshot",
     "CatalogStatus",
     "CATALOG_WIRING_VERSION",
     # Version
@@ -24,25 +24,16 @@ import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, UploadFile, File, Query
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import pandas as pd
 from io import BytesIO
 
+from app.shared.db_pool import get_db
+
 router = APIRouter(prefix="/api/v1/catalog", tags=["Catalog Override"])
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-def get_db():
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 # ============================================================================
 # CONSTANTS
 # ============================================================================
@@ -9,6 +9,8 @@ This module:
 2. Provides filter function for routing/matching layers
 3. Hard aborts (503) if catalog is unavailable
 4. Blocked SKUs never enter the pipeline
+5. Serves an immutable, versioned snapshot that is rebuilt in the background
+   when catalog_products changes and swapped in atomically
 
 CRITICAL: No fallback, no mocks. If catalog fails, entire pipeline fails.
 
@@ -16,13 +18,17 @@ Version: catalog_wiring_v1.1 (os_environment support)
 """
 
 import os
+import json
+import hashlib
 import threading
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set, Any
-from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Optional, Set, Any, FrozenSet, Mapping, Tuple
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from app.shared.db_pool import get_pool, PoolError
 
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -81,12 +87,178 @@ class CatalogWiringError(Exception):
     pass
 
 
+# Change signal poll interval for the background refresher (0 disables it)
+CATALOG_REFRESH_INTERVAL_S = float(os.getenv("CATALOG_REFRESH_INTERVAL_S", "30"))
+# Rebuild at least this often even if the change signal is unchanged
+CATALOG_TTL_S = float(os.getenv("CATALOG_TTL_S", "900"))
+
+CATALOG_PRODUCTS_QUERY = """
+    SELECT 
+        gx_catalog_id,
+        product_name,
+        product_url,
+        category,
+        short_description,
+        base_price,
+        evidence_tier,
+        governance_status,
+        ingredient_tags,
+        sex_target,
+        os_environment
+    FROM catalog_products
+    WHERE governance_status = 'ACTIVE'
+    ORDER BY os_environment, evidence_tier, product_name
+"""
+
+# Cheap change detection: updated_at is maintained by trigger, the count
+# catches deletes
+CATALOG_CHANGE_SIGNAL_QUERY = """
+    SELECT COUNT(*) AS row_count, MAX(updated_at) AS last_updated
+    FROM catalog_products
+"""
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Immutable view of the catalog at one point in time.
+    
+    Reloads build a new snapshot and swap it in, so a request that holds a
+    snapshot keeps a consistent catalog for its whole run. `version` is a
+    content hash of the loaded products, stable across processes, for use
+    in audit hashes.
+    """
+    version: str
+    products: Mapping[str, CatalogProduct]
+    sku_set: FrozenSet[str]
+    maximo_skus: FrozenSet[str]
+    maxima_skus: FrozenSet[str]
+    universal_skus: FrozenSet[str]  # Should be empty after migration 016
+    tier1_skus: FrozenSet[str]
+    tier2_skus: FrozenSet[str]
+    loaded_at: Optional[datetime] = None
+    change_signal: Optional[Tuple[int, Optional[str]]] = None
+    
+    @classmethod
+    def empty(cls) -> "CatalogSnapshot":
+        none: FrozenSet[str] = frozenset()
+        return cls("", MappingProxyType({}), none, none, none, none, none, none)
+    
+    @classmethod
+    def from_rows(
+        cls,
+        rows: List[Dict[str, Any]],
+        change_signal: Optional[Tuple[int, Optional[str]]] = None,
+    ) -> "CatalogSnapshot":
+        """Build a snapshot from catalog_products rows."""
+        products: Dict[str, CatalogProduct] = {}
+        maximo, maxima, universal, tier1, tier2 = set(), set(), set(), set(), set()
+        
+        for row in rows:
+            # v1.1: Use os_environment as canonical product line
+            os_env = row.get('os_environment') or ''
+            
+            product = CatalogProduct(
+                sku=row['gx_catalog_id'],
+                name=row['product_name'],
+                category=row['category'] or 'supplement',
+                evidence_tier=row['evidence_tier'] or 'TIER_2',
+                price_usd=float(row['base_price'] or 0),
+                sex_target=row['sex_target'] or 'unisex',
+                os_environment=os_env,
+                ingredient_tags=row['ingredient_tags'] or [],
+                governance_status=row['governance_status'] or 'ACTIVE',
+                product_url=row['product_url'],
+            )
+            
+            if not product.is_available():
+                continue
+            products[product.sku] = product
+            
+            # v1.1: Index by os_environment (canonical)
+            if os_env == 'MAXimo²':
+                maximo.add(product.sku)
+            elif os_env == 'MAXima²':
+                maxima.add(product.sku)
+            else:
+                # Fallback for any products without os_environment
+                # (should not happen after migration 016)
+                if product.sex_target == 'male':
+                    maximo.add(product.sku)
+                elif product.sex_target == 'female':
+                    maxima.add(product.sku)
+                else:
+                    universal.add(product.sku)
+            
+            # Index by evidence tier
+            if product.evidence_tier == 'TIER_1':
+                tier1.add(product.sku)
+            elif product.evidence_tier == 'TIER_2':
+                tier2.add(product.sku)
+        
+        return cls(
+            version=cls.compute_version(products.values()),
+            products=MappingProxyType(products),
+            sku_set=frozenset(products),
+            maximo_skus=frozenset(maximo),
+            maxima_skus=frozenset(maxima),
+            universal_skus=frozenset(universal),
+            tier1_skus=frozenset(tier1),
+            tier2_skus=frozenset(tier2),
+            loaded_at=datetime.now(timezone.utc),
+            change_signal=change_signal,
+        )
+    
+    @staticmethod
+    def compute_version(products) -> str:
+        """Content hash over all product fields, independent of row order."""
+        canonical = sorted(
+            json.dumps(asdict(p), sort_keys=True, default=str) for p in products
+        )
+        digest = hashlib.sha256("\n".join(canonical).encode("utf-8")).hexdigest()
+        return f"catalog_{digest[:16]}"
+    
+    def is_purchasable(self, sku: str) -> bool:
+        return sku in self.sku_set
+    
+    def get_product(self, sku: str) -> Optional[CatalogProduct]:
+        return self.products.get(sku)
+    
+    def filter_skus(self, skus: List[str]) -> List[str]:
+        return [sku for sku in skus if sku in self.sku_set]
+    
+    def filter_by_product_line(self, product_line: str) -> Set[str]:
+        key = product_line.lower()
+        if 'maximo' in key or key == 'male':
+            return set(self.maximo_skus)
+        elif 'maxima' in key or key == 'female':
+            return set(self.maxima_skus)
+        elif key == 'unisex' or key == 'universal':
+            return set(self.universal_skus)
+        return set(self.sku_set)
+    
+    def filter_by_evidence_tier(self, tier: str) -> Set[str]:
+        if tier == 'TIER_1':
+            return set(self.tier1_skus)
+        elif tier == 'TIER_2':
+            return set(self.tier2_skus)
+        return set(self.sku_set)
+    
+    def get_all_products(self) -> List[CatalogProduct]:
+        return list(self.products.values())
+
+
 class CatalogWiring:
     """
     Singleton that manages the canonical SKU universe.
     
     IMPORTANT: This is the ONLY source of truth for purchasable products.
     The Brain MUST check this before recommending any SKU.
+    
+    Holds the current CatalogSnapshot. Reloads build a complete new snapshot
+    and swap the reference, so readers never see a half-built catalog. A
+    background refresher rebuilds when the change signal moves or the TTL
+    expires; a failed refresh keeps serving the previous snapshot.
     """
     
     _instance = None
@@ -104,34 +276,69 @@ class CatalogWiring:
         if self._initialized:
             return
         
-        self._products: Dict[str, CatalogProduct] = {}
-        self._sku_set: Set[str] = set()
-        self._maximo_skus: Set[str] = set()
-        self._maxima_skus: Set[str] = set()
-        self._universal_skus: Set[str] = set()  # Should be empty after migration 016
-        self._tier1_skus: Set[str] = set()
-        self._tier2_skus: Set[str] = set()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._reload_lock = threading.Lock()
         self._status = CatalogStatus.NOT_LOADED
-        self._loaded_at: Optional[datetime] = None
         self._error: Optional[str] = None
+        self._checked_at: Optional[datetime] = None
+        self._reload_count = 0
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_stop = threading.Event()
         self._initialized = True
     
+    @classmethod
+    def reset(cls):
+        """Drop the singleton (tests)."""
+        with cls._lock:
+            if cls._instance is not None and cls._instance._initialized:
+                cls._instance.stop_refresher()
+            cls._instance = None
+    
+    def snapshot(self) -> CatalogSnapshot:
+        """
+        Current catalog snapshot (empty if never loaded).
+        
+        Hold on to the returned snapshot for the duration of a request so
+        every lookup sees the same catalog version.
+        """
+        return self._snapshot or _EMPTY_SNAPSHOT
+    
+    @property
+    def version(self) -> Optional[str]:
+        """Version id of the current snapshot, None if not loaded."""
+        return self._snapshot.version if self._snapshot else None
+    
     @property
     def status(self) -> CatalogStatus:
+        if self._snapshot is not None:
+            return CatalogStatus.LOADED
         return self._status
     
     @property
     def is_loaded(self) -> bool:
-        return self._status == CatalogStatus.LOADED
+        return self._snapshot is not None
     
     @property
     def product_count(self) -> int:
-        return len(self._products)
+        return len(self.snapshot().products)
     
     @property
     def available_skus(self) -> Set[str]:
         """All SKUs that are available for recommendation."""
-        return {sku for sku, p in self._products.items() if p.is_available()}
+        return set(self.snapshot().sku_set)
+    
+    @property
+    def _loaded_at(self) -> Optional[datetime]:
+        return self.snapshot().loaded_at
+    
+    def _read_change_signal(self, cur) -> Tuple[int, Optional[str]]:
+        cur.execute(CATALOG_CHANGE_SIGNAL_QUERY)
+        row = cur.fetchone()
+        last_updated = row['last_updated']
+        return (
+            int(row['row_count'] or 0),
+            last_updated.isoformat() if last_updated else None,
+        )
     
     def load(self, force_reload: bool = False) -> Dict[str, Any]:
         """
@@ -149,109 +356,89 @@ class CatalogWiring:
         Raises:
             CatalogWiringError: If catalog cannot be loaded
         """
-        if self._status == CatalogStatus.LOADED and not force_reload:
+        if self._snapshot is not None and not force_reload:
             return self._get_stats()
         
-        self._status = CatalogStatus.LOADING
-        self._error = None
+        with self._reload_lock:
+            if self._snapshot is not None and not force_reload:
+                return self._get_stats()
+            self._rebuild()
+        return self._get_stats()
+    
+    def refresh(self) -> bool:
+        """
+        Rebuild the snapshot if the catalog changed or the TTL expired.
+        
+        Returns:
+            True if a new snapshot was swapped in
+            
+        Raises:
+            CatalogWiringError: If the catalog cannot be loaded
+        """
+        with self._reload_lock:
+            current = self._snapshot
+            if current is None:
+                return self._rebuild()
+            
+            expired = (
+                current.loaded_at is None
+                or (datetime.now(timezone.utc) - current.loaded_at).total_seconds() >= CATALOG_TTL_S
+            )
+            if not expired:
+                conn = None
+                try:
+                    conn = get_pool().acquire()
+                    cur = conn.cursor()
+                    signal = self._read_change_signal(cur)
+                    cur.close()
+                except (psycopg2.Error, PoolError) as e:
+                    self._error = f"Change check failed: {str(e)}"
+                    raise CatalogWiringError(
+                        f"CATALOG_DB_ERROR: Cannot check catalog for changes. "
+                        f"Error: {str(e)}"
+                    )
+                finally:
+                    if conn is not None:
+                        conn.close()
+                self._checked_at = datetime.now(timezone.utc)
+                if signal == current.change_signal:
+                    return False
+            return self._rebuild()
+    
+    def _rebuild(self) -> bool:
+        """Build a new snapshot and swap it in. Caller holds _reload_lock."""
+        if self._snapshot is None:
+            self._status = CatalogStatus.LOADING
+        conn = None
         
         try:
-            conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+            conn = get_pool().acquire()
             cur = conn.cursor()
             
-            # Query catalog_products table (v1.1: includes os_environment)
-            cur.execute("""
-                SELECT 
-                    gx_catalog_id,
-                    product_name,
-                    product_url,
-                    category,
-                    short_description,
-                    base_price,
-                    evidence_tier,
-                    governance_status,
-                    ingredient_tags,
-                    sex_target,
-                    os_environment
-                FROM catalog_products
-                WHERE governance_status = 'ACTIVE'
-                ORDER BY os_environment, evidence_tier, product_name
-            """)
+            # Signal first: a change racing the product query triggers
+            # another rebuild on the next check
+            signal = self._read_change_signal(cur)
             
+            # Query catalog_products table (v1.1: includes os_environment)
+            cur.execute(CATALOG_PRODUCTS_QUERY)
             rows = cur.fetchall()
+            cur.close()
             
             if not rows:
-                cur.close()
-                conn.close()
-                self._status = CatalogStatus.FAILED
                 self._error = "No active products found in catalog_products table"
+                if self._snapshot is None:
+                    self._status = CatalogStatus.FAILED
                 raise CatalogWiringError(
                     "CATALOG_EMPTY: No active products in catalog. "
                     "Cannot proceed with recommendations."
                 )
             
-            # Load products into memory
-            self._products.clear()
-            self._sku_set.clear()
-            self._maximo_skus.clear()
-            self._maxima_skus.clear()
-            self._universal_skus.clear()
-            self._tier1_skus.clear()
-            self._tier2_skus.clear()
-            
-            for row in rows:
-                # v1.1: Use os_environment as canonical product line
-                os_env = row.get('os_environment') or ''
-                
-                product = CatalogProduct(
-                    sku=row['gx_catalog_id'],
-                    name=row['product_name'],
-                    category=row['category'] or 'supplement',
-                    evidence_tier=row['evidence_tier'] or 'TIER_2',
-                    price_usd=float(row['base_price'] or 0),
-                    sex_target=row['sex_target'] or 'unisex',
-                    os_environment=os_env,
-                    ingredient_tags=row['ingredient_tags'] or [],
-                    governance_status=row['governance_status'] or 'ACTIVE',
-                    product_url=row['product_url'],
-                )
-                
-                if product.is_available():
-                    self._products[product.sku] = product
-                    self._sku_set.add(product.sku)
-                    
-                    # v1.1: Index by os_environment (canonical)
-                    if os_env == 'MAXimo²':
-                        self._maximo_skus.add(product.sku)
-                    elif os_env == 'MAXima²':
-                        self._maxima_skus.add(product.sku)
-                    else:
-                        # Fallback for any products without os_environment
-                        # (should not happen after migration 016)
-                        if product.sex_target == 'male':
-                            self._maximo_skus.add(product.sku)
-                        elif product.sex_target == 'female':
-                            self._maxima_skus.add(product.sku)
-                        else:
-                            self._universal_skus.add(product.sku)
-                    
-                    # Index by evidence tier
-                    if product.evidence_tier == 'TIER_1':
-                        self._tier1_skus.add(product.sku)
-                    elif product.evidence_tier == 'TIER_2':
-                        self._tier2_skus.add(product.sku)
+            snapshot = CatalogSnapshot.from_rows(rows, change_signal=signal)
             
-            cur.close()
-            conn.close()
-            
-            self._status = CatalogStatus.LOADED
-            self._loaded_at = datetime.now(timezone.utc)
-            
-            return self._get_stats()
-            
-        except psycopg2.Error as e:
-            self._status = CatalogStatus.FAILED
+        except (psycopg2.Error, PoolError) as e:
             self._error = f"Database error: {str(e)}"
+            if self._snapshot is None:
+                self._status = CatalogStatus.FAILED
             raise CatalogWiringError(
                 f"CATALOG_DB_ERROR: Cannot connect to catalog database. "
                 f"Error: {str(e)}"
@@ -259,24 +446,71 @@ class CatalogWiring:
         except Exception as e:
             if isinstance(e, CatalogWiringError):
                 raise
-            self._status = CatalogStatus.FAILED
             self._error = str(e)
+            if self._snapshot is None:
+                self._status = CatalogStatus.FAILED
             raise CatalogWiringError(
                 f"CATALOG_LOAD_ERROR: Unexpected error loading catalog. "
                 f"Error: {str(e)}"
             )
+        finally:
+            # Pooled connections: close() is idempotent and returns the slot
+            if conn is not None:
+                conn.close()
+        
+        changed = self._snapshot is None or self._snapshot.version != snapshot.version
+        self._snapshot = snapshot  # atomic reference swap
+        self._status = CatalogStatus.LOADED
+        self._error = None
+        self._checked_at = snapshot.loaded_at
+        if changed:
+            self._reload_count += 1
+        return changed
+    
+    # ===== BACKGROUND REFRESHER =====
+    
+    def _run_refresher(self, interval_s: float):
+        while True:
+            try:
+                self.refresh()
+            except CatalogWiringError as e:
+                print(f"[CatalogWiring] Refresh failed, keeping version {self.version}: {e}")
+            if self._refresher_stop.wait(interval_s):
+                return
+    
+    def start_refresher(self, interval_s: float = CATALOG_REFRESH_INTERVAL_S):
+        """Poll for catalog changes every interval_s seconds (0 disables)."""
+        if interval_s <= 0 or not DATABASE_URL:
+            return
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=self._run_refresher, args=(interval_s,),
+            name="catalog-refresher", daemon=True
+        )
+        self._refresher.start()
+    
+    def stop_refresher(self, timeout_s: float = 5.0):
+        """Stop the background refresher."""
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout_s)
+            self._refresher = None
     
     def _get_stats(self) -> Dict[str, Any]:
         """Get catalog statistics."""
+        snap = self.snapshot()
         return {
-            "status": self._status.value,
-            "total_products": len(self._products),
-            "maximo_products": len(self._maximo_skus),
-            "maxima_products": len(self._maxima_skus),
-            "universal_products": len(self._universal_skus),  # Should be 0 after migration 016
-            "tier1_products": len(self._tier1_skus),
-            "tier2_products": len(self._tier2_skus),
-            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "status": self.status.value,
+            "total_products": len(snap.products),
+            "maximo_products": len(snap.maximo_skus),
+            "maxima_products": len(snap.maxima_skus),
+            "universal_products": len(snap.universal_skus),  # Should be 0 after migration 016
+            "tier1_products": len(snap.tier1_skus),
+            "tier2_products": len(snap.tier2_skus),
+            "loaded_at": snap.loaded_at.isoformat() if snap.loaded_at else None,
+            "catalog_version": snap.version or None,
             "version": CATALOG_WIRING_VERSION,
         }
     
@@ -302,7 +536,7 @@ class CatalogWiring:
         Returns:
             True if SKU exists in catalog and is available
         """
-        return sku in self._sku_set
+        return self.snapshot().is_purchasable(sku)
     
     def get_product(self, sku: str) -> Optional[CatalogProduct]:
         """
@@ -314,7 +548,7 @@ class CatalogWiring:
         Returns:
             CatalogProduct if found, None otherwise
         """
-        return self._products.get(sku)
+        return self.snapshot().get_product(sku)
     
     def filter_skus(self, skus: List[str]) -> List[str]:
         """
@@ -326,7 +560,7 @@ class CatalogWiring:
         Returns:
             Filtered list containing only purchasable SKUs
         """
-        return [sku for sku in skus if self.is_purchasable(sku)]
+        return self.snapshot().filter_skus(skus)
     
     def filter_by_product_line(
         self, 
@@ -341,14 +575,7 @@ class CatalogWiring:
         Returns:
             Set of SKUs for that product line
         """
-        key = product_line.lower()
-        if 'maximo' in key or key == 'male':
-            return self._maximo_skus.copy()
-        elif 'maxima' in key or key == 'female':
-            return self._maxima_skus.copy()
-        elif key == 'unisex' or key == 'universal':
-            return self._universal_skus.copy()
-        return self._sku_set.copy()
+        return self.snapshot().filter_by_product_line(product_line)
     
     def filter_by_evidence_tier(self, tier: str) -> Set[str]:
         """
@@ -360,30 +587,30 @@ class CatalogWiring:
         Returns:
             Set of SKUs for that tier
         """
-        if tier == 'TIER_1':
-            return self._tier1_skus.copy()
-        elif tier == 'TIER_2':
-            return self._tier2_skus.copy()
-        return self._sku_set.copy()
+        return self.snapshot().filter_by_evidence_tier(tier)
     
     def get_all_products(self) -> List[CatalogProduct]:
         """Get all available products."""
-        return list(self._products.values())
+        return self.snapshot().get_all_products()
     
     def get_health(self) -> Dict[str, Any]:
         """Get health check info."""
+        snap = self.snapshot()
         return {
             "status": "healthy" if self.is_loaded else "unhealthy",
-            "catalog_status": self._status.value,
-            "product_count": len(self._products),
-            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "catalog_status": self.status.value,
+            "product_count": len(snap.products),
+            "loaded_at": snap.loaded_at.isoformat() if snap.loaded_at else None,
+            "checked_at": self._checked_at.isoformat() if self._checked_at else None,
+            "catalog_version": snap.version or None,
+            "reload_count": self._reload_count,
+            "refresher_running": self._refresher is not None and self._refresher.is_alive(),
             "error": self._error,
             "version": CATALOG_WIRING_VERSION,
         }
 
 
-# Global singleton instance
-_catalog_wiring = CatalogWiring()
+_EMPTY_SNAPSHOT = CatalogSnapshot.empty()
 
 
 def get_catalog() -> CatalogWiring:
@@ -396,10 +623,23 @@ def get_catalog() -> CatalogWiring:
         catalog = get_catalog()
         catalog.ensure_loaded()  # Raises CatalogWiringError if unavailable
         
-        if catalog.is_purchasable(sku):
-            # Proceed with recommendation
+        snapshot = catalog.snapshot()  # pin one version for the request
+        if snapshot.is_purchasable(sku):
+            # Proceed with recommendation, record snapshot.version
+    """
+    return CatalogWiring()
+
+
+def get_catalog_snapshot() -> CatalogSnapshot:
+    """
+    Load the catalog if needed and return the current snapshot.
+    
+    Raises:
+        CatalogWiringError: If catalog is unavailable (results in 503)
     """
-    return _catalog_wiring
+    catalog = get_catalog()
+    catalog.ensure_loaded()
+    return catalog.snapshot()
 
 
 def ensure_catalog_available() -> Dict[str, Any]:
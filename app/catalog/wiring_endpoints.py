@@ -62,7 +62,7 @@ def load_catalog(force: bool = False) -> Dict[str, Any]:
     Load or reload the catalog.
     
     Args:
-        force: If True, reload even if already loaded
+        force: If True, rebuild the snapshot even if already loaded
         
     Returns:
         Catalog statistics
@@ -112,28 +112,30 @@ def catalog_stats() -> Dict[str, Any]:
             }
         )
     
+    # One snapshot for the whole response
+    snap = catalog.snapshot()
+    
     # Build category breakdown
     categories: Dict[str, int] = {}
-    for sku in catalog.available_skus:
-        product = catalog.get_product(sku)
-        if product:
-            cat = product.category or "unknown"
-            categories[cat] = categories.get(cat, 0) + 1
+    for product in snap.get_all_products():
+        cat = product.category or "unknown"
+        categories[cat] = categories.get(cat, 0) + 1
     
     return {
         "status": "loaded",
-        "total_products": catalog.product_count,
+        "total_products": len(snap.products),
         "by_product_line": {
-            "maximo": len(catalog.filter_by_product_line("MAXimo²")),
-            "maxima": len(catalog.filter_by_product_line("MAXima²")),
-            "universal": len(catalog.filter_by_product_line("universal")),
+            "maximo": len(snap.maximo_skus),
+            "maxima": len(snap.maxima_skus),
+            "universal": len(snap.universal_skus),
         },
         "by_evidence_tier": {
-            "tier1": len(catalog.filter_by_evidence_tier("TIER_1")),
-            "tier2": len(catalog.filter_by_evidence_tier("TIER_2")),
+            "tier1": len(snap.tier1_skus),
+            "tier2": len(snap.tier2_skus),
         },
         "by_category": categories,
-        "loaded_at": catalog._loaded_at.isoformat() if catalog._loaded_at else None,
+        "loaded_at": snap.loaded_at.isoformat() if snap.loaded_at else None,
+        "catalog_version": snap.version,
         "version": CATALOG_WIRING_VERSION,
     }
 
@@ -164,12 +166,14 @@ def check_sku(sku: str) -> Dict[str, Any]:
             }
         )
     
-    is_purchasable = catalog.is_purchasable(sku)
-    product = catalog.get_product(sku)
+    snap = catalog.snapshot()
+    is_purchasable = snap.is_purchasable(sku)
+    product = snap.get_product(sku)
     
     result = {
         "sku": sku,
         "is_purchasable": is_purchasable,
+        "catalog_version": snap.version,
     }
     
     if product:
@@ -248,17 +252,19 @@ def list_all_skus() -> Dict[str, Any]:
             }
         )
     
+    snap = catalog.snapshot()
+    
     # Group by product line (uses os_environment internally)
-    maximo_skus = sorted(catalog.filter_by_product_line("MAXimo²"))
-    maxima_skus = sorted(catalog.filter_by_product_line("MAXima²"))
-    universal_skus = sorted(catalog.filter_by_product_line("universal"))
+    maximo_skus = sorted(snap.maximo_skus)
+    maxima_skus = sorted(snap.maxima_skus)
+    universal_skus = sorted(snap.universal_skus)
     
     # Group by tier
-    tier1_skus = sorted(catalog.filter_by_evidence_tier("TIER_1"))
-    tier2_skus = sorted(catalog.filter_by_evidence_tier("TIER_2"))
+    tier1_skus = sorted(snap.tier1_skus)
+    tier2_skus = sorted(snap.tier2_skus)
     
     return {
-        "total": catalog.product_count,
+        "total": len(snap.products),
         "by_product_line": {
             "maximo": {
                 "count": len(maximo_skus),
@@ -283,6 +289,7 @@ def list_all_skus() -> Dict[str, Any]:
                 "skus": tier2_skus,
             },
         },
+        "catalog_version": snap.version,
         "version": CATALOG_WIRING_VERSION,
     }
 
@@ -310,8 +317,9 @@ def list_all_products() -> Dict[str, Any]:
             }
         )
     
+    snap = catalog.snapshot()
     products = []
-    for product in catalog.get_all_products():
+    for product in snap.get_all_products():
         products.append({
             "sku": product.sku,
             "gx_catalog_id": product.sku,
@@ -331,5 +339,6 @@ def list_all_products() -> Dict[str, Any]:
     return {
         "total": len(products),
         "products": products,
+        "catalog_version": snap.version,
         "version": CATALOG_WIRING_VERSION,
     }
@@ -21,9 +21,8 @@ from dataclasses import dataclass, asdict
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
+from app.shared.db_pool import get_db
 from app.copy.renderer import (
     render_front_label,
     render_back_label,
@@ -59,14 +58,6 @@ class CleanupScope:
 
 # ===== Database Helpers =====
 
-def get_db():
-    """Get database connection."""
-    try:
-        return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        return None
-
 
 def ensure_audit_table():
     """Create copy_cleanup_audit_v1 table if it doesn't exist."""
@@ -70,6 +70,28 @@ def deployment_health():
     except Exception as e:
         status["components"]["database"] = {"status": "error", "error": str(e)}
     
+    # Connection pool wait/usage stats
+    try:
+        from app.shared.db_pool import get_pool_stats
+        status["db_pool"] = get_pool_stats()
+    except Exception as e:
+        status["db_pool"] = {"status": "error", "error": str(e)}
+    try:
+        from app.shared.async_db_pool import get_async_pool_stats
+        status["async_db_pool"] = get_async_pool_stats()
+    except Exception as e:
+        status["async_db_pool"] = {"status": "error", "error": str(e)}
+    try:
+        from app.shared.http_clients import get_http_client_stats
+        status["http_clients"] = get_http_client_stats()
+    except Exception as e:
+        status["http_clients"] = {"status": "error", "error": str(e)}
+    try:
+        from app.brain.config_registry import get_config_registry
+        status["brain_config"] = get_config_registry().get_stats()
+    except Exception as e:
+        status["brain_config"] = {"status": "error", "error": str(e)}
+
     # Check Catalog Wiring (Issue #15)
     try:
         from app.catalog.wiring import get_catalog_health
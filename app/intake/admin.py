@@ -17,9 +17,8 @@ import hashlib
 from datetime import datetime, timezone
 from typing import Optional, List
 from fastapi import APIRouter, Header, HTTPException, Depends
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
+from app.shared.db_pool import get_db
 from .models import (
     IntakeStatus,
     IntakeCreateRequest,
@@ -65,16 +64,6 @@ router = APIRouter(
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-def get_db():
-    """Get database connection."""
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 def now_iso() -> str:
     """Get current timestamp in ISO format."""
     return datetime.now(timezone.utc).isoformat()
@@ -12,19 +12,33 @@ Usage:
     
     client = ShopifyClient()
     shop_info = client.get_shop()
+
+    # Bulk publishing (rate-limited, concurrent)
+    client = get_async_shopify_client()
+    product, action, mf_error = await client.aupsert_product_with_metafields(handle, data, metafields)
 """
 
 import os
+import re
 import json
 import time
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import httpx
 
+from app.shared.http_clients import get_async_client, get_sync_client
+
 logger = logging.getLogger(__name__)
 
+# REST Admin API leaky bucket: the call-limit header reports the bucket size,
+# the leak rate depends on the plan (2/s standard, 4/s Plus)
+SHOPIFY_BUCKET_LEAK_RATE = float(os.getenv("SHOPIFY_BUCKET_LEAK_RATE", "2.0"))
+SHOPIFY_BUCKET_HEADROOM = int(os.getenv("SHOPIFY_BUCKET_HEADROOM", "2"))
+
 
 class ShopifyError(Exception):
     """Base exception for Shopify API errors."""
@@ -238,15 +252,15 @@ class ShopifyClient:
         
         for attempt in range(self.MAX_RETRIES):
             try:
-                with httpx.Client(timeout=self.timeout) as client:
-                    response = client.request(
-                        method=method,
-                        url=url,
-                        headers=self._get_headers(),
-                        json=data,
-                        params=params,
-                    )
-                    return self._handle_response(response)
+                response = get_sync_client("shopify").request(
+                    method=method,
+                    url=url,
+                    headers=self._get_headers(),
+                    json=data,
+                    params=params,
+                    timeout=self.timeout,
+                )
+                return self._handle_response(response)
                     
             except ShopifyRateLimitError as e:
                 if attempt < self.MAX_RETRIES - 1:
@@ -506,6 +520,434 @@ class ShopifyClient:
             }
 
 
+class LeakyBucket:
+    """
+    Client-side model of Shopify's REST leaky bucket.
+    
+    Every request reserves a slot before it is sent; the level leaks at
+    leak_rate per second. Responses resync the level from
+    X-Shopify-Shop-Api-Call-Limit (plus requests still in flight), and a 429
+    pauses every caller for Retry-After. Reservations are FIFO, so N
+    concurrent publishers share the budget instead of racing into 429s.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 40,
+        leak_rate: float = SHOPIFY_BUCKET_LEAK_RATE,
+        headroom: int = SHOPIFY_BUCKET_HEADROOM,
+    ):
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self.headroom = headroom
+        self.level = 0.0
+        self.in_flight = 0
+        self.waited_s = 0.0
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _leak(self, now: float) -> None:
+        self.level = max(0.0, self.level - (now - self._updated) * self.leak_rate)
+        self._updated = now
+    
+    def wait_time(self, now: float) -> float:
+        """Seconds until one more request fits under capacity - headroom."""
+        self._leak(now)
+        limit = max(1, self.capacity - self.headroom)
+        return max(self._paused_until - now, (self.level + 1 - limit) / self.leak_rate)
+    
+    async def acquire(self) -> None:
+        """Wait for, then reserve, one request slot."""
+        async with self._lock:
+            while True:
+                wait = self.wait_time(time.monotonic())
+                if wait <= 0:
+                    break
+                self.waited_s += wait
+                await asyncio.sleep(wait)
+            self.level += 1
+            self.in_flight += 1
+    
+    def release(self, rate_limit: Optional[RateLimitInfo] = None) -> None:
+        """Finish a reserved request, resyncing from its call-limit header."""
+        self.in_flight = max(0, self.in_flight - 1)
+        if rate_limit is not None:
+            self._leak(time.monotonic())
+            self.capacity = rate_limit.max
+            self.level = float(rate_limit.current + self.in_flight)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for seconds (after a 429)."""
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+# metafieldsSet upserts by (ownerId, namespace, key), at most 25 per call
+METAFIELDS_SET_BATCH = 25
+METAFIELDS_SET_MUTATION = """
+mutation MetafieldsSet($metafields: [MetafieldsSetInput!]!) {
+  metafieldsSet(metafields: $metafields) {
+    metafields { key namespace value }
+    userErrors { field message code }
+  }
+}
+"""
+
+
+class AsyncShopifyClient(ShopifyClient):
+    """
+    Async Shopify client for bulk publishing.
+    
+    Shares configuration and response handling with ShopifyClient, but every
+    call goes through the shared async HTTP client and a LeakyBucket, and
+    429s back off with asyncio.sleep instead of blocking a worker thread.
+    Async methods are prefixed with "a".
+    """
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        access_token: Optional[str] = None,
+        timeout: float = ShopifyClient.DEFAULT_TIMEOUT,
+        bucket: Optional[LeakyBucket] = None,
+    ):
+        super().__init__(base_url=base_url, access_token=access_token, timeout=timeout)
+        self.bucket = bucket or LeakyBucket()
+        self.calls = 0
+    
+    async def arequest(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Async _request: rate-limited by the bucket, same retries and errors."""
+        if not self.is_configured:
+            raise ShopifyError("Shopify client not configured. Set SHOPIFY_ADMIN_BASE_URL and SHOPIFY_ACCESS_TOKEN.")
+        
+        url = f"{self.base_url}{endpoint}"
+        
+        for attempt in range(self.MAX_RETRIES):
+            await self.bucket.acquire()
+            rate_limit = None
+            try:
+                response = await get_async_client("shopify").request(
+                    method=method,
+                    url=url,
+                    headers=self._get_headers(),
+                    json=data,
+                    params=params,
+                    timeout=self.timeout,
+                )
+                self.calls += 1
+                rate_limit = self._parse_rate_limit(response.headers)
+                return self._handle_response(response)
+                
+            except ShopifyRateLimitError as e:
+                if attempt < self.MAX_RETRIES - 1:
+                    wait_time = e.retry_after or (self.RETRY_BACKOFF * (attempt + 1))
+                    logger.warning(f"Rate limited, pausing {wait_time}s (attempt {attempt + 1}/{self.MAX_RETRIES})")
+                    self.bucket.pause(wait_time)
+                else:
+                    raise
+            except httpx.TimeoutException:
+                if attempt < self.MAX_RETRIES - 1:
+                    logger.warning(f"Request timeout, retrying (attempt {attempt + 1}/{self.MAX_RETRIES})")
+                    await asyncio.sleep(self.RETRY_BACKOFF)
+                else:
+                    raise ShopifyError(f"Request timeout after {self.MAX_RETRIES} attempts")
+            except httpx.RequestError as e:
+                raise ShopifyError(f"Request failed: {str(e)}")
+            finally:
+                self.bucket.release(rate_limit)
+    
+    async def aget_product_by_handle(self, handle: str) -> Optional[Dict[str, Any]]:
+        """Async get_product_by_handle."""
+        try:
+            result = await self.arequest("GET", "/products.json", params={"handle": handle})
+            products = result.get("products", [])
+            return products[0] if products else None
+        except ShopifyNotFoundError:
+            return None
+    
+    async def aupsert_product_with_metafields(
+        self,
+        handle: str,
+        product_data: Dict[str, Any],
+        metafields: Optional[List[Dict[str, Any]]] = None,
+    ) -> Tuple[Dict[str, Any], str, Optional[str]]:
+        """
+        Create or update a product by handle with its metafields.
+        
+        A new product carries its metafields in the POST instead of one POST
+        per metafield. An existing product is PUT without them, since a
+        product PUT only creates metafields (a namespace/key already on the
+        product is a 422), and its metafields are upserted with metafieldsSet.
+        Metafield failures never block the product, matching
+        set_product_metafields_bulk.
+        
+        Returns:
+            Tuple of (product dict, "created" or "updated", metafield error or None)
+        """
+        product_data = dict(product_data, handle=handle)
+        existing = await self.aget_product_by_handle(handle)
+        
+        if existing:
+            product, metafield_error = await self.aupdate_product(existing["id"], product_data, metafields)
+            return product, "updated", metafield_error
+        
+        if not metafields:
+            result = await self.arequest("POST", "/products.json", data={"product": product_data})
+            return result.get("product", result), "created", None
+        
+        metafield_error = None
+        try:
+            result = await self.arequest(
+                "POST", "/products.json", data={"product": dict(product_data, metafields=metafields)}
+            )
+        except ShopifyValidationError as e:
+            metafield_error = str(e)
+            logger.warning(f"Metafields rejected for {handle}, creating product without them: {e}")
+            result = await self.arequest("POST", "/products.json", data={"product": product_data})
+        return result.get("product", result), "created", metafield_error
+    
+    async def aupdate_product(
+        self,
+        product_id: int,
+        product_data: Dict[str, Any],
+        metafields: Optional[List[Dict[str, Any]]] = None,
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Update a product (only the given fields), then upsert its metafields.
+        
+        Returns:
+            Tuple of (product dict, metafield error or None)
+        """
+        result = await self.arequest(
+            "PUT", f"/products/{product_id}.json", data={"product": dict(product_data, id=product_id)}
+        )
+        product = result.get("product", result)
+        metafield_error = await self.aset_metafields(product_id, metafields) if metafields else None
+        return product, metafield_error
+    
+    async def aset_metafields(self, product_id: int, metafields: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Upsert product metafields by namespace/key with GraphQL metafieldsSet.
+        
+        One call per METAFIELDS_SET_BATCH metafields; each call is atomic.
+        
+        Returns:
+            Error message if any metafield was rejected, else None
+        """
+        errors = []
+        for start in range(0, len(metafields), METAFIELDS_SET_BATCH):
+            batch = [
+                {
+                    "ownerId": f"gid://shopify/Product/{product_id}",
+                    "namespace": mf["namespace"],
+                    "key": mf["key"],
+                    "value": mf["value"],
+                    "type": mf.get("type", "single_line_text_field"),
+                }
+                for mf in metafields[start:start + METAFIELDS_SET_BATCH]
+            ]
+            result = await self.arequest(
+                "POST", "/graphql.json",
+                data={"query": METAFIELDS_SET_MUTATION, "variables": {"metafields": batch}},
+            )
+            if result.get("errors"):
+                errors.append(str(result["errors"]))
+                continue
+            user_errors = ((result.get("data") or {}).get("metafieldsSet") or {}).get("userErrors") or []
+            errors.extend(f"{'.'.join(map(str, e.get('field') or []))}: {e.get('message')}" for e in user_errors)
+        
+        if errors:
+            logger.warning(f"Metafields rejected for product {product_id}: {errors}")
+            return f"Metafield error: {'; '.join(errors)}"
+        return None
+
+
+class FakeShopifyAPI(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    In-process fake of the Shopify Admin endpoints used for publishing
+    (REST products and metafields, GraphQL metafieldsSet).
+    
+    Install with configure_upstream("shopify", transport=FakeShopifyAPI()).
+    Models the leaky bucket (429 + Retry-After when full, call-limit header on
+    every response) and optional per-request latency, and records request
+    counts and peak concurrency for tests and benchmarks.
+    
+    Metafields follow Shopify's write semantics: a product POST/PUT only
+    creates them (a namespace/key already on the product is a 422), while
+    GraphQL metafieldsSet upserts them atomically.
+    """
+    
+    PRODUCT_PATH = re.compile(r"/products/(\d+)(/metafields)?\.json$")
+    
+    def __init__(
+        self,
+        capacity: int = 40,
+        leak_rate: float = 2.0,
+        latency_s: float = 0.0,
+        retry_after_s: float = 1.0,
+        reject_metafield_keys: Tuple[str, ...] = (),
+    ):
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self.latency_s = latency_s
+        self.retry_after_s = retry_after_s
+        self.reject_metafield_keys = set(reject_metafield_keys)
+        self.products: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.writes: List[Dict[str, Any]] = []  # product payloads of POST/PUT
+        self.metafield_sets: List[List[Dict[str, Any]]] = []  # metafieldsSet inputs
+        self.throttled = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._level = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._enter()
+        try:
+            time.sleep(self.latency_s)
+            return self._respond(request)
+        finally:
+            self._exit()
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._enter()
+        try:
+            await asyncio.sleep(self.latency_s)
+            return self._respond(request)
+        finally:
+            self._exit()
+    
+    def _enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+    
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+    
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            now = time.monotonic()
+            self._level = max(0.0, self._level - (now - self._updated) * self.leak_rate)
+            self._updated = now
+            if self._level + 1 > self.capacity:
+                self.throttled += 1
+                return httpx.Response(
+                    429,
+                    json={"errors": "Exceeded 2 calls per second for api client. Reduce request rates to resume uninterrupted service."},
+                    headers={"Retry-After": str(self.retry_after_s),
+                             "X-Shopify-Shop-Api-Call-Limit": f"{self.capacity}/{self.capacity}"},
+                )
+            self._level += 1
+            call_limit = f"{int(self._level + 0.999)}/{self.capacity}"
+            self.requests.append((request.method, request.url.path))
+            status, body = self._route(request)
+        return httpx.Response(status, json=body, headers={"X-Shopify-Shop-Api-Call-Limit": call_limit})
+    
+    def _route(self, request: httpx.Request) -> Tuple[int, Dict[str, Any]]:
+        path = request.url.path
+        payload = json.loads(request.content) if request.content else {}
+        if "product" in payload:
+            self.writes.append(payload["product"])
+        
+        if path.endswith("/graphql.json"):
+            return self._metafields_set(payload.get("variables", {}).get("metafields", []))
+        
+        if path.endswith("/shop.json"):
+            return 200, {"shop": {"name": "GenoMAX Fake", "myshopify_domain": "fake.myshopify.com"}}
+        
+        if path.endswith("/products.json") and request.method == "GET":
+            handle = request.url.params.get("handle")
+            product = self.products.get(handle)
+            return 200, {"products": [self._public(product)] if product else []}
+        
+        if path.endswith("/products.json") and request.method == "POST":
+            product = dict(payload["product"])
+            metafields = product.pop("metafields", [])
+            if product["handle"] in self.products:
+                return 422, {"errors": {"handle": ["has already been taken"]}}
+            product.update(id=len(self.products) + 1001, metafields={})
+            return self._write(product, metafields, 201)
+        
+        match = self.PRODUCT_PATH.search(path)
+        existing = next((p for p in self.products.values() if match and p["id"] == int(match.group(1))), None)
+        if existing is None:
+            return 404, {"errors": "Not Found"}
+        
+        if match.group(2):
+            if request.method == "POST":
+                metafield = payload["metafield"]
+                existing["metafields"][(metafield["namespace"], metafield["key"])] = metafield["value"]
+                return 201, {"metafield": metafield}
+            return 200, {"metafields": [
+                {"namespace": ns, "key": key, "value": value}
+                for (ns, key), value in existing["metafields"].items()
+            ]}
+        
+        if request.method == "PUT":
+            fields = dict(payload["product"])
+            metafields = fields.pop("metafields", [])
+            taken = [mf["key"] for mf in metafields
+                     if "id" not in mf and (mf["namespace"], mf["key"]) in existing["metafields"]]
+            if taken:
+                return 422, {"errors": {"metafields.key": [
+                    f"{key} must be unique within this namespace" for key in taken
+                ]}}
+            return self._write(dict(existing, **fields), metafields, 200)
+        return 200, {"product": self._public(existing)}
+    
+    def _write(
+        self, product: Dict[str, Any], metafields: List[Dict[str, Any]], status: int
+    ) -> Tuple[int, Dict[str, Any]]:
+        rejected = [mf["key"] for mf in metafields if mf["key"] in self.reject_metafield_keys]
+        if rejected:
+            return 422, {"errors": {"metafields": [f"{key} is invalid" for key in rejected]}}
+        product["metafields"] = dict(product["metafields"])
+        for mf in metafields:
+            product["metafields"][(mf["namespace"], mf["key"])] = mf["value"]
+        self.products[product["handle"]] = product
+        return status, {"product": self._public(product)}
+    
+    def _metafields_set(self, metafields: List[Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+        user_errors = [
+            {"field": ["metafields", str(i), "key"], "message": f"{mf['key']} is invalid", "code": "INVALID"}
+            for i, mf in enumerate(metafields) if mf["key"] in self.reject_metafield_keys
+        ]
+        if len(metafields) > METAFIELDS_SET_BATCH:
+            user_errors.append({"field": ["metafields"], "message": "Exceeded the maximum metafields input limit",
+                                "code": "LESS_THAN_OR_EQUAL_TO"})
+        products = {f"gid://shopify/Product/{p['id']}": p for p in self.products.values()}
+        user_errors += [
+            {"field": ["metafields", str(i), "ownerId"], "message": "Owner does not exist", "code": "INVALID"}
+            for i, mf in enumerate(metafields) if mf["ownerId"] not in products
+        ]
+        if not user_errors:
+            self.metafield_sets.append(metafields)
+            for mf in metafields:
+                products[mf["ownerId"]]["metafields"][(mf["namespace"], mf["key"])] = mf["value"]
+        return 200, {"data": {"metafieldsSet": {
+            "metafields": [] if user_errors else [
+                {"namespace": mf["namespace"], "key": mf["key"], "value": mf["value"]} for mf in metafields
+            ],
+            "userErrors": user_errors,
+        }}}
+    
+    @staticmethod
+    def _public(product: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in product.items() if k != "metafields"}
+
+
 # Singleton instance
 _client: Optional[ShopifyClient] = None
 
@@ -516,3 +958,14 @@ def get_shopify_client() -> ShopifyClient:
     if _client is None:
         _client = ShopifyClient()
     return _client
+
+
+_async_client: Optional[AsyncShopifyClient] = None
+
+
+def get_async_shopify_client() -> AsyncShopifyClient:
+    """Get singleton async Shopify client (one bucket per shop)."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncShopifyClient()
+    return _async_client
@@ -22,7 +22,9 @@ Environment Variables Required:
 import os
 import re
 import json
+import time
 import uuid
+import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
@@ -31,15 +33,17 @@ from enum import Enum
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
+from app.shared.db_pool import get_db
+from app.shared.hashing import canonicalize_and_hash
 from app.integrations.shopify_client import (
+    get_async_shopify_client,
     get_shopify_client,
+    AsyncShopifyClient,
     ShopifyClient,
     ShopifyError,
     ShopifyAuthError,
-    ShopifyValidationError,
+    ShopifyNotFoundError,
 )
 
 logger = logging.getLogger(__name__)
@@ -52,6 +56,10 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 FIELD_MAP_VERSION = "v2"  # Updated for Launch v1 enforcement
 METAFIELD_NAMESPACE = "genomax"
 
+# Concurrent publish: products in flight, and a PROGRESS audit row every N
+PUBLISH_CONCURRENCY = int(os.getenv("SHOPIFY_PUBLISH_CONCURRENCY", "4"))
+PUBLISH_PROGRESS_EVERY = int(os.getenv("SHOPIFY_PUBLISH_PROGRESS_EVERY", "25"))
+
 # Placeholder patterns to block
 PLACEHOLDER_PATTERNS = re.compile(
     r"\b(TBD|MISSING|REVIEW|PLACEHOLDER)\b",
@@ -72,6 +80,8 @@ class ExportRequest(BaseModel):
     """Request body for export endpoints."""
     limit: int = Field(default=50, ge=1, le=250, description="Max modules to process")
     only_ready: bool = Field(default=True, description="Only export READY_FOR_SHOPIFY modules")
+    concurrency: int = Field(default=PUBLISH_CONCURRENCY, ge=1, le=16, description="Products published concurrently")
+    diff: bool = Field(default=False, description="Skip unchanged modules and PUT only changed fields")
     # Note: is_launch_v1 filter is ALWAYS applied, not optional
 
 
@@ -93,18 +103,12 @@ class PublishAction(str, Enum):
     UPDATE = "UPDATE"
     SKIP = "SKIP"
     ERROR = "ERROR"
+    UNCHANGED = "UNCHANGED"  # Diff mode: payload hash matches last publish
+    PROGRESS = "PROGRESS"  # Batch progress/throughput row, not a module
 
 
 # ===== Database Helpers =====
 
-def get_db():
-    """Get database connection."""
-    try:
-        return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        return None
-
 
 def fetch_modules_for_export(limit: int = 50, only_active: bool = True) -> List[Dict[str, Any]]:
     """
@@ -299,7 +303,7 @@ def build_metafields_payload(module: Dict[str, Any]) -> List[Dict[str, Any]]:
 # ===== Audit Table Creation =====
 
 def ensure_audit_table():
-    """Create shopify_publish_audit_v1 table if it doesn't exist."""
+    """Create shopify_publish_audit_v1 and shopify_publish_state_v1 if they don't exist."""
     conn = get_db()
     if not conn:
         return False
@@ -326,6 +330,21 @@ def ensure_audit_table():
                 ON shopify_publish_audit_v1(module_code);
             CREATE INDEX IF NOT EXISTS idx_shopify_audit_created_at 
                 ON shopify_publish_audit_v1(created_at DESC);
+            
+            ALTER TABLE shopify_publish_audit_v1
+                ADD COLUMN IF NOT EXISTS payload_hash TEXT;
+            
+            -- Last successfully published payload per module (diff mode)
+            CREATE TABLE IF NOT EXISTS shopify_publish_state_v1 (
+                module_code TEXT PRIMARY KEY,
+                shopify_handle TEXT NOT NULL,
+                shopify_product_id TEXT NOT NULL,
+                payload_hash TEXT NOT NULL,
+                product_payload JSONB NOT NULL,
+                metafields JSONB NOT NULL,
+                batch_id UUID NOT NULL,
+                published_at TIMESTAMPTZ DEFAULT NOW()
+            );
         """)
         conn.commit()
         cur.close()
@@ -349,6 +368,7 @@ def log_publish_audit(
     request_payload: Optional[Dict] = None,
     response_status: Optional[int] = None,
     response_body: Optional[Dict] = None,
+    payload_hash: Optional[str] = None,
 ):
     """Log a publish attempt to the audit table."""
     conn = get_db()
@@ -361,8 +381,8 @@ def log_publish_audit(
         cur.execute("""
             INSERT INTO shopify_publish_audit_v1 
             (batch_id, module_code, shopify_handle, action, shopify_product_id, 
-             request_payload, response_status, response_body)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+             request_payload, response_status, response_body, payload_hash)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """, (
             batch_id,
             module_code,
@@ -372,6 +392,7 @@ def log_publish_audit(
             json.dumps(request_payload) if request_payload else None,
             response_status,
             json.dumps(response_body) if response_body else None,
+            payload_hash,
         ))
         conn.commit()
         cur.close()
@@ -384,6 +405,328 @@ def log_publish_audit(
             pass
 
 
+# ===== Incremental Sync State =====
+
+def compute_publish_hash(product_payload: Dict[str, Any], metafields: List[Dict[str, Any]]) -> str:
+    """Content hash of everything a publish sends for one module."""
+    return canonicalize_and_hash({
+        "field_map_version": FIELD_MAP_VERSION,
+        "product": product_payload,
+        "metafields": metafields,
+    })
+
+
+def diff_publish_payload(
+    state: Dict[str, Any],
+    product_payload: Dict[str, Any],
+    metafields: List[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Product fields and metafields that differ from the last published state.
+    
+    Metafields dropped since the last publish are left in place, as a full
+    publish never deleted them either.
+    """
+    previous = state.get("product_payload") or {}
+    changed_fields = {k: v for k, v in product_payload.items() if previous.get(k) != v}
+    
+    previous_metafields = {
+        (mf["namespace"], mf["key"]): mf for mf in state.get("metafields") or []
+    }
+    changed_metafields = [
+        mf for mf in metafields
+        if previous_metafields.get((mf["namespace"], mf["key"])) != mf
+    ]
+    return changed_fields, changed_metafields
+
+
+def load_publish_state(module_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Last published state per module_code (missing modules are absent)."""
+    if not module_codes:
+        return {}
+    conn = get_db()
+    if not conn:
+        logger.error("Cannot load publish state: database connection failed")
+        return {}
+    
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT module_code, shopify_handle, shopify_product_id, payload_hash,
+                   product_payload, metafields
+            FROM shopify_publish_state_v1
+            WHERE module_code = ANY(%s)
+        """, (list(module_codes),))
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return {row["module_code"]: dict(row) for row in rows}
+    except Exception as e:
+        logger.error(f"Failed to load publish state: {e}")
+        try:
+            conn.close()
+        except:
+            pass
+        return {}
+
+
+def save_publish_state(
+    batch_id: str,
+    module_code: str,
+    shopify_handle: str,
+    shopify_product_id: str,
+    payload_hash: str,
+    product_payload: Dict[str, Any],
+    metafields: List[Dict[str, Any]],
+):
+    """Record what is now live in Shopify for a module."""
+    conn = get_db()
+    if not conn:
+        logger.error("Cannot save publish state: database connection failed")
+        return
+    
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO shopify_publish_state_v1
+            (module_code, shopify_handle, shopify_product_id, payload_hash,
+             product_payload, metafields, batch_id, published_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+            ON CONFLICT (module_code) DO UPDATE SET
+                shopify_handle = EXCLUDED.shopify_handle,
+                shopify_product_id = EXCLUDED.shopify_product_id,
+                payload_hash = EXCLUDED.payload_hash,
+                product_payload = EXCLUDED.product_payload,
+                metafields = EXCLUDED.metafields,
+                batch_id = EXCLUDED.batch_id,
+                published_at = NOW()
+        """, (
+            module_code,
+            shopify_handle,
+            shopify_product_id,
+            payload_hash,
+            json.dumps(product_payload),
+            json.dumps(metafields),
+            batch_id,
+        ))
+        conn.commit()
+        cur.close()
+        conn.close()
+    except Exception as e:
+        logger.error(f"Failed to save publish state: {e}")
+        try:
+            conn.close()
+        except:
+            pass
+
+
+# ===== Concurrent Publisher =====
+
+async def publish_modules(
+    modules: List[Dict[str, Any]],
+    batch_id: str,
+    client: AsyncShopifyClient,
+    concurrency: int = PUBLISH_CONCURRENCY,
+    progress_every: int = PUBLISH_PROGRESS_EVERY,
+    diff: bool = False,
+) -> Dict[str, Any]:
+    """
+    Publish modules to Shopify, `concurrency` products at a time.
+    
+    Each new module costs two API calls (handle lookup + one product POST
+    carrying its metafields); an existing one costs three (handle lookup,
+    product PUT, metafieldsSet upsert). The client's leaky bucket paces them
+    against X-Shopify-Shop-Api-Call-Limit. Every module gets its audit row as before,
+    plus a PROGRESS row every `progress_every` modules and at the end with
+    batch throughput.
+    
+    With diff=True, modules whose payload hash matches shopify_publish_state_v1
+    are recorded as UNCHANGED without any API call. Changed modules get one
+    PUT of only the changed product fields (which also fails with 404 if the
+    product was deleted) plus, if any metafield changed, one metafieldsSet
+    upsert of only those metafields.
+    
+    Returns:
+        Dict with created/updated/unchanged/skipped/errors lists (module
+        order) and the final throughput stats
+    """
+    state = (
+        await asyncio.to_thread(load_publish_state, [m["module_code"] for m in modules])
+        if diff else {}
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.monotonic()
+    calls_before = client.calls
+    waited_before = client.bucket.waited_s
+    throttled_before = client.bucket.throttled
+    completed = 0
+    final: Dict[str, Any] = {}
+    
+    def throughput() -> Dict[str, Any]:
+        elapsed = time.monotonic() - started
+        return {
+            "completed": completed,
+            "total": len(modules),
+            "elapsed_s": round(elapsed, 3),
+            "modules_per_s": round(completed / elapsed, 2) if elapsed > 0 else None,
+            "api_calls": client.calls - calls_before,
+            "throttle_wait_s": round(client.bucket.waited_s - waited_before, 3),
+            "rate_limited": client.bucket.throttled - throttled_before,
+            "concurrency": concurrency,
+        }
+    
+    async def audit(**kwargs) -> None:
+        await asyncio.to_thread(log_publish_audit, batch_id=batch_id, **kwargs)
+    
+    async def write(
+        shopify_handle: str,
+        product_payload: Dict[str, Any],
+        metafields: List[Dict[str, Any]],
+        previous: Optional[Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], str, Optional[str], Optional[List[str]]]:
+        """Upsert in full, or write only what changed since `previous`."""
+        if previous:
+            changed_fields, changed_metafields = diff_publish_payload(previous, product_payload, metafields)
+            try:
+                product, metafield_error = await client.aupdate_product(
+                    int(previous["shopify_product_id"]), changed_fields, changed_metafields
+                )
+                changed = sorted(changed_fields) + [mf["key"] for mf in changed_metafields]
+                return product, "updated", metafield_error, changed
+            except ShopifyNotFoundError:
+                logger.warning(f"{shopify_handle} no longer exists in Shopify, publishing in full")
+        product, action, metafield_error = await client.aupsert_product_with_metafields(
+            handle=shopify_handle,
+            product_data=product_payload,
+            metafields=metafields,
+        )
+        return product, action, metafield_error, None
+    
+    async def publish_one(module: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        module_code = module["module_code"]
+        shopify_handle = module.get("shopify_handle", "")
+        
+        is_ready, reasons = check_module_readiness(module)
+        if not is_ready:
+            await audit(module_code=module_code, shopify_handle=shopify_handle, action=PublishAction.SKIP)
+            return "skipped", {
+                "module_code": module_code,
+                "tier": module.get("tier"),
+                "reasons": [r.value for r in reasons]
+            }
+        
+        product_payload = build_shopify_product_payload(module)
+        metafields = build_metafields_payload(module)
+        payload_hash = compute_publish_hash(product_payload, metafields)
+        previous = state.get(module_code)
+        
+        if previous and previous["payload_hash"] == payload_hash:
+            await audit(
+                module_code=module_code,
+                shopify_handle=shopify_handle,
+                action=PublishAction.UNCHANGED,
+                shopify_product_id=previous["shopify_product_id"],
+                payload_hash=payload_hash,
+            )
+            return "unchanged", {
+                "module_code": module_code,
+                "tier": module.get("tier"),
+                "shopify_product_id": previous["shopify_product_id"],
+                "shopify_handle": shopify_handle,
+            }
+        
+        try:
+            async with semaphore:
+                product, action, metafield_error, changed = await write(
+                    shopify_handle, product_payload, metafields, previous
+                )
+        except ShopifyError as e:
+            await audit(
+                module_code=module_code,
+                shopify_handle=shopify_handle,
+                action=PublishAction.ERROR,
+                request_payload=product_payload,
+                response_status=e.status_code,
+                response_body=e.response_body,
+                payload_hash=payload_hash,
+            )
+            return "errors", {"module_code": module_code, "error": str(e), "status_code": e.status_code}
+        except Exception as e:
+            await audit(
+                module_code=module_code,
+                shopify_handle=shopify_handle,
+                action=PublishAction.ERROR,
+                response_body={"exception": str(e)},
+            )
+            return "errors", {"module_code": module_code, "error": str(e)}
+        
+        product_id = str(product.get("id", ""))
+        result_entry = {
+            "module_code": module_code,
+            "tier": module.get("tier"),
+            "shopify_product_id": product_id,
+            "shopify_handle": shopify_handle,
+        }
+        if changed is not None:
+            result_entry["changed_fields"] = changed
+        
+        # What is live now; rejected metafields keep their previous values,
+        # so the stored hash differs and the next diff publish retries them
+        live_metafields = metafields
+        if metafield_error:
+            logger.warning(f"Metafield error for {module_code}: {metafield_error}")
+            result_entry["metafield_error"] = metafield_error
+            live_metafields = (previous or {}).get("metafields") or []
+        if product_id:
+            await asyncio.to_thread(
+                save_publish_state,
+                batch_id=batch_id,
+                module_code=module_code,
+                shopify_handle=shopify_handle,
+                shopify_product_id=product_id,
+                payload_hash=compute_publish_hash(product_payload, live_metafields),
+                product_payload=product_payload,
+                metafields=live_metafields,
+            )
+        
+        created = action == "created"
+        await audit(
+            module_code=module_code,
+            shopify_handle=shopify_handle,
+            action=PublishAction.CREATE if created else PublishAction.UPDATE,
+            shopify_product_id=product_id,
+            request_payload=product_payload,
+            response_status=201 if created else 200,
+            payload_hash=payload_hash,
+        )
+        return "created" if created else "updated", result_entry
+    
+    async def tracked(module: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        nonlocal completed
+        outcome = await publish_one(module)
+        completed += 1
+        if completed % progress_every == 0 or completed == len(modules):
+            progress = throughput()
+            if completed == len(modules):
+                final.update(progress)
+            logger.info(f"Shopify publish {batch_id}: {progress}")
+            await audit(
+                module_code="__batch__",
+                shopify_handle="",
+                action=PublishAction.PROGRESS,
+                response_body=progress,
+            )
+        return outcome
+    
+    outcomes = await asyncio.gather(*(tracked(module) for module in modules))
+    
+    results: Dict[str, Any] = {"created": [], "updated": [], "unchanged": [], "skipped": [], "errors": []}
+    for bucket, entry in outcomes:
+        results[bucket].append(entry)
+    results["throughput"] = final or throughput()
+    return results
+
+
 # ===== Endpoints =====
 
 @router.get("/health")
@@ -566,7 +909,7 @@ def export_dry_run(request: ExportRequest):
 
 
 @router.post("/export/publish")
-def export_publish(
+async def export_publish(
     request: ExportRequest,
     confirm: bool = Query(default=False, description="Must be true to execute publish"),
 ):
@@ -576,25 +919,28 @@ def export_publish(
     LAUNCH v1 ENFORCEMENT: Only exports modules where is_launch_v1 = TRUE
     
     If confirm=false, behaves like dry-run.
-    If confirm=true, creates/updates products in Shopify.
+    If confirm=true, creates/updates products in Shopify, request.concurrency
+    at a time under the Shopify rate limit (see publish_modules).
+    If diff=true, unchanged modules are skipped and changed ones only PUT
+    the fields that differ from the last publish.
     
     Idempotent: Uses upsert by handle.
     """
     # If not confirmed, return dry-run
     if not confirm:
-        return export_dry_run(request)
+        return await asyncio.to_thread(export_dry_run, request)
     
     # Ensure audit table exists
-    ensure_audit_table()
+    await asyncio.to_thread(ensure_audit_table)
     
     # Generate batch ID
     batch_id = str(uuid.uuid4())
     
     # Get Shopify client
-    client = get_shopify_client()
+    client = get_async_shopify_client()
     
     # Check connectivity first
-    health = client.health_check()
+    health = await asyncio.to_thread(client.health_check)
     if not health.get("ok"):
         raise HTTPException(
             status_code=503,
@@ -605,136 +951,15 @@ def export_publish(
         )
     
     # Fetch modules (LAUNCH v1 filter always applied)
-    modules = fetch_modules_for_export(
+    modules = await asyncio.to_thread(
+        fetch_modules_for_export,
         limit=request.limit,
         only_active=request.only_ready
     )
     
-    # Process each module
-    results = {
-        "batch_id": batch_id,
-        "created": [],
-        "updated": [],
-        "skipped": [],
-        "errors": [],
-    }
-    
-    for module in modules:
-        module_code = module["module_code"]
-        shopify_handle = module.get("shopify_handle", "")
-        
-        # Check readiness
-        is_ready, reasons = check_module_readiness(module)
-        
-        if not is_ready:
-            results["skipped"].append({
-                "module_code": module_code,
-                "tier": module.get("tier"),
-                "reasons": [r.value for r in reasons]
-            })
-            log_publish_audit(
-                batch_id=batch_id,
-                module_code=module_code,
-                shopify_handle=shopify_handle,
-                action=PublishAction.SKIP,
-            )
-            continue
-        
-        # Build payload
-        product_payload = build_shopify_product_payload(module)
-        metafields = build_metafields_payload(module)
-        
-        try:
-            # Upsert product
-            product, action = client.upsert_product_by_handle(
-                handle=shopify_handle,
-                product_data=product_payload
-            )
-            
-            product_id = str(product.get("id", ""))
-            
-            # Set metafields
-            if product_id and metafields:
-                try:
-                    client.set_product_metafields_bulk(int(product_id), metafields)
-                except Exception as mf_error:
-                    logger.warning(f"Metafield error for {module_code}: {mf_error}")
-            
-            # Record result
-            result_entry = {
-                "module_code": module_code,
-                "tier": module.get("tier"),
-                "shopify_product_id": product_id,
-                "shopify_handle": shopify_handle,
-            }
-            
-            if action == "created":
-                results["created"].append(result_entry)
-                log_publish_audit(
-                    batch_id=batch_id,
-                    module_code=module_code,
-                    shopify_handle=shopify_handle,
-                    action=PublishAction.CREATE,
-                    shopify_product_id=product_id,
-                    request_payload=product_payload,
-                    response_status=201,
-                )
-            else:
-                results["updated"].append(result_entry)
-                log_publish_audit(
-                    batch_id=batch_id,
-                    module_code=module_code,
-                    shopify_handle=shopify_handle,
-                    action=PublishAction.UPDATE,
-                    shopify_product_id=product_id,
-                    request_payload=product_payload,
-                    response_status=200,
-                )
-                
-        except ShopifyValidationError as e:
-            results["errors"].append({
-                "module_code": module_code,
-                "error": str(e),
-                "status_code": e.status_code,
-            })
-            log_publish_audit(
-                batch_id=batch_id,
-                module_code=module_code,
-                shopify_handle=shopify_handle,
-                action=PublishAction.ERROR,
-                request_payload=product_payload,
-                response_status=e.status_code,
-                response_body=e.response_body,
-            )
-            
-        except ShopifyError as e:
-            results["errors"].append({
-                "module_code": module_code,
-                "error": str(e),
-                "status_code": e.status_code,
-            })
-            log_publish_audit(
-                batch_id=batch_id,
-                module_code=module_code,
-                shopify_handle=shopify_handle,
-                action=PublishAction.ERROR,
-                request_payload=product_payload,
-                response_status=e.status_code,
-                response_body=e.response_body,
-            )
-            
-        except Exception as e:
-            results["errors"].append({
-                "module_code": module_code,
-                "error": str(e),
-            })
-            log_publish_audit(
-                batch_id=batch_id,
-                module_code=module_code,
-                shopify_handle=shopify_handle,
-                action=PublishAction.ERROR,
-                response_body={"exception": str(e)},
-            )
+    results = await publish_modules(
+        modules, batch_id, client, concurrency=request.concurrency, diff=request.diff
+    )
     
     # Build summary
     return {
@@ -746,14 +971,17 @@ def export_publish(
         "summary": {
             "created": len(results["created"]),
             "updated": len(results["updated"]),
+            "unchanged": len(results["unchanged"]),
             "skipped": len(results["skipped"]),
             "errors": len(results["errors"]),
             "total_processed": len(modules),
         },
+        "diff": request.diff,
         "created": results["created"],
         "updated": results["updated"],
         "skipped": results["skipped"][:10],  # Limit skipped to 10
         "errors": results["errors"],
+        "throughput": results["throughput"],
         "field_map_version": FIELD_MAP_VERSION,
     }
 
@@ -21,8 +21,8 @@ from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from app.shared.db_pool import get_db
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["launch-admin"])
@@ -30,15 +30,6 @@ router = APIRouter(tags=["launch-admin"])
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-def get_db():
-    """Get database connection."""
-    try:
-        return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        return None
-
-
 # ===== Launch v1 Lock SQL =====
 
 LOCK_LAUNCH_V1_SQL = """
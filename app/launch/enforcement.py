@@ -32,8 +32,8 @@ from typing import Dict, Any, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from app.shared.db_pool import get_db
 
 try:
     import openpyxl
@@ -66,14 +66,6 @@ ENV_SUFFIX_PATTERN = re.compile(r'-maximo$|-maxima$', re.IGNORECASE)
 
 # ===== Database Helpers =====
 
-def get_db():
-    """Get database connection."""
-    try:
-        return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
 
 def derive_base_handle(shopify_handle: Optional[str]) -> Optional[str]:
     """
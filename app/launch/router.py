@@ -16,9 +16,8 @@ from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
+from app.shared.db_pool import get_db
 from app.migrations.launch_v1_lock import (
     MIGRATION_ID,
     MIGRATION_VERSION,
@@ -37,15 +36,6 @@ router = APIRouter(tags=["launch"])
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-def get_db():
-    """Get database connection."""
-    try:
-        return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        return None
-
-
 @router.get("/api/v1/launch/v1/status")
 def get_launch_v1_status():
     """
@@ -16,10 +16,14 @@ PRINCIPLE: Blood does not negotiate. But once safe, we optimize for outcomes.
 Version: matching_layer_v2 (catalog-aware)
 """
 
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Set, Tuple, Optional, FrozenSet, Mapping, Iterable
+from collections import OrderedDict
 from datetime import datetime
 from dataclasses import dataclass, field
+from types import MappingProxyType
 import logging
+import os
+import threading
 
 from .models import (
     MatchingInput,
@@ -42,6 +46,14 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# SKU ingredient indexes kept per catalog version (distinct allowed-SKU sets)
+SKU_INDEX_CACHE_SIZE = int(os.getenv("MATCHING_SKU_INDEX_CACHE_SIZE", "64"))
+
+
+def normalize_tags(tags: Iterable[str]) -> FrozenSet[str]:
+    """Normalize ingredient tags/targets for matching (lowercase, stripped)."""
+    return frozenset(tag.lower().strip() for tag in tags)
+
 
 @dataclass
 class MatchCandidate:
@@ -51,6 +63,90 @@ class MatchCandidate:
     matched_ingredients: Set[str] = field(default_factory=set)
     is_requirement: bool = False
     requirement_ingredients: Set[str] = field(default_factory=set)
+    ingredients: Optional[FrozenSet[str]] = None  # normalized ingredient_tags
+    
+    def __post_init__(self):
+        if self.ingredients is None:
+            self.ingredients = normalize_tags(self.sku.ingredient_tags)
+
+
+@dataclass(frozen=True)
+class SkuIngredientIndex:
+    """
+    Ingredient -> SKU posting lists over one allowed-SKU list.
+    
+    Positions follow first appearance of each sku_id (a repeated sku_id
+    keeps its last tags, like the candidates dict). Matching only computes
+    overlaps for SKUs on the posting lists of an intent's targets, instead
+    of intersecting every intent with every SKU.
+    """
+    sku_ids: Tuple[str, ...]
+    tags: Tuple[FrozenSet[str], ...]
+    postings: Mapping[str, Tuple[int, ...]]
+    
+    @classmethod
+    def build(cls, skus: List[AllowedSKUInput]) -> "SkuIngredientIndex":
+        latest: Dict[str, AllowedSKUInput] = {}
+        for sku in skus:
+            latest[sku.sku_id] = sku
+        
+        tags = tuple(normalize_tags(sku.ingredient_tags) for sku in latest.values())
+        postings: Dict[str, List[int]] = {}
+        for position, sku_tags in enumerate(tags):
+            for tag in sku_tags:
+                postings.setdefault(tag, []).append(position)
+        
+        return cls(
+            sku_ids=tuple(latest),
+            tags=tags,
+            postings=MappingProxyType({tag: tuple(p) for tag, p in postings.items()}),
+        )
+    
+    def candidates(self, targets: Iterable[str]) -> List[int]:
+        """Positions of SKUs sharing at least one tag with targets, in SKU order."""
+        positions: Set[int] = set()
+        for target in targets:
+            positions.update(self.postings.get(target, ()))
+        return sorted(positions)
+
+
+_sku_index_lock = threading.Lock()
+_sku_index_version: Optional[str] = None
+_sku_index_cache: "OrderedDict[Tuple, SkuIngredientIndex]" = OrderedDict()
+
+
+def get_sku_index(
+    skus: List[AllowedSKUInput],
+    catalog_version: Optional[str] = None
+) -> SkuIngredientIndex:
+    """
+    SKU ingredient index for an allowed-SKU list, cached per catalog version.
+    
+    Routing hands the same allowed-SKU lists to many requests, so indexes
+    are reused until the catalog version changes. Without a catalog
+    version (catalog wiring unavailable) the index is built per call.
+    """
+    global _sku_index_version
+    if catalog_version is None:
+        return SkuIngredientIndex.build(skus)
+    
+    key = tuple((sku.sku_id, tuple(sku.ingredient_tags)) for sku in skus)
+    with _sku_index_lock:
+        if _sku_index_version != catalog_version:
+            _sku_index_cache.clear()
+            _sku_index_version = catalog_version
+        index = _sku_index_cache.get(key)
+        if index is not None:
+            _sku_index_cache.move_to_end(key)
+            return index
+    
+    index = SkuIngredientIndex.build(skus)
+    with _sku_index_lock:
+        if _sku_index_version == catalog_version:
+            _sku_index_cache[key] = index
+            while len(_sku_index_cache) > SKU_INDEX_CACHE_SIZE:
+                _sku_index_cache.popitem(last=False)
+    return index
 
 
 def filter_by_catalog(
@@ -103,12 +199,14 @@ def filter_by_catalog(
             audit_info["catalog_filtered_count"] = len(skus)
             return skus, audit_info
         
-        # Filter SKUs through catalog
+        # Filter SKUs through one catalog snapshot and record its version
+        snapshot = catalog.snapshot()
+        audit_info["catalog_version"] = snapshot.version
         filtered = []
         removed = []
         
         for sku in skus:
-            if catalog.is_purchasable(sku.sku_id):
+            if snapshot.is_purchasable(sku.sku_id):
                 filtered.append(sku)
             else:
                 removed.append(sku.sku_id)
@@ -200,63 +298,62 @@ def calculate_match_score(
 
 def match_intents_to_skus(
     skus: List[AllowedSKUInput],
-    intents: List[IntentInput]
+    intents: List[IntentInput],
+    index: Optional[SkuIngredientIndex] = None
 ) -> Tuple[Dict[str, MatchCandidate], List[IntentInput]]:
     """
     Match intents to SKUs based on ingredient overlap.
     
     For each intent:
-    - Find SKUs with overlapping ingredient tags
+    - Find SKUs with overlapping ingredient tags (via the posting lists)
     - Track which intents each SKU satisfies
     - Track unmatched intents
     
     Args:
         skus: Gender-filtered SKUs
         intents: Prioritized intents from Brain Compose
+        index: Ingredient index over skus (built here if not given)
         
     Returns:
         (sku_candidates dict by sku_id, unmatched intents list)
     """
-    candidates: Dict[str, MatchCandidate] = {}
-    unmatched: List[IntentInput] = []
+    if index is None:
+        index = SkuIngredientIndex.build(skus)
     
-    # Pre-compute normalized ingredient sets for SKUs
-    sku_ingredients: Dict[str, Set[str]] = {}
+    latest: Dict[str, AllowedSKUInput] = {}
     for sku in skus:
-        sku_ingredients[sku.sku_id] = {
-            tag.lower().strip() for tag in sku.ingredient_tags
-        }
-        candidates[sku.sku_id] = MatchCandidate(sku=sku)
+        latest[sku.sku_id] = sku
+    candidates: Dict[str, MatchCandidate] = {
+        sku_id: MatchCandidate(sku=latest[sku_id], ingredients=sku_tags)
+        for sku_id, sku_tags in zip(index.sku_ids, index.tags)
+    }
+    unmatched: List[IntentInput] = []
     
     # Process intents in priority order
     for intent in sorted(intents, key=lambda x: x.priority):
-        intent_targets = {
-            target.lower().strip() for target in intent.ingredient_targets
-        }
+        intent_targets = normalize_tags(intent.ingredient_targets)
         
         if not intent_targets:
             unmatched.append(intent)
             continue
         
-        matched_any = False
-        
-        for sku_id, sku_ings in sku_ingredients.items():
-            score, overlap = calculate_match_score(sku_ings, intent_targets)
-            
-            if score > 0:
-                matched_any = True
-                candidates[sku_id].intents.append(intent)
-                candidates[sku_id].matched_ingredients.update(overlap)
-        
-        if not matched_any:
+        positions = index.candidates(intent_targets)
+        if not positions:
             unmatched.append(intent)
+            continue
+        
+        for position in positions:
+            candidate = candidates[index.sku_ids[position]]
+            candidate.intents.append(intent)
+            candidate.matched_ingredients.update(index.tags[position] & intent_targets)
     
     return candidates, unmatched
 
 
 def fulfill_requirements(
     candidates: Dict[str, MatchCandidate],
-    requirements: List[str]
+    requirements: List[str],
+    index: Optional[SkuIngredientIndex] = None
 ) -> Tuple[List[str], List[str]]:
     """
     Mark which SKUs fulfill required ingredients.
@@ -266,16 +363,22 @@ def fulfill_requirements(
     Args:
         candidates: Current match candidates
         requirements: Required ingredient tags from deficiencies
+        index: Ingredient index the candidates were matched with, to only
+            visit SKUs on the requirements' posting lists
         
     Returns:
         (fulfilled_requirements, unfulfilled_requirements)
     """
-    requirements_lower = {req.lower().strip() for req in requirements}
+    requirements_lower = set(normalize_tags(requirements))
     fulfilled: Set[str] = set()
     
-    for sku_id, candidate in candidates.items():
-        sku_ings = {tag.lower().strip() for tag in candidate.sku.ingredient_tags}
-        overlap = sku_ings & requirements_lower
+    if index is not None:
+        visit = [candidates[index.sku_ids[p]] for p in index.candidates(requirements_lower)]
+    else:
+        visit = candidates.values()
+    
+    for candidate in visit:
+        overlap = candidate.ingredients & requirements_lower
         
         if overlap:
             candidate.is_requirement = True
@@ -324,13 +427,8 @@ def build_protocol(
         if has_intents:
             intent_targets = set()
             for intent in candidate.intents:
-                intent_targets.update(
-                    target.lower().strip() for target in intent.ingredient_targets
-                )
-            sku_ings = {
-                tag.lower().strip() for tag in candidate.sku.ingredient_tags
-            }
-            overlap = sku_ings & intent_targets
+                intent_targets.update(normalize_tags(intent.ingredient_targets))
+            overlap = candidate.ingredients & intent_targets
             match_score = len(overlap) / len(intent_targets) if intent_targets else 0
         else:
             match_score = 1.0  # Pure requirement fulfillment
@@ -416,16 +514,19 @@ def resolve_matching(
         require_catalog=require_catalog
     )
     
-    # Step 3: Match intents to SKUs
+    # Step 3: Match intents to SKUs via the ingredient index (per catalog version)
+    index = get_sku_index(catalog_filtered, catalog_audit.get("catalog_version"))
     candidates, unmatched_intents = match_intents_to_skus(
         catalog_filtered,
-        input_data.prioritized_intents
+        input_data.prioritized_intents,
+        index=index
     )
     
     # Step 4: Fulfill requirements
     fulfilled_reqs, unfulfilled_reqs = fulfill_requirements(
         candidates,
-        input_data.requirements
+        input_data.requirements,
+        index=index
     )
     
     # Step 5: Build protocol
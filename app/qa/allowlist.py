@@ -22,23 +22,14 @@ from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File
 from pydantic import BaseModel
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from app.shared.db_pool import get_db
 
 router = APIRouter(prefix="/api/v1/qa/allowlist", tags=["QA Allowlist Mapping"])
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-def get_db():
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 class AllowlistEntry(BaseModel):
     shopify_base_handle: str
     supliful_handle: str
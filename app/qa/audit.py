@@ -18,8 +18,8 @@ import re
 from typing import Dict, Any, List, Optional, Union
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from app.shared.db_pool import get_db
 
 router = APIRouter(prefix="/api/v1/qa", tags=["QA Audit"])
 
@@ -29,15 +29,6 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 SUPLIFUL_CATALOG_BASE = "https://supliful.com/catalog/"
 
 
-def get_db():
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 class FixDuplicatesRequest(BaseModel):
     shopify_handle: str
     keep_module_code: str
@@ -18,23 +18,14 @@ import os
 import re
 from typing import Dict, Any, List, Optional, Set, Tuple
 from fastapi import APIRouter, HTTPException, Query
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from app.shared.db_pool import get_db
 
 router = APIRouter(prefix="/api/v1/qa", tags=["QA Compare"])
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-def get_db():
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 def normalize_text(text: str) -> str:
     """Normalize text for comparison."""
     if not text:
@@ -7,23 +7,14 @@ import os
 from datetime import datetime
 from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException, Query
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from app.shared.db_pool import get_db
 
 router = APIRouter(prefix="/api/v1/admin/catalog-cleanup", tags=["Admin - Catalog Cleanup"])
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-def get_db():
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 # =============================================================================
 # PREVIEW: Show what will be deleted/updated
 # =============================================================================
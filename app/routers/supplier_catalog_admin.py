@@ -9,8 +9,8 @@ import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, HTTPException, Query, Body
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from app.shared.db_pool import get_db
 
 router = APIRouter(prefix="/api/v1/admin/supplier-catalog", tags=["Admin - Supplier Catalog"])
 
@@ -38,15 +38,6 @@ LOCKED_SUFFIX_LIST = [
 ]
 
 
-def get_db():
-    try:
-        conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-
 def derive_base_handle(shopify_handle: str) -> str:
     """Strip -maximo/-maxima suffix from shopify_handle."""
     return re.sub(r'(-maximo|-maxima)$', '', shopify_handle)
@@ -23,7 +23,7 @@ from .models import (
     BlockedSKU,
     RoutingAudit,
 )
-from .apply import apply_routing_constraints
+from .apply import apply_routing_constraints, apply_routing_constraints_batch
 from .admin import router as admin_router
 
 __all__ = [
@@ -36,6 +36,7 @@ __all__ = [
     "RoutingAudit",
     # Functions
     "apply_routing_constraints",
+    "apply_routing_constraints_batch",
     # Router
     "admin_router",
 ]
@@ -10,7 +10,7 @@ Version: routing_layer_v1.1 (fixed metadata attribute name)
 
 import os
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from fastapi import APIRouter, Header, HTTPException, Depends
 from pydantic import BaseModel, Field
 
@@ -25,6 +25,7 @@ from .models import (
 )
 from .apply import (
     apply_routing_constraints,
+    apply_routing_constraints_batch,
     filter_by_gender,
     get_requirements_coverage,
 )
@@ -67,6 +68,29 @@ class ApplyRoutingResponse(BaseModel):
     generated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ApplyRoutingBatchRequest(BaseModel):
+    """Request to apply many routing constraint sets to one SKU list."""
+    routing_constraints: List[RoutingConstraints] = Field(
+        ...,
+        description="One constraint set per user/run"
+    )
+    use_catalog: bool = Field(
+        default=True,
+        description="If true, load valid SKUs from catalog. If false, must provide valid_skus."
+    )
+    valid_skus: Optional[List[SkuInput]] = Field(
+        default=None,
+        description="Optional manual SKU list (used if use_catalog=False)"
+    )
+
+
+class ApplyRoutingBatchResponse(BaseModel):
+    """Response from batch routing application."""
+    success: bool = True
+    results: List[RoutingResult]
+    generated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class GenderFilterRequest(BaseModel):
     """Request to filter by gender."""
     routing_result: RoutingResult
@@ -116,6 +140,58 @@ def verify_admin_key(x_admin_api_key: str = Header(None, alias="X-Admin-API-Key"
 
 # Endpoints
 
+def _load_catalog_valid_skus() -> Tuple[List[SkuInput], str]:
+    """Load and validate the catalog; return VALID SKUs and the catalog version."""
+    # Load valid SKUs from catalog
+    mapper = CatalogMapper()
+    sku_data = mapper.load_catalog_auto()
+    
+    # Validate and filter to only valid SKUs
+    results, coverage = validate_catalog_snapshot(mapper)
+    
+    # Convert valid results to SkuInput
+    # NOTE: SkuValidationResult has 'metadata' field, not 'meta'
+    valid_skus = []
+    for result in results:
+        if result.status.value == "VALID":
+            valid_skus.append(SkuInput(
+                sku_id=result.sku_id,
+                product_name=result.product_name,
+                ingredient_tags=result.metadata.ingredient_tags if result.metadata else [],
+                category_tags=result.metadata.category_tags if result.metadata else [],
+                risk_tags=result.metadata.risk_tags if result.metadata else [],
+                gender_line=result.metadata.gender_line.value if result.metadata and result.metadata.gender_line else None,
+                evidence_tier=result.metadata.evidence_tier if result.metadata else None,
+            ))
+    return valid_skus, coverage.catalog_version
+
+
+def _resolve_valid_skus(
+    use_catalog: bool,
+    provided_skus: Optional[List[SkuInput]]
+) -> Tuple[List[SkuInput], Optional[str]]:
+    """
+    SKUs to route and their catalog version.
+    
+    Manual SKU lists have no catalog version, so their features are
+    compiled per request.
+    """
+    if use_catalog:
+        if not CATALOG_AVAILABLE:
+            raise HTTPException(
+                status_code=503,
+                detail="Catalog module not available. Provide valid_skus manually."
+            )
+        return _load_catalog_valid_skus()
+    
+    if not provided_skus:
+        raise HTTPException(
+            status_code=400,
+            detail="Must provide valid_skus when use_catalog=False"
+        )
+    return provided_skus, None
+
+
 @router.get("/health")
 async def routing_health():
     """
@@ -146,47 +222,13 @@ async def apply_routing(request: ApplyRoutingRequest):
     Does not require admin key - this is a core operational endpoint.
     """
     try:
-        if request.use_catalog:
-            if not CATALOG_AVAILABLE:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Catalog module not available. Provide valid_skus manually."
-                )
-            
-            # Load valid SKUs from catalog
-            mapper = CatalogMapper()
-            sku_data = mapper.load_catalog_auto()
-            
-            # Validate and filter to only valid SKUs
-            from app.catalog.validate import validate_catalog_snapshot
-            results, coverage = validate_catalog_snapshot(mapper)
-            
-            # Convert valid results to SkuInput
-            # NOTE: SkuValidationResult has 'metadata' field, not 'meta'
-            valid_skus = []
-            for result in results:
-                if result.status.value == "VALID":
-                    valid_skus.append(SkuInput(
-                        sku_id=result.sku_id,
-                        product_name=result.product_name,
-                        ingredient_tags=result.metadata.ingredient_tags if result.metadata else [],
-                        category_tags=result.metadata.category_tags if result.metadata else [],
-                        risk_tags=result.metadata.risk_tags if result.metadata else [],
-                        gender_line=result.metadata.gender_line.value if result.metadata and result.metadata.gender_line else None,
-                        evidence_tier=result.metadata.evidence_tier if result.metadata else None,
-                    ))
-        else:
-            if not request.valid_skus:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Must provide valid_skus when use_catalog=False"
-                )
-            valid_skus = request.valid_skus
+        valid_skus, catalog_version = _resolve_valid_skus(request.use_catalog, request.valid_skus)
         
         # Apply routing constraints
         result = apply_routing_constraints(
             valid_skus=valid_skus,
             constraints=request.routing_constraints,
+            catalog_version=catalog_version,
         )
         
         return ApplyRoutingResponse(
@@ -202,6 +244,36 @@ async def apply_routing(request: ApplyRoutingRequest):
         raise HTTPException(status_code=500, detail=f"Routing error: {str(e)}")
 
 
+@router.post("/apply-batch", response_model=ApplyRoutingBatchResponse)
+async def apply_routing_batch(request: ApplyRoutingBatchRequest):
+    """
+    Apply many routing constraint sets to the same SKU list.
+    
+    The catalog is loaded and SKU features are compiled once for the
+    whole batch. results[i] equals /apply with routing_constraints[i].
+    """
+    try:
+        valid_skus, catalog_version = _resolve_valid_skus(request.use_catalog, request.valid_skus)
+        
+        results = apply_routing_constraints_batch(
+            valid_skus=valid_skus,
+            constraints_list=request.routing_constraints,
+            catalog_version=catalog_version,
+        )
+        
+        return ApplyRoutingBatchResponse(
+            success=True,
+            results=results,
+        )
+        
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Routing error: {str(e)}")
+
+
 @router.post("/filter-gender", response_model=GenderFilterResponse)
 async def filter_gender(request: GenderFilterRequest):
     """
@@ -293,7 +365,7 @@ async def test_blocking(
                 ))
         
         # Apply routing
-        result = apply_routing_constraints(valid_skus, constraints)
+        result = apply_routing_constraints(valid_skus, constraints, catalog_version=coverage.catalog_version)
         
         return {
             "test_constraints": constraints.dict(),
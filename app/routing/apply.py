@@ -11,13 +11,22 @@ This module implements the core routing function that:
 5. Tracks requirements fulfillment
 6. Produces deterministic, auditable output
 
+User-independent SKU features (normalized tag sets, metadata blocks,
+pregnancy/lactation contraindication flags) are precompiled once per
+catalog version in a SkuFeatureStore; routing a user is then set
+operations against their constraints.
+
 PRINCIPLE: Blood does not negotiate.
 
 Version: routing_layer_v1.1 (added pregnancy/lactation blocking)
 """
 
+import os
 import re
-from typing import List, Tuple, Set, Optional
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Tuple, Set, Optional, FrozenSet
 from datetime import datetime
 
 from .models import (
@@ -100,9 +109,105 @@ def aggregate_contraindications(sku: SkuInput) -> str:
     return ' '.join(parts)
 
 
+# Feature stores kept per catalog version (distinct valid-SKU lists)
+SKU_FEATURE_CACHE_SIZE = int(os.getenv("ROUTING_SKU_FEATURE_CACHE_SIZE", "16"))
+
+
+@dataclass(frozen=True)
+class SkuFeatures:
+    """User-independent routing features of one SKU."""
+    ingredients: FrozenSet[str]
+    categories: FrozenSet[str]
+    metadata_block_reasons: Tuple[str, ...]
+    pregnancy_contraindicated: bool
+    lactation_contraindicated: bool
+    
+    @classmethod
+    def from_sku(cls, sku: SkuInput) -> "SkuFeatures":
+        risk_tags_lower = {tag.lower() for tag in sku.risk_tags}
+        
+        # Metadata blocks (from Issue #5)
+        metadata_block_reasons = []
+        if "blocked_ingredient" in risk_tags_lower:
+            metadata_block_reasons.append("BLOCKED_BY_EVIDENCE")
+        if "auto_blocked" in risk_tags_lower:
+            metadata_block_reasons.append("AUTO_BLOCKED_METADATA")
+        
+        all_contraindications = aggregate_contraindications(sku)
+        return cls(
+            ingredients=frozenset(tag.lower() for tag in sku.ingredient_tags),
+            categories=frozenset(tag.lower() for tag in sku.category_tags),
+            metadata_block_reasons=tuple(metadata_block_reasons),
+            pregnancy_contraindicated=check_pregnancy_contraindication(all_contraindications),
+            lactation_contraindicated=check_lactation_contraindication(all_contraindications),
+        )
+
+
+@dataclass(frozen=True)
+class SkuFeatureStore:
+    """Precompiled SkuFeatures for a valid-SKU list, in list order."""
+    features: Tuple[SkuFeatures, ...]
+    
+    @classmethod
+    def build(cls, valid_skus: List[SkuInput]) -> "SkuFeatureStore":
+        return cls(features=tuple(SkuFeatures.from_sku(sku) for sku in valid_skus))
+
+
+def _feature_key(sku: SkuInput) -> Tuple:
+    """Everything SkuFeatures.from_sku reads from a SKU."""
+    return (
+        sku.sku_id,
+        tuple(sku.ingredient_tags),
+        tuple(sku.category_tags),
+        tuple(sku.risk_tags),
+        tuple(sku.ingredient_contraindications or ()),
+        getattr(sku, 'contraindications', None),
+    )
+
+
+_feature_store_lock = threading.Lock()
+_feature_store_version: Optional[str] = None
+_feature_store_cache: "OrderedDict[Tuple, SkuFeatureStore]" = OrderedDict()
+
+
+def get_sku_feature_store(
+    valid_skus: List[SkuInput],
+    catalog_version: Optional[str] = None
+) -> SkuFeatureStore:
+    """
+    SKU feature store for a valid-SKU list, cached per catalog version.
+    
+    The cache is dropped when the catalog version changes. Without a
+    catalog version the store is built per call.
+    """
+    global _feature_store_version
+    if catalog_version is None:
+        return SkuFeatureStore.build(valid_skus)
+    
+    key = tuple(_feature_key(sku) for sku in valid_skus)
+    with _feature_store_lock:
+        if _feature_store_version != catalog_version:
+            _feature_store_cache.clear()
+            _feature_store_version = catalog_version
+        store = _feature_store_cache.get(key)
+        if store is not None:
+            _feature_store_cache.move_to_end(key)
+            return store
+    
+    store = SkuFeatureStore.build(valid_skus)
+    with _feature_store_lock:
+        if _feature_store_version == catalog_version:
+            _feature_store_cache[key] = store
+            while len(_feature_store_cache) > SKU_FEATURE_CACHE_SIZE:
+                _feature_store_cache.popitem(last=False)
+    return store
+
+
 def apply_routing_constraints(
     valid_skus: List[SkuInput],
-    constraints: RoutingConstraints
+    constraints: RoutingConstraints,
+    catalog_version: Optional[str] = None,
+    feature_store: Optional[SkuFeatureStore] = None
 ) -> RoutingResult:
     """
     Apply routing constraints to valid SKUs.
@@ -116,10 +221,16 @@ def apply_routing_constraints(
     Args:
         valid_skus: SKUs that passed catalog validation (from Issue #5)
         constraints: Routing constraints from Brain Orchestrate
+        catalog_version: Catalog version of valid_skus, enables the
+            cached SkuFeatureStore
+        feature_store: Prebuilt features for valid_skus (batch routing)
         
     Returns:
         RoutingResult with allowed/blocked SKUs and full audit
     """
+    if feature_store is None:
+        feature_store = get_sku_feature_store(valid_skus, catalog_version)
+    
     allowed_skus: List[AllowedSKU] = []
     blocked_skus: List[BlockedSKU] = []
     
@@ -133,6 +244,7 @@ def apply_routing_constraints(
     
     # Track requirements
     requirements_set = set(constraints.requirements)
+    requirements_lower = [(req, req.lower()) for req in requirements_set]
     fulfilled_requirements: Set[str] = set()
     
     # Normalize constraints to lowercase for matching
@@ -144,21 +256,11 @@ def apply_routing_constraints(
     check_pregnancy = constraints.biological_state == "PREGNANT"
     check_lactation = constraints.biological_state == "BREASTFEEDING"
     
-    for sku in valid_skus:
-        # Normalize SKU tags for matching
-        sku_ingredients_lower = {tag.lower() for tag in sku.ingredient_tags}
-        sku_categories_lower = {tag.lower() for tag in sku.category_tags}
-        sku_risk_tags_lower = {tag.lower() for tag in sku.risk_tags}
-        
-        # Aggregate contraindications for pregnancy/lactation check
-        all_contraindications = aggregate_contraindications(sku)
+    for sku, features in zip(valid_skus, feature_store.features):
+        sku_ingredients_lower = features.ingredients
         
         # Check for metadata blocks (from Issue #5)
-        metadata_block_reasons = []
-        if "blocked_ingredient" in sku_risk_tags_lower:
-            metadata_block_reasons.append("BLOCKED_BY_EVIDENCE")
-        if "auto_blocked" in sku_risk_tags_lower:
-            metadata_block_reasons.append("AUTO_BLOCKED_METADATA")
+        metadata_block_reasons = list(features.metadata_block_reasons)
         
         # Check for blood-based ingredient blocks
         blood_block_ingredients = blocked_ingredients_lower & sku_ingredients_lower
@@ -168,7 +270,7 @@ def apply_routing_constraints(
                 blood_block_reasons.append(f"BLOCK_INGREDIENT_{ing.upper()}")
         
         # Check for category blocks
-        category_block = blocked_categories_lower & sku_categories_lower
+        category_block = blocked_categories_lower & features.categories
         category_block_reasons = []
         if category_block:
             for cat in category_block:
@@ -176,12 +278,12 @@ def apply_routing_constraints(
         
         # Check for pregnancy blocks (NEW)
         pregnancy_block_reasons = []
-        if check_pregnancy and check_pregnancy_contraindication(all_contraindications):
+        if check_pregnancy and features.pregnancy_contraindicated:
             pregnancy_block_reasons.append("BLOCK_PREGNANCY_CONTRAINDICATION")
         
         # Check for lactation blocks (NEW)
         lactation_block_reasons = []
-        if check_lactation and check_lactation_contraindication(all_contraindications):
+        if check_lactation and features.lactation_contraindicated:
             lactation_block_reasons.append("BLOCK_LACTATION_CONTRAINDICATION")
         
         # Aggregate all block reasons
@@ -232,8 +334,8 @@ def apply_routing_constraints(
             
             # Check which requirements this SKU fulfills
             fulfills = []
-            for req in requirements_set:
-                if req.lower() in sku_ingredients_lower:
+            for req, req_lower in requirements_lower:
+                if req_lower in sku_ingredients_lower:
                     fulfills.append(req)
                     fulfilled_requirements.add(req)
             
@@ -300,6 +402,32 @@ def apply_routing_constraints(
     )
 
 
+def apply_routing_constraints_batch(
+    valid_skus: List[SkuInput],
+    constraints_list: List[RoutingConstraints],
+    catalog_version: Optional[str] = None
+) -> List[RoutingResult]:
+    """
+    Route many constraint sets against the same valid-SKU list.
+    
+    SKU features are compiled once for the whole batch. Each result is
+    identical to a separate apply_routing_constraints() call.
+    
+    Args:
+        valid_skus: SKUs that passed catalog validation (from Issue #5)
+        constraints_list: One RoutingConstraints per user/run
+        catalog_version: Catalog version of valid_skus (feature store cache)
+        
+    Returns:
+        RoutingResult per constraint set, in input order
+    """
+    feature_store = get_sku_feature_store(valid_skus, catalog_version)
+    return [
+        apply_routing_constraints(valid_skus, constraints, feature_store=feature_store)
+        for constraints in constraints_list
+    ]
+
+
 def filter_by_gender(
     allowed_skus: List[AllowedSKU],
     target_gender: str
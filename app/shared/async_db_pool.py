@@ -0,0 +1,214 @@
+"""
+GenoMAX² Shared asyncpg Connection Pool
+Single application-lifetime pool for every async (asyncpg) request path.
+
+Replaces the per-request asyncpg.create_pool() in bloodwork_engine.lab_upload
+(one pool bootstrap plus a fresh Postgres session per /upload, /submission
+and /submissions call) and the separate module-level pool kept by
+bloodwork_engine.brain_orchestrator. The synchronous psycopg2 paths keep
+using app.shared.db_pool.
+
+Usage:
+
+    pool = await get_async_pool()        # raises AsyncPoolError if unavailable
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(...)
+
+    pool = await get_async_pool_or_none()  # None (after logging) instead
+
+Lifecycle (registered in main.py):
+- init_async_pool()  - startup: create the pool and warm it (SELECT 1);
+                       failures are logged and creation is retried lazily
+- close_async_pool() - shutdown: graceful close, terminate after
+                       ASYNC_DB_POOL_CLOSE_TIMEOUT_S
+
+Creation is single-flight: concurrent first callers await the same task.
+An asyncpg pool is bound to the event loop that created it, so a caller on a
+different loop (test clients, scripts) gets a fresh pool for that loop. The
+replaced pool is closed on its own loop; if that loop is already closed its
+connections are terminated and counted in abandoned_total.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from app.shared.db_pool import PoolError
+
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DB_POOL_VERSION = "async_db_pool_v1"
+
+ASYNC_DB_POOL_MIN_SIZE = int(os.getenv("ASYNC_DB_POOL_MIN_SIZE", "2"))
+ASYNC_DB_POOL_MAX_SIZE = int(os.getenv("ASYNC_DB_POOL_MAX_SIZE", "10"))
+ASYNC_DB_POOL_CONNECT_TIMEOUT_S = float(os.getenv("ASYNC_DB_POOL_CONNECT_TIMEOUT_S", "10"))
+ASYNC_DB_POOL_COMMAND_TIMEOUT_S = float(os.getenv("ASYNC_DB_POOL_COMMAND_TIMEOUT_S", "60"))
+ASYNC_DB_POOL_MAX_INACTIVE_S = float(os.getenv("ASYNC_DB_POOL_MAX_INACTIVE_S", "300"))
+ASYNC_DB_POOL_CLOSE_TIMEOUT_S = float(os.getenv("ASYNC_DB_POOL_CLOSE_TIMEOUT_S", "10"))
+
+
+class AsyncPoolError(PoolError):
+    """Raised when the shared asyncpg pool cannot be created."""
+    pass
+
+
+# Process-wide singleton: the creation task (its result is the pool)
+_pool_task: Optional["asyncio.Task[asyncpg.Pool]"] = None
+_pool_lock = threading.Lock()
+_created_at: Optional[float] = None
+_created_total = 0
+_create_errors = 0
+_abandoned_total = 0
+
+
+async def _create_pool() -> asyncpg.Pool:
+    global _created_at, _created_total, _create_errors
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise AsyncPoolError("DATABASE_URL not configured")
+    try:
+        pool = await asyncpg.create_pool(
+            database_url,
+            min_size=ASYNC_DB_POOL_MIN_SIZE,
+            max_size=ASYNC_DB_POOL_MAX_SIZE,
+            timeout=ASYNC_DB_POOL_CONNECT_TIMEOUT_S,
+            command_timeout=ASYNC_DB_POOL_COMMAND_TIMEOUT_S,
+            max_inactive_connection_lifetime=ASYNC_DB_POOL_MAX_INACTIVE_S,
+        )
+    except Exception as e:
+        _create_errors += 1
+        raise AsyncPoolError(f"Could not create asyncpg pool: {e}") from e
+    _created_at = time.time()
+    _created_total += 1
+    return pool
+
+
+def _usable(task: Optional[asyncio.Task], loop: asyncio.AbstractEventLoop) -> bool:
+    """A creation task can be shared if it belongs to this loop and has not failed."""
+    if task is None or task.get_loop() is not loop:
+        return False
+    if not task.done():
+        return True
+    return not task.cancelled() and task.exception() is None
+
+
+async def _close_pool(task: "asyncio.Task[asyncpg.Pool]") -> None:
+    """Close the pool a creation task produced. Must run on the task's loop."""
+    try:
+        pool = await task
+    except Exception:
+        return
+    try:
+        await asyncio.wait_for(pool.close(), timeout=ASYNC_DB_POOL_CLOSE_TIMEOUT_S)
+    except Exception as e:
+        logger.warning(f"asyncpg pool close timed out, terminating: {e}")
+        pool.terminate()
+
+
+def _retire(task: "asyncio.Task[asyncpg.Pool]") -> None:
+    """Release the pool of a creation task replaced by another loop's."""
+    global _abandoned_total
+    loop = task.get_loop()
+    if not loop.is_closed():
+        try:
+            asyncio.run_coroutine_threadsafe(_close_pool(task), loop)
+            return
+        except RuntimeError:  # Closed since the check
+            pass
+    if not task.done() or task.cancelled() or task.exception() is not None:
+        return  # No pool was created
+
+    # Nothing can await on a closed loop: drop the sockets directly
+    _abandoned_total += 1
+    try:
+        task.result().terminate()
+    except Exception as e:
+        logger.debug(f"Terminating abandoned asyncpg pool failed: {e}")
+    logger.warning("asyncpg pool of a closed event loop was replaced; its connections were terminated")
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    """Get (lazily creating) the application-lifetime asyncpg pool."""
+    global _pool_task
+    loop = asyncio.get_running_loop()
+    replaced = None
+    with _pool_lock:
+        if not _usable(_pool_task, loop):
+            if _pool_task is not None and _pool_task.get_loop() is not loop:
+                replaced = _pool_task
+            _pool_task = loop.create_task(_create_pool())
+        task = _pool_task
+    if replaced is not None:
+        _retire(replaced)
+    # Shielded: a cancelled request must not abort creation for everyone else
+    return await asyncio.shield(task)
+
+
+async def get_async_pool_or_none() -> Optional[asyncpg.Pool]:
+    """Get the shared pool, or None (after logging) when it is unavailable."""
+    try:
+        return await get_async_pool()
+    except Exception as e:
+        logger.warning(f"asyncpg pool unavailable: {e}")
+        return None
+
+
+async def init_async_pool() -> None:
+    """Startup hook: create the pool and warm one connection."""
+    if not os.getenv("DATABASE_URL"):
+        logger.info("DATABASE_URL not configured - asyncpg pool not started")
+        return
+    try:
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+        logger.info(f"asyncpg pool ready ({pool.get_size()} connections)")
+    except Exception as e:
+        logger.warning(f"asyncpg pool warm-up failed, will retry on first use: {e}")
+
+
+async def close_async_pool() -> None:
+    """Shutdown hook: close the shared pool, terminating it if close stalls."""
+    global _pool_task
+    with _pool_lock:
+        task, _pool_task = _pool_task, None
+    if task is None:
+        return
+    if task.get_loop() is not asyncio.get_running_loop():
+        _retire(task)
+        return
+    await _close_pool(task)
+
+
+def get_async_pool_stats() -> Dict[str, Any]:
+    """Pool usage stats for health endpoints."""
+    task = _pool_task
+    stats: Dict[str, Any] = {
+        "version": ASYNC_DB_POOL_VERSION,
+        "created_total": _created_total,
+        "create_errors": _create_errors,
+        "abandoned_total": _abandoned_total,
+    }
+    if task is None:
+        stats["status"] = "not_initialized"
+    elif not task.done():
+        stats["status"] = "connecting"
+    elif task.cancelled() or task.exception() is not None:
+        stats["status"] = "error"
+    else:
+        pool = task.result()
+        stats.update({
+            "status": "ready",
+            "size": pool.get_size(),
+            "idle": pool.get_idle_size(),
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+            "created_at": _created_at,
+        })
+    return stats
@@ -0,0 +1,421 @@
+"""
+GenoMAX² Shared PostgreSQL Connection Pool
+Single process-wide pool for every synchronous (psycopg2) request path.
+
+Replaces the per-call psycopg2.connect() helpers that were copy-pasted into
+api_server, the QA/copy/launch/intake/override routers, the telemetry emitter
+and catalog wiring. Each of those paid a full TCP + TLS + auth handshake.
+
+Callers keep the existing contract:
+
+    conn = get_db()          # pooled connection, or None if unavailable
+    if not conn:
+        raise HTTPException(status_code=500, detail="Database connection failed")
+    try:
+        cur = conn.cursor()
+        ...
+        conn.commit()
+    finally:
+        conn.close()         # returns the connection to the pool
+
+Pool behaviour:
+- Bounded (DB_POOL_MAX_SIZE) and thread-safe
+- Acquire timeout (DB_POOL_ACQUIRE_TIMEOUT_S) raises PoolTimeoutError
+- Health check (SELECT 1) on checkout of connections idle longer than
+  DB_POOL_HEALTHCHECK_IDLE_S
+- Connections older than DB_POOL_MAX_LIFETIME_S are recycled on release
+- Wait/usage stats exposed via get_pool_stats() (/api/v1/health/deployment)
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor
+
+
+DB_POOL_VERSION = "db_pool_v1"
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "0"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_ACQUIRE_TIMEOUT_S = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT_S", "10"))
+DB_POOL_MAX_LIFETIME_S = float(os.getenv("DB_POOL_MAX_LIFETIME_S", "1800"))
+DB_POOL_HEALTHCHECK_IDLE_S = float(os.getenv("DB_POOL_HEALTHCHECK_IDLE_S", "30"))
+
+
+class PoolError(Exception):
+    """Base error for the shared connection pool."""
+    pass
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection could be acquired within the acquire timeout."""
+    pass
+
+
+class _PoolEntry:
+    """Raw connection plus the bookkeeping the pool needs to recycle it."""
+
+    __slots__ = ("conn", "created_at", "last_used_at")
+
+    def __init__(self, conn: Any):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used_at = now
+
+
+class PooledConnection:
+    """
+    Thin proxy around a pooled psycopg2 connection.
+
+    Behaves like the underlying connection, except close() hands the
+    connection back to the pool instead of tearing it down. Closing twice
+    is a no-op.
+    """
+
+    def __init__(self, pool: "ConnectionPool", entry: _PoolEntry):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_entry", entry)
+
+    @property
+    def raw(self) -> Any:
+        """Underlying psycopg2 connection (None once released)."""
+        entry = self._entry
+        return entry.conn if entry is not None else None
+
+    def close(self) -> None:
+        entry = self._entry
+        if entry is None:
+            return
+        object.__setattr__(self, "_entry", None)
+        self._pool._release(entry)
+
+    def __getattr__(self, name: str) -> Any:
+        entry = object.__getattribute__(self, "_entry")
+        if entry is None:
+            raise PoolError("Connection already returned to pool")
+        return getattr(entry.conn, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        entry = self._entry
+        if entry is None:
+            raise PoolError("Connection already returned to pool")
+        setattr(entry.conn, name, value)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            try:
+                self.rollback()
+            except Exception:
+                pass
+        self.close()
+
+    def __del__(self):
+        # Safety net for callers that forget close() on an error path
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _default_connect(dsn: Optional[str]) -> Any:
+    return psycopg2.connect(dsn, cursor_factory=RealDictCursor)
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe psycopg2 connection pool.
+
+    Args:
+        dsn: Database URL (defaults to DATABASE_URL at creation time)
+        min_size: Connections opened eagerly by warm_up()
+        max_size: Hard cap on open connections (idle + in use)
+        acquire_timeout_s: Max seconds acquire() waits for a free slot
+        max_lifetime_s: Connections older than this are closed on release
+        healthcheck_idle_s: Idle time after which checkout runs SELECT 1
+        connect: Connection factory (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        min_size: int = DB_POOL_MIN_SIZE,
+        max_size: int = DB_POOL_MAX_SIZE,
+        acquire_timeout_s: float = DB_POOL_ACQUIRE_TIMEOUT_S,
+        max_lifetime_s: float = DB_POOL_MAX_LIFETIME_S,
+        healthcheck_idle_s: float = DB_POOL_HEALTHCHECK_IDLE_S,
+        connect: Optional[Callable[[Optional[str]], Any]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._dsn = dsn if dsn is not None else os.getenv("DATABASE_URL")
+        self._min_size = max(0, min(min_size, max_size))
+        self._max_size = max_size
+        self._acquire_timeout_s = acquire_timeout_s
+        self._max_lifetime_s = max_lifetime_s
+        self._healthcheck_idle_s = healthcheck_idle_s
+        self._connect = connect or _default_connect
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: Deque[_PoolEntry] = deque()
+        self._open_count = 0
+        self._in_use = 0
+        self._closed = False
+
+        # Stats
+        self._acquired_total = 0
+        self._waits_total = 0
+        self._wait_time_total_s = 0.0
+        self._wait_time_max_s = 0.0
+        self._timeouts_total = 0
+        self._created_total = 0
+        self._recycled_total = 0
+        self._healthcheck_failures = 0
+        self._connect_errors = 0
+        self._peak_in_use = 0
+
+    # ===== CONNECTION LIFECYCLE =====
+
+    def _open(self) -> _PoolEntry:
+        try:
+            conn = self._connect(self._dsn)
+        except Exception:
+            with self._cond:
+                self._open_count -= 1
+                self._connect_errors += 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created_total += 1
+        return _PoolEntry(conn)
+
+    def _discard(self, entry: _PoolEntry) -> None:
+        """Close a raw connection. Caller must already have released its slot."""
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, entry: _PoolEntry, now: float) -> bool:
+        return self._max_lifetime_s > 0 and (now - entry.created_at) >= self._max_lifetime_s
+
+    def _is_healthy(self, entry: _PoolEntry, now: float) -> bool:
+        conn = entry.conn
+        if getattr(conn, "closed", 0):
+            return False
+        if self._healthcheck_idle_s < 0 or (now - entry.last_used_at) < self._healthcheck_idle_s:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, conn: Any) -> bool:
+        """Return a connection to a clean idle state. False means discard it."""
+        if getattr(conn, "closed", 0):
+            return False
+        try:
+            status = conn.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+            return True
+        except Exception:
+            return False
+
+    # ===== ACQUIRE / RELEASE =====
+
+    def acquire(self, timeout_s: Optional[float] = None) -> PooledConnection:
+        """
+        Check out a connection.
+
+        Raises:
+            PoolTimeoutError: No connection available within the timeout
+            PoolError: Pool has been closed
+            psycopg2.Error: Opening a new connection failed
+        """
+        timeout = self._acquire_timeout_s if timeout_s is None else timeout_s
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        while True:
+            entry = None
+            must_open = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolError("Connection pool is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._open_count < self._max_size:
+                        self._open_count += 1
+                        must_open = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts_total += 1
+                        raise PoolTimeoutError(
+                            f"DB_POOL_TIMEOUT: no connection available within {timeout:.1f}s "
+                            f"(max_size={self._max_size})"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                self._in_use += 1
+
+            if must_open:
+                try:
+                    entry = self._open()
+                except Exception:
+                    with self._cond:
+                        self._in_use -= 1
+                    raise
+            elif not self._is_healthy(entry, time.monotonic()):
+                self._discard(entry)
+                with self._cond:
+                    self._healthcheck_failures += 1
+                    self._open_count -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                continue
+
+            wait_s = time.monotonic() - started
+            with self._cond:
+                self._acquired_total += 1
+                if waited:
+                    self._waits_total += 1
+                self._wait_time_total_s += wait_s
+                self._wait_time_max_s = max(self._wait_time_max_s, wait_s)
+                self._peak_in_use = max(self._peak_in_use, self._in_use)
+            return PooledConnection(self, entry)
+
+    def _release(self, entry: _PoolEntry) -> None:
+        now = time.monotonic()
+        keep = self._reset(entry.conn) and not self._is_expired(entry, now)
+        entry.last_used_at = now
+
+        with self._cond:
+            self._in_use -= 1
+            if keep and not self._closed:
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+            self._open_count -= 1
+            if not keep:
+                self._recycled_total += 1
+            self._cond.notify()
+        self._discard(entry)
+
+    def warm_up(self) -> int:
+        """Open min_size connections up front. Returns number opened."""
+        opened = []
+        try:
+            for _ in range(self._min_size):
+                with self._cond:
+                    if self._open_count >= self._min_size:
+                        break
+                opened.append(self.acquire())
+        finally:
+            for conn in opened:
+                conn.close()
+        return len(opened)
+
+    def close(self) -> None:
+        """Close all idle connections and refuse further acquires."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open_count -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+    # ===== STATS =====
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            acquired = self._acquired_total
+            return {
+                "version": DB_POOL_VERSION,
+                "status": "closed" if self._closed else "open",
+                "max_size": self._max_size,
+                "min_size": self._min_size,
+                "open_connections": self._open_count,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "peak_in_use": self._peak_in_use,
+                "acquired_total": acquired,
+                "waits_total": self._waits_total,
+                "timeouts_total": self._timeouts_total,
+                "avg_wait_ms": round(self._wait_time_total_s * 1000 / acquired, 3) if acquired else 0.0,
+                "max_wait_ms": round(self._wait_time_max_s * 1000, 3),
+                "created_total": self._created_total,
+                "recycled_total": self._recycled_total,
+                "healthcheck_failures": self._healthcheck_failures,
+                "connect_errors": self._connect_errors,
+                "acquire_timeout_s": self._acquire_timeout_s,
+                "max_lifetime_s": self._max_lifetime_s,
+            }
+
+
+# Process-wide singleton
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Get (lazily creating) the process-wide connection pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def get_db() -> Optional[PooledConnection]:
+    """
+    Get a pooled database connection.
+
+    Drop-in replacement for the per-module get_db() helpers: returns None
+    (after logging) when no connection can be acquired, and conn.close()
+    returns the connection to the pool.
+    """
+    try:
+        return get_pool().acquire()
+    except Exception as e:
+        print(f"Database connection error: {e}")
+        return None
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Pool wait/usage stats for health endpoints."""
+    if _pool is None:
+        return {"version": DB_POOL_VERSION, "status": "not_initialized"}
+    return _pool.stats()
+
+
+def close_pool() -> None:
+    """Close the process-wide pool (application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,226 @@
+"""
+GenoMAX² Shared HTTP Clients
+Long-lived, per-upstream httpx clients for outbound integrations.
+
+Replaces the per-call `with httpx.Client(...)` / `async with
+httpx.AsyncClient()` blocks in the lab adapters, the Junction client, the
+Shopify client and the lab upload LLM extraction. Each of those repeated
+DNS, TCP and TLS setup for every request.
+
+Usage:
+
+    client = get_sync_client("shopify")           # shared httpx.Client
+    response = client.request("GET", url, timeout=self.timeout)
+
+    client = get_async_client("junction")         # shared httpx.AsyncClient
+    response = await client.request("GET", url)
+
+Never close a shared client at the call site; close_http_clients() runs on
+application shutdown (registered in main.py).
+
+Client behaviour (per upstream, so limits are per host):
+- Keep-alive connection pool bounded by HTTP_{NAME}_MAX_CONNECTIONS /
+  HTTP_{NAME}_MAX_KEEPALIVE (defaults HTTP_CLIENT_MAX_CONNECTIONS /
+  HTTP_CLIENT_MAX_KEEPALIVE)
+- Default timeout HTTP_{NAME}_TIMEOUT_S; callers may still pass timeout=
+- Connect failures retried HTTP_{NAME}_RETRIES times by the transport
+  (status-code retries stay with the callers, e.g. Shopify 429 handling)
+- HTTP/2 when HTTP_CLIENT_HTTP2 allows it and the h2 package is installed
+
+An httpx.AsyncClient is bound to the event loop that first uses it, so a
+caller on a different loop (test clients, scripts) gets its own client. A
+replaced or reconfigured async client is closed on its own loop; if that loop
+is already closed it cannot be awaited and is counted in leaked_async_total.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+HTTP_CLIENTS_VERSION = "http_clients_v1"
+
+HTTP_CLIENT_TIMEOUT_S = float(os.getenv("HTTP_CLIENT_TIMEOUT_S", "30"))
+HTTP_CLIENT_CONNECT_TIMEOUT_S = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT_S", "10"))
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "20"))
+HTTP_CLIENT_MAX_KEEPALIVE = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "10"))
+HTTP_CLIENT_KEEPALIVE_EXPIRY_S = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY_S", "30"))
+HTTP_CLIENT_RETRIES = int(os.getenv("HTTP_CLIENT_RETRIES", "2"))
+# "auto" enables HTTP/2 only when the optional h2 package is installed
+HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "auto").lower()
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Connection settings for one upstream API."""
+    name: str
+    timeout_s: float = HTTP_CLIENT_TIMEOUT_S
+    connect_timeout_s: float = HTTP_CLIENT_CONNECT_TIMEOUT_S
+    max_connections: int = HTTP_CLIENT_MAX_CONNECTIONS
+    max_keepalive: int = HTTP_CLIENT_MAX_KEEPALIVE
+    retries: int = HTTP_CLIENT_RETRIES
+    http2: bool = False
+    # Test hook: e.g. httpx.MockTransport (serves both sync and async clients)
+    transport: Optional[Any] = None
+
+    @classmethod
+    def from_env(cls, name: str, **defaults: Any) -> "UpstreamConfig":
+        prefix = f"HTTP_{name.upper()}_"
+        config = cls(name=name, **defaults)
+        http2 = os.getenv(f"{prefix}HTTP2", HTTP_CLIENT_HTTP2)
+        return replace(
+            config,
+            timeout_s=float(os.getenv(f"{prefix}TIMEOUT_S", config.timeout_s)),
+            max_connections=int(os.getenv(f"{prefix}MAX_CONNECTIONS", config.max_connections)),
+            max_keepalive=int(os.getenv(f"{prefix}MAX_KEEPALIVE", config.max_keepalive)),
+            retries=int(os.getenv(f"{prefix}RETRIES", config.retries)),
+            http2=HTTP2_AVAILABLE and http2 in ("auto", "true", "1"),
+        )
+
+    def client_kwargs(self) -> Dict[str, Any]:
+        return {
+            "timeout": httpx.Timeout(self.timeout_s, connect=self.connect_timeout_s),
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=HTTP_CLIENT_KEEPALIVE_EXPIRY_S,
+            ),
+        }
+
+
+# Known upstreams; unknown names get the defaults
+UPSTREAMS: Dict[str, UpstreamConfig] = {
+    "junction": UpstreamConfig.from_env("junction"),
+    "lab_testing_api": UpstreamConfig.from_env("lab_testing_api"),
+    "shopify": UpstreamConfig.from_env("shopify"),
+    "anthropic": UpstreamConfig.from_env("anthropic", timeout_s=60.0, max_connections=10),
+}
+
+_clients_lock = threading.Lock()
+_sync_clients: Dict[str, httpx.Client] = {}
+_async_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_leaked_async_total = 0
+
+
+def _retire_async_client(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    """Close a dropped async client on the loop that owns it."""
+    global _leaked_async_total
+    if not loop.is_closed():
+        close = client.aclose()
+        try:
+            asyncio.run_coroutine_threadsafe(close, loop)
+            return
+        except RuntimeError:  # Closed since the check
+            close.close()
+    _leaked_async_total += 1
+    logger.warning("Dropped an async HTTP client whose event loop is closed; its connections were not closed")
+
+
+def get_upstream_config(name: str) -> UpstreamConfig:
+    with _clients_lock:
+        config = UPSTREAMS.get(name)
+        if config is None:
+            config = UPSTREAMS[name] = UpstreamConfig.from_env(name)
+        return config
+
+
+def configure_upstream(name: str, **changes: Any) -> UpstreamConfig:
+    """
+    Override settings for an upstream (tests, admin tooling).
+
+    Existing clients for the upstream are dropped so the next call builds
+    one with the new settings.
+    """
+    config = replace(get_upstream_config(name), **changes)
+    with _clients_lock:
+        UPSTREAMS[name] = config
+        stale = _sync_clients.pop(name, None)
+        stale_async = _async_clients.pop(name, None)
+    if stale is not None:
+        stale.close()
+    if stale_async is not None:
+        _retire_async_client(*stale_async)
+    return config
+
+
+def get_sync_client(name: str) -> httpx.Client:
+    """Get (lazily creating) the shared sync client for an upstream."""
+    client = _sync_clients.get(name)
+    if client is not None:
+        return client
+    config = get_upstream_config(name)
+    with _clients_lock:
+        client = _sync_clients.get(name)
+        if client is None:
+            transport = config.transport or httpx.HTTPTransport(
+                retries=config.retries, http2=config.http2
+            )
+            client = httpx.Client(
+                transport=transport, http2=config.http2, **config.client_kwargs()
+            )
+            _sync_clients[name] = client
+    return client
+
+
+def get_async_client(name: str) -> httpx.AsyncClient:
+    """Get (lazily creating) the shared async client for an upstream on this loop."""
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(name)
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+    config = get_upstream_config(name)
+    replaced = None
+    with _clients_lock:
+        entry = _async_clients.get(name)
+        if entry is None or entry[0] is not loop:
+            replaced = entry
+            transport = config.transport or httpx.AsyncHTTPTransport(
+                retries=config.retries, http2=config.http2
+            )
+            client = httpx.AsyncClient(
+                transport=transport, http2=config.http2, **config.client_kwargs()
+            )
+            entry = _async_clients[name] = (loop, client)
+    if replaced is not None:
+        _retire_async_client(*replaced)
+    return entry[1]
+
+
+async def close_http_clients() -> None:
+    """Shutdown hook: close every shared client."""
+    with _clients_lock:
+        sync_clients = list(_sync_clients.values())
+        async_clients = list(_async_clients.values())
+        _sync_clients.clear()
+        _async_clients.clear()
+    for client in sync_clients:
+        client.close()
+    loop = asyncio.get_running_loop()
+    for client_loop, client in async_clients:
+        if client_loop is loop:
+            await client.aclose()
+        else:
+            _retire_async_client(client_loop, client)
+    if sync_clients or async_clients:
+        logger.info(f"Closed {len(sync_clients) + len(async_clients)} shared HTTP clients")
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    """Open clients per upstream for health endpoints."""
+    return {
+        "version": HTTP_CLIENTS_VERSION,
+        "http2_available": HTTP2_AVAILABLE,
+        "sync": sorted(_sync_clients),
+        "async": sorted(_async_clients),
+        "leaked_async_total": _leaked_async_total,
+    }
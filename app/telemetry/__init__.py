@@ -25,6 +25,7 @@ from .derive import (
     RunSummary,
     EventRecord,
 )
+from .rollup import run_incremental_rollup, start_rollup_worker, stop_rollup_worker
 from .admin import router as telemetry_router
 
 __all__ = [
@@ -40,5 +41,8 @@ __all__ = [
     "derive_error_event",
     "RunSummary",
     "EventRecord",
+    "run_incremental_rollup",
+    "start_rollup_worker",
+    "stop_rollup_worker",
     "telemetry_router",
 ]
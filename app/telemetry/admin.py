@@ -3,17 +3,29 @@ GenoMAX² Telemetry Admin Endpoints (Issue #9)
 Secured admin-only endpoints for observability dashboard.
 
 Auth: X-Admin-API-Key header required
+
+Endpoints are sync (run in FastAPI's threadpool) because they use blocking
+psycopg2 calls. Summary, top-issues and trends read the rollup tables
+maintained by .rollup.
 """
 
 import os
-import json
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
+from app.shared.db_pool import get_db
+from .rollup import (
+    BLOCK_EVENT_TYPES,
+    daily_trends,
+    ensure_rollup_tables,
+    query_event_totals,
+    query_run_cube,
+    run_incremental_rollup,
+    summarize_runs,
+    top_codes,
+)
 from .models import (
     TelemetrySummary,
     TelemetryHealthResponse,
@@ -24,18 +36,6 @@ from .models import (
 router = APIRouter(prefix="/api/v1/admin/telemetry", tags=["telemetry-admin"])
 
 
-def get_db():
-    """Get database connection."""
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
-        return None
-    try:
-        return psycopg2.connect(db_url, cursor_factory=RealDictCursor)
-    except Exception as e:
-        print(f"[Telemetry Admin] DB connection failed: {e}")
-        return None
-
-
 def verify_admin_key(x_admin_api_key: Optional[str] = Header(None)):
     """Verify admin API key."""
     expected_key = os.getenv("ADMIN_API_KEY")
@@ -50,16 +50,20 @@ def verify_admin_key(x_admin_api_key: Optional[str] = Header(None)):
 # ===== HEALTH CHECK =====
 
 @router.get("/health", response_model=TelemetryHealthResponse)
-async def telemetry_health(x_admin_api_key: Optional[str] = Header(None)):
+def telemetry_health(x_admin_api_key: Optional[str] = Header(None)):
     """Check telemetry system health."""
     verify_admin_key(x_admin_api_key)
     
+    from .emitter import get_emitter
+    queue_stats = get_emitter().stats()
+    
     conn = get_db()
     if not conn:
         return TelemetryHealthResponse(
             status="unhealthy",
             telemetry_enabled=os.getenv("TELEMETRY_ENABLED", "true").lower() == "true",
             tables_exist=False,
+            queue=queue_stats,
         )
     
     try:
@@ -86,6 +90,7 @@ async def telemetry_health(x_admin_api_key: Optional[str] = Header(None)):
                 status="degraded",
                 telemetry_enabled=True,
                 tables_exist=False,
+                queue=queue_stats,
             )
         
         # Get last event
@@ -113,6 +118,7 @@ async def telemetry_health(x_admin_api_key: Optional[str] = Header(None)):
             status="healthy",
             telemetry_enabled=True,
             tables_exist=True,
+            queue=queue_stats,
             last_event_at=last_event,
             total_runs_24h=counts["runs_24h"] or 0,
             total_events_24h=counts["events_24h"] or 0,
@@ -126,18 +132,19 @@ async def telemetry_health(x_admin_api_key: Optional[str] = Header(None)):
             status="error",
             telemetry_enabled=True,
             tables_exist=False,
+            queue=queue_stats,
         )
 
 
 # ===== SUMMARY =====
 
 @router.get("/summary", response_model=TelemetrySummary)
-async def telemetry_summary(
+def telemetry_summary(
     from_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     to_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     x_admin_api_key: Optional[str] = Header(None),
 ):
-    """Get telemetry summary for date range."""
+    """Get telemetry summary for date range [from_date, to_date)."""
     verify_admin_key(x_admin_api_key)
     
     # Default to last 7 days
@@ -159,73 +166,13 @@ async def telemetry_summary(
     try:
         cur = conn.cursor()
         
-        # Basic counts
-        cur.execute("""
-            SELECT 
-                COUNT(*) as total_runs,
-                SUM(CASE WHEN has_bloodwork THEN 1 ELSE 0 END) as runs_with_bloodwork,
-                SUM(CASE WHEN confidence_level = 'low' THEN 1 ELSE 0 END) as runs_low_confidence,
-                SUM(blocked_skus_count) as total_blocks,
-                SUM(unmatched_intents_count) as total_unmatched,
-                SUM(caution_flags_count) as total_cautions
-            FROM telemetry_runs
-            WHERE created_at BETWEEN %s AND %s
-        """, (period_start, period_end))
-        counts = cur.fetchone()
-        
-        # By sex
-        cur.execute("""
-            SELECT sex, COUNT(*) as count
-            FROM telemetry_runs
-            WHERE created_at BETWEEN %s AND %s
-            AND sex IS NOT NULL
-            GROUP BY sex
-        """, (period_start, period_end))
-        by_sex = {row["sex"]: row["count"] for row in cur.fetchall()}
-        
-        # By age bucket
-        cur.execute("""
-            SELECT age_bucket, COUNT(*) as count
-            FROM telemetry_runs
-            WHERE created_at BETWEEN %s AND %s
-            AND age_bucket IS NOT NULL
-            GROUP BY age_bucket
-        """, (period_start, period_end))
-        by_age = {row["age_bucket"]: row["count"] for row in cur.fetchall()}
-        
-        # By confidence
-        cur.execute("""
-            SELECT confidence_level, COUNT(*) as count
-            FROM telemetry_runs
-            WHERE created_at BETWEEN %s AND %s
-            AND confidence_level IS NOT NULL
-            GROUP BY confidence_level
-        """, (period_start, period_end))
-        by_confidence = {row["confidence_level"]: row["count"] for row in cur.fetchall()}
-        
-        # Top block reasons
-        cur.execute("""
-            SELECT code, SUM(count) as total
-            FROM telemetry_events
-            WHERE created_at BETWEEN %s AND %s
-            AND event_type = 'ROUTING_BLOCK'
-            GROUP BY code
-            ORDER BY total DESC
-            LIMIT 10
-        """, (period_start, period_end))
-        top_blocks = [{"code": row["code"], "count": row["total"]} for row in cur.fetchall()]
-        
-        # Top unmatched intents
-        cur.execute("""
-            SELECT code, SUM(count) as total
-            FROM telemetry_events
-            WHERE created_at BETWEEN %s AND %s
-            AND event_type = 'MATCHING_UNMATCHED_INTENT'
-            GROUP BY code
-            ORDER BY total DESC
-            LIMIT 10
-        """, (period_start, period_end))
-        top_unmatched = [{"intent": row["code"], "count": row["total"]} for row in cur.fetchall()]
+        summary = summarize_runs(query_run_cube(cur, period_start, period_end))
+        events = query_event_totals(
+            cur, period_start, period_end,
+            event_types=("ROUTING_BLOCK", "MATCHING_UNMATCHED_INTENT"),
+        )
+        top_blocks = [{"code": code, "count": n} for code, n in top_codes(events, ("ROUTING_BLOCK",))]
+        top_unmatched = [{"intent": code, "count": n} for code, n in top_codes(events, ("MATCHING_UNMATCHED_INTENT",))]
         
         cur.close()
         conn.close()
@@ -233,17 +180,17 @@ async def telemetry_summary(
         return TelemetrySummary(
             period_start=period_start,
             period_end=period_end,
-            total_runs=counts["total_runs"] or 0,
-            runs_with_bloodwork=counts["runs_with_bloodwork"] or 0,
-            runs_low_confidence=counts["runs_low_confidence"] or 0,
-            total_blocks=counts["total_blocks"] or 0,
-            total_unmatched_intents=counts["total_unmatched"] or 0,
-            total_caution_flags=counts["total_cautions"] or 0,
+            total_runs=summary["total_runs"],
+            runs_with_bloodwork=summary["runs_with_bloodwork"],
+            runs_low_confidence=summary["runs_low_confidence"],
+            total_blocks=summary["total_blocks"],
+            total_unmatched_intents=summary["total_unmatched"],
+            total_caution_flags=summary["total_cautions"],
             top_block_reasons=top_blocks,
             top_unmatched_intents=top_unmatched,
-            by_sex=by_sex,
-            by_age_bucket=by_age,
-            by_confidence=by_confidence,
+            by_sex=summary["by_sex"],
+            by_age_bucket=summary["by_age_bucket"],
+            by_confidence=summary["by_confidence"],
         )
     except Exception as e:
         try:
@@ -256,7 +203,7 @@ async def telemetry_summary(
 # ===== TOP ISSUES =====
 
 @router.get("/top-issues")
-async def top_issues(
+def top_issues(
     limit: int = Query(10, ge=1, le=50),
     x_admin_api_key: Optional[str] = Header(None),
 ):
@@ -270,52 +217,31 @@ async def top_issues(
     try:
         cur = conn.cursor()
         
-        # Top issues by event type
-        cur.execute("""
-            SELECT 
-                event_type,
-                code,
-                SUM(count) as total,
-                MAX(created_at) as last_seen
-            FROM telemetry_events
-            WHERE created_at > NOW() - INTERVAL '30 days'
-            GROUP BY event_type, code
-            ORDER BY total DESC
-            LIMIT %s
-        """, (limit,))
+        since = datetime.now(timezone.utc) - timedelta(days=30)
+        events = query_event_totals(cur, since, None)
         
+        # Top issues by event type
+        ranked = sorted(events, key=lambda r: (-int(r["total"] or 0), r["event_type"], r["code"]))[:limit]
         issues = []
-        for row in cur.fetchall():
+        for row in ranked:
             issues.append({
                 "event_type": row["event_type"],
                 "code": row["code"],
-                "total_count": row["total"],
+                "total_count": int(row["total"] or 0),
                 "last_seen": row["last_seen"].isoformat() if row["last_seen"] else None,
             })
         
         # Coverage gaps (from matching)
-        cur.execute("""
-            SELECT code, SUM(count) as total
-            FROM telemetry_events
-            WHERE event_type = 'MATCHING_UNMATCHED_INTENT'
-            AND created_at > NOW() - INTERVAL '30 days'
-            GROUP BY code
-            ORDER BY total DESC
-            LIMIT %s
-        """, (limit,))
-        coverage_gaps = [{"intent": row["code"], "count": row["total"]} for row in cur.fetchall()]
+        coverage_gaps = [
+            {"intent": code, "count": n}
+            for code, n in top_codes(events, ("MATCHING_UNMATCHED_INTENT",), limit)
+        ]
         
         # Blocked most often
-        cur.execute("""
-            SELECT code, SUM(count) as total
-            FROM telemetry_events
-            WHERE event_type IN ('ROUTING_BLOCK', 'CATALOG_AUTO_BLOCK')
-            AND created_at > NOW() - INTERVAL '30 days'
-            GROUP BY code
-            ORDER BY total DESC
-            LIMIT %s
-        """, (limit,))
-        top_blocks = [{"reason": row["code"], "count": row["total"]} for row in cur.fetchall()]
+        top_blocks = [
+            {"reason": code, "count": n}
+            for code, n in top_codes(events, BLOCK_EVENT_TYPES, limit)
+        ]
         
         cur.close()
         conn.close()
@@ -337,7 +263,7 @@ async def top_issues(
 # ===== SINGLE RUN DETAIL =====
 
 @router.get("/run/{run_id}")
-async def get_run_telemetry(
+def get_run_telemetry(
     run_id: str,
     x_admin_api_key: Optional[str] = Header(None),
 ):
@@ -401,94 +327,43 @@ async def get_run_telemetry(
 # ===== ROLLUP TRIGGER =====
 
 @router.post("/rollup/run")
-async def run_daily_rollup(
+def run_daily_rollup(
+    rebuild_from: Optional[str] = Query(None, description="Recompute rollups from this date (YYYY-MM-DD)"),
     x_admin_api_key: Optional[str] = Header(None),
 ):
-    """Trigger daily rollup calculation."""
+    """
+    Roll up telemetry created since the last run into the hourly and daily
+    rollup tables. Also runs in the background every TELEMETRY_ROLLUP_INTERVAL_S.
+    """
     verify_admin_key(x_admin_api_key)
     
+    rebuild = None
+    if rebuild_from:
+        try:
+            rebuild = datetime.fromisoformat(rebuild_from).replace(tzinfo=timezone.utc)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid rebuild_from: {rebuild_from} (expected YYYY-MM-DD)")
+    
     conn = get_db()
     if not conn:
         raise HTTPException(status_code=500, detail="Database connection failed")
     
     try:
-        cur = conn.cursor()
+        result = run_incremental_rollup(conn, rebuild_from=rebuild)
         
-        # Calculate rollup for yesterday
+        # Report yesterday's row for callers of the former daily-only job
         yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).date()
-        
-        # Get aggregates
-        cur.execute("""
-            SELECT 
-                COUNT(*) as total_runs,
-                AVG(CASE WHEN has_bloodwork THEN 100.0 ELSE 0 END) as pct_bloodwork,
-                AVG(CASE WHEN confidence_level = 'low' THEN 100.0 ELSE 0 END) as pct_low_conf,
-                AVG(unmatched_intents_count) as avg_unmatched,
-                AVG(blocked_skus_count) as avg_blocked
-            FROM telemetry_runs
-            WHERE DATE(created_at) = %s
-        """, (yesterday,))
-        agg = cur.fetchone()
-        
-        # Top block reasons
-        cur.execute("""
-            SELECT code, SUM(count) as total
-            FROM telemetry_events
-            WHERE DATE(created_at) = %s
-            AND event_type IN ('ROUTING_BLOCK', 'CATALOG_AUTO_BLOCK')
-            GROUP BY code
-            ORDER BY total DESC
-            LIMIT 10
-        """, (yesterday,))
-        top_blocks = [{"code": row["code"], "count": row["total"]} for row in cur.fetchall()]
-        
-        # Top missing fields / ingredients
-        cur.execute("""
-            SELECT code, SUM(count) as total
-            FROM telemetry_events
-            WHERE DATE(created_at) = %s
-            AND event_type = 'UNKNOWN_INGREDIENT'
-            GROUP BY code
-            ORDER BY total DESC
-            LIMIT 10
-        """, (yesterday,))
-        top_unknown = [{"ingredient": row["code"], "count": row["total"]} for row in cur.fetchall()]
-        
-        # Upsert rollup
-        cur.execute("""
-            INSERT INTO telemetry_daily_rollups 
-            (day, total_runs, pct_has_bloodwork, pct_low_confidence, 
-             avg_unmatched_intents, avg_blocked_skus, 
-             top_block_reasons, top_unknown_ingredients, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
-            ON CONFLICT (day) DO UPDATE SET
-                total_runs = EXCLUDED.total_runs,
-                pct_has_bloodwork = EXCLUDED.pct_has_bloodwork,
-                pct_low_confidence = EXCLUDED.pct_low_confidence,
-                avg_unmatched_intents = EXCLUDED.avg_unmatched_intents,
-                avg_blocked_skus = EXCLUDED.avg_blocked_skus,
-                top_block_reasons = EXCLUDED.top_block_reasons,
-                top_unknown_ingredients = EXCLUDED.top_unknown_ingredients,
-                updated_at = NOW()
-        """, (
-            yesterday,
-            agg["total_runs"] or 0,
-            agg["pct_bloodwork"] or 0,
-            agg["pct_low_conf"] or 0,
-            agg["avg_unmatched"] or 0,
-            agg["avg_blocked"] or 0,
-            json.dumps(top_blocks),
-            json.dumps(top_unknown),
-        ))
-        conn.commit()
-        
+        cur = conn.cursor()
+        cur.execute("SELECT total_runs FROM telemetry_daily_rollups WHERE day = %s", (yesterday,))
+        row = cur.fetchone()
         cur.close()
         conn.close()
         
         return {
             "status": "success",
             "day": yesterday.isoformat(),
-            "total_runs": agg["total_runs"] or 0,
+            "total_runs": row["total_runs"] if row else 0,
+            **result,
         }
     except Exception as e:
         try:
@@ -501,7 +376,7 @@ async def run_daily_rollup(
 # ===== TRENDS =====
 
 @router.get("/trends")
-async def get_trends(
+def get_trends(
     days: int = Query(7, ge=1, le=90),
     x_admin_api_key: Optional[str] = Header(None),
 ):
@@ -515,31 +390,8 @@ async def get_trends(
     try:
         cur = conn.cursor()
         
-        # Daily run counts
-        cur.execute("""
-            SELECT 
-                DATE(created_at) as day,
-                COUNT(*) as total_runs,
-                SUM(CASE WHEN has_bloodwork THEN 1 ELSE 0 END) as with_bloodwork,
-                SUM(CASE WHEN confidence_level = 'low' THEN 1 ELSE 0 END) as low_confidence,
-                AVG(unmatched_intents_count) as avg_unmatched,
-                AVG(blocked_skus_count) as avg_blocked
-            FROM telemetry_runs
-            WHERE created_at > NOW() - INTERVAL '%s days'
-            GROUP BY DATE(created_at)
-            ORDER BY day DESC
-        """ % days)
-        
-        daily_data = []
-        for row in cur.fetchall():
-            daily_data.append({
-                "day": row["day"].isoformat(),
-                "total_runs": row["total_runs"],
-                "with_bloodwork": row["with_bloodwork"] or 0,
-                "low_confidence": row["low_confidence"] or 0,
-                "avg_unmatched": float(row["avg_unmatched"] or 0),
-                "avg_blocked": float(row["avg_blocked"] or 0),
-            })
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        daily_data = daily_trends(query_run_cube(cur, since, None, by_day=True))
         
         cur.close()
         conn.close()
@@ -559,7 +411,7 @@ async def get_trends(
 # ===== SETUP TABLES =====
 
 @router.post("/setup")
-async def setup_telemetry_tables(
+def setup_telemetry_tables(
     x_admin_api_key: Optional[str] = Header(None),
 ):
     """Create telemetry tables if they don't exist."""
@@ -573,7 +425,7 @@ async def setup_telemetry_tables(
     if not conn:
         raise HTTPException(status_code=500, detail="Database connection failed")
     
-    success = emitter._ensure_tables(conn)
+    success = emitter._ensure_tables(conn) and ensure_rollup_tables(conn)
     
     try:
         conn.close()
@@ -2,6 +2,19 @@
 GenoMAX² Telemetry Emitter (Issue #9)
 Singleton emitter for collecting telemetry events from all layers.
 
+Emissions are queued in memory and written by a background flusher thread
+with multi-row INSERTs, so the request path never touches the database.
+The queue is bounded: when full, records are dropped (TELEMETRY_QUEUE_POLICY=
+"drop", default) or the caller waits briefly before dropping ("block").
+Table DDL runs once, on the flusher thread, before the first write.
+
+Config:
+    TELEMETRY_QUEUE_MAX           Max queued records (default 10000)
+    TELEMETRY_FLUSH_BATCH         Max records per flush (default 500)
+    TELEMETRY_FLUSH_INTERVAL_S    Max seconds a record waits (default 1.0)
+    TELEMETRY_QUEUE_POLICY        "drop" or "block" (default drop)
+    TELEMETRY_ENQUEUE_TIMEOUT_S   Wait in "block" policy (default 0.05)
+
 Usage:
     from app.telemetry import TelemetryEmitter
     
@@ -11,22 +24,92 @@ Usage:
 
 import os
 import json
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import queue
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from threading import Lock
 import uuid
 
+from app.shared.db_pool import get_pool
+from .derive import RunSummary, EventRecord
 from .models import (
     TelemetryRun,
-    TelemetryEvent,
     TelemetryEventType,
     AgeBucket,
     ConfidenceLevel,
 )
 
 
+QUEUE_POLICY_DROP = "drop"
+QUEUE_POLICY_BLOCK = "block"
+
+# Queue record kinds
+_RUN_INSERT = "run_insert"
+_RUN_UPDATE = "run_update"
+_RUN_RECORD = "run_record"  # (run row, [event rows]) from record_run()
+_EVENT = "event"
+_STOP = object()
+
+_RUN_INSERT_COLUMNS = ("id", "run_id", "sex", "age_bucket", "has_bloodwork", "api_version", "bloodwork_version")
+_RUN_UPDATE_COLUMNS = (
+    "run_id", "intents_count", "matched_items_count", "unmatched_intents_count",
+    "blocked_skus_count", "auto_blocked_skus_count", "caution_flags_count", "confidence_level",
+)
+_RUN_RECORD_COLUMNS = (
+    "id", "run_id", "phase", "sex", "age_bucket", "has_bloodwork", "api_version", "bloodwork_version",
+    "intents_count", "matched_items_count", "unmatched_intents_count", "blocked_skus_count",
+    "auto_blocked_skus_count", "caution_flags_count", "confidence_level",
+)
+_EVENT_COLUMNS = ("run_id", "event_type", "code", "count", "metadata")
+
+# Metadata keys allowed into telemetry_events - NO PII
+_SAFE_METADATA_KEYS = {"reason", "layer", "severity", "marker_code", "gate_name"}
+
+
+def _valid_run_id(run_id: Any) -> bool:
+    """run_id columns are UUID; one malformed id would fail a whole batch."""
+    try:
+        uuid.UUID(str(run_id))
+        return True
+    except ValueError:
+        return False
+
+
+def _sanitize_metadata(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not metadata:
+        return None
+    safe_metadata = {k: v for k, v in metadata.items() if k in _SAFE_METADATA_KEYS}
+    return json.dumps(safe_metadata) if safe_metadata else None
+
+
+def _values_sql(row_count: int, width: int) -> str:
+    row = "(" + ", ".join(["%s"] * width) + ")"
+    return ", ".join([row] * row_count)
+
+
+def _segments(records: List[Tuple[str, tuple]]) -> List[List[Tuple[str, tuple]]]:
+    """
+    Split a drained batch so batching keeps sequential semantics.
+    
+    complete_run() updates every row with the run_id, so a run row inserted
+    after an update for the same run_id must not be written before that
+    update is applied.
+    """
+    segments = [[]]
+    updated = set()
+    for kind, params in records:
+        run_id = params[0][1] if kind == _RUN_RECORD else params[1] if kind == _RUN_INSERT else None
+        if run_id is not None and run_id in updated:
+            segments.append([])
+            updated = set()
+        if kind == _RUN_UPDATE:
+            updated.add(params[0])
+        segments[-1].append((kind, params))
+    return segments
+
+
 class TelemetryEmitter:
     """
     Singleton emitter for telemetry events.
@@ -50,21 +133,250 @@ class TelemetryEmitter:
         self._initialized = True
         self._db_url = os.getenv("DATABASE_URL")
         self._enabled = os.getenv("TELEMETRY_ENABLED", "true").lower() == "true"
-        self._buffer: List[TelemetryEvent] = []
-        self._buffer_lock = Lock()
-        self._max_buffer = 100
+        self._flush_batch = int(os.getenv("TELEMETRY_FLUSH_BATCH", "500"))
+        self._flush_interval_s = float(os.getenv("TELEMETRY_FLUSH_INTERVAL_S", "1.0"))
+        self._policy = os.getenv("TELEMETRY_QUEUE_POLICY", QUEUE_POLICY_DROP)
+        self._enqueue_timeout_s = float(os.getenv("TELEMETRY_ENQUEUE_TIMEOUT_S", "0.05"))
+        self._queue: "queue.Queue" = queue.Queue(maxsize=int(os.getenv("TELEMETRY_QUEUE_MAX", "10000")))
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = Lock()
+        self._stopped = False
+        self._tables_ready = False
+        self._stats_lock = Lock()
+        self._stats = {
+            "enqueued_total": 0,
+            "dropped_total": 0,
+            "rejected_total": 0,
+            "written_total": 0,
+            "write_failures_total": 0,
+            "flushes_total": 0,
+            "flush_errors_total": 0,
+            "last_flush_ms": 0.0,
+            "last_flush_rows": 0,
+        }
         
     @classmethod
     def get_instance(cls) -> "TelemetryEmitter":
         """Get singleton instance."""
         return cls()
     
+    @classmethod
+    def reset(cls):
+        """Stop the flusher and drop the singleton (for testing purposes)."""
+        with cls._lock:
+            if cls._instance is not None and cls._instance._initialized:
+                cls._instance.shutdown(timeout_s=1.0)
+            cls._instance = None
+    
+    # ===== BACKGROUND FLUSHER =====
+    
+    @property
+    def active(self) -> bool:
+        return self._enabled and bool(self._db_url) and not self._stopped
+    
+    def start(self):
+        """Start the background flusher (idempotent; also started on first emit)."""
+        if not self.active:
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="telemetry-flusher", daemon=True)
+                self._worker.start()
+    
+    def _enqueue(self, kind: str, params: tuple, run_id: Any) -> bool:
+        if not self.active:
+            return False
+        if not _valid_run_id(run_id):
+            self._bump("rejected_total")
+            return False
+        if self._worker is None:
+            self.start()
+        try:
+            if self._policy == QUEUE_POLICY_BLOCK:
+                self._queue.put((kind, params), timeout=self._enqueue_timeout_s)
+            else:
+                self._queue.put_nowait((kind, params))
+        except queue.Full:
+            self._bump("dropped_total")
+            return False
+        self._bump("enqueued_total")
+        return True
+    
+    def _bump(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+    
+    def _drain(self) -> Tuple[List[Tuple[str, tuple]], bool]:
+        """Collect up to a batch, waiting at most the flush interval. Returns (records, stop)."""
+        records = []
+        deadline = time.monotonic() + self._flush_interval_s
+        while len(records) < self._flush_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.task_done()
+                return records, True
+            records.append(item)
+        return records, False
+    
+    def _run_worker(self):
+        stop = False
+        while not stop:
+            records, stop = self._drain()
+            if records:
+                self._flush_records(records)
+                for _ in records:
+                    self._queue.task_done()
+        # Drain anything enqueued before shutdown
+        while True:
+            records = []
+            while len(records) < self._flush_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    continue
+                records.append(item)
+            if not records:
+                break
+            self._flush_records(records)
+            for _ in records:
+                self._queue.task_done()
+    
+    def _flush_records(self, records: List[Tuple[str, tuple]]):
+        """Write one drained batch in a single transaction."""
+        started = time.perf_counter()
+        conn = self._get_conn()
+        if not conn:
+            self._bump("write_failures_total", len(records))
+            self._bump("flush_errors_total")
+            return
+        try:
+            if not self._tables_ready:
+                self._tables_ready = self._ensure_tables(conn)
+                if not self._tables_ready:
+                    conn.rollback()
+            cur = conn.cursor()
+            for segment in _segments(records):
+                self._write_segment(cur, segment)
+            conn.commit()
+            cur.close()
+            with self._stats_lock:
+                self._stats["written_total"] += len(records)
+                self._stats["flushes_total"] += 1
+                self._stats["last_flush_rows"] = len(records)
+                self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        except Exception as e:
+            print(f"[Telemetry] flush of {len(records)} records failed: {e}")
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self._bump("write_failures_total", len(records))
+            self._bump("flush_errors_total")
+        finally:
+            conn.close()
+    
+    def _write_segment(self, cur, segment: List[Tuple[str, tuple]]):
+        """Write one segment with a single multi-statement execute (one round trip)."""
+        inserts = [p for kind, p in segment if kind == _RUN_INSERT]
+        # Last record per (run_id, phase) wins; one upsert cannot touch a row twice
+        records = list({(p[0][1], p[0][2]): p[0] for kind, p in segment if kind == _RUN_RECORD}.values())
+        # Each complete_run overwrites all fields, so the last one per run_id wins
+        updates = list({p[0]: p for kind, p in segment if kind == _RUN_UPDATE}.values())
+        events = [p for kind, p in segment if kind == _EVENT]
+        for kind, p in segment:
+            if kind == _RUN_RECORD:
+                events.extend(p[1])
+        
+        statements = []
+        params: List[Any] = []
+        if inserts:
+            statements.append(
+                f"INSERT INTO telemetry_runs ({', '.join(_RUN_INSERT_COLUMNS)}) "
+                f"VALUES {_values_sql(len(inserts), len(_RUN_INSERT_COLUMNS))}"
+            )
+            params.extend(v for row in inserts for v in row)
+        if records:
+            upsert_columns = _RUN_RECORD_COLUMNS[3:]
+            statements.append(
+                f"INSERT INTO telemetry_runs ({', '.join(_RUN_RECORD_COLUMNS)}) "
+                f"VALUES {_values_sql(len(records), len(_RUN_RECORD_COLUMNS))} "
+                f"ON CONFLICT (run_id, phase) DO UPDATE SET "
+                + ", ".join(f"{c} = EXCLUDED.{c}" for c in upsert_columns)
+            )
+            params.extend(v for row in records for v in row)
+        if updates:
+            statements.append(
+                f"""
+                UPDATE telemetry_runs AS t SET
+                    intents_count = v.intents_count,
+                    matched_items_count = v.matched_items_count,
+                    unmatched_intents_count = v.unmatched_intents_count,
+                    blocked_skus_count = v.blocked_skus_count,
+                    auto_blocked_skus_count = v.auto_blocked_skus_count,
+                    caution_flags_count = v.caution_flags_count,
+                    confidence_level = v.confidence_level
+                FROM (VALUES {_values_sql(len(updates), len(_RUN_UPDATE_COLUMNS))})
+                    AS v({', '.join(_RUN_UPDATE_COLUMNS)})
+                WHERE t.run_id = v.run_id::uuid
+                """
+            )
+            params.extend(v for row in updates for v in row)
+        if events:
+            statements.append(
+                f"INSERT INTO telemetry_events ({', '.join(_EVENT_COLUMNS)}) "
+                f"VALUES {_values_sql(len(events), len(_EVENT_COLUMNS))}"
+            )
+            params.extend(v for row in events for v in row)
+        if statements:
+            cur.execute(";\n".join(statements), params)
+    
+    def flush(self, timeout_s: float = 5.0) -> bool:
+        """Wait until everything enqueued so far is written. Returns False on timeout."""
+        deadline = time.monotonic() + timeout_s
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+    
+    def shutdown(self, timeout_s: float = 5.0):
+        """Flush queued records and stop the flusher. Later emissions are ignored."""
+        self._stopped = True
+        worker = self._worker
+        if worker is None or not worker.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout_s)
+        except queue.Full:
+            pass
+        worker.join(timeout_s)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue and flush counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            "enabled": self._enabled,
+            "running": self._worker is not None and self._worker.is_alive(),
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self._queue.maxsize,
+            "policy": self._policy,
+        })
+        return stats
+    
     def _get_conn(self):
-        """Get database connection."""
+        """Get pooled database connection (close() returns it to the pool)."""
         if not self._db_url:
             return None
         try:
-            return psycopg2.connect(self._db_url, cursor_factory=RealDictCursor)
+            return get_pool().acquire()
         except Exception as e:
             print(f"[Telemetry] DB connection failed: {e}")
             return None
@@ -108,6 +420,12 @@ class TelemetryEmitter:
                 CREATE INDEX IF NOT EXISTS idx_telemetry_runs_run_id 
                     ON telemetry_runs(run_id);
                 
+                -- One row per (run_id, phase) for record_run() upserts;
+                -- legacy start_run() rows have NULL phase and never conflict
+                ALTER TABLE telemetry_runs ADD COLUMN IF NOT EXISTS phase VARCHAR(50);
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_telemetry_runs_run_id_phase 
+                    ON telemetry_runs(run_id, phase);
+                
                 CREATE TABLE IF NOT EXISTS telemetry_events (
                     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
                     run_id UUID NOT NULL,
@@ -160,44 +478,21 @@ class TelemetryEmitter:
         bloodwork_version: str = "1.0",
     ) -> Optional[str]:
         """Start telemetry for a run. Returns telemetry_run_id."""
-        if not self._enabled:
-            return None
-            
-        conn = self._get_conn()
-        if not conn:
-            return None
-            
-        try:
-            self._ensure_tables(conn)
-            cur = conn.cursor()
-            
-            telemetry_id = str(uuid.uuid4())
-            age_bucket = AgeBucket.from_age(age).value
-            
-            cur.execute("""
-                INSERT INTO telemetry_runs 
-                (id, run_id, sex, age_bucket, has_bloodwork, api_version, bloodwork_version)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (
-                telemetry_id,
-                run_id,
-                sex,
-                age_bucket,
-                has_bloodwork,
-                api_version,
-                bloodwork_version,
-            ))
-            conn.commit()
-            cur.close()
-            conn.close()
-            return telemetry_id
-        except Exception as e:
-            print(f"[Telemetry] start_run failed: {e}")
-            try:
-                conn.close()
-            except:
-                pass
+        if not self.active:
             return None
+        
+        telemetry_id = str(uuid.uuid4())
+        age_bucket = AgeBucket.from_age(age).value
+        self._enqueue(_RUN_INSERT, (
+            telemetry_id,
+            run_id,
+            sex,
+            age_bucket,
+            has_bloodwork,
+            api_version,
+            bloodwork_version,
+        ), run_id)
+        return telemetry_id
     
     def complete_run(
         self,
@@ -211,44 +506,59 @@ class TelemetryEmitter:
         confidence_level: str = "unknown",
     ):
         """Update run with final counts."""
-        if not self._enabled:
-            return
-            
-        conn = self._get_conn()
-        if not conn:
-            return
-            
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                UPDATE telemetry_runs SET
-                    intents_count = %s,
-                    matched_items_count = %s,
-                    unmatched_intents_count = %s,
-                    blocked_skus_count = %s,
-                    auto_blocked_skus_count = %s,
-                    caution_flags_count = %s,
-                    confidence_level = %s
-                WHERE run_id = %s
-            """, (
-                intents_count,
-                matched_items_count,
-                unmatched_intents_count,
-                blocked_skus_count,
-                auto_blocked_skus_count,
-                caution_flags_count,
-                confidence_level,
-                run_id,
-            ))
-            conn.commit()
-            cur.close()
-            conn.close()
-        except Exception as e:
-            print(f"[Telemetry] complete_run failed: {e}")
-            try:
-                conn.close()
-            except:
-                pass
+        self._enqueue(_RUN_UPDATE, (
+            run_id,
+            intents_count,
+            matched_items_count,
+            unmatched_intents_count,
+            blocked_skus_count,
+            auto_blocked_skus_count,
+            caution_flags_count,
+            confidence_level,
+        ), run_id)
+    
+    def record_run(
+        self,
+        summary: RunSummary,
+        events: List[EventRecord],
+        run_id: Optional[str] = None,
+        api_version: str = "3.16.0",
+        bloodwork_version: str = "1.0",
+    ) -> bool:
+        """
+        Record a completed phase: its run row and all its events.
+        
+        Written in one transaction and one round trip. The run row is upserted
+        on (run_id, phase), so a repeated phase replaces its row instead of
+        adding a duplicate. Returns False if telemetry is off or the record
+        was dropped.
+        """
+        if not self.active:
+            return False
+        
+        run_id = run_id or summary.run_id
+        run_row = (
+            str(uuid.uuid4()),
+            run_id,
+            summary.phase,
+            summary.sex,
+            summary.age_bucket,
+            summary.has_bloodwork,
+            api_version,
+            bloodwork_version,
+            summary.intents_count,
+            summary.matched_items_count,
+            summary.unmatched_intents_count,
+            summary.blocked_skus_count,
+            summary.auto_blocked_skus_count,
+            summary.caution_flags_count,
+            summary.confidence_level,
+        )
+        event_rows = [
+            (run_id, e.event_type, e.code, e.count, _sanitize_metadata(e.metadata))
+            for e in events
+        ]
+        return self._enqueue(_RUN_RECORD, (run_row, event_rows), run_id)
     
     # ===== EVENT EMISSIONS =====
     
@@ -261,42 +571,17 @@ class TelemetryEmitter:
         metadata: Optional[Dict[str, Any]] = None,
     ):
         """Internal event emission."""
-        if not self._enabled:
+        if not self.active:
             return
             
         # Sanitize metadata - NO PII
-        safe_metadata = {}
-        if metadata:
-            # Only allow safe keys
-            safe_keys = {"reason", "layer", "severity", "marker_code", "gate_name"}
-            safe_metadata = {k: v for k, v in metadata.items() if k in safe_keys}
-        
-        conn = self._get_conn()
-        if not conn:
-            return
-            
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO telemetry_events 
-                (run_id, event_type, code, count, metadata)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (
-                run_id,
-                event_type.value if isinstance(event_type, TelemetryEventType) else event_type,
-                code,
-                count,
-                json.dumps(safe_metadata) if safe_metadata else None,
-            ))
-            conn.commit()
-            cur.close()
-            conn.close()
-        except Exception as e:
-            print(f"[Telemetry] emit_event failed: {e}")
-            try:
-                conn.close()
-            except:
-                pass
+        self._enqueue(_EVENT, (
+            run_id,
+            event_type.value if isinstance(event_type, TelemetryEventType) else event_type,
+            code,
+            count,
+            _sanitize_metadata(metadata),
+        ), run_id)
     
     # ===== CATALOG GOVERNANCE EVENTS =====
     
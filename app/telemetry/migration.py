@@ -3,6 +3,8 @@ GenoMAX² Telemetry Migration Endpoint
 Creates telemetry tables in PostgreSQL.
 """
 
+from .rollup import ROLLUP_TABLES_SQL
+
 TELEMETRY_MIGRATION_SQL = """
 -- Telemetry Tables (Issue #9)
 -- Run this migration to enable observability
@@ -37,6 +39,10 @@ CREATE INDEX IF NOT EXISTS idx_telemetry_runs_confidence ON telemetry_runs(confi
 CREATE INDEX IF NOT EXISTS idx_telemetry_runs_bloodwork ON telemetry_runs(has_bloodwork);
 CREATE INDEX IF NOT EXISTS idx_telemetry_runs_run_id ON telemetry_runs(run_id);
 
+-- One row per (run_id, phase) for record_run() upserts
+ALTER TABLE telemetry_runs ADD COLUMN IF NOT EXISTS phase VARCHAR(50);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_telemetry_runs_run_id_phase ON telemetry_runs(run_id, phase);
+
 CREATE TABLE IF NOT EXISTS telemetry_events (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     run_id UUID NOT NULL,
@@ -65,7 +71,9 @@ CREATE TABLE IF NOT EXISTS telemetry_daily_rollups (
     top_unknown_ingredients JSONB,
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
-"""
+
+-- Incremental hourly rollups (see rollup.py)
+""" + ROLLUP_TABLES_SQL
 
 
 def get_migration_sql() -> str:
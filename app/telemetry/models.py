@@ -161,3 +161,4 @@ class TelemetryHealthResponse(BaseModel):
     last_event_at: Optional[datetime] = None
     total_runs_24h: int = 0
     total_events_24h: int = 0
+    queue: Optional[Dict[str, Any]] = None
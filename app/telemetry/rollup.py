@@ -0,0 +1,537 @@
+"""
+GenoMAX² Telemetry Rollups (Issue #9)
+Incremental hourly/daily aggregates so admin reads do not scan raw telemetry.
+
+Tables:
+- telemetry_hourly_run_rollups: run counts per hour x (sex, age_bucket,
+  confidence_level, has_bloodwork), with summed unmatched/blocked/caution counts
+- telemetry_hourly_event_rollups: event totals per hour x (event_type, code)
+- telemetry_daily_rollups: per-day summary (top block reasons, unknown
+  ingredients, confidence mix), refreshed from the hourly tables
+- telemetry_rollup_state: watermark of the last rolled-up created_at
+
+Each pass recomputes only the hours between the watermark and NOW() minus a
+short lag (TELEMETRY_ROLLUP_LAG_S, for rows whose transaction commits after
+their created_at), using half-open created_at ranges that can use the
+created_at indexes. Readers combine full hours before the watermark from the
+rollup tables with raw rows for the remainder, so results stay exact.
+
+Rows changed after their hour was rolled up (record_run upserts of a repeated
+phase) keep their earlier counts until that range is rebuilt with
+run_incremental_rollup(conn, rebuild_from=...).
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, date, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+
+ROLLUP_NAME = "telemetry_hourly"
+ROLLUP_LAG = timedelta(seconds=int(os.getenv("TELEMETRY_ROLLUP_LAG_S", "120")))
+ROLLUP_INTERVAL_S = float(os.getenv("TELEMETRY_ROLLUP_INTERVAL_S", "300"))
+# Max created_at span per transaction when catching up on history
+ROLLUP_CHUNK = timedelta(days=1)
+TOP_N = 10
+
+HOUR = timedelta(hours=1)
+FAR_FUTURE = datetime(9999, 1, 1, tzinfo=timezone.utc)
+
+BLOCK_EVENT_TYPES = ("ROUTING_BLOCK", "CATALOG_AUTO_BLOCK")
+
+ROLLUP_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS telemetry_hourly_run_rollups (
+    bucket_start TIMESTAMPTZ NOT NULL,
+    sex VARCHAR(10) NOT NULL DEFAULT '',
+    age_bucket VARCHAR(20) NOT NULL DEFAULT '',
+    confidence_level VARCHAR(20) NOT NULL DEFAULT '',
+    has_bloodwork BOOLEAN NOT NULL DEFAULT FALSE,
+    runs INTEGER NOT NULL DEFAULT 0,
+    unmatched_intents BIGINT NOT NULL DEFAULT 0,
+    blocked_skus BIGINT NOT NULL DEFAULT 0,
+    caution_flags BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket_start, sex, age_bucket, confidence_level, has_bloodwork)
+);
+
+CREATE TABLE IF NOT EXISTS telemetry_hourly_event_rollups (
+    bucket_start TIMESTAMPTZ NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    code VARCHAR(255) NOT NULL,
+    total BIGINT NOT NULL DEFAULT 0,
+    last_seen TIMESTAMPTZ,
+    PRIMARY KEY (bucket_start, event_type, code)
+);
+
+CREATE TABLE IF NOT EXISTS telemetry_rollup_state (
+    name VARCHAR(50) PRIMARY KEY,
+    watermark TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE telemetry_daily_rollups ADD COLUMN IF NOT EXISTS by_confidence JSONB;
+"""
+
+# Hour bucket in UTC regardless of session time zone
+_HOUR_EXPR = "date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+
+
+# ===== TIME HELPERS =====
+
+def floor_hour(ts: datetime) -> datetime:
+    """Start of the UTC hour containing ts."""
+    return ts.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(ts: datetime) -> datetime:
+    """Start of the first UTC hour at or after ts."""
+    floored = floor_hour(ts)
+    return floored if floored == ts.astimezone(timezone.utc) else floored + HOUR
+
+
+def day_start(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+
+
+def split_range(
+    start: datetime,
+    end: datetime,
+    watermark: Optional[datetime],
+) -> Tuple[Tuple[datetime, datetime], List[Tuple[datetime, datetime]]]:
+    """
+    Split [start, end) into a rolled-up part and raw parts.
+
+    Returns ((rollup_start, rollup_end), [raw ranges]). The rollup part covers
+    whole hours that end at or before the watermark's hour; everything else
+    (a partial leading hour, and the tail from the watermark's hour on) is
+    read from raw rows. Empty ranges have start >= end.
+    """
+    if watermark is None:
+        return (start, start), [(start, end)]
+    rolled_start = ceil_hour(start)
+    rolled_end = min(floor_hour(end) if end < FAR_FUTURE else FAR_FUTURE, floor_hour(watermark))
+    if rolled_start >= rolled_end:
+        return (start, start), [(start, end)]
+    return (rolled_start, rolled_end), [(start, rolled_start), (rolled_end, end)]
+
+
+# ===== DDL =====
+
+_tables_ready = False
+_tables_lock = threading.Lock()
+
+
+def ensure_rollup_tables(conn) -> bool:
+    """Create rollup tables once per process."""
+    global _tables_ready
+    if _tables_ready:
+        return True
+    with _tables_lock:
+        if _tables_ready:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute(ROLLUP_TABLES_SQL)
+            conn.commit()
+            cur.close()
+            _tables_ready = True
+        except Exception as e:
+            print(f"[Telemetry] Rollup table creation failed: {e}")
+            conn.rollback()
+    return _tables_ready
+
+
+# ===== INCREMENTAL ROLLUP =====
+
+def _recompute_hours(cur, range_start: datetime, range_end: datetime):
+    """Rebuild hourly buckets in [range_start, range_end) from raw rows."""
+    params = (range_start, range_end)
+    cur.execute("""
+        DELETE FROM telemetry_hourly_run_rollups
+        WHERE bucket_start >= %s AND bucket_start < %s
+    """, params)
+    cur.execute(f"""
+        INSERT INTO telemetry_hourly_run_rollups
+        (bucket_start, sex, age_bucket, confidence_level, has_bloodwork,
+         runs, unmatched_intents, blocked_skus, caution_flags)
+        SELECT
+            {_HOUR_EXPR},
+            COALESCE(sex, ''),
+            COALESCE(age_bucket, ''),
+            COALESCE(confidence_level, ''),
+            COALESCE(has_bloodwork, FALSE),
+            COUNT(*),
+            COALESCE(SUM(unmatched_intents_count), 0),
+            COALESCE(SUM(blocked_skus_count), 0),
+            COALESCE(SUM(caution_flags_count), 0)
+        FROM telemetry_runs
+        WHERE created_at >= %s AND created_at < %s
+        GROUP BY 1, 2, 3, 4, 5
+    """, params)
+    cur.execute("""
+        DELETE FROM telemetry_hourly_event_rollups
+        WHERE bucket_start >= %s AND bucket_start < %s
+    """, params)
+    cur.execute(f"""
+        INSERT INTO telemetry_hourly_event_rollups
+        (bucket_start, event_type, code, total, last_seen)
+        SELECT
+            {_HOUR_EXPR},
+            event_type,
+            code,
+            COALESCE(SUM(count), 0),
+            MAX(created_at)
+        FROM telemetry_events
+        WHERE created_at >= %s AND created_at < %s
+        GROUP BY 1, 2, 3
+    """, params)
+
+
+def _refresh_day(cur, day: date):
+    """Rebuild one telemetry_daily_rollups row from the hourly tables."""
+    start = day_start(day)
+    end = start + timedelta(days=1)
+
+    cur.execute("""
+        SELECT confidence_level, has_bloodwork,
+               SUM(runs) AS runs,
+               SUM(unmatched_intents) AS unmatched,
+               SUM(blocked_skus) AS blocked
+        FROM telemetry_hourly_run_rollups
+        WHERE bucket_start >= %s AND bucket_start < %s
+        GROUP BY confidence_level, has_bloodwork
+    """, (start, end))
+    rows = cur.fetchall()
+    total = sum(int(r["runs"]) for r in rows)
+    with_bloodwork = sum(int(r["runs"]) for r in rows if r["has_bloodwork"])
+    by_confidence: Dict[str, int] = {}
+    for r in rows:
+        if r["confidence_level"]:
+            by_confidence[r["confidence_level"]] = by_confidence.get(r["confidence_level"], 0) + int(r["runs"])
+    unmatched = sum(int(r["unmatched"]) for r in rows)
+    blocked = sum(int(r["blocked"]) for r in rows)
+
+    cur.execute("""
+        SELECT event_type, code, SUM(total) AS total, MAX(last_seen) AS last_seen
+        FROM telemetry_hourly_event_rollups
+        WHERE bucket_start >= %s AND bucket_start < %s
+        AND event_type IN ('ROUTING_BLOCK', 'CATALOG_AUTO_BLOCK', 'UNKNOWN_INGREDIENT')
+        GROUP BY event_type, code
+    """, (start, end))
+    events = cur.fetchall()
+    top_blocks = [{"code": code, "count": n} for code, n in top_codes(events, BLOCK_EVENT_TYPES)]
+    top_unknown = [{"ingredient": code, "count": n} for code, n in top_codes(events, ("UNKNOWN_INGREDIENT",))]
+
+    cur.execute("""
+        INSERT INTO telemetry_daily_rollups
+        (day, total_runs, pct_has_bloodwork, pct_low_confidence,
+         avg_unmatched_intents, avg_blocked_skus,
+         top_block_reasons, top_unknown_ingredients, by_confidence, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+        ON CONFLICT (day) DO UPDATE SET
+            total_runs = EXCLUDED.total_runs,
+            pct_has_bloodwork = EXCLUDED.pct_has_bloodwork,
+            pct_low_confidence = EXCLUDED.pct_low_confidence,
+            avg_unmatched_intents = EXCLUDED.avg_unmatched_intents,
+            avg_blocked_skus = EXCLUDED.avg_blocked_skus,
+            top_block_reasons = EXCLUDED.top_block_reasons,
+            top_unknown_ingredients = EXCLUDED.top_unknown_ingredients,
+            by_confidence = EXCLUDED.by_confidence,
+            updated_at = NOW()
+    """, (
+        day,
+        total,
+        100.0 * with_bloodwork / total if total else 0,
+        100.0 * by_confidence.get("low", 0) / total if total else 0,
+        unmatched / total if total else 0,
+        blocked / total if total else 0,
+        json.dumps(top_blocks),
+        json.dumps(top_unknown),
+        json.dumps(by_confidence),
+    ))
+
+
+def run_incremental_rollup(
+    conn,
+    now: Optional[datetime] = None,
+    rebuild_from: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Roll up telemetry created since the watermark (up to now - lag).
+
+    Commits once per ROLLUP_CHUNK so catching up on a long history never
+    holds one huge transaction. The state row is locked FOR UPDATE, so
+    concurrent runners serialize instead of double-processing.
+
+    Args:
+        conn: DB connection (RealDictCursor)
+        now: Override current time (tests)
+        rebuild_from: Reset the watermark to this time first
+    """
+    ensure_rollup_tables(conn)
+    cutoff = (now or datetime.now(timezone.utc)) - ROLLUP_LAG
+    cur = conn.cursor()
+    hours = 0
+    days: List[date] = []
+    watermark = None
+
+    try:
+        cur.execute("""
+            INSERT INTO telemetry_rollup_state (name) VALUES (%s)
+            ON CONFLICT (name) DO NOTHING
+        """, (ROLLUP_NAME,))
+        if rebuild_from is not None:
+            cur.execute("""
+                UPDATE telemetry_rollup_state SET watermark = %s, updated_at = NOW()
+                WHERE name = %s
+            """, (floor_hour(rebuild_from), ROLLUP_NAME))
+        conn.commit()
+
+        while True:
+            cur.execute("""
+                SELECT watermark FROM telemetry_rollup_state WHERE name = %s FOR UPDATE
+            """, (ROLLUP_NAME,))
+            watermark = cur.fetchone()["watermark"]
+
+            if watermark is None:
+                cur.execute("""
+                    SELECT LEAST(
+                        (SELECT MIN(created_at) FROM telemetry_runs),
+                        (SELECT MIN(created_at) FROM telemetry_events)
+                    ) AS first_row
+                """)
+                first_row = cur.fetchone()["first_row"]
+                if first_row is None:
+                    conn.commit()
+                    break
+                watermark = floor_hour(first_row)
+
+            if watermark >= cutoff:
+                conn.commit()
+                break
+
+            chunk_end = min(cutoff, watermark + ROLLUP_CHUNK)
+            range_start = floor_hour(watermark)
+            # Include the whole hour containing chunk_end; it is recomputed
+            # again on the next pass, so partial data there is harmless
+            range_end = floor_hour(chunk_end) + HOUR
+            _recompute_hours(cur, range_start, range_end)
+            hours += int((range_end - range_start) / HOUR)
+
+            day = range_start.date()
+            while day_start(day) < range_end:
+                _refresh_day(cur, day)
+                if day not in days:
+                    days.append(day)
+                day += timedelta(days=1)
+
+            cur.execute("""
+                UPDATE telemetry_rollup_state SET watermark = %s, updated_at = NOW()
+                WHERE name = %s
+            """, (chunk_end, ROLLUP_NAME))
+            conn.commit()
+            watermark = chunk_end
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+    return {
+        "watermark": watermark.isoformat() if watermark else None,
+        "hours_recomputed": hours,
+        "days_refreshed": [d.isoformat() for d in days],
+    }
+
+
+# ===== READERS =====
+
+def get_watermark(cur) -> Optional[datetime]:
+    """Current rollup watermark, or None if rollups have never run."""
+    try:
+        cur.execute("SELECT watermark FROM telemetry_rollup_state WHERE name = %s", (ROLLUP_NAME,))
+    except Exception:
+        # Tables not created yet: read everything raw
+        cur.connection.rollback()
+        return None
+    row = cur.fetchone()
+    return row["watermark"] if row else None
+
+
+def _raw_range_sql(raw: List[Tuple[datetime, datetime]]) -> Tuple[str, List[datetime]]:
+    clauses = " OR ".join(["(created_at >= %s AND created_at < %s)"] * len(raw))
+    return f"({clauses})", [t for r in raw for t in r]
+
+
+def query_run_cube(cur, start: datetime, end: Optional[datetime], by_day: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run counts for [start, end) grouped by sex, age_bucket, confidence_level,
+    has_bloodwork (and UTC day when by_day), from rollups + raw remainder.
+    Missing dimension values are ''.
+    """
+    end = end or FAR_FUTURE
+    (r_start, r_end), raw = split_range(start, end, get_watermark(cur))
+    raw_sql, raw_params = _raw_range_sql(raw)
+    day_col = "(ts AT TIME ZONE 'UTC')::date AS day, " if by_day else ""
+    day_group = "day, " if by_day else ""
+    cur.execute(f"""
+        SELECT {day_col}sex, age_bucket, confidence_level, has_bloodwork,
+               SUM(runs) AS runs,
+               SUM(unmatched_intents) AS unmatched_intents,
+               SUM(blocked_skus) AS blocked_skus,
+               SUM(caution_flags) AS caution_flags
+        FROM (
+            SELECT bucket_start AS ts, sex, age_bucket, confidence_level, has_bloodwork,
+                   runs, unmatched_intents, blocked_skus, caution_flags
+            FROM telemetry_hourly_run_rollups
+            WHERE bucket_start >= %s AND bucket_start < %s
+            UNION ALL
+            SELECT created_at, COALESCE(sex, ''), COALESCE(age_bucket, ''),
+                   COALESCE(confidence_level, ''), COALESCE(has_bloodwork, FALSE), 1,
+                   COALESCE(unmatched_intents_count, 0), COALESCE(blocked_skus_count, 0),
+                   COALESCE(caution_flags_count, 0)
+            FROM telemetry_runs
+            WHERE {raw_sql}
+        ) cube
+        GROUP BY {day_group}sex, age_bucket, confidence_level, has_bloodwork
+    """, [r_start, r_end] + raw_params)
+    return cur.fetchall()
+
+
+def query_event_totals(
+    cur,
+    start: datetime,
+    end: Optional[datetime],
+    event_types: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Event totals and last_seen for [start, end) per (event_type, code)."""
+    end = end or FAR_FUTURE
+    (r_start, r_end), raw = split_range(start, end, get_watermark(cur))
+    raw_sql, raw_params = _raw_range_sql(raw)
+    type_sql = ""
+    type_params: List[Any] = []
+    if event_types:
+        type_sql = "AND event_type = ANY(%s)"
+        type_params = [list(event_types)]
+    cur.execute(f"""
+        SELECT event_type, code, SUM(total) AS total, MAX(last_seen) AS last_seen
+        FROM (
+            SELECT event_type, code, total, last_seen
+            FROM telemetry_hourly_event_rollups
+            WHERE bucket_start >= %s AND bucket_start < %s {type_sql}
+            UNION ALL
+            SELECT event_type, code, COALESCE(count, 0), created_at
+            FROM telemetry_events
+            WHERE {raw_sql} {type_sql}
+        ) events
+        GROUP BY event_type, code
+    """, [r_start, r_end] + type_params + raw_params + type_params)
+    return cur.fetchall()
+
+
+# ===== AGGREGATION HELPERS =====
+
+def top_codes(rows: Iterable[Dict[str, Any]], event_types: Iterable[str], limit: int = TOP_N) -> List[Tuple[str, int]]:
+    """Top codes by summed total across the given event types."""
+    event_types = set(event_types)
+    totals: Dict[str, int] = {}
+    for r in rows:
+        if r["event_type"] in event_types:
+            totals[r["code"]] = totals.get(r["code"], 0) + int(r["total"] or 0)
+    return sorted(totals.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+
+
+def summarize_runs(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Collapse run cube rows into summary counts and dimension breakdowns."""
+    summary = {
+        "total_runs": 0,
+        "runs_with_bloodwork": 0,
+        "runs_low_confidence": 0,
+        "total_blocks": 0,
+        "total_unmatched": 0,
+        "total_cautions": 0,
+        "by_sex": {},
+        "by_age_bucket": {},
+        "by_confidence": {},
+    }
+    for r in rows:
+        runs = int(r["runs"] or 0)
+        summary["total_runs"] += runs
+        if r["has_bloodwork"]:
+            summary["runs_with_bloodwork"] += runs
+        if r["confidence_level"] == "low":
+            summary["runs_low_confidence"] += runs
+        summary["total_blocks"] += int(r["blocked_skus"] or 0)
+        summary["total_unmatched"] += int(r["unmatched_intents"] or 0)
+        summary["total_cautions"] += int(r["caution_flags"] or 0)
+        for key, column in (("by_sex", "sex"), ("by_age_bucket", "age_bucket"), ("by_confidence", "confidence_level")):
+            if r[column]:
+                summary[key][r[column]] = summary[key].get(r[column], 0) + runs
+    return summary
+
+
+def daily_trends(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-day trend rows (newest first) from a by_day run cube."""
+    days: Dict[date, Dict[str, int]] = {}
+    for r in rows:
+        d = days.setdefault(r["day"], {"runs": 0, "with_bloodwork": 0, "low_confidence": 0, "unmatched": 0, "blocked": 0})
+        runs = int(r["runs"] or 0)
+        d["runs"] += runs
+        if r["has_bloodwork"]:
+            d["with_bloodwork"] += runs
+        if r["confidence_level"] == "low":
+            d["low_confidence"] += runs
+        d["unmatched"] += int(r["unmatched_intents"] or 0)
+        d["blocked"] += int(r["blocked_skus"] or 0)
+    return [
+        {
+            "day": day.isoformat(),
+            "total_runs": d["runs"],
+            "with_bloodwork": d["with_bloodwork"],
+            "low_confidence": d["low_confidence"],
+            "avg_unmatched": d["unmatched"] / d["runs"] if d["runs"] else 0.0,
+            "avg_blocked": d["blocked"] / d["runs"] if d["runs"] else 0.0,
+        }
+        for day, d in sorted(days.items(), reverse=True)
+    ]
+
+
+# ===== BACKGROUND WORKER =====
+
+_worker: Optional[threading.Thread] = None
+_worker_stop = threading.Event()
+
+
+def _run_worker(interval_s: float):
+    from app.shared.db_pool import get_db
+    while not _worker_stop.wait(interval_s):
+        conn = get_db()
+        if not conn:
+            continue
+        try:
+            run_incremental_rollup(conn)
+        except Exception as e:
+            print(f"[Telemetry] Incremental rollup failed: {e}")
+        finally:
+            conn.close()
+
+
+def start_rollup_worker(interval_s: float = ROLLUP_INTERVAL_S):
+    """Run incremental rollups every interval_s seconds (0 disables)."""
+    global _worker
+    if interval_s <= 0 or not os.getenv("DATABASE_URL"):
+        return
+    if _worker is not None and _worker.is_alive():
+        return
+    _worker_stop.clear()
+    _worker = threading.Thread(target=_run_worker, args=(interval_s,), name="telemetry-rollup", daemon=True)
+    _worker.start()
+
+
+def stop_rollup_worker(timeout_s: float = 5.0):
+    """Stop the rollup worker (an in-flight pass finishes first)."""
+    global _worker
+    _worker_stop.set()
+    if _worker is not None:
+        _worker.join(timeout_s)
+        _worker = None
@@ -3,21 +3,27 @@ GenoMAX² Webhook Processor
 Processes lab results and triggers Brain orchestration
 
 Flow:
-1. Receive webhook with lab results
-2. Normalize biomarker codes and units
-3. Create bloodwork_input payload
-4. Call orchestrate/v2 endpoint
-5. Store results and notify user
+1. Receive webhook with lab results (receiver enqueues, returns 202)
+2. Queue worker claims the event (app.webhooks.queue)
+3. Normalize biomarker codes and units
+4. Create bloodwork_input payload
+5. Call the orchestrate/v2 service in process (bounded concurrency)
+6. Worker stores the result on the webhook_events row
 """
 
 import os
 import json
+import asyncio
 import hashlib
-import httpx
+import logging
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any, List
+from fastapi import HTTPException
+from pydantic import ValidationError
 from .models import (
     WebhookEvent,
+    WebhookEventType,
     JunctionWebhookPayload,
     LabTestingAPIWebhookPayload,
     LabResult,
@@ -26,9 +32,33 @@ from .models import (
     convert_unit
 )
 
+logger = logging.getLogger(__name__)
+
 # Configuration
-API_BASE_URL = os.getenv("API_BASE_URL", "https://web-production-7110.up.railway.app")
 DATABASE_URL = os.getenv("DATABASE_URL", "")
+ORCHESTRATION_CONCURRENCY = int(os.getenv("ORCHESTRATION_CONCURRENCY", "4"))
+ORCHESTRATION_ACQUIRE_TIMEOUT_S = float(os.getenv("ORCHESTRATION_ACQUIRE_TIMEOUT_S", "30"))
+
+# Bounds webhook-triggered Brain runs across all queue worker threads
+_orchestration_slots = threading.BoundedSemaphore(ORCHESTRATION_CONCURRENCY)
+
+
+def _run_orchestrate_v2(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the orchestrate/v2 service in process, holding an orchestration slot.
+    
+    Raises TimeoutError if no slot frees up in time, ValidationError when
+    the request does not fit OrchestrateInputV2, and HTTPException when
+    orchestrate/v2 rejects the request.
+    """
+    from api_server import OrchestrateInputV2, orchestrate_v2
+    
+    if not _orchestration_slots.acquire(timeout=ORCHESTRATION_ACQUIRE_TIMEOUT_S):
+        raise TimeoutError(f"No orchestration slot free after {ORCHESTRATION_ACQUIRE_TIMEOUT_S}s")
+    try:
+        return orchestrate_v2(OrchestrateInputV2(**request)).model_dump()
+    finally:
+        _orchestration_slots.release()
 
 
 class WebhookProcessor:
@@ -37,9 +67,6 @@ class WebhookProcessor:
     Implements "Blood does not negotiate" principle.
     """
     
-    def __init__(self):
-        self.api_base_url = API_BASE_URL
-    
     async def process_junction_results(
         self, 
         event: WebhookEvent, 
@@ -206,47 +233,36 @@ class WebhookProcessor:
     ) -> Dict[str, Any]:
         """
         Trigger Brain orchestration with bloodwork input.
-        Uses internal API call to orchestrate/v2.
+        Calls orchestrate/v2 in process; HTTP is only for external clients.
         """
+        request = {
+            "bloodwork_input": bloodwork_input,
+            "selected_goals": ["optimize"],  # Default goal
+            "assessment_context": {
+                "gender": bloodwork_input.get("sex", "male"),
+                "age": bloodwork_input.get("age", 35)
+            }
+        }
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.api_base_url}/api/v1/brain/orchestrate/v2",
-                    json={
-                        "bloodwork_input": bloodwork_input,
-                        "selected_goals": ["optimize"],  # Default goal
-                        "assessment_context": {
-                            "gender": bloodwork_input.get("sex", "male"),
-                            "age": bloodwork_input.get("age", 35)
-                        },
-                        "metadata": {
-                            "source": source,
-                            "order_id": order_id,
-                            "user_id": user_id,
-                            "webhook_triggered": True
-                        }
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "status": "orchestration_triggered",
-                        "run_id": data.get("run_id"),
-                        "order_id": order_id,
-                        "source": source,
-                        "markers_processed": len(bloodwork_input.get("markers", [])),
-                        "routing_constraints": data.get("routing_constraints", {})
-                    }
-                else:
-                    return {
-                        "status": "orchestration_failed",
-                        "order_id": order_id,
-                        "source": source,
-                        "error": response.text,
-                        "status_code": response.status_code
-                    }
-                    
+            data = await asyncio.to_thread(_run_orchestrate_v2, request)
+        except HTTPException as e:
+            return {
+                "status": "orchestration_failed",
+                "order_id": order_id,
+                "source": source,
+                "error": json.dumps(e.detail, default=str),
+                "status_code": e.status_code
+            }
+        except ValidationError as e:
+            # Malformed bloodwork_input: a 422 like the HTTP route would return
+            return {
+                "status": "orchestration_failed",
+                "order_id": order_id,
+                "source": source,
+                "error": json.dumps(e.errors(include_url=False), default=str),
+                "status_code": 422
+            }
         except Exception as e:
             return {
                 "status": "orchestration_error",
@@ -254,6 +270,16 @@ class WebhookProcessor:
                 "source": source,
                 "error": str(e)
             }
+        
+        logger.info(f"[WebhookProcessor] Orchestrated {source} order {order_id} for user {user_id}: run {data.get('run_id')}")
+        return {
+            "status": "orchestration_triggered",
+            "run_id": data.get("run_id"),
+            "order_id": order_id,
+            "source": source,
+            "markers_processed": len(bloodwork_input.get("markers", [])),
+            "routing_constraints": data.get("routing_constraints", {})
+        }
     
     async def _store_webhook_event(
         self,
@@ -261,10 +287,11 @@ class WebhookProcessor:
         result: Dict[str, Any]
     ) -> None:
         """
-        Store webhook event in database for audit trail.
-        Uses append-only pattern per governance requirements.
+        Log the processing outcome.
+        
+        The event row itself is written by the receiver (enqueue) and the
+        result is stored on it by the queue worker when the handler returns.
         """
-        # For now, log to stdout. In production, this would insert to webhook_events table.
         log_entry = {
             "event_id": event.event_id,
             "event_type": event.event_type.value,
@@ -275,49 +302,79 @@ class WebhookProcessor:
             "run_id": result.get("run_id"),
             "processed_at": datetime.utcnow().isoformat()
         }
-        print(f"[WebhookProcessor] Event stored: {json.dumps(log_entry)}")
+        logger.info(f"[WebhookProcessor] Event processed: {json.dumps(log_entry)}")
 
 
-# === Database Schema for Webhook Events ===
-"""
-CREATE TABLE IF NOT EXISTS webhook_events (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    event_id VARCHAR(255) NOT NULL UNIQUE,
-    event_type VARCHAR(100) NOT NULL,
-    source VARCHAR(50) NOT NULL,
-    payload JSONB NOT NULL,
-    signature VARCHAR(255),
-    verified BOOLEAN DEFAULT FALSE,
-    processed_at TIMESTAMPTZ,
-    result_status VARCHAR(50),
-    result_run_id UUID,
-    result_data JSONB,
-    created_at TIMESTAMPTZ DEFAULT NOW(),
-    
-    -- Indexes
-    INDEX idx_webhook_events_source (source),
-    INDEX idx_webhook_events_type (event_type),
-    INDEX idx_webhook_events_created (created_at)
-);
+# === Queue handlers (app.webhooks.queue workers) ===
 
--- Audit trigger for append-only pattern
-CREATE OR REPLACE FUNCTION webhook_events_audit()
-RETURNS TRIGGER AS $$
-BEGIN
-    IF TG_OP = 'DELETE' THEN
-        RAISE EXCEPTION 'DELETE not allowed on webhook_events (append-only)';
-    END IF;
-    IF TG_OP = 'UPDATE' THEN
-        -- Only allow updating result fields
-        IF OLD.event_id != NEW.event_id OR OLD.payload != NEW.payload THEN
-            RAISE EXCEPTION 'Cannot modify immutable fields on webhook_events';
-        END IF;
-    END IF;
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
+QUEUE_HANDLER_JUNCTION = "orchestrate_junction"
+QUEUE_HANDLER_LAB_TESTING_API = "orchestrate_lab_testing_api"
 
-CREATE TRIGGER webhook_events_audit_trigger
-BEFORE UPDATE OR DELETE ON webhook_events
-FOR EACH ROW EXECUTE FUNCTION webhook_events_audit();
-"""
+ORCHESTRATION_FAILED_STATUSES = ("orchestration_failed", "orchestration_error")
+
+# 4xx rejections that may still succeed later
+RETRYABLE_CLIENT_ERRORS = (408, 429)
+
+
+def _queued_webhook_event(row: Dict[str, Any], source: str) -> WebhookEvent:
+    try:
+        event_type = WebhookEventType(row["event_type"])
+    except ValueError:
+        event_type = WebhookEventType.UNKNOWN
+    return WebhookEvent(
+        event_id=str(row["event_id"]),
+        event_type=event_type,
+        timestamp=row.get("received_at") or datetime.utcnow(),
+        source=source,
+        payload=row["raw_payload"],
+        verified=bool(row.get("signature_valid"))
+    )
+
+
+def _orchestration_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Raise on orchestration failure so the queue retries.
+
+    A 4xx rejection from orchestrate/v2 (e.g. invalid bloodwork input) can
+    never succeed and is dead-lettered; 5xx and unexpected errors are retried.
+    """
+    from .queue import PermanentWebhookError
+    if result.get("status") in ORCHESTRATION_FAILED_STATUSES:
+        message = f"{result['status']}: {result.get('error')}"
+        status_code = result.get("status_code")
+        if status_code and 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_ERRORS:
+            raise PermanentWebhookError(f"{message} (HTTP {status_code})")
+        raise RuntimeError(message)
+    return result
+
+
+def handle_queued_junction_event(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point for a queued Junction results delivery."""
+    from .queue import PermanentWebhookError
+    try:
+        payload = JunctionWebhookPayload(**row["raw_payload"])
+    except ValidationError as e:
+        raise PermanentWebhookError(f"Invalid Junction payload: {e}")
+    event = _queued_webhook_event(row, "junction")
+    return _orchestration_result(
+        asyncio.run(WebhookProcessor().process_junction_results(event, payload))
+    )
+
+
+def handle_queued_lab_testing_api_event(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point for a queued Lab Testing API results delivery."""
+    from .queue import PermanentWebhookError
+    try:
+        payload = LabTestingAPIWebhookPayload(**row["raw_payload"])
+    except ValidationError as e:
+        raise PermanentWebhookError(f"Invalid Lab Testing API payload: {e}")
+    event = _queued_webhook_event(row, "lab_testing_api")
+    return _orchestration_result(
+        asyncio.run(WebhookProcessor().process_lab_testing_api_results(event, payload))
+    )
+
+
+# === Database Schema for Webhook Events ===
+# webhook_events is defined in migrations/014_users_orders_webhooks.sql;
+# the queue columns (provider_event_id, queue_handler, next_attempt_at,
+# locked_at, locked_by, result_data) are added by 017_webhook_event_queue.sql.
@@ -0,0 +1,475 @@
+"""
+GenoMAX² Webhook Event Queue
+Durable ingestion queue on the webhook_events table (migration 017).
+
+Receivers only verify the signature, enqueue() and return 202. Provider
+retries of the same delivery are dropped on (queue_handler, provider_event_id).
+
+A worker pool claims ready rows with FOR UPDATE SKIP LOCKED, runs the handler
+registered for the row's queue_handler and then:
+- marks the row processed (result stored in result_data), or
+- schedules a retry with exponential backoff (status failed, next_attempt_at), or
+- dead-letters it after WEBHOOK_MAX_ATTEMPTS or on PermanentWebhookError.
+
+Rows left in processing by a crashed worker are reclaimed after
+WEBHOOK_VISIBILITY_TIMEOUT_S; each reclaim counts as a failed attempt, so an
+event that keeps killing its worker is dead-lettered too.
+"""
+
+import os
+import json
+import random
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import psycopg2
+
+from app.shared.db_pool import get_pool, PoolError
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "2"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "5"))
+WEBHOOK_BACKOFF_BASE_S = float(os.getenv("WEBHOOK_BACKOFF_BASE_S", "5"))
+WEBHOOK_BACKOFF_MAX_S = float(os.getenv("WEBHOOK_BACKOFF_MAX_S", "900"))
+WEBHOOK_POLL_INTERVAL_S = float(os.getenv("WEBHOOK_POLL_INTERVAL_S", "1.0"))
+WEBHOOK_VISIBILITY_TIMEOUT_S = float(os.getenv("WEBHOOK_VISIBILITY_TIMEOUT_S", "300"))
+
+STATUS_RECEIVED = "received"
+STATUS_PROCESSING = "processing"
+STATUS_PROCESSED = "processed"
+STATUS_FAILED = "failed"
+STATUS_IGNORED = "ignored"
+STATUS_DEAD_LETTER = "dead_letter"
+
+# Delivery id headers, most specific first (Junction delivers via Svix)
+PROVIDER_EVENT_ID_HEADERS = ("webhook-id", "svix-id", "x-event-id", "x-webhook-id")
+
+EventHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class WebhookQueueError(Exception):
+    """Raised when an event cannot be enqueued. Receivers answer 503 so the provider retries."""
+    pass
+
+
+class PermanentWebhookError(Exception):
+    """Raised by a handler for events that can never succeed (dead-lettered without retry)."""
+    pass
+
+
+@dataclass
+class EnqueueResult:
+    """Outcome of enqueue()."""
+    event_id: str
+    duplicate: bool
+    status: str
+
+
+# ============================================================
+# HANDLER REGISTRY
+# ============================================================
+
+_handlers: Dict[str, EventHandler] = {}
+
+
+def register_handler(name: str, handler: EventHandler) -> None:
+    """
+    Register the worker function for a queue_handler name.
+
+    The handler receives the claimed row (event_id, provider, event_type,
+    raw_payload, parsed_order_id, parsed_user_id, retry_count, ...) and returns
+    a JSON-serializable result. Raising retries the event.
+    """
+    _handlers[name] = handler
+
+
+def registered_handlers() -> List[str]:
+    return sorted(_handlers)
+
+
+def provider_event_id_for(
+    headers: Mapping[str, str],
+    payload: Dict[str, Any],
+    raw_body: bytes,
+) -> str:
+    """
+    Dedupe key for a delivery: the provider's delivery id header, an explicit
+    event id in the payload, or a hash of the raw body (provider retries resend
+    identical bytes).
+    """
+    lowered = {k.lower(): v for k, v in headers.items()}
+    for header in PROVIDER_EVENT_ID_HEADERS:
+        if lowered.get(header):
+            return str(lowered[header])
+    for key in ("event_id", "webhook_id"):
+        if payload.get(key):
+            return str(payload[key])
+    return "sha256:" + hashlib.sha256(raw_body).hexdigest()
+
+
+def backoff_seconds(attempts: int, jitter: bool = True) -> float:
+    """Delay before retry number `attempts` (1-based), capped, with +/-20% jitter."""
+    delay = min(WEBHOOK_BACKOFF_MAX_S, WEBHOOK_BACKOFF_BASE_S * (2 ** max(0, attempts - 1)))
+    if jitter:
+        delay *= random.uniform(0.8, 1.2)
+    return delay
+
+
+# ============================================================
+# STORAGE
+# ============================================================
+
+def enqueue(
+    queue_handler: str,
+    provider: str,
+    event_type: str,
+    payload: Dict[str, Any],
+    provider_event_id: str,
+    parsed_order_id: Optional[str] = None,
+    parsed_user_id: Optional[str] = None,
+    signature_header: Optional[str] = None,
+    signature_valid: Optional[bool] = None,
+    ip_address: Optional[str] = None,
+    process: bool = True,
+) -> EnqueueResult:
+    """
+    Persist a verified delivery.
+
+    Args:
+        process: False records the event as ignored (audit only, no worker run)
+
+    Raises:
+        WebhookQueueError: If the event could not be stored
+    """
+    status = STATUS_RECEIVED if process else STATUS_IGNORED
+    conn = None
+    try:
+        conn = get_pool().acquire()
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO webhook_events (
+                provider, event_type, raw_payload, parsed_order_id, parsed_user_id,
+                signature_header, signature_valid, ip_address, status,
+                provider_event_id, queue_handler
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (queue_handler, provider_event_id)
+                WHERE provider_event_id IS NOT NULL
+                DO NOTHING
+            RETURNING event_id
+        """, (
+            provider, event_type, json.dumps(payload), parsed_order_id, parsed_user_id,
+            signature_header, signature_valid, ip_address, status,
+            provider_event_id, queue_handler,
+        ))
+        row = cur.fetchone()
+        duplicate = row is None
+        if duplicate:
+            cur.execute("""
+                SELECT event_id, status FROM webhook_events
+                WHERE queue_handler = %s AND provider_event_id = %s
+            """, (queue_handler, provider_event_id))
+            row = cur.fetchone()
+            status = row["status"]
+        conn.commit()
+        cur.close()
+    except (psycopg2.Error, PoolError) as e:
+        raise WebhookQueueError(f"WEBHOOK_QUEUE_UNAVAILABLE: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if not duplicate and process:
+        _wakeup.set()
+    return EnqueueResult(event_id=str(row["event_id"]), duplicate=duplicate, status=status)
+
+
+def claim(worker_id: str, handlers: List[str], limit: int = 1) -> List[Dict[str, Any]]:
+    """
+    Lock up to `limit` ready events for this worker, oldest first.
+
+    A stale processing row (its worker died or hung) counts as a failed
+    attempt: it is reclaimed with retry_count + 1, or dead-lettered once that
+    reaches WEBHOOK_MAX_ATTEMPTS.
+    """
+    conn = get_pool().acquire()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE webhook_events
+            SET status = 'dead_letter', retry_count = retry_count + 1,
+                error_message = 'Worker lost: not completed within visibility timeout',
+                next_attempt_at = NULL, processed_at = NOW(),
+                locked_at = NULL, locked_by = NULL
+            WHERE queue_handler = ANY(%s)
+            AND status = 'processing'
+            AND locked_at < NOW() - make_interval(secs => %s)
+            AND retry_count + 1 >= %s
+            RETURNING event_id, locked_by
+        """, (handlers, WEBHOOK_VISIBILITY_TIMEOUT_S, WEBHOOK_MAX_ATTEMPTS))
+        for row in cur.fetchall():
+            logger.error(
+                f"Webhook event {row['event_id']} dead-lettered: worker {row['locked_by']} "
+                f"did not complete it within {WEBHOOK_VISIBILITY_TIMEOUT_S}s"
+            )
+
+        cur.execute("""
+            UPDATE webhook_events
+            SET status = 'processing', locked_at = NOW(), locked_by = %s,
+                retry_count = retry_count + CASE WHEN status = 'processing' THEN 1 ELSE 0 END
+            WHERE id IN (
+                SELECT id FROM webhook_events
+                WHERE queue_handler = ANY(%s)
+                AND (
+                    (status IN ('received', 'failed')
+                     AND (next_attempt_at IS NULL OR next_attempt_at <= NOW()))
+                    OR (status = 'processing'
+                        AND locked_at < NOW() - make_interval(secs => %s))
+                )
+                ORDER BY received_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, event_id, provider, event_type, raw_payload,
+                      parsed_order_id, parsed_user_id, signature_valid,
+                      retry_count, queue_handler, received_at
+        """, (worker_id, handlers, WEBHOOK_VISIBILITY_TIMEOUT_S, limit))
+        rows = cur.fetchall()
+        conn.commit()
+        cur.close()
+        return rows
+    finally:
+        conn.close()
+
+
+def complete(event: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Mark a claimed event processed."""
+    conn = get_pool().acquire()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE webhook_events
+            SET status = 'processed', processed_at = NOW(), result_data = %s,
+                error_message = NULL, locked_at = NULL, locked_by = NULL
+            WHERE id = %s
+        """, (json.dumps(result, default=str), event["id"]))
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+
+def fail(event: Dict[str, Any], error: str, permanent: bool = False) -> str:
+    """
+    Record a failed attempt: schedule a retry or dead-letter.
+
+    Returns:
+        The new status (failed or dead_letter)
+    """
+    attempts = (event.get("retry_count") or 0) + 1
+    dead = permanent or attempts >= WEBHOOK_MAX_ATTEMPTS
+    status = STATUS_DEAD_LETTER if dead else STATUS_FAILED
+    delay = None if dead else backoff_seconds(attempts)
+
+    conn = get_pool().acquire()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE webhook_events
+            SET status = %s, retry_count = %s, error_message = %s,
+                next_attempt_at = CASE WHEN %s IS NULL THEN NULL
+                                       ELSE NOW() + make_interval(secs => %s) END,
+                processed_at = CASE WHEN %s = 'dead_letter' THEN NOW() ELSE NULL END,
+                locked_at = NULL, locked_by = NULL
+            WHERE id = %s
+        """, (status, attempts, error[:2000], delay, delay, status, event["id"]))
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+    return status
+
+
+def requeue_dead_letters(queue_handler: Optional[str] = None) -> int:
+    """Move dead-lettered events back to the queue with a fresh attempt budget."""
+    conn = get_pool().acquire()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE webhook_events
+            SET status = 'received', retry_count = 0, next_attempt_at = NULL,
+                processed_at = NULL
+            WHERE status = 'dead_letter'
+            AND (%s IS NULL OR queue_handler = %s)
+        """, (queue_handler, queue_handler))
+        count = cur.rowcount
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+    if count:
+        _wakeup.set()
+    return count
+
+
+def get_queue_metrics() -> Dict[str, Any]:
+    """
+    Queue depth and lag.
+
+    depth: events waiting to run (received + failed awaiting retry)
+    lag_seconds: age of the oldest waiting event
+    """
+    conn = get_pool().acquire()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT status,
+                   COUNT(*) AS n,
+                   MIN(received_at) AS oldest,
+                   COUNT(*) FILTER (WHERE next_attempt_at IS NULL OR next_attempt_at <= NOW()) AS ready
+            FROM webhook_events
+            WHERE queue_handler IS NOT NULL
+            AND status IN ('received', 'failed', 'processing', 'dead_letter')
+            GROUP BY status
+        """)
+        rows = {r["status"]: r for r in cur.fetchall()}
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+    waiting = [rows[s] for s in (STATUS_RECEIVED, STATUS_FAILED) if s in rows]
+    oldest = min((r["oldest"] for r in waiting if r["oldest"]), default=None)
+    now = datetime.now(timezone.utc)
+    return {
+        "depth": sum(int(r["n"]) for r in waiting),
+        "ready": sum(int(r["ready"]) for r in waiting),
+        "retrying": int(rows[STATUS_FAILED]["n"]) if STATUS_FAILED in rows else 0,
+        "processing": int(rows[STATUS_PROCESSING]["n"]) if STATUS_PROCESSING in rows else 0,
+        "dead_letter": int(rows[STATUS_DEAD_LETTER]["n"]) if STATUS_DEAD_LETTER in rows else 0,
+        "oldest_waiting_at": oldest.isoformat() if oldest else None,
+        "lag_seconds": round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+        "workers": get_worker_pool().stats(),
+    }
+
+
+# ============================================================
+# WORKER POOL
+# ============================================================
+
+# Set on enqueue so idle workers in this process wake immediately
+_wakeup = threading.Event()
+
+
+class WebhookWorkerPool:
+    """Threads that drain the queue; each processes one event at a time."""
+
+    def __init__(self):
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {
+            "processed_total": 0,
+            "retried_total": 0,
+            "dead_lettered_total": 0,
+            "claim_errors_total": 0,
+        }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def process(self, event: Dict[str, Any]) -> str:
+        """Run the handler for one claimed event and record the outcome."""
+        handler = _handlers.get(event["queue_handler"])
+        try:
+            if handler is None:
+                raise PermanentWebhookError(f"No handler registered for {event['queue_handler']}")
+            result = handler(event)
+        except PermanentWebhookError as e:
+            logger.error(f"Webhook event {event['event_id']} dead-lettered: {e}")
+            fail(event, str(e), permanent=True)
+            self._count("dead_lettered_total")
+            return STATUS_DEAD_LETTER
+        except Exception as e:
+            status = fail(event, f"{type(e).__name__}: {e}")
+            self._count("dead_lettered_total" if status == STATUS_DEAD_LETTER else "retried_total")
+            logger.warning(f"Webhook event {event['event_id']} failed ({status}): {e}")
+            return status
+        complete(event, result or {})
+        self._count("processed_total")
+        return STATUS_PROCESSED
+
+    def run_once(self, worker_id: str) -> bool:
+        """Claim and process one event. Returns False if none was ready."""
+        handlers = registered_handlers()
+        if not handlers:
+            return False
+        events = claim(worker_id, handlers, limit=1)
+        for event in events:
+            self.process(event)
+        return bool(events)
+
+    def _run(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                busy = self.run_once(worker_id)
+            except Exception as e:
+                self._count("claim_errors_total")
+                logger.warning(f"Webhook worker {worker_id} claim failed: {e}")
+                busy = False
+            if not busy:
+                _wakeup.wait(WEBHOOK_POLL_INTERVAL_S)
+                _wakeup.clear()
+
+    def start(self, workers: int = WEBHOOK_WORKERS):
+        """Start `workers` threads (0 disables; requires DATABASE_URL)."""
+        if workers <= 0 or not os.getenv("DATABASE_URL"):
+            return
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop.clear()
+        host = os.getenv("HOSTNAME", "local")
+        self._threads = [
+            threading.Thread(
+                target=self._run, args=(f"{host}:{os.getpid()}:{i}",),
+                name=f"webhook-worker-{i}", daemon=True
+            )
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout_s: float = 10.0):
+        """Stop workers after their current event."""
+        self._stop.set()
+        _wakeup.set()
+        for t in self._threads:
+            t.join(timeout_s)
+        self._threads = []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["running"] = sum(1 for t in self._threads if t.is_alive())
+        stats["handlers"] = registered_handlers()
+        return stats
+
+
+_worker_pool = WebhookWorkerPool()
+
+
+def get_worker_pool() -> WebhookWorkerPool:
+    return _worker_pool
+
+
+def start_webhook_workers():
+    get_worker_pool().start()
+
+
+def stop_webhook_workers():
+    get_worker_pool().stop()
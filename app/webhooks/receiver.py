@@ -6,6 +6,9 @@ Security:
 - HMAC signature verification for Junction
 - API key verification for Lab Testing API
 - Rate limiting per source
+
+Receivers verify, enqueue to webhook_events and answer 202; the
+app.webhooks.queue worker pool runs the orchestration.
 """
 
 import hashlib
@@ -14,22 +17,36 @@ import json
 import os
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Request, HTTPException, Header, BackgroundTasks
+from fastapi import APIRouter, Request, HTTPException, Header
 from pydantic import BaseModel
 
 from .models import (
     JunctionWebhookPayload,
     LabTestingAPIWebhookPayload,
-    WebhookEvent,
     WebhookEventType,
     LabResult,
     Biomarker,
     normalize_biomarker_code
 )
-from .processor import WebhookProcessor
+from .processor import (
+    QUEUE_HANDLER_JUNCTION,
+    QUEUE_HANDLER_LAB_TESTING_API,
+    handle_queued_junction_event,
+    handle_queued_lab_testing_api_event,
+)
+from .queue import (
+    enqueue,
+    get_queue_metrics,
+    provider_event_id_for,
+    register_handler,
+    WebhookQueueError,
+)
 
 router = APIRouter(prefix="/api/v1/webhooks", tags=["Webhooks"])
 
+register_handler(QUEUE_HANDLER_JUNCTION, handle_queued_junction_event)
+register_handler(QUEUE_HANDLER_LAB_TESTING_API, handle_queued_lab_testing_api_event)
+
 # Environment variables
 JUNCTION_WEBHOOK_SECRET = os.getenv("JUNCTION_WEBHOOK_SECRET", "")
 LAB_TESTING_API_KEY = os.getenv("LAB_TESTING_API_KEY", "")
@@ -74,10 +91,9 @@ async def webhook_health():
     }
 
 
-@router.post("/junction", response_model=WebhookResponse)
+@router.post("/junction", response_model=WebhookResponse, status_code=202)
 async def receive_junction_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
     x_vital_signature: Optional[str] = Header(None, alias="X-Vital-Signature"),
     x_vital_timestamp: Optional[str] = Header(None, alias="X-Vital-Timestamp")
 ):
@@ -121,36 +137,36 @@ async def receive_junction_webhook(
     elif payload.event_type == "labtest.order.updated":
         event_type = WebhookEventType.LABTEST_ORDER_UPDATED
     
-    event = WebhookEvent(
-        event_id=f"junction_{payload.data.get('order_id', 'unknown')}_{datetime.utcnow().timestamp()}",
-        event_type=event_type,
-        source="junction",
-        payload=data,
-        signature=x_vital_signature,
-        verified=bool(JUNCTION_WEBHOOK_SECRET and x_vital_signature)
-    )
-    
-    # Process results in background if ready
-    if event_type in [WebhookEventType.LABTEST_RESULTS_READY, WebhookEventType.LABTEST_RESULTS_CRITICAL]:
-        processor = WebhookProcessor()
-        background_tasks.add_task(
-            processor.process_junction_results,
-            event,
-            payload
+    # Enqueue; results are orchestrated by the queue worker pool
+    process = event_type in [WebhookEventType.LABTEST_RESULTS_READY, WebhookEventType.LABTEST_RESULTS_CRITICAL]
+    try:
+        queued = enqueue(
+            queue_handler=QUEUE_HANDLER_JUNCTION,
+            provider="junction",
+            event_type=payload.event_type,
+            payload=data,
+            provider_event_id=provider_event_id_for(request.headers, data, body),
+            parsed_order_id=payload.data.get("order_id"),
+            parsed_user_id=payload.data.get("client_user_id") or payload.data.get("user_id"),
+            signature_header=x_vital_signature,
+            signature_valid=bool(JUNCTION_WEBHOOK_SECRET and x_vital_signature),
+            ip_address=request.client.host if request.client else None,
+            process=process
         )
+    except WebhookQueueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     
     return WebhookResponse(
-        status="received",
-        event_id=event.event_id,
+        status="duplicate" if queued.duplicate else "received",
+        event_id=queued.event_id,
         message=f"Webhook {payload.event_type} received and queued",
-        processed=event_type in [WebhookEventType.LABTEST_RESULTS_READY, WebhookEventType.LABTEST_RESULTS_CRITICAL]
+        processed=process
     )
 
 
-@router.post("/lab-testing-api", response_model=WebhookResponse)
+@router.post("/lab-testing-api", response_model=WebhookResponse, status_code=202)
 async def receive_lab_testing_api_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
     x_api_key: Optional[str] = Header(None, alias="X-API-Key")
 ):
     """
@@ -182,31 +198,41 @@ async def receive_lab_testing_api_webhook(
     elif payload.event == "order.completed":
         event_type = WebhookEventType.LTA_ORDER_COMPLETED
     
-    event = WebhookEvent(
-        event_id=f"lta_{payload.order_id}_{datetime.utcnow().timestamp()}",
-        event_type=event_type,
-        source="lab_testing_api",
-        payload=data,
-        verified=bool(LAB_TESTING_API_KEY and x_api_key)
-    )
-    
-    # Process results in background
-    if event_type == WebhookEventType.LTA_RESULTS_AVAILABLE:
-        processor = WebhookProcessor()
-        background_tasks.add_task(
-            processor.process_lab_testing_api_results,
-            event,
-            payload
+    # Enqueue; results are orchestrated by the queue worker pool
+    process = event_type == WebhookEventType.LTA_RESULTS_AVAILABLE
+    try:
+        queued = enqueue(
+            queue_handler=QUEUE_HANDLER_LAB_TESTING_API,
+            provider="lab_testing_api",
+            event_type=payload.event,
+            payload=data,
+            provider_event_id=provider_event_id_for(request.headers, data, body),
+            parsed_order_id=payload.order_id,
+            parsed_user_id=payload.patient_id,
+            signature_valid=bool(LAB_TESTING_API_KEY and x_api_key),
+            ip_address=request.client.host if request.client else None,
+            process=process
         )
+    except WebhookQueueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     
     return WebhookResponse(
-        status="received",
-        event_id=event.event_id,
+        status="duplicate" if queued.duplicate else "received",
+        event_id=queued.event_id,
         message=f"Webhook {payload.event} received and queued",
-        processed=event_type == WebhookEventType.LTA_RESULTS_AVAILABLE
+        processed=process
     )
 
 
+@router.get("/queue/metrics")
+def webhook_queue_metrics():
+    """Queue depth, lag, dead letters and worker counters."""
+    try:
+        return get_queue_metrics()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Queue metrics unavailable: {e}")
+
+
 @router.post("/test")
 async def test_webhook_endpoint(request: Request):
     """
@@ -20,6 +20,7 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from dataclasses import asdict
 from fastapi import UploadFile, File, Body, Query
+from fastapi.responses import StreamingResponse
 from starlette.requests import Request
 
 # ============================================================
@@ -109,6 +110,18 @@ class ProcessMarkersResponse(BaseModel):
     output_hash: str
 
 
+class BatchPanelInput(ProcessMarkersRequest):
+    """One panel within a batch request."""
+    panel_id: Optional[str] = Field(default=None, description="Caller reference echoed on the result line")
+
+
+class ProcessMarkersBatchRequest(BaseModel):
+    """Request to process many panels in one call."""
+    panels: List[BatchPanelInput] = Field(..., description="Panels to process (results stream back in this order)")
+    workers: Optional[int] = Field(default=None, ge=1, description="Worker processes (capped by BLOODWORK_BATCH_WORKERS)")
+    chunk_size: Optional[int] = Field(default=None, ge=1, description="Panels per worker task")
+
+
 # Lab API Models
 class CreateVitalUserRequest(BaseModel):
     """Request to create a Junction/Vital user."""
@@ -127,6 +140,87 @@ class CreateLabOrderRequest(BaseModel):
     patient_address: Optional[Dict[str, Any]] = Field(default=None, description="Address: street, city, state, zip_code, country")
 
 
+# ============================================================
+# RESULT SERIALIZATION
+# ============================================================
+
+def serialize_result(result) -> Dict[str, Any]:
+    """Convert a BloodworkResult into the /process response payload."""
+    # Convert computed markers
+    computed_markers_response = []
+    if hasattr(result, 'computed_markers') and result.computed_markers:
+        for cm in result.computed_markers:
+            computed_markers_response.append({
+                "code": cm.code,
+                "name": cm.name,
+                "value": cm.value,
+                "formula": cm.formula,
+                "unit": cm.unit,
+                "source_markers": cm.source_markers
+            })
+    
+    # Convert safety gates
+    safety_gates_response = []
+    for g in result.safety_gates:
+        safety_gates_response.append({
+            "gate_id": g.gate_id,
+            "name": g.name,
+            "tier": g.tier.value if hasattr(g.tier, 'value') else str(g.tier),
+            "description": g.description,
+            "trigger_marker": g.trigger_marker,
+            "trigger_value": g.trigger_value,
+            "threshold": g.threshold,
+            "action": g.action.value if hasattr(g.action, 'value') else str(g.action),
+            "routing_constraint": g.routing_constraint,
+            "blocked_ingredients": getattr(g, 'blocked_ingredients', []),
+            "caution_ingredients": getattr(g, 'caution_ingredients', []),
+            "recommended_ingredients": getattr(g, 'recommended_ingredients', []),
+            "exception_active": g.exception_active,
+            "exception_reason": g.exception_reason
+        })
+    
+    # Convert markers
+    markers_response = []
+    for m in result.markers:
+        markers_response.append({
+            "original_code": m.original_code,
+            "canonical_code": m.canonical_code,
+            "original_value": m.original_value,
+            "canonical_value": m.canonical_value,
+            "original_unit": m.original_unit,
+            "canonical_unit": m.canonical_unit,
+            "status": m.status.value if hasattr(m.status, 'value') else m.status,
+            "range_status": m.range_status.value if hasattr(m.range_status, 'value') else m.range_status,
+            "reference_range": m.reference_range,
+            "genomax_optimal": getattr(m, 'genomax_optimal', None),
+            "decision_limits": getattr(m, 'decision_limits', None),
+            "lab_profile_used": m.lab_profile_used,
+            "fallback_used": m.fallback_used,
+            "conversion_applied": m.conversion_applied,
+            "conversion_multiplier": m.conversion_multiplier,
+            "flags": m.flags,
+            "log_entries": m.log_entries,
+            "is_genetic": getattr(m, 'is_genetic', False),
+            "genetic_interpretation": getattr(m, 'genetic_interpretation', None)
+        })
+    
+    return {
+        "processed_at": result.processed_at,
+        "engine_version": result.engine_version,
+        "lab_profile": result.lab_profile,
+        "markers": markers_response,
+        "computed_markers": computed_markers_response,
+        "routing_constraints": result.routing_constraints,
+        "safety_gates": safety_gates_response,
+        "require_review": result.require_review,
+        "summary": result.summary,
+        "gate_summary": result.gate_summary,
+        "ruleset_version": result.ruleset_version,
+        "input_hash": result.input_hash,
+        "output_hash": result.output_hash
+    }
+
+
 # ============================================================
 # ENDPOINT REGISTRATION
 # ============================================================
@@ -362,79 +456,44 @@ def register_bloodwork_endpoints(app):
             age=request.age
         )
         
-        # Convert computed markers
-        computed_markers_response = []
-        if hasattr(result, 'computed_markers') and result.computed_markers:
-            for cm in result.computed_markers:
-                computed_markers_response.append({
-                    "code": cm.code,
-                    "name": cm.name,
-                    "value": cm.value,
-                    "formula": cm.formula,
-                    "unit": cm.unit,
-                    "source_markers": cm.source_markers
-                })
+        return serialize_result(result)
+    
+    # ---------------------------------------------------------
+    # POST /api/v1/bloodwork/process/batch
+    # ---------------------------------------------------------
+    @app.post("/api/v1/bloodwork/process/batch", tags=["Bloodwork Engine"])
+    def process_markers_batch(request: ProcessMarkersBatchRequest):
+        """
+        Process many panels through the Bloodwork Engine v2.0.
         
-        # Convert safety gates
-        safety_gates_response = []
-        for g in result.safety_gates:
-            safety_gates_response.append({
-                "gate_id": g.gate_id,
-                "name": g.name,
-                "tier": g.tier.value if hasattr(g.tier, 'value') else str(g.tier),
-                "description": g.description,
-                "trigger_marker": g.trigger_marker,
-                "trigger_value": g.trigger_value,
-                "threshold": g.threshold,
-                "action": g.action.value if hasattr(g.action, 'value') else str(g.action),
-                "routing_constraint": g.routing_constraint,
-                "blocked_ingredients": getattr(g, 'blocked_ingredients', []),
-                "caution_ingredients": getattr(g, 'caution_ingredients', []),
-                "recommended_ingredients": getattr(g, 'recommended_ingredients', []),
-                "exception_active": g.exception_active,
-                "exception_reason": g.exception_reason
-            })
+        Streams NDJSON: one {"type": "result", "index": ...} line per panel in
+        input order (same payload as /process under "result"), then a
+        {"type": "summary"} trailer with throughput and timing.
+        """
+        from bloodwork_engine.batch import BATCH_MAX_PANELS, iter_batch_ndjson
         
-        # Convert markers
-        markers_response = []
-        for m in result.markers:
-            markers_response.append({
-                "original_code": m.original_code,
-                "canonical_code": m.canonical_code,
-                "original_value": m.original_value,
-                "canonical_value": m.canonical_value,
-                "original_unit": m.original_unit,
-                "canonical_unit": m.canonical_unit,
-                "status": m.status.value if hasattr(m.status, 'value') else m.status,
-                "range_status": m.range_status.value if hasattr(m.range_status, 'value') else m.range_status,
-                "reference_range": m.reference_range,
-                "genomax_optimal": getattr(m, 'genomax_optimal', None),
-                "decision_limits": getattr(m, 'decision_limits', None),
-                "lab_profile_used": m.lab_profile_used,
-                "fallback_used": m.fallback_used,
-                "conversion_applied": m.conversion_applied,
-                "conversion_multiplier": m.conversion_multiplier,
-                "flags": m.flags,
-                "log_entries": m.log_entries,
-                "is_genetic": getattr(m, 'is_genetic', False),
-                "genetic_interpretation": getattr(m, 'genetic_interpretation', None)
-            })
+        if len(request.panels) > BATCH_MAX_PANELS:
+            return {
+                "error": "BATCH_TOO_LARGE",
+                "message": f"Batch of {len(request.panels)} panels exceeds maximum {BATCH_MAX_PANELS}",
+                "max_panels": BATCH_MAX_PANELS
+            }
         
-        return {
-            "processed_at": result.processed_at,
-            "engine_version": result.engine_version,
-            "lab_profile": result.lab_profile,
-            "markers": markers_response,
-            "computed_markers": computed_markers_response,
-            "routing_constraints": result.routing_constraints,
-            "safety_gates": safety_gates_response,
-            "require_review": result.require_review,
-            "summary": result.summary,
-            "gate_summary": result.gate_summary,
-            "ruleset_version": result.ruleset_version,
-            "input_hash": result.input_hash,
-            "output_hash": result.output_hash
-        }
+        panels = [
+            {
+                "panel_id": p.panel_id,
+                "markers": [{"code": m.code, "value": m.value, "unit": m.unit} for m in p.markers],
+                "lab_profile": p.lab_profile,
+                "sex": p.sex,
+                "age": p.age
+            }
+            for p in request.panels
+        ]
+        
+        return StreamingResponse(
+            iter_batch_ndjson(panels, workers=request.workers, chunk_size=request.chunk_size),
+            media_type="application/x-ndjson"
+        )
     
     # ---------------------------------------------------------
     # GET /api/v1/bloodwork/status
@@ -541,7 +600,7 @@ def register_bloodwork_endpoints(app):
             return {
                 "ocr_available": status["configured"],
                 "configuration": status,
-                "supported_formats": ["image/png", "image/jpeg", "image/gif", "image/webp", "application/pdf"],
+                "supported_formats": ["image/png", "image/jpeg", "image/gif", "image/webp", "image/tiff", "application/pdf"],
                 "max_file_size_mb": 20,
                 "provider": "Google Cloud Vision" if status["configured"] else None
             }
@@ -558,28 +617,19 @@ def register_bloodwork_endpoints(app):
                 "configuration": {"configured": False}
             }
     
-    # ---------------------------------------------------------
-    # POST /api/v1/bloodwork/ocr/parse
-    # ---------------------------------------------------------
-    @app.post("/api/v1/bloodwork/ocr/parse", tags=["Bloodwork OCR"])
-    async def parse_bloodwork_upload(
-        file: UploadFile = File(...),
-        lab_profile: str = "GLOBAL_CONSERVATIVE",
-        sex: Optional[str] = None,
-        age: Optional[int] = None
-    ):
+    async def read_ocr_upload(file: UploadFile):
         """
-        Parse a bloodwork report image/PDF using OCR and process markers.
+        Check OCR configuration and read a validated upload.
         
-        Accepts: PNG, JPEG, GIF, WebP, PDF
-        Max size: 20MB
+        Returns (content, content_type, None) or (None, None, error_response).
         """
-        from bloodwork_engine.ocr_parser import OCRParser, get_ocr_status
+        from bloodwork_engine.ocr_parser import get_ocr_status
+        from bloodwork_engine.ocr_pipeline import OCR_FAKE_VISION
         
         # Check configuration
         status = get_ocr_status()
-        if not status["configured"]:
-            return {
+        if not status["configured"] and not OCR_FAKE_VISION:
+            return None, None, {
                 "error": "OCR_NOT_CONFIGURED",
                 "message": "Google Cloud Vision credentials not configured",
                 "setup_instructions": {
@@ -590,9 +640,9 @@ def register_bloodwork_endpoints(app):
         
         # Validate file type
         content_type = file.content_type or ""
-        valid_types = ["image/png", "image/jpeg", "image/gif", "image/webp", "application/pdf"]
+        valid_types = ["image/png", "image/jpeg", "image/gif", "image/webp", "image/tiff", "application/pdf"]
         if content_type not in valid_types:
-            return {
+            return None, None, {
                 "error": "INVALID_FILE_TYPE",
                 "message": f"Unsupported file type: {content_type}",
                 "supported_types": valid_types
@@ -604,27 +654,68 @@ def register_bloodwork_endpoints(app):
         # Check size (20MB max)
         max_size = 20 * 1024 * 1024
         if len(content) > max_size:
-            return {
+            return None, None, {
                 "error": "FILE_TOO_LARGE",
                 "message": f"File size {len(content)} exceeds maximum {max_size} bytes",
                 "max_size_mb": 20
             }
         
+        return content, content_type, None
+    
+    def run_engine_on_markers(markers_input, lab_profile, sex, age):
+        """Process parsed OCR markers; None when nothing was parsed."""
+        if not markers_input:
+            return None
+        engine = get_engine(lab_profile=lab_profile)
+        engine_result = engine.process_markers(
+            markers=markers_input,
+            sex=sex,
+            age=age
+        )
+        return {
+            "processed_at": engine_result.processed_at,
+            "markers": len(engine_result.markers),
+            "routing_constraints": engine_result.routing_constraints,
+            "safety_gates": len(engine_result.safety_gates),
+            "require_review": engine_result.require_review,
+            "summary": engine_result.summary
+        }
+    
+    # ---------------------------------------------------------
+    # POST /api/v1/bloodwork/ocr/parse
+    # ---------------------------------------------------------
+    @app.post("/api/v1/bloodwork/ocr/parse", tags=["Bloodwork OCR"])
+    async def parse_bloodwork_upload(
+        file: UploadFile = File(...),
+        lab_profile: str = "GLOBAL_CONSERVATIVE",
+        sex: Optional[str] = None,
+        age: Optional[int] = None
+    ):
+        """
+        Parse a bloodwork report image/PDF using OCR and process markers.
+        
+        Accepts: PNG, JPEG, GIF, WebP, TIFF, PDF
+        Max size: 20MB
+        
+        Pages of multi-page documents are OCRed in parallel off the event
+        loop. Use /ocr/parse/stream to receive markers page by page.
+        """
+        import asyncio
+        from bloodwork_engine.ocr_parser import OCRParser
+        
+        content, content_type, error = await read_ocr_upload(file)
+        if error:
+            return error
+        
         try:
             # Parse with OCR
             parser = OCRParser()
-            parse_result = parser.parse_image(content, content_type)
+            parse_result = await asyncio.to_thread(parser.parse_image, content, content_type)
             
             # If markers found, process through engine
-            engine_result = None
-            if parse_result.markers:
-                engine = get_engine(lab_profile=lab_profile)
-                markers_input = parse_result.to_engine_input()
-                engine_result = engine.process_markers(
-                    markers=markers_input,
-                    sex=sex,
-                    age=age
-                )
+            engine_result = await asyncio.to_thread(
+                run_engine_on_markers, parse_result.to_engine_input(), lab_profile, sex, age
+            )
             
             return {
                 "status": "success",
@@ -644,14 +735,7 @@ def register_bloodwork_endpoints(app):
                         for m in parse_result.markers
                     ]
                 },
-                "engine_result": {
-                    "processed_at": engine_result.processed_at,
-                    "markers": len(engine_result.markers),
-                    "routing_constraints": engine_result.routing_constraints,
-                    "safety_gates": len(engine_result.safety_gates),
-                    "require_review": engine_result.require_review,
-                    "summary": engine_result.summary
-                } if engine_result else None
+                "engine_result": engine_result
             }
             
         except Exception as e:
@@ -660,6 +744,51 @@ def register_bloodwork_endpoints(app):
                 "message": str(e)
             }
     
+    # ---------------------------------------------------------
+    # POST /api/v1/bloodwork/ocr/parse/stream
+    # ---------------------------------------------------------
+    @app.post("/api/v1/bloodwork/ocr/parse/stream", tags=["Bloodwork OCR"])
+    async def parse_bloodwork_upload_stream(
+        file: UploadFile = File(...),
+        lab_profile: str = "GLOBAL_CONSERVATIVE",
+        sex: Optional[str] = None,
+        age: Optional[int] = None
+    ):
+        """
+        Parse a bloodwork report with page-parallel OCR, streaming NDJSON.
+        
+        Emits one {"type": "page"} line per page as soon as it is OCRed and
+        parsed (completion order, with that page's markers or error), then a
+        {"type": "summary"} line with the deduplicated document markers and
+        the engine result for them.
+        """
+        import json
+        from bloodwork_engine.ocr_parser import OCRParser
+        from bloodwork_engine.ocr_pipeline import get_vision_client, iter_ocr_events
+        
+        content, content_type, error = await read_ocr_upload(file)
+        if error:
+            return error
+        
+        def events():
+            parser = OCRParser()
+            try:
+                for event in iter_ocr_events(content, content_type, client=get_vision_client(parser), parser=parser):
+                    if event["type"] == "summary":
+                        event["engine_result"] = run_engine_on_markers(
+                            [{"code": m["code"], "value": m["value"], "unit": m["unit"]} for m in event["markers"]],
+                            lab_profile, sex, age
+                        )
+                    yield json.dumps(event, default=str) + "\n"
+            except Exception as e:
+                yield json.dumps({
+                    "type": "error",
+                    "error": "OCR_PROCESSING_ERROR",
+                    "message": str(e)
+                }) + "\n"
+        
+        return StreamingResponse(events(), media_type="application/x-ndjson")
+    
     # ---------------------------------------------------------
     # POST /api/v1/bloodwork/ocr/parse-text
     # ---------------------------------------------------------
@@ -6,12 +6,38 @@ FastAPI endpoints for receiving lab result webhooks from Junction (Vital) and La
 These endpoints should be registered on the main app via:
     from bloodwork_engine.api_webhook_endpoints import register_webhook_endpoints
     register_webhook_endpoints(app)
+
+Receivers verify, enqueue to webhook_events and answer 202; results are
+fetched and processed by the app.webhooks.queue worker pool.
 """
 
 import os
 import json
 from typing import Optional
 from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+
+def _queued_response(queued, event_type: str, order_id: Optional[str]) -> JSONResponse:
+    return JSONResponse(status_code=202, content={
+        "success": True,
+        "event_id": queued.event_id,
+        "event_type": event_type,
+        "message": "Duplicate delivery ignored" if queued.duplicate else f"Event queued: {event_type}",
+        "order_id": order_id,
+        "duplicate": queued.duplicate,
+        "status": queued.status,
+        "error": None
+    })
+
+
+def _queue_unavailable_response(error: Exception) -> JSONResponse:
+    # 503 makes the provider redeliver later instead of losing the event
+    return JSONResponse(status_code=503, content={
+        "success": False,
+        "error": "QUEUE_UNAVAILABLE",
+        "message": str(error)
+    })
 
 
 def register_webhook_endpoints(app):
@@ -22,6 +48,15 @@ def register_webhook_endpoints(app):
         from bloodwork_engine.api_webhook_endpoints import register_webhook_endpoints
         register_webhook_endpoints(app)
     """
+    from app.webhooks.queue import register_handler
+    from bloodwork_engine.webhooks import (
+        QUEUE_HANDLER_VITAL,
+        QUEUE_HANDLER_LAB_TESTING_API,
+        handle_queued_vital_event,
+        handle_queued_lab_testing_api_event
+    )
+    register_handler(QUEUE_HANDLER_VITAL, handle_queued_vital_event)
+    register_handler(QUEUE_HANDLER_LAB_TESTING_API, handle_queued_lab_testing_api_event)
     
     # ---------------------------------------------------------
     # POST /api/v1/webhooks/vital
@@ -32,7 +67,8 @@ def register_webhook_endpoints(app):
         Junction/Vital results webhook endpoint.
         
         Receives lab result notifications from Junction (formerly Vital).
-        Verifies signature and processes results through Bloodwork Engine.
+        Verifies signature and queues the event (202); a worker fetches
+        results and processes them through Bloodwork Engine.
         
         Headers:
         - X-Vital-Signature: HMAC-SHA256 signature for verification
@@ -42,9 +78,12 @@ def register_webhook_endpoints(app):
         - results.ready, results.partial, results.critical
         """
         from bloodwork_engine.webhooks import (
-            process_vital_webhook,
-            verify_vital_signature
+            verify_vital_signature,
+            parse_vital_event,
+            QUEUE_HANDLER_VITAL,
+            VITAL_RESULTS_EVENTS
         )
+        from app.webhooks.queue import enqueue, provider_event_id_for, WebhookQueueError
         
         # Get raw body for signature verification
         raw_body = await request.body()
@@ -69,22 +108,26 @@ def register_webhook_endpoints(app):
                 "message": f"Failed to parse JSON: {e}"
             }
         
-        # Process webhook
-        result = process_vital_webhook(
-            payload=payload,
-            signature_header=signature,
-            ip_address=ip_address,
-            auto_process=True
-        )
+        # Enqueue; results are fetched and processed by the worker pool
+        event_type, order_id, user_id = parse_vital_event(payload)
+        try:
+            queued = enqueue(
+                queue_handler=QUEUE_HANDLER_VITAL,
+                provider="junction",
+                event_type=event_type,
+                payload=payload,
+                provider_event_id=provider_event_id_for(request.headers, payload, raw_body),
+                parsed_order_id=order_id,
+                parsed_user_id=user_id,
+                signature_header=signature,
+                signature_valid=True,
+                ip_address=ip_address,
+                process=event_type in VITAL_RESULTS_EVENTS
+            )
+        except WebhookQueueError as e:
+            return _queue_unavailable_response(e)
         
-        return {
-            "success": result.success,
-            "event_id": str(result.event_id) if result.event_id else None,
-            "event_type": result.event_type,
-            "message": result.message,
-            "order_id": result.order_id,
-            "error": result.error
-        }
+        return _queued_response(queued, event_type, order_id)
     
     # ---------------------------------------------------------
     # POST /api/v1/webhooks/labtestingapi
@@ -95,7 +138,8 @@ def register_webhook_endpoints(app):
         Lab Testing API results webhook endpoint.
         
         Receives lab result notifications from Lab Testing API (Quest Diagnostics).
-        Verifies signature and processes results through Bloodwork Engine.
+        Verifies signature and queues the event (202); a worker fetches
+        results and processes them through Bloodwork Engine.
         
         Headers:
         - X-Signature: HMAC-SHA256 signature for verification
@@ -106,9 +150,12 @@ def register_webhook_endpoints(app):
         - results.ready, results.critical
         """
         from bloodwork_engine.webhooks import (
-            process_lab_testing_api_webhook,
-            verify_lab_testing_api_signature
+            verify_lab_testing_api_signature,
+            parse_lab_testing_api_event,
+            QUEUE_HANDLER_LAB_TESTING_API,
+            LAB_TESTING_API_RESULTS_EVENTS
         )
+        from app.webhooks.queue import enqueue, provider_event_id_for, WebhookQueueError
         
         # Get raw body for signature verification
         raw_body = await request.body()
@@ -134,23 +181,26 @@ def register_webhook_endpoints(app):
                 "message": f"Failed to parse JSON: {e}"
             }
         
-        # Process webhook
-        result = process_lab_testing_api_webhook(
-            payload=payload,
-            signature_header=signature,
-            timestamp_header=timestamp,
-            ip_address=ip_address,
-            auto_process=True
-        )
+        # Enqueue; results are fetched and processed by the worker pool
+        event_type, order_id, patient_id = parse_lab_testing_api_event(payload)
+        try:
+            queued = enqueue(
+                queue_handler=QUEUE_HANDLER_LAB_TESTING_API,
+                provider="lab_testing_api",
+                event_type=event_type,
+                payload=payload,
+                provider_event_id=provider_event_id_for(request.headers, payload, raw_body),
+                parsed_order_id=order_id,
+                parsed_user_id=patient_id,
+                signature_header=signature,
+                signature_valid=True,
+                ip_address=ip_address,
+                process=event_type in LAB_TESTING_API_RESULTS_EVENTS
+            )
+        except WebhookQueueError as e:
+            return _queue_unavailable_response(e)
         
-        return {
-            "success": result.success,
-            "event_id": str(result.event_id) if result.event_id else None,
-            "event_type": result.event_type,
-            "message": result.message,
-            "order_id": result.order_id,
-            "error": result.error
-        }
+        return _queued_response(queued, event_type, order_id)
     
     # ---------------------------------------------------------
     # GET /api/v1/webhooks/status
@@ -0,0 +1,246 @@
+"""
+GenoMAX² Bloodwork Engine v2.0 - Batch Processing
+==================================================
+Processes many panels per call for backfills and ruleset re-scoring.
+
+Panels are split into chunks and run on a process pool (the engine is
+CPU-bound pure Python, so threads would serialize on the GIL). Results are
+yielded strictly in input order as soon as each chunk completes, followed by
+a summary line with throughput and timing. Small batches, or a pool that
+cannot be started, run inline in the calling thread.
+
+The pool is shared by all requests and lives for the application lifetime
+(start_batch_pool / shutdown_batch_pool in main.py), so the process count is
+bounded by BLOODWORK_BATCH_WORKERS however many batches run concurrently.
+Workers are started with the spawn method (BLOODWORK_BATCH_START_METHOD):
+forking the multithreaded server could copy held locks into the children.
+
+Usage:
+    from bloodwork_engine.batch import iter_batch_ndjson
+    for line in iter_batch_ndjson(panels):
+        ...
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_PANELS = int(os.getenv("BLOODWORK_BATCH_MAX_PANELS", "10000"))
+BATCH_WORKERS = int(os.getenv("BLOODWORK_BATCH_WORKERS", str(min(4, os.cpu_count() or 1))))
+BATCH_CHUNK_SIZE = int(os.getenv("BLOODWORK_BATCH_CHUNK_SIZE", "25"))
+# Below this many panels pool startup costs more than it saves
+BATCH_PARALLEL_MIN = int(os.getenv("BLOODWORK_BATCH_PARALLEL_MIN", "50"))
+# spawn or forkserver; fork is unsafe once the server has started threads
+BATCH_START_METHOD = os.getenv("BLOODWORK_BATCH_START_METHOD", "spawn")
+
+MODE_INLINE = "inline"
+MODE_PROCESS_POOL = "process_pool"
+
+
+def process_panel(panel: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process one panel and return its NDJSON result line (without index).
+
+    Engine errors are reported on the line instead of aborting the batch.
+    """
+    from bloodwork_engine.api import serialize_result
+    from bloodwork_engine.engine_v2 import get_engine
+
+    started = time.perf_counter()
+    line = {"type": "result", "panel_id": panel.get("panel_id")}
+    try:
+        engine = get_engine(lab_profile=panel.get("lab_profile") or "GLOBAL_CONSERVATIVE")
+        result = engine.process_markers(
+            markers=panel.get("markers", []),
+            sex=panel.get("sex"),
+            age=panel.get("age")
+        )
+        line["status"] = "ok"
+        line["result"] = serialize_result(result)
+    except Exception as e:
+        line["status"] = "error"
+        line["error"] = f"{type(e).__name__}: {e}"
+    line["processing_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return line
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Shared batch process pool, created on first use.
+
+    A pool broken by a crashed worker is replaced.
+    """
+    global _executor
+    if _executor is None or getattr(_executor, "_broken", False):
+        with _executor_lock:
+            if _executor is None or getattr(_executor, "_broken", False):
+                if _executor is not None:
+                    _executor.shutdown(wait=False, cancel_futures=True)
+                _executor = ProcessPoolExecutor(
+                    max_workers=max(1, BATCH_WORKERS),
+                    mp_context=multiprocessing.get_context(BATCH_START_METHOD),
+                )
+    return _executor
+
+
+def start_batch_pool() -> None:
+    """Create the shared pool (app startup). Failures leave batches inline."""
+    if BATCH_WORKERS <= 1:
+        return
+    try:
+        _get_executor()
+    except (OSError, ValueError, NotImplementedError) as e:
+        logger.warning(f"Batch process pool unavailable, batches will run inline: {e}")
+
+
+def shutdown_batch_pool() -> None:
+    """Stop the shared pool (app shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _process_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    lines = []
+    for index, panel in chunk:
+        line = process_panel(panel)
+        line["index"] = index
+        lines.append(line)
+    return lines
+
+
+def _chunks(panels: List[Dict[str, Any]], size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    for start in range(0, len(panels), size):
+        yield list(enumerate(panels[start:start + size], start=start))
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def _iter_inline(panels: List[Dict[str, Any]], chunk_size: int) -> Iterator[Dict[str, Any]]:
+    for chunk in _chunks(panels, chunk_size):
+        yield from _process_chunk(chunk)
+
+
+def _iter_pool(
+    executor: ProcessPoolExecutor,
+    panels: List[Dict[str, Any]],
+    chunk_size: int,
+    window: int
+) -> Iterator[Dict[str, Any]]:
+    """Yield pool results in input order with at most `window` chunks in flight."""
+    chunks = _chunks(panels, chunk_size)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(_process_chunk, chunk))
+            if len(pending) >= window:
+                break
+        while pending:
+            lines = pending.popleft().result()
+            next_chunk = next(chunks, None)
+            if next_chunk is not None:
+                pending.append(executor.submit(_process_chunk, next_chunk))
+            yield from lines
+    finally:
+        # The pool is shared: drop only this batch's queued chunks (also
+        # reached when the client disconnects mid-stream)
+        for future in pending:
+            future.cancel()
+
+
+def iter_batch(
+    panels: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Process panels and yield one result line per panel, in input order,
+    then a final summary line.
+
+    Args:
+        panels: dicts with markers, lab_profile, sex, age and optional panel_id
+        workers: pool workers this batch may keep busy (capped at
+            BLOODWORK_BATCH_WORKERS, the shared pool size)
+        chunk_size: panels per pool task (defaults to BLOODWORK_BATCH_CHUNK_SIZE)
+    """
+    workers = max(1, min(workers or BATCH_WORKERS, BATCH_WORKERS))
+    chunk_size = max(1, chunk_size or BATCH_CHUNK_SIZE)
+
+    started = time.perf_counter()
+    timings = []
+    succeeded = 0
+    failed = 0
+
+    executor = None
+    mode = MODE_INLINE
+    if workers > 1 and len(panels) >= BATCH_PARALLEL_MIN:
+        try:
+            executor = _get_executor()
+            mode = MODE_PROCESS_POOL
+        except (OSError, ValueError, NotImplementedError) as e:
+            logger.warning(f"Batch process pool unavailable, running inline: {e}")
+
+    if executor is not None:
+        lines = _iter_pool(executor, panels, chunk_size, window=workers * 2)
+    else:
+        lines = _iter_inline(panels, chunk_size)
+
+    try:
+        for line in lines:
+            timings.append(line["processing_ms"])
+            if line["status"] == "ok":
+                succeeded += 1
+            else:
+                failed += 1
+            yield line
+    finally:
+        lines.close()
+
+    elapsed_s = time.perf_counter() - started
+    timings.sort()
+    yield {
+        "type": "summary",
+        "panel_count": len(panels),
+        "succeeded": succeeded,
+        "failed": failed,
+        "mode": mode,
+        "workers": workers if mode == MODE_PROCESS_POOL else 1,
+        "chunk_size": chunk_size,
+        "elapsed_ms": round(elapsed_s * 1000, 3),
+        "panels_per_second": round(len(panels) / elapsed_s, 2) if elapsed_s > 0 else None,
+        "panel_ms": {
+            "mean": round(sum(timings) / len(timings), 3) if timings else 0.0,
+            "p50": _percentile(timings, 50),
+            "p95": _percentile(timings, 95),
+            "max": timings[-1] if timings else 0.0
+        }
+    }
+
+
+def iter_batch_ndjson(
+    panels: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> Iterator[str]:
+    """iter_batch() encoded as NDJSON lines."""
+    for line in iter_batch(panels, workers=workers, chunk_size=chunk_size):
+        yield json.dumps(line, default=str) + "\n"
@@ -14,32 +14,35 @@ Pipeline Flow:
 
 "Blood does not negotiate" - safety constraints are absolute.
 
-Version: 1.1.3 - Remove UNIVERSAL filtering (migration 016 compliance)
+Version: 1.1.5 - Vectorized module scoring per catalog version
 """
 
 import os
 import json
-import httpx
+import asyncio
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple, Set
 from enum import Enum
 from dataclasses import dataclass, field
 from pydantic import BaseModel, Field
-import asyncpg
 from asyncpg import Pool
 
+try:
+    import numpy as np
+except ImportError:  # Vectorized scoring only; falls back to score_module()
+    np = None
+
 # =============================================================================
 # VERSION CONSTANT
 # =============================================================================
 
-BRAIN_ORCHESTRATOR_VERSION = "1.1.3"
+BRAIN_ORCHESTRATOR_VERSION = "1.1.5"
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
 DATABASE_URL = os.getenv("DATABASE_URL", "")
-API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 
 # 13 Priority Biomarkers with deficiency thresholds
 BIOMARKER_DEFICIENCY_THRESHOLDS = {
@@ -308,113 +311,158 @@ class BrainRunResult:
 # DATABASE CONNECTION
 # =============================================================================
 
-_pool: Optional[Pool] = None
-
 async def get_pool() -> Pool:
-    """Get or create database connection pool."""
-    global _pool
-    if _pool is None:
-        _pool = await asyncpg.create_pool(DATABASE_URL, min_size=2, max_size=10)
-    return _pool
+    """Get the application-lifetime asyncpg pool shared with lab uploads."""
+    from app.shared.async_db_pool import get_async_pool
+    return await get_async_pool()
 
 async def close_pool():
-    """Close database connection pool."""
-    global _pool
-    if _pool:
-        await _pool.close()
-        _pool = None
+    """Close the shared asyncpg pool (application shutdown)."""
+    from app.shared.async_db_pool import close_async_pool
+    await close_async_pool()
 
 # =============================================================================
-# CATALOG LOADING - Uses catalog wiring endpoint
+# CATALOG LOADING - Reads CatalogWiring snapshots in process
 # =============================================================================
 
-# In-memory catalog cache
-_catalog_cache: Optional[List[Dict[str, Any]]] = None
-_catalog_loaded_at: Optional[datetime] = None
-CATALOG_CACHE_TTL_SECONDS = 300  # 5 minutes
+# Evidence tiers the Brain may recommend
+ELIGIBLE_EVIDENCE_TIERS = ("TIER_1", "TIER_2")
 
-async def load_catalog_from_wiring() -> List[Dict[str, Any]]:
+
+@dataclass(frozen=True)
+class CatalogModules:
     """
-    Load supplement catalog from catalog wiring endpoint.
+    Module records derived from one catalog snapshot version.
     
-    Maps catalog wiring format to Brain orchestrator expected format.
+    Built once per CatalogWiring snapshot version: target_biomarkers,
+    lowercase ingredient sets, the gender partitions and their scoring
+    matrices (when NumPy is available) are computed here instead of on
+    every run. Records are shared between runs; copy before
+    mutating.
     """
-    global _catalog_cache, _catalog_loaded_at
+    version: str
+    modules: Tuple[Dict[str, Any], ...]
+    by_gender: Dict[str, Tuple[Dict[str, Any], ...]]
+    matrices: Dict[str, "ModuleMatrix"] = field(default_factory=dict)
+
+
+def _module_record(product) -> Dict[str, Any]:
+    """Map a CatalogProduct to the Brain orchestrator module format."""
+    ingredient_tags = list(product.ingredient_tags or [])
     
-    # Check cache
-    if _catalog_cache and _catalog_loaded_at:
-        age = (datetime.utcnow() - _catalog_loaded_at).total_seconds()
-        if age < CATALOG_CACHE_TTL_SECONDS:
-            return _catalog_cache
+    # Derive target_biomarkers from ingredients
+    target_biomarkers = set()
+    for ingredient in ingredient_tags:
+        ingredient_lower = ingredient.lower()
+        if ingredient_lower in INGREDIENT_BIOMARKER_MAP:
+            target_biomarkers.update(INGREDIENT_BIOMARKER_MAP[ingredient_lower])
     
-    # Fetch from catalog wiring endpoint
-    try:
-        async with httpx.AsyncClient() as client:
-            # Try internal endpoint first
-            response = await client.get(
-                f"{API_BASE_URL}/api/v1/catalog/wiring/products",
-                timeout=10.0
-            )
-            if response.status_code != 200:
-                # Fallback to self-reference
-                response = await client.get(
-                    "http://localhost:8000/api/v1/catalog/wiring/products",
-                    timeout=10.0
-                )
-            
-            data = response.json()
-            products = data.get("products", [])
-            
-    except Exception as e:
-        print(f"Error loading catalog from wiring: {e}")
-        # Return cached data if available, even if stale
-        if _catalog_cache:
-            return _catalog_cache
-        return []
+    # NOTE: Migration 016 eliminated UNIVERSAL - all products are MAXimo² or MAXima²
+    ingredients_lower = frozenset(i.lower() for i in ingredient_tags)
+    return {
+        "id": product.sku,
+        "sku": product.sku,
+        "name": product.name or "Unknown",
+        "os_environment": product.os_environment or "",  # Source of truth
+        "category": product.category or "General",
+        "subcategory": "",  # Not available in wiring
+        "description": "",  # Not available in wiring
+        "target_biomarkers": sorted(target_biomarkers),
+        "primary_ingredients": ingredient_tags,
+        "all_ingredients": ingredient_tags,
+        "primary_ingredients_lower": ingredients_lower,
+        "all_ingredients_lower": ingredients_lower,
+        "evidence_tier": product.evidence_tier or "TIER_2",
+        "product_line": product.product_line,  # Derived from os_environment
+        "sex_target": product.sex_target or "",  # Derived convenience field
+        "lifecycle_phases": [],  # Derive from category if needed
+        "contraindications": [],  # Not available in wiring
+        "price_usd": product.price_usd or 0
+    }
+
+
+# Precomputed scoring keys, not part of the module API shape
+_DERIVED_MODULE_KEYS = ("primary_ingredients_lower", "all_ingredients_lower")
+
+
+def _public_module(module: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in module.items() if k not in _DERIVED_MODULE_KEYS}
+
+
+def _module_genders(module: Dict[str, Any]) -> List[str]:
+    """Genders a module is eligible for (canonical os_environment first)."""
+    os_env = module["os_environment"].lower()
+    product_line = module["product_line"].lower()
+    sex_target = module["sex_target"].lower()
     
-    # Transform to Brain orchestrator format
-    modules = []
-    for idx, product in enumerate(products):
-        # Extract ingredient tags
-        ingredient_tags = product.get("ingredient_tags", [])
-        
-        # Derive target_biomarkers from ingredients
-        target_biomarkers = set()
-        for ingredient in ingredient_tags:
-            ingredient_lower = ingredient.lower()
-            if ingredient_lower in INGREDIENT_BIOMARKER_MAP:
-                target_biomarkers.update(INGREDIENT_BIOMARKER_MAP[ingredient_lower])
-        
-        # Map product_line to gender eligibility
-        # NOTE: Migration 016 eliminated UNIVERSAL - all products are MAXimo² or MAXima²
-        product_line = product.get("product_line", "")
-        os_environment = product.get("os_environment", "")
-        sex_target = product.get("sex_target", "")
-        
-        modules.append({
-            "id": product.get("sku", f"module_{idx}"),
-            "sku": product.get("sku", ""),
-            "name": product.get("name", "Unknown"),
-            "os_environment": os_environment,  # Source of truth
-            "category": product.get("category", "General"),
-            "subcategory": "",  # Not available in wiring
-            "description": "",  # Not available in wiring
-            "target_biomarkers": list(target_biomarkers),
-            "primary_ingredients": ingredient_tags,
-            "all_ingredients": ingredient_tags,
-            "evidence_tier": product.get("evidence_tier", "TIER_2"),
-            "product_line": product_line,  # Derived from os_environment
-            "sex_target": sex_target,  # Derived convenience field
-            "lifecycle_phases": [],  # Derive from category if needed
-            "contraindications": [],  # Not available in wiring
-            "price_usd": product.get("price_usd", 0)
-        })
+    # Migration 016: No more UNIVERSAL - strict gender matching only
+    genders = []
+    if os_env == "maximo²" or product_line == "maximo²" or sex_target == "male":
+        genders.append("male")
+    if os_env == "maxima²" or product_line == "maxima²" or sex_target == "female":
+        genders.append("female")
+    return genders
+
+
+def build_catalog_modules(snapshot) -> CatalogModules:
+    """Derive module records and gender partitions from a catalog snapshot."""
+    modules = [_module_record(p) for p in snapshot.get_all_products()]
+    # Same order as /api/v1/catalog/wiring/products, so score ties rank stably
+    modules.sort(key=lambda m: (m["os_environment"], m["evidence_tier"], m["name"]))
     
-    # Update cache
-    _catalog_cache = modules
-    _catalog_loaded_at = datetime.utcnow()
+    by_gender: Dict[str, List[Dict[str, Any]]] = {"male": [], "female": []}
+    for module in modules:
+        if module["evidence_tier"] not in ELIGIBLE_EVIDENCE_TIERS:
+            continue
+        for gender in _module_genders(module):
+            by_gender[gender].append(module)
     
-    return modules
+    partitions = {g: tuple(ms) for g, ms in by_gender.items()}
+    return CatalogModules(
+        version=snapshot.version,
+        modules=tuple(modules),
+        by_gender=partitions,
+        matrices={g: ModuleMatrix(ms) for g, ms in partitions.items()} if np is not None else {},
+    )
+
+
+# Derived records for the most recent catalog version
+_catalog_modules: Optional[CatalogModules] = None
+
+
+async def get_catalog_modules() -> CatalogModules:
+    """
+    Module records for the current CatalogWiring snapshot.
+    
+    Follows the snapshot version: records are rebuilt only when the
+    catalog refresher swaps in a new version. There is no stale or empty
+    fallback; an unavailable catalog raises CatalogWiringError.
+    """
+    global _catalog_modules
+    from app.catalog.wiring import get_catalog
+    
+    catalog = get_catalog()
+    if not catalog.is_loaded:
+        # First use before the startup load finished: load off the event loop
+        await asyncio.to_thread(catalog.ensure_loaded)
+    snapshot = catalog.snapshot()
+    
+    cached = _catalog_modules
+    if cached is not None and cached.version == snapshot.version:
+        return cached
+    
+    cached = build_catalog_modules(snapshot)
+    _catalog_modules = cached  # atomic reference swap
+    return cached
+
+
+async def load_catalog_from_wiring() -> List[Dict[str, Any]]:
+    """
+    Load the supplement catalog from the in-process catalog wiring.
+    
+    Maps catalog wiring format to Brain orchestrator expected format.
+    """
+    return list((await get_catalog_modules()).modules)
 
 async def load_supplement_catalog(
     gender: str,
@@ -432,48 +480,13 @@ async def load_supplement_catalog(
     NOTE (v1.1.3): Migration 016 eliminated UNIVERSAL/UNISEX products.
     All products are now explicitly MAXimo² (male) or MAXima² (female).
     """
-    # Load from catalog wiring
-    all_modules = await load_catalog_from_wiring()
+    catalog_modules = await get_catalog_modules()
     
-    # Filter by gender eligibility
-    gender_lower = gender.lower()
+    # Gender and evidence tier partitions are precomputed per catalog version
     eligible_modules = []
-    
-    for module in all_modules:
-        # Check os_environment (canonical) and fallback to product_line/sex_target
-        os_env = module.get("os_environment", "").lower()
-        product_line = module.get("product_line", "").lower()
-        sex_target = module.get("sex_target", "").lower()
-        
-        # Determine eligibility based on canonical os_environment
-        # Migration 016: No more UNIVERSAL - strict gender matching only
-        if gender_lower == "male":
-            is_eligible = (
-                os_env == "maximo²" or 
-                product_line == "maximo²" or 
-                sex_target == "male"
-            )
-        elif gender_lower == "female":
-            is_eligible = (
-                os_env == "maxima²" or 
-                product_line == "maxima²" or 
-                sex_target == "female"
-            )
-        else:
-            is_eligible = False
-        
-        if not is_eligible:
-            continue
-        
-        # Filter by evidence tier
-        evidence_tier = module.get("evidence_tier", "TIER_2")
-        if evidence_tier not in ["TIER_1", "TIER_2"]:
-            continue
-        
+    for module in catalog_modules.by_gender.get(gender.lower(), ()):
         # Check if any ingredient is blocked
-        all_ingredients = module.get("all_ingredients", [])
-        ingredient_set = set(i.lower() for i in all_ingredients)
-        blocked_match = ingredient_set.intersection(blocked_ingredients)
+        blocked_match = module["all_ingredients_lower"].intersection(blocked_ingredients)
         
         eligible_modules.append({
             **module,
@@ -581,6 +594,33 @@ def detect_deficiencies(
 # MODULE SCORING
 # =============================================================================
 
+# Base score by evidence tier (unknown tiers score 10)
+TIER_SCORES = {"TIER_1": 30, "TIER_2": 20, "TIER_3": 0}
+
+# Health goal -> category/ingredient keywords (substring match)
+GOAL_KEYWORDS = {
+    "energy": ["b_complex", "b12", "iron", "coq10", "mitochondrial", "cordyceps"],
+    "sleep": ["magnesium", "gaba", "melatonin", "glycine", "valerian"],
+    "stress": ["magnesium", "rhodiola", "adaptogen", "reishi", "holy_basil"],
+    "immunity": ["vitamin_d", "zinc", "vitamin_c", "elderberry", "echinacea"],
+    "heart_health": ["omega_3", "coq10", "magnesium", "vitamin_k2", "fish_oil"],
+    "brain_health": ["omega_3", "b_complex", "choline", "lions_mane", "alpha_gpc"],
+    "bone_health": ["vitamin_d", "calcium", "vitamin_k2", "magnesium"],
+    "skin_health": ["collagen", "vitamin_c", "vitamin_e", "biotin"],
+    "gut_health": ["probiotic", "fiber", "digestive_enzyme", "glutamine"],
+    "muscle_recovery": ["magnesium", "protein", "bcaa", "creatine", "l_glutamine"],
+    "inflammation": ["curcumin", "turmeric", "omega_3", "fish_oil", "quercetin"],
+    "detox": ["milk_thistle", "chlorella", "spirulina"],
+    "longevity": ["nmn", "resveratrol", "coq10", "quercetin"]
+}
+
+# Severity multiplier for biomarker match contributions
+SEVERITY_MULTIPLIERS = {
+    DeficiencyLevel.DEFICIENT: 2.0,
+    DeficiencyLevel.ELEVATED: 1.8,
+    DeficiencyLevel.SUBOPTIMAL: 1.0
+}
+
 def score_module(
     module: Dict[str, Any],
     deficiencies: List[BiomarkerDeficiency],
@@ -614,18 +654,21 @@ def score_module(
         return score
     
     # Check for caution ingredients
-    module_ingredients = set(i.lower() for i in module.get("all_ingredients", []))
+    module_ingredients = module.get("all_ingredients_lower")
+    if module_ingredients is None:
+        module_ingredients = set(i.lower() for i in module.get("all_ingredients", []))
     caution_match = module_ingredients.intersection(caution_ingredients)
     if caution_match:
         score.caution = True
         score.caution_reasons.append(f"Contains caution ingredients: {', '.join(caution_match)}")
     
     # Base score from evidence tier
-    tier_scores = {"TIER_1": 30, "TIER_2": 20, "TIER_3": 0}
-    score.base_score = tier_scores.get(module.get("evidence_tier", "TIER_2"), 10)
+    score.base_score = TIER_SCORES.get(module.get("evidence_tier", "TIER_2"), 10)
     
     # Biomarker match scoring
-    module_ingredients_lower = set(i.lower() for i in module.get("primary_ingredients", []))
+    module_ingredients_lower = module.get("primary_ingredients_lower")
+    if module_ingredients_lower is None:
+        module_ingredients_lower = set(i.lower() for i in module.get("primary_ingredients", []))
     module_biomarkers = set(b.lower() for b in module.get("target_biomarkers", []))
     
     for deficiency in deficiencies:
@@ -638,11 +681,7 @@ def score_module(
         
         if ingredient_match or biomarker_match:
             # Score based on deficiency severity and priority
-            severity_multiplier = {
-                DeficiencyLevel.DEFICIENT: 2.0,
-                DeficiencyLevel.ELEVATED: 1.8,
-                DeficiencyLevel.SUBOPTIMAL: 1.0
-            }.get(deficiency.level, 0.5)
+            severity_multiplier = SEVERITY_MULTIPLIERS.get(deficiency.level, 0.5)
             
             contribution = (
                 10 * 
@@ -658,26 +697,10 @@ def score_module(
             )
     
     # Goal alignment scoring
-    goal_keywords = {
-        "energy": ["b_complex", "b12", "iron", "coq10", "mitochondrial", "cordyceps"],
-        "sleep": ["magnesium", "gaba", "melatonin", "glycine", "valerian"],
-        "stress": ["magnesium", "rhodiola", "adaptogen", "reishi", "holy_basil"],
-        "immunity": ["vitamin_d", "zinc", "vitamin_c", "elderberry", "echinacea"],
-        "heart_health": ["omega_3", "coq10", "magnesium", "vitamin_k2", "fish_oil"],
-        "brain_health": ["omega_3", "b_complex", "choline", "lions_mane", "alpha_gpc"],
-        "bone_health": ["vitamin_d", "calcium", "vitamin_k2", "magnesium"],
-        "skin_health": ["collagen", "vitamin_c", "vitamin_e", "biotin"],
-        "gut_health": ["probiotic", "fiber", "digestive_enzyme", "glutamine"],
-        "muscle_recovery": ["magnesium", "protein", "bcaa", "creatine", "l_glutamine"],
-        "inflammation": ["curcumin", "turmeric", "omega_3", "fish_oil", "quercetin"],
-        "detox": ["milk_thistle", "chlorella", "spirulina"],
-        "longevity": ["nmn", "resveratrol", "coq10", "quercetin"]
-    }
-    
     for goal in goals:
         goal_key = goal.lower().replace(" ", "_")
-        if goal_key in goal_keywords:
-            keywords = goal_keywords[goal_key]
+        if goal_key in GOAL_KEYWORDS:
+            keywords = GOAL_KEYWORDS[goal_key]
             category_match = any(kw in module["category"].lower() for kw in keywords)
             ingredient_match = any(
                 kw in i.lower() 
@@ -725,6 +748,205 @@ def score_module(
     
     return score
 
+# =============================================================================
+# VECTORIZED SCORING - Per catalog version module matrix
+# =============================================================================
+
+def _row_index(keys_per_module: List[Any]) -> Dict[str, Any]:
+    """Inverted index: key -> array of module rows containing it."""
+    rows: Dict[str, List[int]] = {}
+    for row, keys in enumerate(keys_per_module):
+        for key in keys:
+            rows.setdefault(key, []).append(row)
+    return {key: np.array(idx, dtype=np.intp) for key, idx in rows.items()}
+
+
+class ModuleMatrix:
+    """
+    Vectorized score_module() over one gender partition of one catalog version.
+    
+    Ingredient and biomarker membership are stored as inverted row indexes
+    (key -> module rows), expanded into per-module bitsets only for the keys
+    a run asks about. Goal and lifecycle keyword hits, which score_module()
+    finds by substring scans, are precomputed per module. Scoring a run is
+    then a few array operations per deficiency/goal; ModuleScore objects are
+    only built for the modules a run returns (top-N, blocked, caution).
+    
+    Scores follow score_module() operation order, so they match exactly.
+    """
+    
+    def __init__(self, modules: Tuple[Dict[str, Any], ...]):
+        self.modules = modules
+        self.size = len(modules)
+        
+        all_sets = [_ingredients_lower(m, "all_ingredients") for m in modules]
+        primary_sets = [_ingredients_lower(m, "primary_ingredients") for m in modules]
+        self._all_ingredient_rows = _row_index(all_sets)
+        self._primary_ingredient_rows = _row_index(primary_sets)
+        self._biomarker_rows = _row_index(
+            [set(b.lower() for b in m.get("target_biomarkers", [])) for m in modules]
+        )
+        
+        self.base_scores = np.array(
+            [TIER_SCORES.get(m.get("evidence_tier", "TIER_2"), 10) for m in modules],
+            dtype=np.float64
+        )
+        
+        primary_lower = [[i.lower() for i in m.get("primary_ingredients", [])] for m in modules]
+        categories = [m["category"].lower() for m in modules]
+        
+        def substring_hits(keywords: List[str], include_category: bool):
+            return np.array([
+                (include_category and any(kw in category for kw in keywords))
+                or any(kw in i for i in ingredients for kw in keywords)
+                for category, ingredients in zip(categories, primary_lower)
+            ], dtype=bool)
+        
+        self.goal_hits = {
+            goal_key: substring_hits(keywords, include_category=True)
+            for goal_key, keywords in GOAL_KEYWORDS.items()
+        }
+        self.lifecycle_hits = {
+            phase: (
+                substring_hits([r.lower() for r in config.get("required", [])], include_category=False),
+                substring_hits([r.lower() for r in config.get("recommended", [])], include_category=False),
+            )
+            for phase, config in LIFECYCLE_RECOMMENDATIONS.items()
+        }
+    
+    def _mask(self, index: Dict[str, Any], keys) -> Any:
+        mask = np.zeros(self.size, dtype=bool)
+        for key in keys:
+            rows = index.get(key)
+            if rows is not None:
+                mask[rows] = True
+        return mask
+    
+    def rank(
+        self,
+        deficiencies: List[BiomarkerDeficiency],
+        goals: List[str],
+        lifecycle_phase: Optional[str],
+        confidence_score: float,
+        caution_ingredients: Set[str],
+        blocked_ingredients: Set[str],
+        max_modules: int
+    ) -> Tuple[List[ModuleScore], List[ModuleScore], List[ModuleScore]]:
+        """
+        Score all modules and return (recommended, blocked, caution).
+        
+        Same result as load_supplement_catalog() + score_module() per module
+        followed by the ranking in BrainOrchestrator.run().
+        """
+        if self.size == 0:
+            return [], [], []
+        
+        blocked = self._mask(self._all_ingredient_rows, blocked_ingredients)
+        caution = self._mask(self._all_ingredient_rows, caution_ingredients) & ~blocked
+        
+        # Biomarker match: one bitset per deficiency, summed in order
+        deficiency_hits = []
+        biomarker_scores = np.zeros(self.size, dtype=np.float64)
+        for deficiency in deficiencies:
+            hit = self._mask(
+                self._primary_ingredient_rows,
+                set(i.lower() for i in deficiency.target_ingredients)
+            )
+            rows = self._biomarker_rows.get(deficiency.marker_code.lower())
+            if rows is not None:
+                hit[rows] = True
+            severity_multiplier = SEVERITY_MULTIPLIERS.get(deficiency.level, 0.5)
+            contribution = (
+                10 *
+                severity_multiplier *
+                deficiency.priority_weight *
+                (1 + deficiency.distance_from_optimal)
+            )
+            biomarker_scores = biomarker_scores + np.where(hit, contribution, 0.0)
+            deficiency_hits.append(hit)
+        
+        goal_hits = []
+        goal_scores = np.zeros(self.size, dtype=np.float64)
+        for goal in goals:
+            hit = self.goal_hits.get(goal.lower().replace(" ", "_"))
+            if hit is not None:
+                goal_scores = goal_scores + np.where(hit, 15.0, 0.0)
+            goal_hits.append(hit)
+        
+        required = recommended = None
+        lifecycle_bonus = np.zeros(self.size, dtype=np.float64)
+        if lifecycle_phase:
+            required, recommended = self.lifecycle_hits.get(lifecycle_phase.lower(), (None, None))
+            if required is not None:
+                lifecycle_bonus = np.where(required, 25.0, 0.0) + np.where(recommended, 15.0, 0.0)
+            priority_boost = LIFECYCLE_RECOMMENDATIONS.get(lifecycle_phase.lower(), {}).get("priority_boost", 1.0)
+            lifecycle_bonus = lifecycle_bonus * priority_boost
+        
+        confidence_multiplier = 0.5 + (confidence_score * 0.5)
+        final = (self.base_scores + biomarker_scores + goal_scores + lifecycle_bonus) * confidence_multiplier
+        final = np.where(caution, final * 0.8, final)
+        
+        def module_score(row: int) -> ModuleScore:
+            module = self.modules[row]
+            score = ModuleScore(
+                module_id=module["id"],
+                module_name=module["name"],
+                category=module["category"],
+                sku=module.get("sku", "")
+            )
+            if blocked[row]:
+                blocked_match = _ingredients_lower(module, "all_ingredients").intersection(blocked_ingredients)
+                score.blocked = True
+                score.block_reason = f"Contains blocked ingredients: {', '.join(list(blocked_match))}"
+                score.final_score = -1000
+                return score
+            if caution[row]:
+                caution_match = _ingredients_lower(module, "all_ingredients").intersection(caution_ingredients)
+                score.caution = True
+                score.caution_reasons.append(f"Contains caution ingredients: {', '.join(caution_match)}")
+            score.base_score = TIER_SCORES.get(module.get("evidence_tier", "TIER_2"), 10)
+            score.biomarker_match_score = float(biomarker_scores[row])
+            for deficiency, hit in zip(deficiencies, deficiency_hits):
+                if hit[row]:
+                    score.matched_deficiencies.append(deficiency.marker_code)
+                    score.reasons.append(f"Targets {deficiency.marker_code} ({deficiency.level.value})")
+            score.goal_match_score = float(goal_scores[row])
+            for goal, hit in zip(goals, goal_hits):
+                if hit is not None and hit[row]:
+                    score.reasons.append(f"Supports goal: {goal}")
+            if required is not None:
+                if required[row]:
+                    score.reasons.append(f"Required for {lifecycle_phase}")
+                if recommended[row]:
+                    score.reasons.append(f"Recommended for {lifecycle_phase}")
+            score.lifecycle_bonus = float(lifecycle_bonus[row])
+            score.confidence_multiplier = confidence_multiplier
+            score.final_score = float(final[row])
+            return score
+        
+        eligible_rows = np.flatnonzero(~blocked)
+        order = np.argsort(-final[eligible_rows], kind="stable")
+        top_rows = eligible_rows[order[:max_modules]]
+        
+        built = {int(row): module_score(int(row)) for row in top_rows}
+        for row in np.flatnonzero(blocked | caution):
+            if int(row) not in built:
+                built[int(row)] = module_score(int(row))
+        
+        return (
+            [built[int(row)] for row in top_rows],
+            [built[int(row)] for row in np.flatnonzero(blocked)],
+            [built[int(row)] for row in np.flatnonzero(caution)],
+        )
+
+
+def _ingredients_lower(module: Dict[str, Any], key: str):
+    """Lowercase ingredient set, precomputed on catalog module records."""
+    cached = module.get(f"{key}_lower")
+    if cached is not None:
+        return cached
+    return set(i.lower() for i in module.get(key, []))
+
 # =============================================================================
 # BRAIN ORCHESTRATOR
 # =============================================================================
@@ -777,32 +999,47 @@ class BrainOrchestrator:
             deficiencies = detect_deficiencies(markers, gender)
             
             # Step 2: Load supplement catalog from wiring
-            modules = await load_supplement_catalog(gender, all_blocked)
+            catalog_modules = await get_catalog_modules()
+            matrix = catalog_modules.matrices.get(gender.lower())
+            max_modules = 8 if lifecycle_phase in ["pregnant", "breastfeeding"] else 6
             
-            # Step 3: Score all modules
-            scored_modules = []
-            for module in modules:
-                score = score_module(
-                    module=module,
+            if matrix is not None:
+                # Steps 3-6 vectorized over the precompiled module matrix
+                recommended, blocked_modules, caution_modules = matrix.rank(
                     deficiencies=deficiencies,
                     goals=goals or [],
                     lifecycle_phase=lifecycle_phase,
                     confidence_score=confidence_score,
-                    caution_ingredients=caution_set
+                    caution_ingredients=caution_set,
+                    blocked_ingredients=all_blocked,
+                    max_modules=max_modules
                 )
-                scored_modules.append(score)
-            
-            # Step 4: Separate blocked, caution, and recommended
-            blocked_modules = [m for m in scored_modules if m.blocked]
-            caution_modules = [m for m in scored_modules if m.caution and not m.blocked]
-            eligible_modules = [m for m in scored_modules if not m.blocked]
-            
-            # Step 5: Rank by score
-            eligible_modules.sort(key=lambda m: m.final_score, reverse=True)
-            
-            # Step 6: Select top recommendations (limit to reasonable number)
-            max_modules = 8 if lifecycle_phase in ["pregnant", "breastfeeding"] else 6
-            recommended = eligible_modules[:max_modules]
+            else:
+                modules = await load_supplement_catalog(gender, all_blocked)
+                
+                # Step 3: Score all modules
+                scored_modules = []
+                for module in modules:
+                    score = score_module(
+                        module=module,
+                        deficiencies=deficiencies,
+                        goals=goals or [],
+                        lifecycle_phase=lifecycle_phase,
+                        confidence_score=confidence_score,
+                        caution_ingredients=caution_set
+                    )
+                    scored_modules.append(score)
+                
+                # Step 4: Separate blocked, caution, and recommended
+                blocked_modules = [m for m in scored_modules if m.blocked]
+                caution_modules = [m for m in scored_modules if m.caution and not m.blocked]
+                eligible_modules = [m for m in scored_modules if not m.blocked]
+                
+                # Step 5: Rank by score
+                eligible_modules.sort(key=lambda m: m.final_score, reverse=True)
+                
+                # Step 6: Select top recommendations (limit to reasonable number)
+                recommended = eligible_modules[:max_modules]
             
             # Calculate processing time
             end_time = datetime.utcnow()
@@ -1309,31 +1546,19 @@ class BrainOrchestrator:
         NOTE (v1.1.3): Migration 016 eliminated UNIVERSAL/UNISEX products.
         All products are now explicitly MAXimo² (male) or MAXima² (female).
         """
-        modules = await load_catalog_from_wiring()
+        catalog_modules = await get_catalog_modules()
+        modules = list(catalog_modules.modules)
         
-        # Filter by sex
+        # Filter by sex - strict gender matching, no UNIVERSAL fallback
         if sex:
             gender = sex.value if isinstance(sex, SexType) else sex
-            filtered = []
-            for m in modules:
-                os_env = m.get("os_environment", "").lower()
-                product_line = m.get("product_line", "").lower()
-                sex_target = m.get("sex_target", "").lower()
-                
-                # Strict gender matching - no UNIVERSAL fallback
-                if gender == "male":
-                    if os_env == "maximo²" or product_line == "maximo²" or sex_target == "male":
-                        filtered.append(m)
-                elif gender == "female":
-                    if os_env == "maxima²" or product_line == "maxima²" or sex_target == "female":
-                        filtered.append(m)
-            modules = filtered
+            modules = [m for m in modules if gender in _module_genders(m)]
         
         # Filter by category
         if category:
             modules = [m for m in modules if m.get("category", "").lower() == category.lower()]
         
-        return modules[:limit]
+        return [_public_module(m) for m in modules[:limit]]
 
 # =============================================================================
 # SINGLETON INSTANCE
@@ -1357,21 +1582,22 @@ INTEGRATION WITH BLOODWORK ENGINE:
 1. BloodworkCanonical arrives with markers, safety gates, blocked/caution lists
 2. Brain orchestrator receives canonical data
 3. Detects deficiencies from markers
-4. Loads catalog from wiring endpoint (cached for 5 minutes)
+4. Loads catalog from the in-process CatalogWiring snapshot
 5. Scores modules against deficiencies + goals + lifecycle
 6. Enforces safety constraints (blocked ingredients)
 7. Returns ranked recommendations
 
-CATALOG LOADING (v1.1.3):
-- Uses /api/v1/catalog/wiring/products endpoint
+CATALOG LOADING (v1.1.4):
+- Reads app.catalog.wiring snapshots directly (no self-HTTP)
 - Maps ingredient_tags to target_biomarkers via INGREDIENT_BIOMARKER_MAP
-- Caches catalog in memory for 5 minutes (CATALOG_CACHE_TTL_SECONDS)
-- Falls back to stale cache on errors
+- Module records, lowercase ingredient sets and gender partitions are
+  built once per catalog version (get_catalog_modules)
+- No stale/empty fallback: an unavailable catalog fails the run
 - NOW INCLUDES os_environment in module responses
 - UNIVERSAL/UNISEX filtering REMOVED per migration 016
 
 EXPORTS FOR brain_routes.py:
-- BRAIN_ORCHESTRATOR_VERSION: Version constant "1.1.3"
+- BRAIN_ORCHESTRATOR_VERSION: Version constant "1.1.5"
 - SexType: Enum with MALE, FEMALE
 - ConstraintType: Enum with BLOCK, LIMIT, CAUTION, BOOST
 - BrainInput: Pydantic model for pipeline input
@@ -1405,6 +1631,22 @@ SCORING ALGORITHM:
 - Lifecycle bonus: +15-25 for recommended/required
 - Confidence multiplier: 0.5 + (confidence * 0.5)
 - Caution penalty: 0.8x final score
+- run() scores with ModuleMatrix (NumPy, per catalog version and gender);
+  score_module() is the reference implementation and NumPy-less fallback
+
+CHANGELOG v1.1.5:
+- ModuleMatrix: per catalog version/gender ingredient and biomarker row
+  indexes plus precomputed goal/lifecycle keyword hits
+- run() ranks all modules with a few array operations and only builds
+  ModuleScore objects for returned modules (identical results)
+- GOAL_KEYWORDS, TIER_SCORES, SEVERITY_MULTIPLIERS lifted to module level
+- Benchmark: scripts/benchmark_brain_scoring.py
+
+CHANGELOG v1.1.4:
+- load_catalog_from_wiring() reads CatalogWiring in process instead of
+  fetching /api/v1/catalog/wiring/products from API_BASE_URL
+- Derived module records are precomputed per catalog snapshot version
+- REMOVED 5 minute TTL cache and stale/empty fallback
 
 CHANGELOG v1.1.3:
 - REMOVED "universal" and "unisex" eligibility checks from load_supplement_catalog()
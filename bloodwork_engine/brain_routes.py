@@ -12,13 +12,13 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, HTTPException, Query, Body
 from pydantic import BaseModel, Field
-import asyncpg
 import os
 
 # Import the brain orchestrator
 from bloodwork_engine.brain_orchestrator import (
     BrainOrchestrator,
     BrainInput,
+    get_pool,
     SexType,
     ConstraintType
 )
@@ -482,8 +482,8 @@ async def health_check():
                 "timestamp": datetime.utcnow().isoformat()
             }
         
-        conn = await asyncpg.connect(database_url)
-        try:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
             # Query os_modules_v3_1 - simple count without governance_status filter
             result = await conn.fetchval(
                 "SELECT COUNT(*) FROM os_modules_v3_1"
@@ -496,8 +496,6 @@ async def health_check():
                 "version": "1.1.1",
                 "timestamp": datetime.utcnow().isoformat()
             }
-        finally:
-            await conn.close()
             
     except Exception as e:
         logger.error(f"Health check error: {e}")
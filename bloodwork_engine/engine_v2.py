@@ -32,6 +32,11 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:  # Batch gate evaluation only
+    np = None
+
 # Configure logging
 logger = logging.getLogger("bloodwork_engine_v2")
 logger.setLevel(logging.INFO)
@@ -44,6 +49,11 @@ ENGINE_VERSION = "2.0.0"
 REGISTRY_FILE = "marker_registry_v2_0.json"
 RANGES_FILE = "reference_ranges_v2_0.json"
 
+# Reference range index bucket keys (see BloodworkDataLoader._build_range_index)
+_RANGE_ALL_SEXES = None          # no sex supplied: every range matches on sex
+_RANGE_NEUTRAL = "__neutral__"   # unseen sex: only ranges without a specific sex
+_RANGE_BOTH = "__both__"         # explicit sex == "both" (final fallback pass)
+
 # ============================================================
 # ENUMS AND DATA CLASSES
 # ============================================================
@@ -157,6 +167,496 @@ class BloodworkResult:
     output_hash: str
 
 
+# ============================================================
+# SAFETY GATE RULE TABLE
+# ============================================================
+#
+# Gate definitions in reference_ranges_v2_0.json (get_all_gates_flat) are
+# compiled once at load time into GateRule entries. The JSON supplies
+# markers, thresholds, names, routing constraints, sex restriction and
+# ingredient lists; GATE_RULE_SPECS below supplies what the JSON only states
+# as prose: comparator per term, how terms combine, trigger precedence and
+# the description text the engine emits.
+#
+# Threshold keys resolve to a 4-tuple indexed by
+#   (0 if sex == "male" else 1) + (0 if under_40 else 2)
+# so scalar, sex-split and sex+age-split thresholds share one lookup.
+
+# Term: (marker, comparator, threshold key | (male_key, female_key) |
+#        (male_u40, female_u40, male_o40, female_o40))
+GATE_RULE_SPECS: Dict[str, Dict[str, Any]] = {
+    "GATE_001": {
+        "description": "Block iron supplementation when ferritin elevated",
+        "terms": [("ferritin", ">", ("threshold_male", "threshold_female"))],
+        "exception": ("hs_crp", ">", 3.0, "Acute inflammation (CRP > 3) - defer ferritin interpretation"),
+    },
+    "GATE_002": {
+        "description": "Caution vitamin D when calcium elevated",
+        "terms": [("calcium_serum", ">", "threshold")],
+    },
+    "GATE_003": {
+        "description": "Caution hepatotoxic supplements when liver enzymes elevated",
+        "terms": [
+            ("alt", ">", ("threshold_male", "threshold_female")),
+            ("ast", ">", ("threshold_male", "threshold_female")),
+        ],
+    },
+    "GATE_004": {
+        "description": "Caution renally-cleared supplements with impaired kidney function",
+        "terms": [
+            ("egfr", "<", "egfr_threshold"),
+            ("creatinine", ">", ("creatinine_threshold_male", "creatinine_threshold_female")),
+        ],
+        # Engine emits supplement ingredients only (JSON also lists nsaids)
+        "caution_ingredients": ["creatine", "high_dose_protein"],
+    },
+    "GATE_005": {
+        "description": "Flag acute inflammation - defer iron interpretation",
+        "terms": [("hs_crp", ">", "threshold")],
+    },
+    "GATE_006": {
+        "description": "Block potassium with hyperkalemia",
+        "terms": [("potassium", ">", "threshold")],
+    },
+    "GATE_007": {
+        "description": "Flag low potassium for electrolyte support",
+        "terms": [("potassium", "<", "threshold")],
+    },
+    "GATE_008": {
+        "description": "Block iodine with hyperthyroidism",
+        "terms": [("tsh", "<", "threshold")],
+    },
+    "GATE_009": {
+        "description": "Flag elevated TSH for thyroid support",
+        "terms": [("tsh", ">", "threshold")],
+    },
+    "GATE_010": {
+        "description": "Flag B12 deficiency",
+        "terms": [("vitamin_b12", "<", "threshold")],
+    },
+    "GATE_011": {
+        "description": "Flag folate deficiency",
+        "terms": [("folate_serum", "<", "threshold")],
+    },
+    "GATE_012": {
+        "description": "Flag elevated homocysteine for methylation support",
+        "terms": [("homocysteine", ">", "threshold")],
+    },
+    "GATE_013": {
+        "description": "Caution purine supplements with elevated uric acid",
+        "terms": [("uric_acid", ">", ("threshold_male", "threshold_female"))],
+    },
+    "GATE_014": {
+        "description": "Caution blood-thinning supplements with low platelets",
+        "terms": [("platelet_count", "<", "threshold")],
+    },
+    "GATE_015": {
+        "description": "Flag omega-3 deficiency - high priority",
+        "terms": [("omega3_index", "<", "threshold")],
+    },
+    "GATE_016": {
+        "description": "Omega-3 sufficient - reduce dosing",
+        "terms": [("omega3_index", ">", "threshold")],
+    },
+    "GATE_017": {
+        "description": "Caution zinc excess - reduce zinc dosing",
+        "terms": [("zinc_copper_ratio", ">", "threshold_ratio")],
+    },
+    "GATE_018": {
+        "description": "Flag insulin resistance for metabolic support",
+        "terms": [
+            ("homa_ir", ">", "homa_ir_threshold"),
+            ("fasting_insulin", ">", "insulin_threshold"),
+        ],
+    },
+    "GATE_019": {
+        "description": "Flag IDA - override iron block",
+        "mode": "all",
+        "terms": [
+            ("hemoglobin", "<", ("hemoglobin_threshold_male", "hemoglobin_threshold_female")),
+            ("ferritin", "<", "ferritin_threshold"),
+        ],
+    },
+    "GATE_020": {
+        "description": "Caution fish oil dose with very high triglycerides",
+        "terms": [("triglycerides", ">", "threshold")],
+    },
+    "GATE_021": {
+        "description": "MTHFR variant - methylfolate required",
+        "mode": "genotype",
+        "genotypes": [
+            {"mthfr_c677t": "TT"},
+            {"mthfr_c677t": "CT", "mthfr_a1298c": "AC"},  # Compound heterozygous
+        ],
+        "trigger_marker": "mthfr_c677t",
+        "threshold": "TT or compound",
+        "recommended_from": "required_ingredients",
+    },
+    "GATE_022": {
+        "description": "Flag elevated morning cortisol",
+        "terms": [("cortisol_am", ">", "threshold")],
+    },
+    "GATE_023": {
+        "description": "Flag low cortisol for adrenal support",
+        "terms": [("cortisol_am", "<", "threshold")],
+    },
+    "GATE_024": {
+        "description": "Flag low DHEA-S for hormonal support",
+        "terms": [("dhea_s", "<", (
+            "threshold_under_40_male", "threshold_under_40_female",
+            "threshold_over_40_male", "threshold_over_40_female",
+        ))],
+    },
+    "GATE_025": {
+        "description": "Flag poor T4-to-T3 conversion",
+        "terms": [("rt3_ft3_ratio", ">", "threshold_ratio")],
+    },
+    "GATE_026": {
+        "description": "Flag low fT3 for thyroid support",
+        "terms": [("free_t3", "<", "threshold")],
+    },
+    "GATE_027": {
+        "description": "Flag low testosterone for support",
+        "terms": [
+            ("total_testosterone", "<", "total_t_threshold"),
+            ("free_testosterone", "<", "free_t_threshold"),
+        ],
+    },
+    "GATE_028": {
+        "description": "Flag estrogen dominance",
+        "terms": [("estradiol_progesterone_ratio", ">", "threshold_ratio")],
+    },
+    "GATE_029": {
+        "description": "Flag elevated ApoB for cardiovascular support",
+        "terms": [("apolipoprotein_b", ">", "threshold")],
+    },
+    "GATE_030": {
+        "description": "Flag elevated Lp(a) - genetic CVD risk",
+        "terms": [("lp_a", ">", "threshold")],
+    },
+    "GATE_031": {
+        "description": "Flag elevated GGT for oxidative stress support",
+        "terms": [("ggt", ">", ("threshold_male", "threshold_female"))],
+    },
+}
+
+_GATE_TIER_ORDER = [GateTier.TIER1_SAFETY, GateTier.TIER2_OPTIMIZATION, GateTier.TIER3_GENETIC_HORMONAL]
+
+
+@dataclass(frozen=True)
+class GateTerm:
+    """One compiled comparison: marker <op> threshold[sex/age index]."""
+    marker: str
+    greater: bool  # True for ">", False for "<"
+    thresholds: Tuple[Any, Any, Any, Any]
+
+
+@dataclass(frozen=True)
+class GateRule:
+    """A compiled safety gate, evaluated by SafetyGateEvaluator."""
+    gate_id: str
+    name: str
+    tier: GateTier
+    description: str
+    action: GateAction
+    routing_constraint: str
+    mode: str  # "any", "all" or "genotype"
+    terms: Tuple[GateTerm, ...] = ()
+    genotypes: Tuple[Tuple[Tuple[str, str], ...], ...] = ()
+    trigger_marker: Optional[str] = None
+    fixed_threshold: Optional[str] = None
+    sex: Optional[str] = None
+    exception: Optional[Tuple[str, float, str]] = None  # (marker, greater-than value, reason)
+    blocked_ingredients: Tuple[str, ...] = ()
+    caution_ingredients: Tuple[str, ...] = ()
+    recommended_ingredients: Tuple[str, ...] = ()
+
+
+@dataclass
+class GateBatchResult:
+    """Vectorized gate evaluation for N panels (rows) x R rules (columns)."""
+    gate_ids: Tuple[str, ...]
+    routing_constraints: Tuple[str, ...]
+    triggered: Any  # np.ndarray[bool] (N, R)
+    excepted: Any   # np.ndarray[bool] (N, R)
+    
+    @property
+    def active(self) -> Any:
+        return self.triggered & ~self.excepted
+    
+    def panel_gate_ids(self, i: int) -> List[str]:
+        return [self.gate_ids[j] for j in range(len(self.gate_ids)) if self.triggered[i, j]]
+    
+    def panel_routing_constraints(self, i: int) -> List[str]:
+        active = self.active[i]
+        return sorted({self.routing_constraints[j] for j in range(len(self.gate_ids)) if active[j]})
+
+
+def _gate_action_for(routing_constraint: str) -> GateAction:
+    if routing_constraint.startswith("BLOCK_"):
+        return GateAction.BLOCK
+    if routing_constraint.startswith("CAUTION_"):
+        return GateAction.CAUTION
+    return GateAction.FLAG
+
+
+def _resolve_thresholds(gate_def: Dict, key: Union[str, Tuple[str, ...]]) -> Tuple[Any, Any, Any, Any]:
+    """Resolve a threshold key spec against the JSON gate definition."""
+    keys = (key,) if isinstance(key, str) else tuple(key)
+    missing = [k for k in keys if k not in gate_def]
+    if missing:
+        raise ValueError(f"{gate_def.get('gate_id')}: missing threshold keys {missing}")
+    values = [gate_def[k] for k in keys]
+    if len(values) == 1:
+        return (values[0],) * 4
+    if len(values) == 2:
+        return (values[0], values[1], values[0], values[1])
+    if len(values) == 4:
+        return tuple(values)
+    raise ValueError(f"{gate_def.get('gate_id')}: unsupported threshold spec {key}")
+
+
+def compile_gate_rules(gate_definitions: Dict[str, Dict]) -> Tuple[GateRule, ...]:
+    """
+    Compile JSON gate definitions (get_all_gates_flat) into an ordered rule table.
+    
+    Raises:
+        ValueError: If a gate has no spec, or its definition lacks a threshold
+    """
+    tiers = {t.value: t for t in GateTier}
+    ordered = sorted(
+        gate_definitions.values(),
+        key=lambda g: (_GATE_TIER_ORDER.index(tiers[g["tier_key"]]), g["gate_id"])
+    )
+    rules = []
+    for gate_def in ordered:
+        gate_id = gate_def["gate_id"]
+        spec = GATE_RULE_SPECS.get(gate_id)
+        if spec is None:
+            raise ValueError(f"{gate_id}: no rule spec for gate definition")
+        routing_constraint = gate_def["action"]
+        mode = spec.get("mode", "any")
+        
+        terms = tuple(
+            GateTerm(marker=marker, greater=(op == ">"), thresholds=_resolve_thresholds(gate_def, key))
+            for marker, op, key in spec.get("terms", [])
+        )
+        genotypes = tuple(tuple(sorted(g.items())) for g in spec.get("genotypes", []))
+        
+        exception = None
+        if "exception" in spec:
+            marker, op, value, reason = spec["exception"]
+            exception = (marker, value, reason)
+        
+        recommended_key = spec.get("recommended_from", "recommended_ingredients")
+        rules.append(GateRule(
+            gate_id=gate_id,
+            name=gate_def["name"],
+            tier=tiers[gate_def["tier_key"]],
+            description=spec["description"],
+            action=_gate_action_for(routing_constraint),
+            routing_constraint=routing_constraint,
+            mode=mode,
+            terms=terms,
+            genotypes=genotypes,
+            trigger_marker=spec.get("trigger_marker"),
+            fixed_threshold=spec.get("threshold"),
+            sex=gate_def.get("sex"),
+            exception=exception,
+            blocked_ingredients=tuple(spec.get("blocked_ingredients", gate_def.get("blocked_ingredients", []))),
+            caution_ingredients=tuple(spec.get("caution_ingredients", gate_def.get("caution_ingredients", []))),
+            recommended_ingredients=tuple(spec.get("recommended_ingredients", gate_def.get(recommended_key, []))),
+        ))
+    return tuple(rules)
+
+
+def _threshold_index(sex: Optional[str], age: Optional[int]) -> int:
+    return (0 if sex == "male" else 1) + (0 if (age and age < 40) else 2)
+
+
+class SafetyGateEvaluator:
+    """
+    Single-pass evaluator over the compiled gate rule table.
+    
+    evaluate() returns the same SafetyGate list (order and field values) as
+    the hand-written tier methods; evaluate_batch() scores many panels at
+    once with NumPy, one column per marker.
+    """
+    
+    def __init__(self, rules: Tuple[GateRule, ...]):
+        self.rules = rules
+        markers = []
+        for rule in rules:
+            for term in rule.terms:
+                markers.append(term.marker)
+            for genotype in rule.genotypes:
+                markers.extend(m for m, _ in genotype)
+            if rule.exception:
+                markers.append(rule.exception[0])
+        self.marker_columns: Tuple[str, ...] = tuple(dict.fromkeys(markers))
+        self.genotype_markers = frozenset(m for rule in rules for g in rule.genotypes for m, _ in g)
+    
+    @classmethod
+    def from_definitions(cls, gate_definitions: Dict[str, Dict]) -> "SafetyGateEvaluator":
+        return cls(compile_gate_rules(gate_definitions))
+    
+    def evaluate(self, values: Dict[str, Any], sex: Optional[str], age: Optional[int]) -> List[SafetyGate]:
+        """Evaluate every rule against one panel's canonical + computed values."""
+        idx = _threshold_index(sex, age)
+        gates = []
+        for rule in self.rules:
+            if rule.sex is not None and rule.sex != sex:
+                continue
+            
+            if rule.mode == "genotype":
+                if not any(all(values.get(m) == v for m, v in g) for g in rule.genotypes):
+                    continue
+                trigger_marker = rule.trigger_marker
+                trigger_value = values.get(trigger_marker)
+                threshold = rule.fixed_threshold
+            elif rule.mode == "all":
+                hit = True
+                for term in rule.terms:
+                    v = values.get(term.marker)
+                    t = term.thresholds[idx]
+                    if v is None or not (v > t if term.greater else v < t):
+                        hit = False
+                        break
+                if not hit:
+                    continue
+                first = rule.terms[0]
+                trigger_marker = first.marker
+                trigger_value = values.get(first.marker)
+                threshold = first.thresholds[idx]
+            else:
+                hit = False
+                trigger = None
+                for term in rule.terms:
+                    v = values.get(term.marker)
+                    if v is None:
+                        continue
+                    t = term.thresholds[idx]
+                    if v > t if term.greater else v < t:
+                        hit = True
+                        # Trigger is the first satisfied term with a truthy value
+                        if v and trigger is None:
+                            trigger = term
+                if not hit:
+                    continue
+                if trigger is None:
+                    trigger = rule.terms[-1]
+                trigger_marker = trigger.marker
+                trigger_value = values.get(trigger.marker)
+                threshold = trigger.thresholds[idx]
+            
+            exception_active = False
+            exception_reason = None
+            if rule.exception is not None:
+                marker, limit, reason = rule.exception
+                v = values.get(marker)
+                if v is not None and v > limit:
+                    exception_active = True
+                    exception_reason = reason
+            
+            gates.append(SafetyGate(
+                gate_id=rule.gate_id,
+                name=rule.name,
+                tier=rule.tier,
+                description=rule.description,
+                trigger_marker=trigger_marker,
+                trigger_value=trigger_value,
+                threshold=threshold,
+                action=rule.action,
+                routing_constraint=rule.routing_constraint,
+                blocked_ingredients=list(rule.blocked_ingredients),
+                caution_ingredients=list(rule.caution_ingredients),
+                recommended_ingredients=list(rule.recommended_ingredients),
+                exception_active=exception_active,
+                exception_reason=exception_reason
+            ))
+        return gates
+    
+    def build_columns(self, panels: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build NumPy marker columns from per-panel value dicts.
+        
+        Numeric markers become float64 columns (NaN = missing); genotype
+        markers become object columns (None = missing).
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for batch gate evaluation")
+        columns = {}
+        for marker in self.marker_columns:
+            if marker in self.genotype_markers:
+                columns[marker] = np.array([p.get(marker) for p in panels], dtype=object)
+            else:
+                columns[marker] = np.array(
+                    [np.nan if p.get(marker) is None else p.get(marker) for p in panels],
+                    dtype=np.float64
+                )
+        return columns
+    
+    def evaluate_batch(
+        self,
+        columns: Dict[str, Any],
+        sex: List[Optional[str]],
+        age: List[Optional[int]]
+    ) -> GateBatchResult:
+        """
+        Evaluate all rules for N panels at once.
+        
+        Args:
+            columns: marker -> array of length N (see build_columns)
+            sex: per-panel sex
+            age: per-panel age (None allowed)
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for batch gate evaluation")
+        n = len(sex)
+        sex_arr = np.array(sex, dtype=object)
+        age_arr = np.array([np.nan if a is None else a for a in age], dtype=np.float64)
+        male = sex_arr == "male"
+        under_40 = (age_arr != 0) & (age_arr < 40)
+        idx = np.where(male, 0, 1) + np.where(under_40, 0, 2)
+        
+        missing_numeric = np.full(n, np.nan)
+        missing_object = np.full(n, None, dtype=object)
+        
+        triggered = np.zeros((n, len(self.rules)), dtype=bool)
+        excepted = np.zeros((n, len(self.rules)), dtype=bool)
+        
+        for j, rule in enumerate(self.rules):
+            if rule.mode == "genotype":
+                hit = np.zeros(n, dtype=bool)
+                for genotype in rule.genotypes:
+                    match = np.ones(n, dtype=bool)
+                    for marker, value in genotype:
+                        match &= columns.get(marker, missing_object) == value
+                    hit |= match
+            else:
+                term_hits = []
+                for term in rule.terms:
+                    col = columns.get(term.marker, missing_numeric)
+                    thr = np.asarray(term.thresholds, dtype=np.float64)[idx]
+                    term_hits.append(col > thr if term.greater else col < thr)
+                hit = np.logical_and.reduce(term_hits) if rule.mode == "all" else np.logical_or.reduce(term_hits)
+            
+            if rule.sex is not None:
+                hit &= sex_arr == rule.sex
+            triggered[:, j] = hit
+            
+            if rule.exception is not None:
+                marker, limit, _ = rule.exception
+                excepted[:, j] = hit & (columns.get(marker, missing_numeric) > limit)
+        
+        return GateBatchResult(
+            gate_ids=tuple(r.gate_id for r in self.rules),
+            routing_constraints=tuple(r.routing_constraint for r in self.rules),
+            triggered=triggered,
+            excepted=excepted,
+        )
+
+
 # ============================================================
 # DATA LOADER (SINGLETON CACHE)
 # ============================================================
@@ -179,8 +679,11 @@ class BloodworkDataLoader:
             self._marker_registry = None
             self._reference_ranges = None
             self._marker_lookup = {}
+            self._marker_def_lookup = {}
             self._conversion_lookup = {}
             self._safety_gates_lookup = {}
+            self._range_index = {}
+            self._gate_evaluator = None
             self._load_data()
             BloodworkDataLoader._loaded = True
     
@@ -216,7 +719,9 @@ class BloodworkDataLoader:
             self._reference_ranges = {"ranges": [], "lab_profiles": [], "policy": {}, "safety_gates": {}}
         
         self._build_indexes()
+        self._build_range_index()
         self._build_safety_gates_index()
+        self._compile_gate_rules()
         self._validate_ranges()
     
     def _build_indexes(self):
@@ -224,6 +729,7 @@ class BloodworkDataLoader:
         for marker in self._marker_registry.get("markers", []):
             code = marker["code"]
             self._marker_lookup[code.lower()] = code
+            self._marker_def_lookup.setdefault(code, marker)
             for alias in marker.get("aliases", []):
                 self._marker_lookup[alias.lower()] = code
         
@@ -235,6 +741,42 @@ class BloodworkDataLoader:
         
         logger.info(f"Built indexes: {len(self._marker_lookup)} aliases, {len(self._conversion_lookup)} conversions")
     
+    def _build_range_index(self):
+        """
+        Precompile reference ranges into a (marker_code, lab_profile) index.
+
+        Each key maps sex buckets to a tuple of (age_min, age_max, range_def)
+        kept in file order, so the first age-interval hit in a bucket is the
+        same range the linear scan in get_reference_range_scan() returns.
+        """
+        grouped: Dict[Tuple[str, str], List[Dict]] = {}
+        for r in self._reference_ranges.get("ranges", []):
+            grouped.setdefault((r.get("marker_code"), r.get("lab_profile")), []).append(r)
+        
+        specific_sexes = {
+            r.get("sex") for r in self._reference_ranges.get("ranges", [])
+            if r.get("sex") and r.get("sex") != "both"
+        }
+        
+        def _entries(rs: List[Dict]) -> Tuple[Tuple[Optional[int], Optional[int], Dict], ...]:
+            return tuple((r.get("age_min"), r.get("age_max"), r) for r in rs)
+        
+        def _is_neutral(r: Dict) -> bool:
+            return not r.get("sex") or r.get("sex") == "both"
+        
+        self._range_index = {}
+        for key, rs in grouped.items():
+            buckets = {
+                _RANGE_ALL_SEXES: _entries(rs),
+                _RANGE_NEUTRAL: _entries([r for r in rs if _is_neutral(r)]),
+                _RANGE_BOTH: _entries([r for r in rs if r.get("sex") == "both"]),
+            }
+            for sex in specific_sexes:
+                buckets[sex] = _entries([r for r in rs if _is_neutral(r) or r.get("sex") == sex])
+            self._range_index[key] = buckets
+        
+        logger.info(f"Indexed {len(self._range_index)} reference range keys")
+    
     def _build_safety_gates_index(self):
         """Build safety gates lookup index."""
         safety_gates = self._reference_ranges.get("safety_gates", {})
@@ -251,6 +793,16 @@ class BloodworkDataLoader:
         
         logger.info(f"Indexed {len(self._safety_gates_lookup)} safety gates")
     
+    def _compile_gate_rules(self):
+        """Compile gate definitions into the table-driven evaluator."""
+        try:
+            self._gate_evaluator = SafetyGateEvaluator.from_definitions(self.get_all_gates_flat())
+            logger.info(f"Compiled {len(self._gate_evaluator.rules)} safety gate rules")
+        except (KeyError, ValueError) as e:
+            # Engine falls back to the hand-written tier evaluation
+            self._gate_evaluator = None
+            logger.error(f"Safety gate rule compilation failed: {e}")
+    
     def _validate_ranges(self):
         """Validate that all ranges reference valid markers and units."""
         allowed_codes = set(self._marker_registry.get("allowed_marker_codes", []))
@@ -277,6 +829,10 @@ class BloodworkDataLoader:
     def reference_ranges(self) -> Dict:
         return self._reference_ranges
     
+    @property
+    def gate_evaluator(self) -> Optional[SafetyGateEvaluator]:
+        return self._gate_evaluator
+    
     @property
     def ruleset_version(self) -> str:
         registry_v = self._marker_registry.get("version", "?")
@@ -371,10 +927,7 @@ class BloodworkDataLoader:
         canonical = self._marker_lookup.get(code_or_alias.lower())
         if not canonical:
             return None
-        for marker in self._marker_registry.get("markers", []):
-            if marker["code"] == canonical:
-                return marker
-        return None
+        return self._marker_def_lookup.get(canonical)
     
     def resolve_marker_code(self, code_or_alias: str) -> Optional[str]:
         return self._marker_lookup.get(code_or_alias.lower())
@@ -397,7 +950,66 @@ class BloodworkDataLoader:
         sex: Optional[str] = None,
         age: Optional[int] = None
     ) -> Tuple[Optional[Dict], str, bool]:
-        """Get reference range for a marker."""
+        """
+        Get reference range for a marker.
+        
+        Indexed lookup with the same fallback order as the scan:
+        lab_profile -> GLOBAL_CONSERVATIVE -> GLOBAL_CONSERVATIVE sex "both".
+        """
+        sex_key = sex or _RANGE_ALL_SEXES
+        
+        r = self._lookup_range(marker_code, lab_profile, sex_key, age)
+        if r is not None:
+            return (r, lab_profile, False)
+        
+        if lab_profile != "GLOBAL_CONSERVATIVE":
+            r = self._lookup_range(marker_code, "GLOBAL_CONSERVATIVE", sex_key, age)
+            if r is not None:
+                return (r, "GLOBAL_CONSERVATIVE", True)
+        
+        if sex:
+            r = self._lookup_range(marker_code, "GLOBAL_CONSERVATIVE", _RANGE_BOTH, age)
+            if r is not None:
+                return (r, "GLOBAL_CONSERVATIVE", True)
+        
+        return (None, None, False)
+    
+    def _lookup_range(
+        self,
+        marker_code: str,
+        lab_profile: str,
+        sex_key: Optional[str],
+        age: Optional[int]
+    ) -> Optional[Dict]:
+        """First range in a (marker, profile, sex) bucket whose age interval contains age."""
+        buckets = self._range_index.get((marker_code, lab_profile))
+        if not buckets:
+            return None
+        entries = buckets.get(sex_key)
+        if entries is None:
+            entries = buckets[_RANGE_NEUTRAL]
+        for age_min, age_max, r in entries:
+            if age is None:
+                return r
+            if age_min is not None and age < age_min:
+                continue
+            if age_max is not None and age > age_max:
+                continue
+            return r
+        return None
+    
+    def get_reference_range_scan(
+        self, 
+        marker_code: str, 
+        lab_profile: str, 
+        sex: Optional[str] = None,
+        age: Optional[int] = None
+    ) -> Tuple[Optional[Dict], str, bool]:
+        """
+        Reference implementation: linear scan over all ranges.
+        
+        Kept for parity tests against the indexed get_reference_range().
+        """
         ranges = self._reference_ranges.get("ranges", [])
         
         for r in ranges:
@@ -878,7 +1490,23 @@ class BloodworkEngineV2:
         sex: Optional[str],
         age: Optional[int]
     ) -> List[SafetyGate]:
-        """Evaluate all safety gates across all tiers."""
+        """Evaluate all safety gates across all tiers (compiled rule table)."""
+        evaluator = self.loader.gate_evaluator
+        if evaluator is None:
+            return self._evaluate_all_safety_gates_legacy(processed, computed, sex, age)
+        
+        marker_values = {m.canonical_code: m.canonical_value for m in processed if m.canonical_code}
+        marker_values.update({c.code: c.value for c in computed})
+        return evaluator.evaluate(marker_values, sex, age)
+    
+    def _evaluate_all_safety_gates_legacy(
+        self,
+        processed: List[ProcessedMarker],
+        computed: List[ComputedMarker],
+        sex: Optional[str],
+        age: Optional[int]
+    ) -> List[SafetyGate]:
+        """Evaluate all safety gates via the per-tier if-chains."""
         gates = []
         
         # Build marker values lookup
@@ -8,7 +8,6 @@ Version: 1.0.0
 """
 
 import os
-import httpx
 import hashlib
 import hmac
 from datetime import datetime
@@ -17,6 +16,8 @@ from enum import Enum
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, Request, Header, BackgroundTasks
 
+from app.shared.http_clients import get_async_client
+
 router = APIRouter(prefix="/api/v1/labs", tags=["labs"])
 
 # =============================================================================
@@ -175,23 +176,22 @@ class JunctionClient:
     
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make authenticated request to Junction API."""
-        async with httpx.AsyncClient() as client:
-            url = f"{self.base_url}{endpoint}"
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=self.headers,
-                **kwargs
+        url = f"{self.base_url}{endpoint}"
+        response = await get_async_client("junction").request(
+            method=method,
+            url=url,
+            headers=self.headers,
+            **kwargs
+        )
+        
+        if response.status_code >= 400:
+            error_detail = response.json() if response.content else {"message": "Unknown error"}
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Junction API error: {error_detail}"
             )
-            
-            if response.status_code >= 400:
-                error_detail = response.json() if response.content else {"message": "Unknown error"}
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Junction API error: {error_detail}"
-                )
-            
-            return response.json() if response.content else {}
+        
+        return response.json() if response.content else {}
     
     async def create_user(self, user_id: str, patient: PatientInfo) -> Dict[str, Any]:
         """Create or get Junction user for GenoMAX² user."""
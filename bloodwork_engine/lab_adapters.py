@@ -36,6 +36,8 @@ from dataclasses import dataclass, asdict, field
 from datetime import datetime, date
 from enum import Enum
 
+from app.shared.http_clients import get_sync_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -339,16 +341,16 @@ class VitalAdapter(LabAdapter):
         url = f"{self.base_url}{endpoint}"
         
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.request(
-                    method=method,
-                    url=url,
-                    headers=self.headers,
-                    json=data,
-                    params=params
-                )
-                response.raise_for_status()
-                return response.json()
+            response = get_sync_client("junction").request(
+                method=method,
+                url=url,
+                headers=self.headers,
+                json=data,
+                params=params,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(f"Junction API error: {e.response.status_code} - {e.response.text}")
             raise
@@ -845,16 +847,16 @@ class LabTestingAPIAdapter(LabAdapter):
         url = f"{self.base_url}{endpoint}"
         
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.request(
-                    method=method,
-                    url=url,
-                    headers=self.headers,
-                    json=data,
-                    params=params
-                )
-                response.raise_for_status()
-                return response.json()
+            response = get_sync_client("lab_testing_api").request(
+                method=method,
+                url=url,
+                headers=self.headers,
+                json=data,
+                params=params,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(f"Lab Testing API error: {e.response.status_code} - {e.response.text}")
             raise
@@ -5,15 +5,24 @@ Add this to api_server.py or import as a separate router
 
 import os
 import uuid
+import json
 import hashlib
 import base64
-import httpx
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from pydantic import BaseModel, Field
 import asyncpg
 
+from app.shared.async_db_pool import AsyncPoolError, get_async_pool
+from app.shared.http_clients import get_async_client
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/v1/lab", tags=["Lab Integration"])
 
 # ============================================================================
@@ -24,6 +33,8 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 GCS_BUCKET = os.getenv("GCS_BUCKET_NAME", "genomax2-lab-uploads")
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_TYPES = {"application/pdf", "image/jpeg", "image/png", "image/webp"}
+# In-process entries of the upload extraction cache (the DB table is unbounded)
+EXTRACTION_CACHE_SIZE = int(os.getenv("LAB_EXTRACTION_CACHE_SIZE", "256"))
 
 # 13 Priority Biomarkers
 PRIORITY_BIOMARKERS = {
@@ -93,6 +104,7 @@ class OCRUploadResponse(BaseModel):
     needs_review: bool
     review_reasons: List[str]
     markers: List[ExtractedMarker]
+    cached: bool = False  # Served from the extraction cache (no OCR/LLM call)
 
 class SubmissionStatus(BaseModel):
     submission_id: str
@@ -106,6 +118,9 @@ class SubmissionStatus(BaseModel):
 # LLM EXTRACTION (Claude)
 # ============================================================================
 
+EXTRACTION_MODEL = "claude-sonnet-4-20250514"
+EXTRACTION_MAX_CHARS = 15000  # Limit input size
+
 EXTRACTION_PROMPT = """You are a medical lab report parser. Extract ALL biomarkers from this lab report.
 
 For EACH biomarker found, output a JSON object with:
@@ -136,41 +151,40 @@ async def extract_markers_with_llm(text: str) -> List[Dict[str, Any]]:
     if not ANTHROPIC_API_KEY:
         raise HTTPException(500, "ANTHROPIC_API_KEY not configured")
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": ANTHROPIC_API_KEY,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            },
-            json={
-                "model": "claude-sonnet-4-20250514",
-                "max_tokens": 4096,
-                "messages": [{
-                    "role": "user",
-                    "content": EXTRACTION_PROMPT + text[:15000]  # Limit input size
-                }]
-            }
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(500, f"LLM extraction failed: {response.text}")
-        
-        result = response.json()
-        content = result["content"][0]["text"]
-        
-        # Parse JSON from response
-        import json
-        try:
-            # Handle potential markdown code blocks
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-            return json.loads(content.strip())
-        except json.JSONDecodeError:
-            return []
+    response = await get_async_client("anthropic").post(
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": ANTHROPIC_API_KEY,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json"
+        },
+        json={
+            "model": EXTRACTION_MODEL,
+            "max_tokens": 4096,
+            "messages": [{
+                "role": "user",
+                "content": EXTRACTION_PROMPT + text[:EXTRACTION_MAX_CHARS]
+            }]
+        }
+    )
+    
+    if response.status_code != 200:
+        raise HTTPException(500, f"LLM extraction failed: {response.text}")
+    
+    result = response.json()
+    content = result["content"][0]["text"]
+    
+    # Parse JSON from response
+    import json
+    try:
+        # Handle potential markdown code blocks
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+        return json.loads(content.strip())
+    except json.JSONDecodeError:
+        return []
 
 # ============================================================================
 # OCR SIMULATION (replace with real GCS + Cloud Vision in production)
@@ -195,6 +209,10 @@ async def perform_ocr(file_content: bytes, content_type: str) -> str:
 # MARKER NORMALIZATION
 # ============================================================================
 
+# Bump when normalize_markers() changes behavior; alias and priority
+# edits are picked up by NORMALIZER_FINGERPRINT automatically.
+NORMALIZER_VERSION = "1"
+
 def normalize_marker_name(name: str) -> str:
     """Convert various marker names to GenoMAX² standard codes."""
     normalized = name.lower().strip()
@@ -260,16 +278,168 @@ def check_needs_review(markers: List[ExtractedMarker], confidence: float) -> tup
     
     return len(reasons) > 0, reasons
 
+# ============================================================================
+# EXTRACTION CACHE (content-addressed by upload hash)
+# ============================================================================
+
+# Sample extraction used while perform_ocr() is a placeholder
+SAMPLE_RAW_MARKERS = [
+    {"name": "Ferritin", "value": 85, "unit": "ng/mL", "reference_low": 30, "reference_high": 400, "flag": "N"},
+    {"name": "Vitamin D, 25-Hydroxy", "value": 32, "unit": "ng/mL", "reference_low": 30, "reference_high": 100, "flag": "N"},
+    {"name": "Vitamin B12", "value": 450, "unit": "pg/mL", "reference_low": 200, "reference_high": 900, "flag": "N"},
+    {"name": "Hemoglobin A1c", "value": 5.4, "unit": "%", "reference_low": 4.0, "reference_high": 5.6, "flag": "N"},
+]
+
+def _version_hash(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+# Cache entries are only reused for the same extraction and normalization
+PROMPT_VERSION = _version_hash(EXTRACTION_MODEL, EXTRACTION_PROMPT, EXTRACTION_MAX_CHARS)
+NORMALIZER_FINGERPRINT = _version_hash(NORMALIZER_VERSION, BIOMARKER_ALIASES, sorted(PRIORITY_BIOMARKERS))
+
+@dataclass
+class Extraction:
+    """OCR text, raw LLM markers and normalized markers for one upload."""
+    raw_text: str
+    raw_markers: List[Dict[str, Any]]
+    markers: List[ExtractedMarker]
+    source: str  # memory, database, renormalized or extracted
+
+    @property
+    def cached(self) -> bool:
+        return self.source != "extracted"
+
+_extraction_cache_lock = threading.Lock()
+_extraction_cache: "OrderedDict[Tuple[str, str, str], Extraction]" = OrderedDict()
+
+def _memory_get(key: Tuple[str, str, str]) -> Optional[Extraction]:
+    with _extraction_cache_lock:
+        entry = _extraction_cache.get(key)
+        if entry is not None:
+            _extraction_cache.move_to_end(key)
+        return entry
+
+def _memory_put(key: Tuple[str, str, str], extraction: Extraction) -> None:
+    with _extraction_cache_lock:
+        _extraction_cache[key] = extraction
+        _extraction_cache.move_to_end(key)
+        while len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+
+def _json_column(value: Any) -> Any:
+    # asyncpg returns JSONB as text unless a codec is registered
+    return json.loads(value) if isinstance(value, str) else value
+
+async def _load_cached_extraction(pool: asyncpg.Pool, file_hash: str) -> Optional[Any]:
+    """Cache row for file_hash, preferring the current prompt version."""
+    async with pool.acquire() as conn:
+        return await conn.fetchrow("""
+            UPDATE lab_extraction_cache c
+            SET hit_count = c.hit_count + 1, updated_at = NOW()
+            FROM (
+                SELECT file_hash, prompt_version FROM lab_extraction_cache
+                WHERE file_hash = $1
+                ORDER BY (prompt_version = $2) DESC, updated_at DESC
+                LIMIT 1
+            ) best
+            WHERE c.file_hash = best.file_hash AND c.prompt_version = best.prompt_version
+            RETURNING c.raw_text, c.prompt_version, c.raw_markers,
+                      c.normalizer_version, c.normalized_markers
+        """, file_hash, PROMPT_VERSION)
+
+async def _store_cached_extraction(pool: asyncpg.Pool, file_hash: str, extraction: Extraction) -> None:
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO lab_extraction_cache (
+                file_hash, prompt_version, raw_text, raw_markers,
+                normalizer_version, normalized_markers
+            ) VALUES ($1, $2, $3, $4, $5, $6)
+            ON CONFLICT (file_hash, prompt_version) DO UPDATE SET
+                raw_text = EXCLUDED.raw_text,
+                raw_markers = EXCLUDED.raw_markers,
+                normalizer_version = EXCLUDED.normalizer_version,
+                normalized_markers = EXCLUDED.normalized_markers,
+                updated_at = NOW()
+        """,
+            file_hash,
+            PROMPT_VERSION,
+            extraction.raw_text,
+            json.dumps(extraction.raw_markers),
+            NORMALIZER_FINGERPRINT,
+            json.dumps([m.model_dump() for m in extraction.markers])
+        )
+
+async def _try_store(pool: asyncpg.Pool, file_hash: str, extraction: Extraction) -> None:
+    try:
+        await _store_cached_extraction(pool, file_hash, extraction)
+    except Exception as e:
+        logger.warning(f"Extraction cache write failed for {file_hash[:12]}: {e}")
+
+async def get_extraction(
+    pool: Optional[asyncpg.Pool],
+    file_hash: str,
+    content: bytes,
+    content_type: str
+) -> Extraction:
+    """
+    OCR, extract and normalize an upload, reusing cached work by file hash.
+
+    Lookup order: in-process LRU, then lab_extraction_cache. A row from
+    another prompt version still saves the OCR call; a row from another
+    normalizer version is re-normalized without calling the LLM.
+    Placeholder OCR output and empty extractions are never cached. Cache
+    read/write failures fall back to extracting.
+    """
+    key = (file_hash, PROMPT_VERSION, NORMALIZER_FINGERPRINT)
+    cached = _memory_get(key)
+    if cached is not None:
+        return Extraction(cached.raw_text, cached.raw_markers, list(cached.markers), "memory")
+
+    row = None
+    if pool is not None:
+        try:
+            row = await _load_cached_extraction(pool, file_hash)
+        except Exception as e:
+            logger.warning(f"Extraction cache read failed for {file_hash[:12]}: {e}")
+
+    raw_text = row["raw_text"] if row else None
+    if row and row["prompt_version"] == PROMPT_VERSION:
+        raw_markers = _json_column(row["raw_markers"])
+        if row["normalizer_version"] == NORMALIZER_FINGERPRINT:
+            markers = [ExtractedMarker(**m) for m in _json_column(row["normalized_markers"])]
+            extraction = Extraction(raw_text, raw_markers, markers, "database")
+        else:
+            extraction = Extraction(raw_text, raw_markers, normalize_markers(raw_markers), "renormalized")
+            await _try_store(pool, file_hash, extraction)
+        _memory_put(key, extraction)
+        return extraction
+
+    if raw_text is None:
+        raw_text = await perform_ocr(content, content_type)
+
+    if raw_text.startswith("["):
+        # For testing without real OCR, use sample data
+        return Extraction(raw_text, SAMPLE_RAW_MARKERS, normalize_markers(SAMPLE_RAW_MARKERS), "extracted")
+
+    # Real LLM extraction
+    raw_markers = await extract_markers_with_llm(raw_text)
+    extraction = Extraction(raw_text, raw_markers, normalize_markers(raw_markers), "extracted")
+    if raw_markers:
+        _memory_put(key, extraction)
+        if pool is not None:
+            await _try_store(pool, file_hash, extraction)
+    return extraction
+
 # ============================================================================
 # DATABASE OPERATIONS
 # ============================================================================
 
-async def get_db_pool():
-    """Get database connection pool."""
-    database_url = os.getenv("DATABASE_URL")
-    if not database_url:
-        raise HTTPException(500, "DATABASE_URL not configured")
-    return await asyncpg.create_pool(database_url, min_size=1, max_size=5)
+async def get_db_pool() -> asyncpg.Pool:
+    """Get the application-lifetime asyncpg pool (never close it here)."""
+    try:
+        return await get_async_pool()
+    except AsyncPoolError as e:
+        raise HTTPException(500, str(e))
 
 async def save_submission(
     pool: asyncpg.Pool,
@@ -341,24 +511,17 @@ async def upload_lab_results(
     # Calculate hash for deduplication
     file_hash = hashlib.sha256(content).hexdigest()
     
-    # Perform OCR
-    raw_text = await perform_ocr(content, file.content_type)
-    
-    # For testing without real OCR, use sample data
-    if raw_text.startswith("["):
-        # Simulate with sample extraction
-        raw_markers = [
-            {"name": "Ferritin", "value": 85, "unit": "ng/mL", "reference_low": 30, "reference_high": 400, "flag": "N"},
-            {"name": "Vitamin D, 25-Hydroxy", "value": 32, "unit": "ng/mL", "reference_low": 30, "reference_high": 100, "flag": "N"},
-            {"name": "Vitamin B12", "value": 450, "unit": "pg/mL", "reference_low": 200, "reference_high": 900, "flag": "N"},
-            {"name": "Hemoglobin A1c", "value": 5.4, "unit": "%", "reference_low": 4.0, "reference_high": 5.6, "flag": "N"},
-        ]
-    else:
-        # Real LLM extraction
-        raw_markers = await extract_markers_with_llm(raw_text)
+    # Database is optional (testing mode): the cache then lives in memory only
+    try:
+        pool = await get_db_pool()
+    except Exception as e:
+        pool = None
+        print(f"DB unavailable (testing mode): {e}")
     
-    # Normalize markers
-    markers = normalize_markers(raw_markers)
+    # OCR + extraction + normalization, served from cache for repeat uploads
+    extraction = await get_extraction(pool, file_hash, content, file.content_type)
+    raw_text = extraction.raw_text
+    markers = extraction.markers
     
     # Calculate confidence
     confidence = calculate_confidence(markers)
@@ -371,12 +534,12 @@ async def upload_lab_results(
     
     # Save to database
     try:
-        pool = await get_db_pool()
+        if pool is None:
+            raise RuntimeError("no database pool")
         submission_id = await save_submission(
             pool, user_id, file.filename, file_hash, raw_text,
             markers, confidence, needs_review, review_reasons
         )
-        await pool.close()
     except Exception as e:
         # For testing without DB, generate ID
         submission_id = str(uuid.uuid4())
@@ -390,7 +553,8 @@ async def upload_lab_results(
         priority_markers_found=priority_found,
         needs_review=needs_review,
         review_reasons=review_reasons,
-        markers=markers
+        markers=markers,
+        cached=extraction.cached
     )
 
 @router.get("/submission/{submission_id}", response_model=SubmissionStatus)
@@ -403,7 +567,6 @@ async def get_submission_status(submission_id: str):
                 SELECT id, status, created_at, markers_count, needs_review, brain_run_id
                 FROM bloodwork_submissions WHERE id = $1
             """, uuid.UUID(submission_id))
-        await pool.close()
         
         if not row:
             raise HTTPException(404, "Submission not found")
@@ -443,7 +606,6 @@ async def list_submissions(
                 status,
                 limit
             )
-        await pool.close()
         
         return [SubmissionStatus(
             submission_id=str(row["id"]),
@@ -28,13 +28,141 @@ import tempfile
 import os
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Numeric result value, optionally labelled and with a </> qualifier
+VALUE_PATTERN = re.compile(r"(?:(?:result|value|level)[\s:]+)?([<>]?\s*[\d,]+\.?\d*)", re.IGNORECASE)
+
+_REGEX_META = set(".^$*+?{}[]|()")
+_LEADING_FLAGS = re.compile(r"^\(\?[aiLmsux]+\)")
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Split a regex on its top-level '|' (outside groups and classes)."""
+    branches = []
+    current = []
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            current.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            branches.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(ch)
+        i += 1
+    branches.append("".join(current))
+    return branches
+
+
+def _literal_prefix(branch: str) -> str:
+    """
+    Literal text every match of a regex branch starts with (casefolded).
+    
+    Stops at the first metacharacter, class escape or optional literal;
+    zero-width \\b is skipped. Empty if the branch has no literal prefix.
+    """
+    literal = []
+    i = 0
+    while i < len(branch):
+        ch = branch[i]
+        if ch == "\\":
+            escaped = branch[i + 1:i + 2]
+            if escaped == "b":
+                i += 2
+                continue
+            if not escaped or escaped.isalnum():
+                break
+            token, step = escaped, 2
+        elif ch in _REGEX_META:
+            break
+        else:
+            token, step = ch, 1
+        if branch[i + step:i + step + 1] in ("?", "*", "{"):
+            break
+        literal.append(token)
+        i += step
+    return "".join(literal).casefold()
+
+
+class FirstMatchRecognizer:
+    """
+    Compiled form of an ordered {regex: label} table.
+    
+    match() returns the label of the first pattern (in table order) that
+    matches anywhere in the text - the same result as calling re.search
+    for each pattern in turn - but scans the text once. Every alternative
+    of every pattern is reduced to its literal prefix (its anchor); one
+    compiled scan of the casefolded text finds the anchors present, and
+    only patterns owning one of them are searched, in table order.
+    Patterns with an alternative lacking a literal prefix are always
+    searched. Casefolding over-approximates re.IGNORECASE, so the anchor
+    scan never rejects a line a pattern would match.
+    """
+    
+    def __init__(self, patterns: Dict[str, str], flags: int = 0):
+        self.labels = list(patterns.values())
+        self.regexes = [re.compile(pattern, flags) for pattern in patterns]
+        
+        always: List[int] = []
+        owners: Dict[str, List[int]] = {}
+        for index, pattern in enumerate(patterns):
+            anchors = [
+                _literal_prefix(branch)
+                for branch in _split_alternatives(_LEADING_FLAGS.sub("", pattern))
+            ]
+            if "" in anchors:
+                always.append(index)
+                continue
+            for anchor in anchors:
+                owners.setdefault(anchor, []).append(index)
+        self.always: FrozenSet[int] = frozenset(always)
+        
+        # Longest first, so the scan reports the longest anchor at each
+        # position; shorter anchors found there are prefixes of it.
+        vocabulary = sorted(owners, key=lambda anchor: (-len(anchor), anchor))
+        self.candidates: Dict[str, FrozenSet[int]] = {
+            anchor: frozenset(
+                index
+                for other in vocabulary if anchor.startswith(other)
+                for index in owners[other]
+            )
+            for anchor in vocabulary
+        }
+        self.anchor_scan = re.compile(
+            "(?=(" + "|".join(re.escape(anchor) for anchor in vocabulary) + "))"
+        ) if vocabulary else None
+    
+    def match(self, text: str) -> Optional[str]:
+        """Label of the first pattern matching text, or None."""
+        candidates = set(self.always)
+        if self.anchor_scan is not None:
+            for anchor in self.anchor_scan.findall(text.casefold()):
+                candidates.update(self.candidates[anchor])
+        for index in sorted(candidates):
+            if self.regexes[index].search(text):
+                return self.labels[index]
+        return None
+
 
 @dataclass
 class ParsedMarker:
@@ -45,6 +173,7 @@ class ParsedMarker:
     confidence: float = 1.0
     raw_text: str = ""
     line_number: int = 0
+    page: Optional[int] = None  # Source page in multi-page documents
 
 
 @dataclass
@@ -248,6 +377,19 @@ class OCRParser:
         self._client = None
         self._credentials_setup = False
     
+    @classmethod
+    def _recognizers(cls) -> Tuple[FirstMatchRecognizer, FirstMatchRecognizer, FirstMatchRecognizer]:
+        """Marker, unit and lab recognizers, compiled once per parser class."""
+        compiled = cls.__dict__.get("_compiled_recognizers")
+        if compiled is None:
+            compiled = (
+                FirstMatchRecognizer(cls.MARKER_PATTERNS),
+                FirstMatchRecognizer(cls.UNIT_PATTERNS, re.IGNORECASE),
+                FirstMatchRecognizer(cls.LAB_PATTERNS),
+            )
+            cls._compiled_recognizers = compiled
+        return compiled
+    
     def _ensure_credentials(self) -> bool:
         """Ensure Google credentials are configured."""
         if self._credentials_setup:
@@ -306,41 +448,17 @@ class OCRParser:
         
         Returns:
             ParseResult with extracted markers
+        
+        Multi-page PDF/TIFF/GIF documents are OCRed page by page in
+        parallel (see bloodwork_engine.ocr_pipeline).
         """
-        from google.cloud import vision
+        from bloodwork_engine.ocr_pipeline import get_vision_client, parse_document
         
         # Decode base64 if necessary
         if isinstance(image_data, str):
             image_data = base64.b64decode(image_data)
         
-        # Build vision image
-        image = vision.Image(content=image_data)
-        
-        # Perform OCR
-        if mime_type == "application/pdf":
-            # For PDF, use document_text_detection
-            response = self.client.document_text_detection(image=image)
-        else:
-            # For images, use text_detection
-            response = self.client.text_detection(image=image)
-        
-        if response.error.message:
-            raise RuntimeError(f"Google Cloud Vision error: {response.error.message}")
-        
-        # Extract full text
-        texts = response.text_annotations
-        if not texts:
-            return ParseResult(
-                markers=[],
-                raw_text="",
-                parse_stats={"total_lines": 0, "matched_markers": 0},
-                errors=["No text detected in image"]
-            )
-        
-        raw_text = texts[0].description
-        
-        # Parse the text
-        return self._parse_text(raw_text)
+        return parse_document(image_data, mime_type, client=get_vision_client(self), parser=self)
     
     def parse_file(self, file_path: str) -> ParseResult:
         """
@@ -366,6 +484,8 @@ class OCRParser:
             ".jpeg": "image/jpeg",
             ".gif": "image/gif",
             ".webp": "image/webp",
+            ".tif": "image/tiff",
+            ".tiff": "image/tiff",
         }
         
         mime_type = mime_types.get(suffix)
@@ -438,12 +558,8 @@ class OCRParser:
         Returns:
             ParsedMarker if found, None otherwise
         """
-        # Try to match marker name
-        matched_code = None
-        for pattern, code in self.MARKER_PATTERNS.items():
-            if re.search(pattern, line):
-                matched_code = code
-                break
+        # Try to match marker name (first pattern in MARKER_PATTERNS order wins)
+        matched_code = self._recognizers()[0].match(line)
         
         if not matched_code:
             return None
@@ -475,8 +591,7 @@ class OCRParser:
         confidence = 0.5
         
         # Try to find a numeric value
-        value_pattern = r"(?:(?:result|value|level)[\s:]+)?([<>]?\s*[\d,]+\.?\d*)"
-        value_match = re.search(value_pattern, line, re.IGNORECASE)
+        value_match = VALUE_PATTERN.search(line)
         
         if value_match:
             raw_value = value_match.group(1).replace(",", "").strip()
@@ -501,21 +616,17 @@ class OCRParser:
                 except ValueError:
                     return None, "", 0.0
         
-        # Try to find unit
-        for pattern, canonical_unit in self.UNIT_PATTERNS.items():
-            if re.search(pattern, line, re.IGNORECASE):
-                unit = canonical_unit
-                confidence = min(confidence + 0.1, 1.0)
-                break
+        # Try to find unit (first pattern in UNIT_PATTERNS order wins)
+        canonical_unit = self._recognizers()[1].match(line)
+        if canonical_unit:
+            unit = canonical_unit
+            confidence = min(confidence + 0.1, 1.0)
         
         return value, unit, confidence
     
     def _detect_lab(self, text: str) -> Optional[str]:
         """Detect lab name from text."""
-        for pattern, lab_name in self.LAB_PATTERNS.items():
-            if re.search(pattern, text):
-                return lab_name
-        return None
+        return self._recognizers()[2].match(text)
     
     def _extract_date(self, text: str) -> Optional[str]:
         """Extract report date from text."""
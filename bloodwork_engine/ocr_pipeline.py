@@ -0,0 +1,368 @@
+"""
+GenoMAX² OCR Page Pipeline
+==========================
+Page-parallel OCR for multi-page lab reports.
+
+PDF, TIFF and GIF documents are OCRed one page per Vision files:annotate
+request on a shared, bounded thread pool. The first page also reports the
+document's page count; the remaining pages are then submitted together.
+Each page's text is parsed as soon as it arrives and yielded as a "page"
+event (in completion order), followed by a "summary" event with the
+merged, deduplicated markers. Single images (PNG, JPEG, WebP) are one
+text_detection request.
+
+FakeVisionClient answers the same Vision calls from local text, so the
+pipeline and the OCR endpoints run offline (OCR_FAKE_VISION=true).
+
+Usage:
+    from bloodwork_engine.ocr_pipeline import iter_ocr_events, parse_document
+
+    for event in iter_ocr_events(pdf_bytes, "application/pdf"):
+        ...
+    result = parse_document(pdf_bytes, "application/pdf")
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bloodwork_engine.ocr_parser import OCRParser, ParseResult
+
+logger = logging.getLogger(__name__)
+
+# Concurrent Vision requests across all documents
+OCR_PAGE_WORKERS = int(os.getenv("OCR_PAGE_WORKERS", "4"))
+# Pages beyond this are not OCRed (reported in the summary errors)
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "50"))
+# Serve OCR from FakeVisionClient instead of Google Cloud Vision
+OCR_FAKE_VISION = os.getenv("OCR_FAKE_VISION", "false").lower() == "true"
+
+# MIME types Vision accepts on files:annotate (per-page requests)
+MULTI_PAGE_MIME_TYPES = {"application/pdf", "image/tiff", "image/gif"}
+
+
+@dataclass
+class PageText:
+    """OCR output for one page (page 1 for single images)."""
+    page: int
+    text: str = ""
+    total_pages: int = 1
+    error: Optional[str] = None
+    ocr_ms: float = 0.0
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared OCR page pool, bounding Vision concurrency process-wide."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, OCR_PAGE_WORKERS),
+                    thread_name_prefix="ocr-page",
+                )
+    return _executor
+
+
+def shutdown_ocr_pool() -> None:
+    """Stop the shared page pool (app shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _ocr_file_page(client, content: bytes, mime_type: str, page: int) -> PageText:
+    """OCR one page of a PDF/TIFF/GIF with files:annotate."""
+    started = time.perf_counter()
+    try:
+        response = client.batch_annotate_files(requests=[{
+            "input_config": {"content": content, "mime_type": mime_type},
+            "features": [{"type_": "DOCUMENT_TEXT_DETECTION"}],
+            "pages": [page],
+        }])
+        file_response = response.responses[0]
+        if file_response.error.message:
+            raise RuntimeError(f"Google Cloud Vision error: {file_response.error.message}")
+        page_response = file_response.responses[0]
+        if page_response.error.message:
+            raise RuntimeError(f"Google Cloud Vision error: {page_response.error.message}")
+        return PageText(
+            page=page,
+            text=page_response.full_text_annotation.text,
+            total_pages=file_response.total_pages or 1,
+            ocr_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+    except Exception as e:
+        logger.warning(f"OCR failed for page {page}: {e}")
+        return PageText(
+            page=page,
+            error=str(e),
+            ocr_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+
+def _ocr_image(client, content: bytes) -> PageText:
+    """OCR a single image with text_detection."""
+    started = time.perf_counter()
+    try:
+        response = client.text_detection(image={"content": content})
+        if response.error.message:
+            raise RuntimeError(f"Google Cloud Vision error: {response.error.message}")
+        texts = response.text_annotations
+        return PageText(
+            page=1,
+            text=texts[0].description if texts else "",
+            ocr_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+    except Exception as e:
+        return PageText(
+            page=1,
+            error=str(e),
+            ocr_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+
+def iter_ocr_pages(content: bytes, mime_type: str, client) -> Iterator[PageText]:
+    """
+    OCR a document page by page, yielding pages as they complete.
+
+    Page 1 runs first to learn the page count; pages 2..N then run
+    concurrently on the shared pool. Pages not yet started are cancelled
+    if the consumer stops early (e.g. a client disconnects mid-stream).
+    """
+    executor = _get_executor()
+    if mime_type not in MULTI_PAGE_MIME_TYPES:
+        yield executor.submit(_ocr_image, client, content).result()
+        return
+
+    first = executor.submit(_ocr_file_page, client, content, mime_type, 1).result()
+    yield first
+    if first.error or first.total_pages <= 1:
+        return
+
+    last_page = min(first.total_pages, OCR_MAX_PAGES)
+    futures = [
+        executor.submit(_ocr_file_page, client, content, mime_type, page)
+        for page in range(2, last_page + 1)
+    ]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def iter_parsed_pages(
+    content: bytes,
+    mime_type: str,
+    client=None,
+    parser: Optional[OCRParser] = None
+) -> Iterator[Tuple[PageText, Optional[ParseResult]]]:
+    """iter_ocr_pages() with each page's text parsed as soon as it arrives."""
+    parser = parser or OCRParser()
+    client = client if client is not None else get_vision_client(parser)
+    for page in iter_ocr_pages(content, mime_type, client):
+        if page.error:
+            yield page, None
+            continue
+        parsed = parser._parse_text(page.text)
+        for marker in parsed.markers:
+            marker.page = page.page
+        yield page, parsed
+
+
+def merge_pages(
+    parser: OCRParser,
+    pages: Iterable[Tuple[PageText, Optional[ParseResult]]]
+) -> ParseResult:
+    """
+    Combine per-page results into one document ParseResult.
+
+    Markers are deduplicated across pages with the parser's rule (highest
+    confidence, earliest page on ties); lab and date are detected on the
+    full text in page order.
+    """
+    pages = sorted(pages, key=lambda item: item[0].page)
+    total_pages = max((page.total_pages for page, _ in pages), default=0)
+    parsed_pages = [(page, parsed) for page, parsed in pages if parsed is not None]
+    raw_text = "\n".join(page.text for page, _ in parsed_pages)
+
+    errors = [f"Page {page.page}: {page.error}" for page, parsed in pages if parsed is None]
+    if total_pages > OCR_MAX_PAGES:
+        errors.append(f"Only the first {OCR_MAX_PAGES} of {total_pages} pages were processed")
+    if parsed_pages and not raw_text.strip():
+        errors.append("No text detected in image")
+
+    markers = parser._deduplicate_markers(
+        [marker for _, parsed in parsed_pages for marker in parsed.markers]
+    )
+    return ParseResult(
+        markers=markers,
+        raw_text=raw_text,
+        parse_stats={
+            "total_lines": sum(parsed.parse_stats["total_lines"] for _, parsed in parsed_pages),
+            "non_empty_lines": sum(parsed.parse_stats["non_empty_lines"] for _, parsed in parsed_pages),
+            "matched_markers": len(markers),
+            "total_pages": total_pages,
+            "parsed_pages": len(parsed_pages),
+        },
+        lab_name=parser._detect_lab(raw_text) if raw_text else None,
+        report_date=parser._extract_date(raw_text) if raw_text else None,
+        errors=errors or None,
+    )
+
+
+def parse_document(
+    content: bytes,
+    mime_type: str,
+    client=None,
+    parser: Optional[OCRParser] = None
+) -> ParseResult:
+    """
+    OCR and parse a whole document with page-parallel OCR.
+
+    Raises:
+        RuntimeError: if no page could be OCRed
+    """
+    parser = parser or OCRParser()
+    pages = list(iter_parsed_pages(content, mime_type, client=client, parser=parser))
+    if pages and all(parsed is None for _, parsed in pages):
+        raise RuntimeError(pages[0][0].error)
+    return merge_pages(parser, pages)
+
+
+def iter_ocr_events(
+    content: bytes,
+    mime_type: str,
+    client=None,
+    parser: Optional[OCRParser] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream OCR progress as event dicts.
+
+    Yields one {"type": "page"} event per page in completion order (its
+    markers, or its error), then a {"type": "summary"} event with the
+    merged ParseResult fields for the whole document.
+    """
+    parser = parser or OCRParser()
+    started = time.perf_counter()
+    pages = []
+    for page, parsed in iter_parsed_pages(content, mime_type, client=client, parser=parser):
+        pages.append((page, parsed))
+        event = {
+            "type": "page",
+            "page": page.page,
+            "total_pages": page.total_pages,
+            "ocr_ms": page.ocr_ms,
+        }
+        if parsed is None:
+            event["status"] = "error"
+            event["error"] = page.error
+        else:
+            event["status"] = "ok"
+            event["markers"] = [asdict(marker) for marker in parsed.markers]
+            event["parse_stats"] = parsed.parse_stats
+        yield event
+
+    result = merge_pages(parser, pages)
+    summary = result.to_dict()
+    summary.pop("raw_text")
+    yield {
+        "type": "summary",
+        "status": "ok" if any(parsed is not None for _, parsed in pages) else "error",
+        **summary,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def get_vision_client(parser: Optional[OCRParser] = None):
+    """Vision client for the pipeline: FakeVisionClient when OCR_FAKE_VISION is set."""
+    if OCR_FAKE_VISION:
+        return FakeVisionClient()
+    return (parser or OCRParser()).client
+
+
+class FakeVisionClient:
+    """
+    Offline stand-in for google.cloud.vision.ImageAnnotatorClient.
+
+    Implements the two calls the pipeline makes (batch_annotate_files and
+    text_detection) with the same response shape. Page text comes from
+    `pages`, or from the uploaded content decoded as UTF-8 with pages
+    separated by form feeds. `delay_s` simulates per-request latency and
+    `failing_pages` return a Vision error. Requested page numbers and the
+    peak number of concurrent requests are recorded.
+    """
+
+    def __init__(
+        self,
+        pages: Optional[List[str]] = None,
+        delay_s: float = 0.0,
+        failing_pages: Iterable[int] = ()
+    ):
+        self.pages = pages
+        self.delay_s = delay_s
+        self.failing_pages = set(failing_pages)
+        self.requested_pages: List[int] = []
+        self.peak_concurrency = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def _document(self, content: bytes) -> List[str]:
+        if self.pages is not None:
+            return self.pages
+        return content.decode("utf-8", errors="replace").split("\f")
+
+    def _request(self, page: int) -> None:
+        with self._lock:
+            self.requested_pages.append(page)
+            self._active += 1
+            self.peak_concurrency = max(self.peak_concurrency, self._active)
+        try:
+            if self.delay_s:
+                time.sleep(self.delay_s)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    @staticmethod
+    def _status(message: str = "") -> SimpleNamespace:
+        return SimpleNamespace(message=message)
+
+    def batch_annotate_files(self, requests: List[Dict[str, Any]]) -> SimpleNamespace:
+        request = requests[0]
+        page = request["pages"][0]
+        self._request(page)
+        document = self._document(request["input_config"]["content"])
+        error = f"Fake Vision error on page {page}" if page in self.failing_pages else ""
+        text = document[page - 1] if page <= len(document) and not error else ""
+        return SimpleNamespace(responses=[SimpleNamespace(
+            responses=[SimpleNamespace(
+                full_text_annotation=SimpleNamespace(text=text),
+                error=self._status(error),
+            )],
+            total_pages=len(document),
+            error=self._status(),
+        )])
+
+    def text_detection(self, image: Dict[str, Any]) -> SimpleNamespace:
+        self._request(1)
+        content = image["content"] if isinstance(image, dict) else image.content
+        error = "Fake Vision error on page 1" if 1 in self.failing_pages else ""
+        text = "" if error else "\n".join(self._document(content))
+        return SimpleNamespace(
+            text_annotations=[SimpleNamespace(description=text)] if text else [],
+            error=self._status(error),
+        )
@@ -5,7 +5,7 @@ Webhook handlers for receiving lab results from Junction (Vital) and Lab Testing
 
 Features:
 - Signature verification for security
-- Automatic processing through Bloodwork Engine
+- Automatic processing through Bloodwork Engine (queued, see app.webhooks.queue)
 - Database storage for events, orders, and results
 - Error handling with retry support
 
@@ -307,6 +307,10 @@ def parse_lab_testing_api_event(payload: Dict[str, Any]) -> Tuple[str, Optional[
 # WEBHOOK PROCESSING
 # ============================================================
 
+# Events that fetch results and run the Bloodwork Engine
+VITAL_RESULTS_EVENTS = ["results.ready", "results.partial", "results.critical", "order.completed"]
+LAB_TESTING_API_RESULTS_EVENTS = ["lta.results.ready", "lta.results.critical"]
+
 def process_vital_webhook(
     payload: Dict[str, Any],
     signature_header: Optional[str] = None,
@@ -314,7 +318,8 @@ def process_vital_webhook(
     auto_process: bool = True,
     lab_profile: str = "GLOBAL_CONSERVATIVE",
     sex: Optional[str] = None,
-    age: Optional[int] = None
+    age: Optional[int] = None,
+    event_id: Optional[str] = None
 ) -> WebhookResult:
     """
     Process a Junction/Vital webhook.
@@ -327,11 +332,12 @@ def process_vital_webhook(
         lab_profile: Lab profile for Bloodwork Engine
         sex: Patient sex for engine processing
         age: Patient age for engine processing
+        event_id: webhook_events id when processed from the queue
     
     Returns:
         WebhookResult with processing outcome
     """
-    event_id = str(uuid.uuid4())
+    event_id = event_id or str(uuid.uuid4())
     
     try:
         # Parse event
@@ -353,9 +359,7 @@ def process_vital_webhook(
         )
         
         # Check if this is a results event
-        results_events = ["results.ready", "results.partial", "results.critical", "order.completed"]
-        
-        if event_type in results_events and auto_process:
+        if event_type in VITAL_RESULTS_EVENTS and auto_process:
             return _process_vital_results(event, lab_profile, sex, age)
         
         # For non-results events, just log and return
@@ -461,7 +465,8 @@ def process_lab_testing_api_webhook(
     auto_process: bool = True,
     lab_profile: str = "GLOBAL_CONSERVATIVE",
     sex: Optional[str] = None,
-    age: Optional[int] = None
+    age: Optional[int] = None,
+    event_id: Optional[str] = None
 ) -> WebhookResult:
     """
     Process a Lab Testing API webhook.
@@ -475,11 +480,12 @@ def process_lab_testing_api_webhook(
         lab_profile: Lab profile for Bloodwork Engine
         sex: Patient sex for engine processing
         age: Patient age for engine processing
+        event_id: webhook_events id when processed from the queue
     
     Returns:
         WebhookResult with processing outcome
     """
-    event_id = str(uuid.uuid4())
+    event_id = event_id or str(uuid.uuid4())
     
     try:
         # Parse event
@@ -501,9 +507,7 @@ def process_lab_testing_api_webhook(
         )
         
         # Check if this is a results event
-        results_events = ["lta.results.ready", "lta.results.critical"]
-        
-        if event_type in results_events and auto_process:
+        if event_type in LAB_TESTING_API_RESULTS_EVENTS and auto_process:
             return _process_lab_testing_api_results(event, lab_profile, sex, age)
         
         # For non-results events, just log and return
@@ -601,10 +605,49 @@ def _process_lab_testing_api_results(
         )
 
 
+# ============================================================
+# QUEUE HANDLERS (app.webhooks.queue workers)
+# ============================================================
+
+QUEUE_HANDLER_VITAL = "bloodwork_vital"
+QUEUE_HANDLER_LAB_TESTING_API = "bloodwork_lab_testing_api"
+
+
+def _queued_result(result: WebhookResult) -> Dict[str, Any]:
+    """Raise on failure so the queue retries; otherwise return the stored result."""
+    if not result.success:
+        raise RuntimeError(result.error or result.message)
+    return asdict(result)
+
+
+def handle_queued_vital_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point for a queued Junction/Vital delivery."""
+    return _queued_result(process_vital_webhook(
+        payload=event["raw_payload"],
+        auto_process=True,
+        event_id=str(event["event_id"])
+    ))
+
+
+def handle_queued_lab_testing_api_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point for a queued Lab Testing API delivery."""
+    return _queued_result(process_lab_testing_api_webhook(
+        payload=event["raw_payload"],
+        auto_process=True,
+        event_id=str(event["event_id"])
+    ))
+
+
 # ============================================================
 # DATABASE OPERATIONS (for future integration)
 # ============================================================
 
+async def _shared_pool():
+    """The application-lifetime asyncpg pool, or None if the DB is unavailable."""
+    from app.shared.async_db_pool import get_async_pool_or_none
+    return await get_async_pool_or_none()
+
+
 async def store_webhook_event(
     event: WebhookEvent,
     db_pool = None
@@ -614,13 +657,15 @@ async def store_webhook_event(
     
     Args:
         event: WebhookEvent to store
-        db_pool: Database connection pool
+        db_pool: Database connection pool (defaults to the shared asyncpg pool)
     
     Returns:
         True if stored successfully
     """
     if db_pool is None:
-        logger.warning("No database pool provided - skipping event storage")
+        db_pool = await _shared_pool()
+    if db_pool is None:
+        logger.warning("No database pool available - skipping event storage")
         return False
     
     try:
@@ -664,13 +709,15 @@ async def update_lab_order_status(
         provider: Provider name (junction, lab_testing_api)
         status: New status
         additional_data: Additional fields to update
-        db_pool: Database connection pool
+        db_pool: Database connection pool (defaults to the shared asyncpg pool)
     
     Returns:
         True if updated successfully
     """
     if db_pool is None:
-        logger.warning("No database pool provided - skipping order status update")
+        db_pool = await _shared_pool()
+    if db_pool is None:
+        logger.warning("No database pool available - skipping order status update")
         return False
     
     try:
@@ -720,13 +767,15 @@ async def store_safety_gate_trigger(
         user_id: User UUID
         bloodwork_result_id: Result UUID
         gate_data: Safety gate information
-        db_pool: Database connection pool
+        db_pool: Database connection pool (defaults to the shared asyncpg pool)
     
     Returns:
         True if stored successfully
     """
     if db_pool is None:
-        logger.warning("No database pool provided - skipping safety gate storage")
+        db_pool = await _shared_pool()
+    if db_pool is None:
+        logger.warning("No database pool available - skipping safety gate storage")
         return False
     
     try:
@@ -93,10 +93,31 @@ from api_server import app, get_db, now_iso
 from app.brain.painpoints_data import PAINPOINTS_DICTIONARY, LIFESTYLE_SCHEMA
 import json
 
+# ===== SHARED ASYNCPG POOL + HTTP CLIENTS (lab, Brain, webhooks, Shopify) =====
+try:
+    from app.shared.async_db_pool import init_async_pool, close_async_pool
+    app.add_event_handler("startup", init_async_pool)
+    # Webhook workers and the catalog refresher are inserted at the front of
+    # on_shutdown, so they stop before this closes the pool
+    app.add_event_handler("shutdown", close_async_pool)
+    from app.shared.http_clients import close_http_clients
+    app.add_event_handler("shutdown", close_http_clients)
+    print("Shared asyncpg pool and HTTP client lifecycle registered")
+except Exception as e:
+    print(f"ERROR registering shared pools: {type(e).__name__}: {e}")
+    import traceback
+    traceback.print_exc()
+
 # ===== BLOODWORK ENGINE V2 =====
 try:
     from bloodwork_engine.api import register_bloodwork_endpoints
     register_bloodwork_endpoints(app)
+    from bloodwork_engine.ocr_pipeline import shutdown_ocr_pool
+    app.add_event_handler("shutdown", shutdown_ocr_pool)
+    # One spawn-context process pool shared by all batch requests
+    from bloodwork_engine.batch import start_batch_pool, shutdown_batch_pool
+    app.add_event_handler("startup", start_batch_pool)
+    app.add_event_handler("shutdown", shutdown_batch_pool)
     from bloodwork_engine import __version__ as bw_version
     print(f"Bloodwork Engine v{bw_version} endpoints registered successfully")
 except Exception as e:
@@ -129,6 +150,11 @@ except Exception as e:
 try:
     from app.webhooks import webhook_router
     app.include_router(webhook_router)
+    # Queue workers for both webhook stacks (WEBHOOK_WORKERS, 0 disables)
+    from app.webhooks.queue import start_webhook_workers, stop_webhook_workers
+    app.add_event_handler("startup", start_webhook_workers)
+    # Stop before the DB pool closes (api_server registered that first)
+    app.router.on_shutdown.insert(0, stop_webhook_workers)
     print("Webhook Infrastructure (v3.31.0) registered: Junction + Lab Testing API")
 except Exception as e:
     print(f"ERROR loading Webhook Infrastructure: {type(e).__name__}: {e}")
@@ -258,7 +284,11 @@ except Exception as e:
 try:
     from app.catalog.wiring_endpoints import router as catalog_wiring_router
     app.include_router(catalog_wiring_router)
-    from app.catalog.wiring import CATALOG_WIRING_VERSION
+    from app.catalog.wiring import CATALOG_WIRING_VERSION, get_catalog
+    # Background snapshot refresher (CATALOG_REFRESH_INTERVAL_S, 0 disables)
+    app.add_event_handler("startup", get_catalog().start_refresher)
+    # Stop before the DB pool closes (api_server registered that first)
+    app.router.on_shutdown.insert(0, get_catalog().stop_refresher)
     print(f"Catalog Wiring {CATALOG_WIRING_VERSION} endpoints registered successfully")
 except Exception as e:
     print(f"ERROR loading Catalog Wiring: {type(e).__name__}: {e}")
@@ -0,0 +1,32 @@
+-- =====================================================
+-- Migration 017: Durable Webhook Event Queue
+-- =====================================================
+-- Turns webhook_events (migration 014) into the ingestion queue:
+-- receivers verify, insert and return 202; workers claim rows with
+-- FOR UPDATE SKIP LOCKED, retry with backoff and dead-letter.
+--
+-- Status lifecycle:
+--   received -> processing -> processed
+--                          -> failed (retry at next_attempt_at) -> ...
+--                          -> dead_letter (max attempts reached)
+-- =====================================================
+
+ALTER TABLE webhook_events ADD COLUMN IF NOT EXISTS provider_event_id VARCHAR(255);
+ALTER TABLE webhook_events ADD COLUMN IF NOT EXISTS queue_handler VARCHAR(50);
+ALTER TABLE webhook_events ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE webhook_events ADD COLUMN IF NOT EXISTS locked_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE webhook_events ADD COLUMN IF NOT EXISTS locked_by VARCHAR(100);
+ALTER TABLE webhook_events ADD COLUMN IF NOT EXISTS result_data JSONB;
+
+-- Dedupe provider retries of the same event
+CREATE UNIQUE INDEX IF NOT EXISTS uq_we_handler_provider_event
+    ON webhook_events(queue_handler, provider_event_id)
+    WHERE provider_event_id IS NOT NULL;
+
+-- Claim query: ready rows in arrival order
+CREATE INDEX IF NOT EXISTS idx_we_queue_ready
+    ON webhook_events(received_at)
+    WHERE status IN ('received', 'failed', 'processing');
+
+COMMENT ON COLUMN webhook_events.provider_event_id IS 'Provider delivery id (or body hash) used to drop duplicate deliveries.';
+COMMENT ON COLUMN webhook_events.queue_handler IS 'Worker pipeline that processes this event.';
@@ -0,0 +1,31 @@
+-- =====================================================
+-- Migration 018: Lab Upload Extraction Cache
+-- =====================================================
+-- Content-addressed cache for /api/v1/lab/upload: the SHA-256 of the
+-- uploaded file maps to its OCR text, the raw LLM extraction and the
+-- normalized markers, so re-uploads of the same report skip OCR and the
+-- paid extraction call.
+--
+-- Versioning:
+--   prompt_version     - hash of extraction model, prompt and input limit;
+--                        a new prompt re-extracts (OCR text is reused)
+--   normalizer_version - hash of normalizer version, aliases and priority
+--                        set; a new normalizer re-normalizes raw_markers
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS lab_extraction_cache (
+    file_hash VARCHAR(64) NOT NULL,
+    prompt_version VARCHAR(32) NOT NULL,
+    raw_text TEXT NOT NULL,
+    raw_markers JSONB NOT NULL,
+    normalizer_version VARCHAR(32) NOT NULL,
+    normalized_markers JSONB NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (file_hash, prompt_version)
+);
+
+COMMENT ON TABLE lab_extraction_cache IS 'OCR text and marker extraction per uploaded file hash (see bloodwork_engine/lab_upload.py).';
+COMMENT ON COLUMN lab_extraction_cache.file_hash IS 'SHA-256 hex digest of the uploaded file bytes.';
+COMMENT ON COLUMN lab_extraction_cache.raw_markers IS 'LLM extraction output before normalization.';
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+GenoMAX² Bloodwork Handoff Transport Benchmark
+
+Compares fetch_bloodwork_handoff() latency for the in-process transport
+(direct BloodworkEngineV2 call) and the HTTP transport.
+
+Usage:
+    python scripts/benchmark_bloodwork_handoff.py [--iterations 200] [--base-url URL]
+
+Options:
+    --iterations N   Handoffs per transport (default 200)
+    --base-url URL   Benchmark HTTP against a running deployment instead of
+                     a local uvicorn server started by this script
+
+The local server is loopback-only, so it understates the production HTTP
+cost (no TLS, no public network hop).
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.brain import bloodwork_handoff
+from app.brain.bloodwork_handoff import (
+    TRANSPORT_HTTP,
+    TRANSPORT_IN_PROCESS,
+    fetch_bloodwork_handoff,
+)
+
+PANEL = {
+    "markers": [
+        {"code": "ferritin", "value": 400, "unit": "ng/mL"},
+        {"code": "vitamin_d_25oh", "value": 35, "unit": "ng/mL"},
+        {"code": "vitamin_b12", "value": 500, "unit": "pg/mL"},
+        {"code": "hs_crp", "value": 1.2, "unit": "mg/L"},
+        {"code": "hba1c", "value": 5.4, "unit": "%"},
+        {"code": "alt", "value": 28, "unit": "U/L"},
+    ],
+    "lab_profile": "GLOBAL_CONSERVATIVE",
+    "sex": "male",
+    "age": 42,
+}
+
+
+def start_local_server() -> str:
+    """Serve the bloodwork endpoints on a free loopback port; return base URL."""
+    import uvicorn
+    from fastapi import FastAPI
+    from bloodwork_engine.api import register_bloodwork_endpoints
+
+    app = FastAPI()
+    register_bloodwork_endpoints(app)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def measure(fn: Callable[[], object], iterations: int) -> Dict[str, float]:
+    fn()  # warm up (loader, connections)
+    samples: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+        "max_ms": samples[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bloodwork handoff transports")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--base-url", default=None)
+    args = parser.parse_args()
+
+    bloodwork_handoff.BLOODWORK_BASE_URL = args.base_url or start_local_server()
+
+    results = {}
+    for transport in (TRANSPORT_IN_PROCESS, TRANSPORT_HTTP):
+        results[transport] = measure(
+            lambda: fetch_bloodwork_handoff(transport=transport, **PANEL),
+            args.iterations
+        )
+
+    print(f"Bloodwork handoff benchmark ({args.iterations} iterations, HTTP -> {bloodwork_handoff.BLOODWORK_BASE_URL})")
+    print(f"{'transport':<12} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for transport, r in results.items():
+        print(f"{transport:<12} {r['mean_ms']:>7.2f}ms {r['p50_ms']:>7.2f}ms {r['p95_ms']:>7.2f}ms {r['max_ms']:>7.2f}ms")
+    speedup = results[TRANSPORT_HTTP]["mean_ms"] / results[TRANSPORT_IN_PROCESS]["mean_ms"]
+    print(f"in_process is {speedup:.1f}x faster (mean)")
+
+
+if __name__ == "__main__":
+    main()
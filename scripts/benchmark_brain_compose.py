@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+GenoMAX² Brain Compose Benchmark
+
+Compares compose() re-reading its configs on every call (the registry is
+invalidated before each run) with compose() served from the cached
+ConfigRegistry snapshots, and times the lifestyle rule pass with
+evaluate_rule_condition vs the compiled predicates. The reload path also
+hashes and compiles both configs, so it overstates the old per-request
+json.load cost (~120us for the two files).
+
+Usage:
+    python scripts/benchmark_brain_compose.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.brain.compose import (
+    LifestyleInput,
+    PainpointInput,
+    compose,
+    evaluate_rule_condition,
+    load_lifestyle_ruleset,
+)
+from app.brain.config_registry import get_config_registry
+
+PAINPOINTS = [
+    PainpointInput(id="fatigue", severity=2),
+    PainpointInput(id="stress", severity=3),
+    PainpointInput(id="poor_sleep", severity=2),
+]
+
+LIFESTYLE = LifestyleInput(
+    sleep_hours=5.5, sleep_quality=4, stress_level=9,
+    activity_level="sedentary", caffeine_intake="high",
+    alcohol_intake="low", work_schedule="night",
+    meals_per_day=2, sugar_intake="high", smoking=True,
+)
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples), statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Brain compose config loading")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    registry = get_config_registry()
+
+    def cold():
+        registry.invalidate()
+        compose(painpoints_input=PAINPOINTS, lifestyle_input=LIFESTYLE)
+
+    def cached():
+        compose(painpoints_input=PAINPOINTS, lifestyle_input=LIFESTYLE)
+
+    rules, _ = load_lifestyle_ruleset()
+    compiled = registry.get("lifestyle").compiled.rules
+
+    def interpreted_rules():
+        for rule in rules:
+            evaluate_rule_condition(rule.get("input_conditions", {}), LIFESTYLE)
+
+    def compiled_rules():
+        for rule in compiled:
+            rule.matches(LIFESTYLE)
+
+    results = {
+        "compose (reload)": timed(cold, args.iterations),
+        "compose (cached)": timed(cached, args.iterations),
+        "rules (interp)": timed(interpreted_rules, args.iterations * 10),
+        "rules (compiled)": timed(compiled_rules, args.iterations * 10),
+    }
+
+    print(f"Brain compose benchmark ({args.iterations} iterations, "
+          f"{len(PAINPOINTS)} painpoints, {len(compiled)} lifestyle rules)")
+    print(f"{'path':<18} {'median':>10} {'mean':>10}")
+    for name, (median, mean) in results.items():
+        print(f"{name:<18} {median:>8.1f}us {mean:>8.1f}us")
+    print(f"cached compose is {results['compose (reload)'][0] / results['compose (cached)'][0]:.1f}x faster; "
+          f"compiled rules {results['rules (interp)'][0] / results['rules (compiled)'][0]:.1f}x faster")
+    print(f"config versions: {registry.versions()}")
+
+
+if __name__ == "__main__":
+    main()
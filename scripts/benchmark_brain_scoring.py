@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+GenoMAX² Brain Module Scoring Benchmark
+
+Compares the per-module path (load_supplement_catalog() + score_module()
+per module + sort) with the vectorized ModuleMatrix.rank() used by
+BrainOrchestrator.run(), on synthetic catalogs.
+
+Usage:
+    python scripts/benchmark_brain_scoring.py [--sizes 150,1500,15000] [--iterations 50]
+
+Options:
+    --sizes N,N,...  Catalog sizes (modules, split across both genders)
+    --iterations N   Scoring runs per size and path (default 50)
+
+Matrix build time is reported separately: it is paid once per catalog
+version, not per run.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.catalog.wiring import CatalogSnapshot
+from bloodwork_engine.brain_orchestrator import (
+    GOAL_KEYWORDS,
+    INGREDIENT_BIOMARKER_MAP,
+    build_catalog_modules,
+    detect_deficiencies,
+    score_module,
+)
+
+INGREDIENTS = sorted(
+    set(INGREDIENT_BIOMARKER_MAP) | {kw for kws in GOAL_KEYWORDS.values() for kw in kws}
+)
+
+MARKERS = [
+    {"code": "ferritin", "value": 18, "unit": "ng/mL"},
+    {"code": "vitamin_d_25oh", "value": 24, "unit": "ng/mL"},
+    {"code": "hscrp", "value": 3.4, "unit": "mg/L"},
+    {"code": "homocysteine", "value": 12, "unit": "umol/L"},
+    {"code": "magnesium_rbc", "value": 4.0, "unit": "mg/dL"},
+]
+
+RUN = {
+    "goals": ["energy", "sleep", "heart_health"],
+    "lifecycle_phase": "athletic",
+    "confidence_score": 0.85,
+    "caution_ingredients": {"niacin", "iron"},
+    "blocked_ingredients": {"ashwagandha", "vitamin_k2"},
+}
+
+
+def synthetic_rows(n: int, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "gx_catalog_id": f"GX-{i:06d}",
+            "product_name": f"Module {i}",
+            "product_url": None,
+            "category": rng.choice(["supplement", "sleep", "energy", "immunity", "heart health"]),
+            "short_description": None,
+            "base_price": 25.0,
+            "evidence_tier": rng.choice(["TIER_1", "TIER_2"]),
+            "governance_status": "ACTIVE",
+            "ingredient_tags": rng.sample(INGREDIENTS, rng.randint(1, 5)),
+            "sex_target": "",
+            "os_environment": "MAXimo²" if i % 2 == 0 else "MAXima²",
+        }
+        for i in range(n)
+    ]
+
+
+def per_module_rank(modules, deficiencies) -> List:
+    """The pre-matrix BrainOrchestrator.run() steps 2-6."""
+    scored = []
+    for module in modules:
+        blocked_match = module["all_ingredients_lower"].intersection(RUN["blocked_ingredients"])
+        scored.append(score_module(
+            module={**module, "is_blocked": len(blocked_match) > 0, "blocked_ingredients": list(blocked_match)},
+            deficiencies=deficiencies,
+            goals=RUN["goals"],
+            lifecycle_phase=RUN["lifecycle_phase"],
+            confidence_score=RUN["confidence_score"],
+            caution_ingredients=RUN["caution_ingredients"],
+        ))
+    eligible = [m for m in scored if not m.blocked]
+    eligible.sort(key=lambda m: m.final_score, reverse=True)
+    return eligible[:6]
+
+
+def measure(fn: Callable[[], object], iterations: int) -> Dict[str, float]:
+    fn()  # warm up
+    samples: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[max(int(len(samples) * 0.95) - 1, 0)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Brain module scoring")
+    parser.add_argument("--sizes", default="150,1500,15000")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    deficiencies = detect_deficiencies(MARKERS, "male")
+
+    print(f"Brain module scoring benchmark ({args.iterations} runs per path, gender=male)")
+    print(f"{'modules':>8} {'build':>9} {'per-module p50':>15} {'matrix p50':>11} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        snapshot = CatalogSnapshot.from_rows(synthetic_rows(size))
+        started = time.perf_counter()
+        catalog_modules = build_catalog_modules(snapshot)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        modules = catalog_modules.by_gender["male"]
+        matrix = catalog_modules.matrices["male"]
+
+        baseline = measure(lambda: per_module_rank(modules, deficiencies), args.iterations)
+        vectorized = measure(lambda: matrix.rank(
+            deficiencies=deficiencies, max_modules=6, **RUN
+        ), args.iterations)
+
+        assert [m.sku for m in matrix.rank(deficiencies=deficiencies, max_modules=6, **RUN)[0]] == \
+            [m.sku for m in per_module_rank(modules, deficiencies)], "ranking mismatch"
+
+        speedup = baseline["p50_ms"] / vectorized["p50_ms"]
+        print(f"{size:>8} {build_ms:>7.1f}ms {baseline['p50_ms']:>13.2f}ms "
+              f"{vectorized['p50_ms']:>9.2f}ms {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
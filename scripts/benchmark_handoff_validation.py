@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+GenoMAX² Bloodwork Handoff Validation Benchmark
+
+Per-request cost of validating a BloodworkHandoffV1 object:
+
+- jsonschema.validate(): the previous path (meta-schema check and a new
+  validator on every call)
+- cached validator: the prebuilt Draft7Validator from get_handoff_validator()
+- validate_handoff_schema(): the compiled fast path (valid handoffs never
+  reach jsonschema)
+
+Usage:
+    python scripts/benchmark_handoff_validation.py [--markers 1,10,50] [--iterations 2000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import jsonschema
+
+from app.brain.bloodwork_handoff import (
+    get_handoff_validator,
+    load_handoff_schema,
+    validate_handoff_schema,
+)
+from app.shared.hashing import canonicalize_and_hash
+
+
+def make_handoff(n_markers):
+    payload = {
+        "lab_profile": "GLOBAL_CONSERVATIVE",
+        "sex": "male",
+        "age": 35,
+        "markers": [{"code": f"marker_{i}", "value": 10.0 + i, "unit": "ng/mL"} for i in range(n_markers)],
+    }
+    output = {
+        "routing_constraints": {
+            "blocked_ingredients": ["iron"],
+            "blocked_categories": [],
+            "caution_flags": ["vitamin_d"],
+            "requirements": [],
+            "reason_codes": ["BLOCK_IRON"],
+        },
+        "signal_flags": [],
+        "unknown_biomarkers": [],
+        "processed_markers": [
+            {
+                "original_code": m["code"], "canonical_code": m["code"],
+                "original_value": m["value"], "canonical_value": m["value"],
+                "original_unit": m["unit"], "canonical_unit": m["unit"],
+                "status": "VALID", "range_status": "IN_RANGE", "flags": [],
+            }
+            for m in payload["markers"]
+        ],
+        "safety_gates": [],
+        "summary": {"total_markers": n_markers, "valid_markers": n_markers},
+        "require_review": False,
+    }
+    return {
+        "handoff_version": "bloodwork_handoff.v1",
+        "source": {
+            "service": "bloodwork_engine",
+            "base_url": "https://bloodwork.example",
+            "endpoint": "/api/v1/bloodwork/process",
+            "engine_version": "1.0.0",
+        },
+        "input": payload,
+        "output": output,
+        "audit": {
+            "input_hash": canonicalize_and_hash(payload),
+            "output_hash": canonicalize_and_hash(output),
+            "ruleset_version": "registry_v1.0+ranges_v1.0",
+            "processed_at": "2026-01-01T00:00:00Z",
+        },
+    }
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bloodwork handoff schema validation")
+    parser.add_argument("--markers", default="1,10,50")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    schema = load_handoff_schema()
+    validator = get_handoff_validator().validator
+
+    print(f"Handoff validation benchmark ({args.iterations} iterations, median us per call)")
+    print(f"{'markers':>7} {'validate()':>11} {'cached':>9} {'fast path':>10} {'speedup':>8}")
+    for n_markers in [int(n) for n in args.markers.split(",")]:
+        handoff = make_handoff(n_markers)
+        assert validate_handoff_schema(handoff) == (True, None)
+
+        legacy = timed(lambda: jsonschema.validate(instance=handoff, schema=schema), args.iterations)
+        cached = timed(lambda: validator.validate(handoff), args.iterations)
+        fast = timed(lambda: validate_handoff_schema(handoff), args.iterations)
+        print(f"{n_markers:>7} {legacy:>10.1f} {cached:>9.1f} {fast:>10.1f} {legacy / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
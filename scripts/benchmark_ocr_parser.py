@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+GenoMAX² OCR Text Parser Benchmark
+
+Compares the per-pattern parser (re.search for each MARKER_PATTERNS and
+UNIT_PATTERNS entry in turn) with the compiled FirstMatchRecognizer used
+by OCRParser._parse_text(), on synthetic multi-page lab reports.
+
+Usage:
+    python scripts/benchmark_ocr_parser.py [--pages 20] [--reports 20] [--iterations 10]
+
+Options:
+    --pages N       Pages per synthetic report (default 20)
+    --reports N     Distinct reports per run (default 20)
+    --iterations N  Timed runs per parser (default 10)
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bloodwork_engine.ocr_parser import OCRParser, ParsedMarker
+
+RESULT_LINES = [
+    ("Ferritin", "ng/mL"), ("Iron, Serum", "µg/dL"), ("Hemoglobin", "g/dL"),
+    ("Vitamin D, 25-Hydroxy", "ng/mL"), ("Vitamin B12", "pg/mL"), ("Folate, Serum", "ng/mL"),
+    ("ALT (SGPT)", "U/L"), ("AST (SGOT)", "U/L"), ("GGT", "U/L"), ("Creatinine", "mg/dL"),
+    ("eGFR", "mL/min/1.73m2"), ("Glucose, Fasting", "mg/dL"), ("Hemoglobin A1c", "%"),
+    ("Insulin, Fasting", "µIU/mL"), ("Homocysteine", "umol/L"), ("hs-CRP", "mg/L"),
+    ("Magnesium, Serum", "mg/dL"), ("Potassium", "mmol/L"), ("TSH", "mIU/L"),
+    ("Free T4", "ng/dL"), ("Triglycerides", "mg/dL"), ("LDL Cholesterol Calc", "mg/dL"),
+    ("HDL Cholesterol", "mg/dL"), ("Apolipoprotein B", "mg/dL"), ("Lipoprotein (a)", "nmol/L"),
+    ("Testosterone, Total", "ng/dL"), ("SHBG", "nmol/L"), ("DHEA-S", "µg/dL"),
+    ("Platelet Count", "x10^3/µL"), ("Omega-3 Index", "%"),
+]
+
+NOISE_LINES = [
+    "Patient: Jane Doe    DOB: 04/12/1984    Sex: F",
+    "Ordering Physician: Dr. Rebecca Miles",
+    "Specimen collected 03/02/2025 07:45 Received 03/02/2025 11:10",
+    "Test Name                 Result     Flag    Units     Reference Interval",
+    "This test was developed and its performance characteristics determined by",
+    "Comment: Results should be interpreted in the context of clinical findings.",
+    "Quest Diagnostics Incorporated, 500 Plaza Drive, Secaucus, NJ 07094",
+    "Final Report",
+]
+
+
+def synthetic_report(pages: int, seed: int) -> str:
+    rng = random.Random(seed)
+    lines: List[str] = []
+    for page in range(pages):
+        lines.append(f"Page {page + 1} of {pages}")
+        for _ in range(45):
+            if rng.random() < 0.4:
+                name, unit = rng.choice(RESULT_LINES)
+                value = rng.choice([f"{rng.uniform(0.5, 300):.1f}", f"<{rng.randint(1, 10)}", f"{rng.randint(1000, 9000):,}"])
+                lines.append(f"{name}    {value}    {rng.choice(['', 'H', 'L'])}    {unit}    {rng.randint(1, 50)}-{rng.randint(60, 400)}")
+            else:
+                lines.append(rng.choice(NOISE_LINES))
+            if rng.random() < 0.1:
+                lines.append("")
+    return "\n".join(lines)
+
+
+class PerPatternParser(OCRParser):
+    """The pre-recognizer line parsing: one re.search per pattern."""
+
+    def _parse_line(self, line: str, line_number: int) -> Optional[ParsedMarker]:
+        matched_code = None
+        for pattern, code in self.MARKER_PATTERNS.items():
+            if re.search(pattern, line):
+                matched_code = code
+                break
+        if not matched_code:
+            return None
+        value, unit, confidence = self._extract_value_unit(line)
+        if value is None:
+            return None
+        return ParsedMarker(code=matched_code, value=value, unit=unit, confidence=confidence,
+                            raw_text=line, line_number=line_number)
+
+    def _extract_value_unit(self, line: str) -> Tuple[Optional[Any], str, float]:
+        value = None
+        unit = "unknown"
+        confidence = 0.5
+        value_pattern = r"(?:(?:result|value|level)[\s:]+)?([<>]?\s*[\d,]+\.?\d*)"
+        value_match = re.search(value_pattern, line, re.IGNORECASE)
+        if value_match:
+            raw_value = value_match.group(1).replace(",", "").strip()
+            try:
+                if raw_value.startswith("<"):
+                    value, confidence = float(raw_value[1:].strip()) / 2, 0.7
+                elif raw_value.startswith(">"):
+                    value, confidence = float(raw_value[1:].strip()) * 1.1, 0.7
+                else:
+                    value, confidence = float(raw_value), 0.9
+            except ValueError:
+                return None, "", 0.0
+        for pattern, canonical_unit in self.UNIT_PATTERNS.items():
+            if re.search(pattern, line, re.IGNORECASE):
+                unit = canonical_unit
+                confidence = min(confidence + 0.1, 1.0)
+                break
+        return value, unit, confidence
+
+    def _detect_lab(self, text: str) -> Optional[str]:
+        for pattern, lab_name in self.LAB_PATTERNS.items():
+            if re.search(pattern, text):
+                return lab_name
+        return None
+
+
+def measure(fn: Callable[[], object], iterations: int) -> Dict[str, float]:
+    fn()  # warm up
+    samples: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[max(int(len(samples) * 0.95) - 1, 0)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR text parsing")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    reports = [synthetic_report(args.pages, seed) for seed in range(args.reports)]
+    lines = sum(report.count("\n") + 1 for report in reports)
+    per_pattern, compiled = PerPatternParser(), OCRParser()
+
+    for report in reports:
+        assert per_pattern._parse_text(report).to_dict()["markers"] == \
+            compiled._parse_text(report).to_dict()["markers"], "parse mismatch"
+
+    baseline = measure(lambda: [per_pattern._parse_text(r) for r in reports], args.iterations)
+    recognizer = measure(lambda: [compiled._parse_text(r) for r in reports], args.iterations)
+
+    print(f"OCR text parsing: {args.reports} reports x {args.pages} pages ({lines} lines), "
+          f"{args.iterations} runs per parser")
+    print(f"{'parser':>12} {'p50':>10} {'p95':>10} {'per page':>10}")
+    for name, stats in (("per-pattern", baseline), ("recognizer", recognizer)):
+        per_page = stats["p50_ms"] / (args.reports * args.pages)
+        print(f"{name:>12} {stats['p50_ms']:>8.1f}ms {stats['p95_ms']:>8.1f}ms {per_page:>8.3f}ms")
+    print(f"speedup: {baseline['p50_ms'] / recognizer['p50_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
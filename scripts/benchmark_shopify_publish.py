@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+GenoMAX² Shopify Publish Benchmark
+
+Compares the legacy sequential publish loop (upsert_product_by_handle, then
+set_product_metafields_bulk = one POST per metafield, time.sleep on 429) with
+publish_modules (N products concurrently, metafields in the product create,
+leaky-bucket pacing), both against the in-process FakeShopifyAPI. A third
+run republishes the catalog in diff mode with two modules edited, so only
+their changed fields are PUT and changed metafields upserted.
+
+Usage:
+    python scripts/benchmark_shopify_publish.py [--modules 20] [--concurrency 4]
+
+Options:
+    --modules N       Modules to publish (default 20)
+    --concurrency N   Concurrent products for publish_modules (default 4)
+    --latency-ms MS   Fake per-request latency (default 30)
+    --leak-rate R     Fake bucket leak rate, calls/s (default 40; Shopify
+                      standard is 2, so real runs are rate-bound for both)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.integrations import shopify_router
+from app.integrations.shopify_client import (
+    AsyncShopifyClient,
+    FakeShopifyAPI,
+    LeakyBucket,
+    ShopifyClient,
+)
+from app.integrations.shopify_router import (
+    build_metafields_payload,
+    build_shopify_product_payload,
+    publish_modules,
+)
+from app.shared.http_clients import configure_upstream
+
+BASE_URL = "https://genomax-bench.myshopify.com/admin/api/2026-01"
+
+
+def make_modules(n):
+    return [{
+        "module_code": f"BENCH-{i:03d}",
+        "product_name": f"Benchmark Module {i}",
+        "shopify_handle": f"benchmark-module-{i}",
+        "os_environment": "MAXimo²",
+        "os_layer": "Core",
+        "tier": "TIER_1",
+        "biological_domain": "Energy",
+        "net_quantity": "60 capsules",
+        "fda_disclaimer": "These statements have not been evaluated by the FDA.",
+        "back_label_text": "Take two daily.",
+        "suggested_use_full": "Take two capsules daily with food.",
+        "safety_notes": "Consult your physician if pregnant.",
+        "contraindications": "None known.",
+        "dosing_protocol": "2 caps AM",
+        "supplier_page_url": "https://supplier.example/product",
+        "supliful_handle": f"supliful-{i}",
+        "supplier_status": "ACTIVE",
+        "is_launch_v1": True,
+    } for i in range(n)]
+
+
+def install_fake(args):
+    fake = FakeShopifyAPI(capacity=40, leak_rate=args.leak_rate, latency_s=args.latency_ms / 1000)
+    configure_upstream("shopify", transport=fake)
+    return fake
+
+
+def run_legacy(modules):
+    """The pre-publisher export loop."""
+    client = ShopifyClient(base_url=BASE_URL, access_token="bench")
+    for module in modules:
+        product, _ = client.upsert_product_by_handle(module["shopify_handle"], build_shopify_product_payload(module))
+        client.set_product_metafields_bulk(int(product["id"]), build_metafields_payload(module))
+
+
+def run_concurrent(modules, args, diff=False):
+    client = AsyncShopifyClient(
+        base_url=BASE_URL, access_token="bench", bucket=LeakyBucket(leak_rate=args.leak_rate)
+    )
+    return asyncio.run(publish_modules(modules, "bench", client, concurrency=args.concurrency, diff=diff))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Shopify catalog publishing")
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--leak-rate", type=float, default=40)
+    args = parser.parse_args()
+
+    state = {}
+    shopify_router.log_publish_audit = lambda **row: None
+    shopify_router.save_publish_state = lambda **row: state.__setitem__(row["module_code"], row)
+    shopify_router.load_publish_state = lambda codes: {c: state[c] for c in codes if c in state}
+    modules = make_modules(args.modules)
+
+    results = {}
+    fake = install_fake(args)
+    started = time.perf_counter()
+    run_legacy(modules)
+    results["sequential"] = (time.perf_counter() - started, len(fake.requests), fake.throttled)
+
+    fake = install_fake(args)
+    started = time.perf_counter()
+    run_concurrent(modules, args)
+    results["concurrent"] = (time.perf_counter() - started, len(fake.requests), fake.throttled)
+
+    edited = list(modules)
+    edited[0] = dict(edited[0], net_quantity="90 capsules")
+    edited[-1] = dict(edited[-1], product_name="Benchmark Module (renamed)")
+    fake.requests.clear()
+    started = time.perf_counter()
+    run_concurrent(edited, args, diff=True)
+    results["diff"] = (time.perf_counter() - started, len(fake.requests), fake.throttled)
+
+    print(f"Shopify publish benchmark ({args.modules} modules, {args.latency_ms:.0f}ms latency, "
+          f"leak {args.leak_rate:g}/s, concurrency {args.concurrency})")
+    print(f"{'publisher':<12} {'total':>9} {'calls':>6} {'429s':>5} {'modules/s':>10}")
+    for name, (elapsed, calls, throttled) in results.items():
+        print(f"{name:<12} {elapsed:>8.2f}s {calls:>6} {throttled:>5} {args.modules / elapsed:>10.1f}")
+    speedup = results["sequential"][0] / results["concurrent"][0]
+    print(f"concurrent is {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
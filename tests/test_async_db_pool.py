@@ -0,0 +1,263 @@
+"""
+Shared asyncpg Pool Tests (lab upload endpoints)
+
+Tests verify (no database required, asyncpg.create_pool is faked):
+1. One pool is created per process and reused across requests
+2. Concurrent first callers share a single creation (single-flight)
+3. Failed creation is not cached and surfaces as AsyncPoolError / HTTP 500
+4. Startup warms the pool; shutdown closes it (terminating on timeout)
+5. A pool replaced by another event loop's is closed on its own loop, or
+   terminated if that loop is gone
+6. lab_upload, brain_orchestrator and webhook storage all use the shared pool
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.shared import async_db_pool
+from app.shared.async_db_pool import (
+    AsyncPoolError,
+    close_async_pool,
+    get_async_pool,
+    get_async_pool_or_none,
+    get_async_pool_stats,
+    init_async_pool,
+)
+from bloodwork_engine import brain_orchestrator, lab_upload, webhooks
+
+
+# ============================================================================
+# FAKE ASYNCPG POOL
+# ============================================================================
+
+class FakeConnection:
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def fetchval(self, sql, *args):
+        self.pool.queries.append(sql)
+        return 1
+
+    async def fetch(self, sql, *args):
+        self.pool.queries.append(sql)
+        return []
+
+    async def execute(self, sql, *args):
+        self.pool.queries.append(sql)
+
+
+class FakePool:
+
+    def __init__(self, close_delay_s=0.0):
+        self.queries = []
+        self.closed = False
+        self.terminated = False
+        self.close_delay_s = close_delay_s
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                assert not pool.closed
+                return FakeConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+    async def close(self):
+        await asyncio.sleep(self.close_delay_s)
+        self.closed = True
+
+    def terminate(self):
+        self.terminated = True
+
+    def get_size(self):
+        return 2
+
+    def get_idle_size(self):
+        return 2
+
+    def get_min_size(self):
+        return 2
+
+    def get_max_size(self):
+        return 10
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Every pool handed out by the faked asyncpg.create_pool."""
+    pools = []
+
+    async def create_pool(dsn, **kwargs):
+        await asyncio.sleep(0.01)
+        if dsn == "postgres://down":
+            raise OSError("connection refused")
+        pool = FakePool()
+        pools.append(pool)
+        return pool
+
+    monkeypatch.setenv("DATABASE_URL", "postgres://fake")
+    monkeypatch.setattr(async_db_pool.asyncpg, "create_pool", create_pool)
+    monkeypatch.setattr(async_db_pool, "_pool_task", None)
+    monkeypatch.setattr(async_db_pool, "_abandoned_total", 0)
+    yield pools
+    async_db_pool._pool_task = None
+
+
+class TestLifecycle:
+
+    def test_concurrent_callers_share_one_pool(self, created):
+        async def scenario():
+            pools = await asyncio.gather(*(get_async_pool() for _ in range(20)))
+            again = await get_async_pool()
+            return pools, again
+
+        pools, again = asyncio.run(scenario())
+        assert len(created) == 1
+        assert all(pool is created[0] for pool in pools)
+        assert again is created[0]
+
+    def test_failed_creation_is_retried(self, created, monkeypatch):
+        monkeypatch.setenv("DATABASE_URL", "postgres://down")
+
+        async def scenario():
+            with pytest.raises(AsyncPoolError, match="connection refused"):
+                await get_async_pool()
+            assert await get_async_pool_or_none() is None
+            monkeypatch.setenv("DATABASE_URL", "postgres://fake")
+            return await get_async_pool()
+
+        assert asyncio.run(scenario()) is created[0]
+        assert get_async_pool_stats()["status"] == "ready"
+
+    def test_missing_database_url(self, created, monkeypatch):
+        monkeypatch.delenv("DATABASE_URL")
+
+        async def scenario():
+            with pytest.raises(AsyncPoolError, match="DATABASE_URL"):
+                await get_async_pool()
+            with pytest.raises(HTTPException) as exc:
+                await lab_upload.get_db_pool()
+            return exc.value
+
+        assert asyncio.run(scenario()).status_code == 500
+        assert created == []
+
+    def test_init_warms_and_close_closes(self, created):
+        async def scenario():
+            await init_async_pool()
+            stats = get_async_pool_stats()
+            await close_async_pool()
+            return stats
+
+        stats = asyncio.run(scenario())
+        assert stats["status"] == "ready"
+        assert (stats["size"], stats["max_size"]) == (2, 10)
+        assert created[0].queries == ["SELECT 1"]
+        assert created[0].closed
+        assert get_async_pool_stats()["status"] == "not_initialized"
+
+    def test_init_without_database_is_not_fatal(self, created, monkeypatch):
+        monkeypatch.setenv("DATABASE_URL", "postgres://down")
+        asyncio.run(init_async_pool())
+        assert get_async_pool_stats()["status"] == "error"
+
+    def test_stalled_close_terminates(self, created, monkeypatch):
+        monkeypatch.setattr(async_db_pool, "ASYNC_DB_POOL_CLOSE_TIMEOUT_S", 0.01)
+
+        async def scenario():
+            pool = await get_async_pool()
+            pool.close_delay_s = 1
+            await close_async_pool()
+            return pool
+
+        assert asyncio.run(scenario()).terminated
+
+    def test_new_event_loop_gets_its_own_pool(self, created):
+        first = asyncio.run(get_async_pool())
+        second = asyncio.run(get_async_pool())
+        assert first is not second
+        assert len(created) == 2
+        # The first loop is closed: its pool is terminated, not leaked
+        assert first.terminated
+        assert get_async_pool_stats()["abandoned_total"] == 1
+
+    def test_replaced_pool_is_closed_on_its_running_loop(self, created):
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+        try:
+            first = asyncio.run_coroutine_threadsafe(get_async_pool(), other).result(5)
+            second = asyncio.run(get_async_pool())
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other).result(5)
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join(5)
+            other.close()
+
+        assert first is not second
+        assert first.closed and not first.terminated
+        assert not second.closed
+        assert get_async_pool_stats()["abandoned_total"] == 0
+
+    def test_close_from_another_loop_closes_on_owner(self, created):
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+        try:
+            pool = asyncio.run_coroutine_threadsafe(get_async_pool(), other).result(5)
+            asyncio.run(close_async_pool())
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other).result(5)
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join(5)
+            other.close()
+
+        assert pool.closed
+        assert get_async_pool_stats()["status"] == "not_initialized"
+
+
+class TestSharedUsers:
+
+    def test_modules_share_the_pool(self, created):
+        async def scenario():
+            return (
+                await lab_upload.get_db_pool(),
+                await brain_orchestrator.get_pool(),
+                await get_async_pool(),
+            )
+
+        lab, brain, shared = asyncio.run(scenario())
+        assert lab is brain is shared is created[0]
+
+    def test_webhook_storage_defaults_to_shared_pool(self, created):
+        async def scenario():
+            return await webhooks.update_lab_order_status("order-1", "junction", "completed")
+
+        assert asyncio.run(scenario()) is True
+        assert "UPDATE lab_orders" in created[0].queries[0]
+
+    def test_lab_endpoints_reuse_pool_across_requests(self, created):
+        app = FastAPI()
+        app.include_router(lab_upload.router)
+        app.add_event_handler("startup", init_async_pool)
+        app.add_event_handler("shutdown", close_async_pool)
+
+        with TestClient(app) as client:
+            for _ in range(5):
+                assert client.get("/api/v1/lab/submissions").json() == []
+            assert not created[0].closed
+
+        assert len(created) == 1
+        assert created[0].queries.count("SELECT 1") == 1
+        assert len(created[0].queries) == 6
+        assert created[0].closed
@@ -0,0 +1,178 @@
+"""
+Bloodwork Batch Processing Tests
+
+Tests verify:
+1. POST /api/v1/bloodwork/process/batch streams one NDJSON line per panel,
+   in input order, followed by a summary trailer
+2. Each result matches POST /api/v1/bloodwork/process for the same panel
+3. Process pool and inline execution produce identical results
+4. A failing panel is reported on its line without aborting the batch
+5. Batches share one spawn-context process pool bounded by BATCH_WORKERS
+"""
+
+import json
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bloodwork_engine import batch
+from bloodwork_engine.api import register_bloodwork_endpoints
+from bloodwork_engine.batch import iter_batch
+
+
+def _panel(i):
+    return {
+        "panel_id": f"p{i}",
+        "markers": [
+            {"code": "ferritin", "value": 50 + i * 17 % 400, "unit": "ng/mL"},
+            {"code": "hs_crp", "value": (i % 7) * 0.8, "unit": "mg/L"},
+            {"code": "vitamin_d_25oh", "value": 20 + i % 50, "unit": "ng/mL"},
+        ],
+        "sex": "male" if i % 2 else "female",
+        "age": 30 + i % 40,
+    }
+
+
+@pytest.fixture
+def shared_pool(monkeypatch):
+    """A 2-worker shared pool used for every batch, shut down afterwards."""
+    monkeypatch.setattr(batch, "BATCH_WORKERS", 2)
+    monkeypatch.setattr(batch, "BATCH_PARALLEL_MIN", 1)
+    monkeypatch.setattr(batch, "_executor", None)
+    yield
+    batch.shutdown_batch_pool()
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    register_bloodwork_endpoints(app)
+    return TestClient(app)
+
+
+def _read_ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def _stable(result):
+    return {k: v for k, v in result.items() if k != "processed_at"}
+
+
+class TestBatchEndpoint:
+
+    def test_streams_results_in_order_with_summary(self, client):
+        panels = [_panel(i) for i in range(12)]
+        response = client.post("/api/v1/bloodwork/process/batch", json={"panels": panels})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = _read_ndjson(response)
+        assert len(lines) == 13
+
+        results, summary = lines[:-1], lines[-1]
+        assert [line["index"] for line in results] == list(range(12))
+        assert [line["panel_id"] for line in results] == [p["panel_id"] for p in panels]
+        assert all(line["status"] == "ok" for line in results)
+
+        assert summary["type"] == "summary"
+        assert summary["panel_count"] == 12
+        assert summary["succeeded"] == 12
+        assert summary["failed"] == 0
+        assert summary["elapsed_ms"] > 0
+        assert set(summary["panel_ms"]) == {"mean", "p50", "p95", "max"}
+
+    def test_results_match_single_process_endpoint(self, client):
+        panels = [_panel(i) for i in range(5)]
+        lines = _read_ndjson(client.post("/api/v1/bloodwork/process/batch", json={"panels": panels}))
+
+        for panel, line in zip(panels, lines):
+            body = {k: v for k, v in panel.items() if k != "panel_id"}
+            single = client.post("/api/v1/bloodwork/process", json=body).json()
+            assert _stable(line["result"]) == _stable(single)
+
+    def test_rejects_oversized_batch(self, client, monkeypatch):
+        monkeypatch.setattr(batch, "BATCH_MAX_PANELS", 2)
+        response = client.post("/api/v1/bloodwork/process/batch", json={"panels": [_panel(i) for i in range(3)]})
+        assert response.json()["error"] == "BATCH_TOO_LARGE"
+
+    def test_empty_batch_returns_summary_only(self, client):
+        lines = _read_ndjson(client.post("/api/v1/bloodwork/process/batch", json={"panels": []}))
+        assert len(lines) == 1
+        assert lines[0]["panel_count"] == 0
+
+
+class TestBatchExecution:
+
+    def test_process_pool_matches_inline(self, shared_pool):
+        panels = [_panel(i) for i in range(30)]
+        inline = list(iter_batch(panels, workers=1, chunk_size=4))
+
+        pooled = list(iter_batch(panels, workers=2, chunk_size=4))
+
+        assert inline[-1]["mode"] == "inline"
+        assert pooled[-1]["mode"] == "process_pool"
+        assert pooled[-1]["workers"] == 2
+        assert [line["index"] for line in pooled[:-1]] == list(range(30))
+        for a, b in zip(inline[:-1], pooled[:-1]):
+            assert a["result"]["output_hash"] == b["result"]["output_hash"]
+
+    def test_failing_panel_does_not_abort_batch(self):
+        panels = [_panel(0), {"panel_id": "bad", "markers": None}, _panel(2)]
+        lines = list(iter_batch(panels, workers=1))
+
+        assert [line["status"] for line in lines[:-1]] == ["ok", "error", "ok"]
+        assert lines[1]["panel_id"] == "bad"
+        assert "TypeError" in lines[1]["error"]
+        assert lines[-1]["succeeded"] == 2
+        assert lines[-1]["failed"] == 1
+
+
+class TestSharedPool:
+
+    def test_batches_reuse_one_spawn_pool(self, shared_pool):
+        batch.start_batch_pool()
+        pool = batch._executor
+        assert pool._mp_context.get_start_method() == "spawn"
+
+        panels = [_panel(i) for i in range(8)]
+        for _ in range(3):
+            lines = list(iter_batch(panels, workers=8, chunk_size=2))
+            assert lines[-1]["mode"] == "process_pool"
+            assert lines[-1]["workers"] == 2  # Capped at the shared pool size
+
+        assert batch._executor is pool
+        assert len(pool._processes) <= 2
+
+    def test_concurrent_batches_bound_process_count(self, shared_pool):
+        panels = [_panel(i) for i in range(12)]
+        results = []
+
+        def run():
+            results.append(list(iter_batch(panels, workers=2, chunk_size=2)))
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 4
+        assert all([line["index"] for line in lines[:-1]] == list(range(12)) for lines in results)
+        assert len(batch._executor._processes) <= 2
+
+    def test_abandoned_stream_leaves_pool_running(self, shared_pool):
+        panels = [_panel(i) for i in range(40)]
+        stream = iter_batch(panels, workers=2, chunk_size=2)
+        next(stream)
+        stream.close()
+
+        lines = list(iter_batch(panels[:4], workers=2, chunk_size=2))
+        assert lines[-1]["succeeded"] == 4
+
+    def test_shutdown_clears_pool(self, shared_pool):
+        batch.start_batch_pool()
+        assert batch._executor is not None
+        batch.shutdown_batch_pool()
+        assert batch._executor is None
@@ -9,6 +9,7 @@ Tests:
 3. test_persistence - handoff stored to decision_outputs
 4. test_outage_hard_abort - unavailability returns 503
 5. test_schema_validation - validates against JSON Schema
+6. test_in_process_transport - direct engine call matches the HTTP handoff
 """
 
 import pytest
@@ -32,7 +33,9 @@ from app.brain.bloodwork_handoff import (
     handoff_to_decision_output,
     _build_handoff_from_response,
     BLOODWORK_BASE_URL,
-    BLOODWORK_ENDPOINT
+    BLOODWORK_ENDPOINT,
+    TRANSPORT_HTTP,
+    TRANSPORT_IN_PROCESS
 )
 from app.shared.hashing import canonicalize_and_hash
 
@@ -412,6 +415,10 @@ class TestOutageHardAbort:
     STRICT MODE: No fallback, no graceful degradation.
     """
     
+    @pytest.fixture(autouse=True)
+    def http_transport(self, monkeypatch):
+        monkeypatch.setattr("app.brain.bloodwork_handoff.BLOODWORK_TRANSPORT", TRANSPORT_HTTP)
+    
     def test_connection_error_raises_503(self, mock_request_payload):
         """Connection failure raises BLOODWORK_UNAVAILABLE with 503."""
         with patch('app.brain.bloodwork_handoff.httpx.Client') as mock_client:
@@ -653,5 +660,105 @@ class TestIntegration:
         assert blood_blocks_ingredient(handoff, "vitamin_d") is False
 
 
+# ============================================
+# TEST 6: IN-PROCESS TRANSPORT
+# ============================================
+
+class TestInProcessTransport:
+    """
+    Test the default in-process transport (no HTTP loopback).
+    """
+    
+    def test_default_transport_does_not_use_http(self, mock_request_payload):
+        """Default transport calls the engine directly."""
+        with patch('app.brain.bloodwork_handoff.httpx.Client') as mock_client:
+            handoff = fetch_bloodwork_handoff(
+                markers=mock_request_payload["markers"],
+                lab_profile=mock_request_payload["lab_profile"],
+                sex=mock_request_payload["sex"],
+                age=mock_request_payload["age"]
+            )
+            mock_client.assert_not_called()
+        
+        assert "iron" in handoff.output["routing_constraints"]["blocked_ingredients"]
+        assert "base_url" not in handoff.source
+        assert handoff.source["endpoint"] == BLOODWORK_ENDPOINT
+    
+    def test_matches_http_handoff(self, mock_request_payload):
+        """In-process handoff equals the handoff built from the JSON API response."""
+        from bloodwork_engine.api import serialize_result
+        from bloodwork_engine.engine_v2 import get_engine
+        
+        result = get_engine(lab_profile=mock_request_payload["lab_profile"]).process_markers(
+            markers=mock_request_payload["markers"],
+            sex=mock_request_payload["sex"],
+            age=mock_request_payload["age"]
+        )
+        api_response = json.loads(json.dumps(serialize_result(result)))
+        
+        with patch('bloodwork_engine.engine_v2.BloodworkEngineV2.process_markers', return_value=result):
+            in_process = fetch_bloodwork_handoff(
+                markers=mock_request_payload["markers"],
+                lab_profile=mock_request_payload["lab_profile"],
+                sex=mock_request_payload["sex"],
+                age=mock_request_payload["age"],
+                transport=TRANSPORT_IN_PROCESS
+            )
+        over_http = _build_handoff_from_response(api_response, mock_request_payload)
+        
+        assert in_process.output == over_http.output
+        assert in_process.input == over_http.input
+        assert in_process.audit == over_http.audit
+    
+    def test_transports_build_same_handoff(self, mock_request_payload):
+        """fetch_bloodwork_handoff over HTTP (real /process endpoint) and in process agree."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from bloodwork_engine.api import register_bloodwork_endpoints
+        from bloodwork_engine.engine_v2 import get_engine
+        
+        engine_app = FastAPI()
+        register_bloodwork_endpoints(engine_app)
+        result = get_engine(lab_profile=mock_request_payload["lab_profile"]).process_markers(
+            markers=mock_request_payload["markers"],
+            sex=mock_request_payload["sex"],
+            age=mock_request_payload["age"]
+        )
+        
+        handoffs = {}
+        with patch('bloodwork_engine.engine_v2.BloodworkEngineV2.process_markers', return_value=result), \
+                patch('app.brain.bloodwork_handoff.httpx.Client',
+                      side_effect=lambda **kwargs: TestClient(engine_app, base_url=BLOODWORK_BASE_URL)):
+            for transport in (TRANSPORT_IN_PROCESS, "http"):
+                handoffs[transport] = fetch_bloodwork_handoff(
+                    markers=mock_request_payload["markers"],
+                    lab_profile=mock_request_payload["lab_profile"],
+                    sex=mock_request_payload["sex"],
+                    age=mock_request_payload["age"],
+                    transport=transport
+                ).to_dict()
+        
+        in_process, over_http = handoffs[TRANSPORT_IN_PROCESS], handoffs["http"]
+        assert over_http["source"].pop("base_url") == BLOODWORK_BASE_URL
+        assert in_process == over_http
+        assert in_process["output"]["processed_markers"]
+    
+    def test_engine_failure_raises_502(self, mock_request_payload):
+        """Engine exception maps to BLOODWORK_API_ERROR like a non-200 response."""
+        with patch('bloodwork_engine.engine_v2.BloodworkEngineV2.process_markers', side_effect=KeyError("unit")):
+            with pytest.raises(BloodworkHandoffException) as exc_info:
+                fetch_bloodwork_handoff(markers=mock_request_payload["markers"])
+        
+        assert exc_info.value.error_code == BloodworkHandoffError.BLOODWORK_API_ERROR
+        assert exc_info.value.http_code == 502
+    
+    def test_unknown_transport_rejected(self, mock_request_payload):
+        with pytest.raises(BloodworkHandoffException) as exc_info:
+            fetch_bloodwork_handoff(markers=mock_request_payload["markers"], transport="grpc")
+        
+        assert exc_info.value.error_code == BloodworkHandoffError.BLOODWORK_CONFIG_ERROR
+        assert exc_info.value.http_code == 500
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
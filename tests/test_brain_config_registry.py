@@ -0,0 +1,217 @@
+"""
+Brain Config Registry Tests (Compose painpoints and lifestyle rules)
+
+Tests verify:
+1. Compose configs load once and are served from cache
+2. Hot reload: rebuild only when the file content changes; bad reloads keep
+   the previous snapshot
+3. Compiled lifestyle predicates agree with evaluate_rule_condition
+4. Compose embeds the config version ids in its result and audit dicts
+"""
+
+import itertools
+import json
+import os
+
+import pytest
+
+from app.brain.compose import (
+    LifestyleInput,
+    PainpointInput,
+    compose,
+    compose_result_to_dict,
+    evaluate_rule_condition,
+    load_lifestyle_ruleset,
+    load_painpoints_dictionary,
+)
+from app.brain.config_registry import (
+    ConfigRegistry,
+    ConfigRegistryError,
+    compile_lifestyle_ruleset,
+    compile_painpoints,
+    compile_rule_condition,
+    get_config_registry,
+)
+
+
+def make_lifestyle(**overrides):
+    values = dict(
+        sleep_hours=7, sleep_quality=7, stress_level=4,
+        activity_level="moderate", caffeine_intake="low",
+        alcohol_intake="none", work_schedule="day",
+        meals_per_day=3, sugar_intake="low", smoking=False,
+    )
+    values.update(overrides)
+    return LifestyleInput(**values)
+
+
+RULESET = {
+    "version": "1.0",
+    "rules": [
+        {
+            "id": "short_sleep",
+            "input_conditions": {"sleep_hours": {"max": 6}},
+            "effects": {"intent_modifiers": {"sleep_support": 0.3, "energy": 2.5}},
+        },
+    ],
+    "global_constraints": {"max_modifier_value": 1.0, "min_modifier_value": -1.0},
+}
+
+
+@pytest.fixture
+def ruleset_file(tmp_path):
+    path = tmp_path / "lifestyle_ruleset.json"
+    path.write_text(json.dumps(RULESET))
+    return path
+
+
+@pytest.fixture
+def registry(ruleset_file):
+    registry = ConfigRegistry(reload_check_s=0)
+    # Absolute paths bypass the config/ lookup
+    registry.register("lifestyle", str(ruleset_file), compile_lifestyle_ruleset)
+    return registry
+
+
+def rewrite(path, data, bump_ns=1_000_000):
+    stat = path.stat()
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+class TestCaching:
+
+    def test_loads_once(self, registry):
+        first = registry.get("lifestyle")
+        for _ in range(20):
+            assert registry.get("lifestyle") is first
+        assert registry.get_stats()["lifestyle"]["loads"] == 1
+        assert first.version.startswith("1.0+")
+        assert first.compiled.rules[0].intent_modifiers == (("sleep_support", 0.3), ("energy", 1.0))
+
+    def test_shared_registry_serves_compose_loaders(self):
+        registry = get_config_registry()
+        assert registry is get_config_registry()
+        assert load_painpoints_dictionary() is registry.get("painpoints").data["painpoints"]
+        rules, constraints = load_lifestyle_ruleset()
+        assert [r["id"] for r in rules] == [r.id for r in registry.get("lifestyle").compiled.rules]
+        assert constraints["max_modifier_value"] == 1.0
+
+    def test_unknown_or_missing_config(self, tmp_path):
+        registry = ConfigRegistry()
+        with pytest.raises(ConfigRegistryError):
+            registry.get("lifestyle")
+        registry.register("painpoints", str(tmp_path / "missing.json"), compile_painpoints)
+        with pytest.raises(ConfigRegistryError):
+            registry.get("painpoints")
+
+
+class TestHotReload:
+
+    def test_touch_without_change_keeps_snapshot(self, registry, ruleset_file):
+        first = registry.get("lifestyle")
+        rewrite(ruleset_file, RULESET)
+
+        second = registry.get("lifestyle")
+        assert second.version == first.version
+        assert second.compiled is first.compiled
+        assert registry.get_stats()["lifestyle"]["loads"] == 1
+
+    def test_content_change_rebuilds(self, registry, ruleset_file):
+        first = registry.get("lifestyle")
+        changed = json.loads(json.dumps(RULESET))
+        changed["rules"][0]["input_conditions"] = {"sleep_hours": {"max": 5}}
+        rewrite(ruleset_file, changed)
+
+        second = registry.get("lifestyle")
+        assert second.version != first.version
+        assert registry.get_stats()["lifestyle"]["loads"] == 2
+        assert first.compiled.rules[0].matches(make_lifestyle(sleep_hours=6))
+        assert not second.compiled.rules[0].matches(make_lifestyle(sleep_hours=6))
+
+    def test_check_interval_throttles_stat(self, ruleset_file):
+        registry = ConfigRegistry(reload_check_s=3600)
+        registry.register("lifestyle", str(ruleset_file), compile_lifestyle_ruleset)
+        first = registry.get("lifestyle")
+        rewrite(ruleset_file, dict(RULESET, version="2.0"))
+
+        assert registry.get("lifestyle") is first
+        registry.invalidate("lifestyle")
+        assert registry.get("lifestyle").version.startswith("2.0+")
+
+    def test_broken_reload_keeps_previous(self, registry, ruleset_file):
+        first = registry.get("lifestyle")
+        ruleset_file.write_text("{ not json")
+        os.utime(ruleset_file, ns=(0, first.mtime_ns + 1_000_000))
+
+        assert registry.get("lifestyle") is first
+        assert "JSONDecodeError" in registry.get_stats()["lifestyle"]["last_error"]
+
+        rewrite(ruleset_file, RULESET)
+        assert registry.get("lifestyle").version == first.version
+        assert registry.get_stats()["lifestyle"]["last_error"] is None
+
+
+class TestCompiledRules:
+
+    def test_shipped_rules_match_interpreter(self):
+        rules, _ = load_lifestyle_ruleset()
+        compiled = get_config_registry().get("lifestyle").compiled.rules
+        grid = itertools.product(
+            [4, 6, 8], [3, 4, 8], [5, 8, 9],
+            ["sedentary", "high"], ["low", "high"], ["none", "high"],
+            ["day", "night", "rotating"], [2, 3], ["low", "high"], [False, True],
+        )
+        fields = ["sleep_hours", "sleep_quality", "stress_level", "activity_level",
+                  "caffeine_intake", "alcohol_intake", "work_schedule",
+                  "meals_per_day", "sugar_intake", "smoking"]
+        for n, values in enumerate(grid):
+            if n % 7:
+                continue
+            lifestyle = LifestyleInput(**dict(zip(fields, values)))
+            expected = [evaluate_rule_condition(r["input_conditions"], lifestyle) for r in rules]
+            assert [rule.matches(lifestyle) for rule in compiled] == expected
+
+    @pytest.mark.parametrize("condition", [
+        {"sleep_hours": {"min": 5, "max": 7}},
+        {"stress_level": {"min": 6}, "work_schedule": "night"},
+        {"smoking": True},
+        {"missing_field": {"equals": 1}},
+        {},
+    ])
+    def test_multi_term_conditions(self, condition):
+        predicate = compile_rule_condition(condition)
+        for lifestyle in [
+            make_lifestyle(),
+            make_lifestyle(sleep_hours=4, stress_level=9, work_schedule="night", smoking=True),
+            make_lifestyle(sleep_hours=6, stress_level=6, work_schedule="night"),
+        ]:
+            assert predicate(lifestyle) == evaluate_rule_condition(condition, lifestyle)
+
+
+class TestComposeVersions:
+
+    def test_compose_records_versions(self):
+        registry = get_config_registry()
+        result = compose(
+            painpoints_input=[PainpointInput(id="stress", severity=2)],
+            lifestyle_input=make_lifestyle(stress_level=9),
+        )
+
+        assert result.config_versions == {
+            "painpoints": registry.get("painpoints").version,
+            "lifestyle": registry.get("lifestyle").version,
+        }
+        assert compose_result_to_dict(result)["config_versions"] == result.config_versions
+        assert "high_stress" in result.lifestyle_rules_applied
+
+    def test_goal_only_compose_uses_no_config(self):
+        assert compose().config_versions == {}
+
+    def test_compose_does_not_reload(self):
+        registry = get_config_registry()
+        registry.get("painpoints")
+        loads = registry.get_stats()["painpoints"]["loads"]
+        for _ in range(50):
+            compose(painpoints_input=[PainpointInput(id="fatigue", severity=2)])
+        assert registry.get_stats()["painpoints"]["loads"] == loads
@@ -0,0 +1,186 @@
+"""
+Brain Module Matrix Tests (vectorized module scoring)
+
+Tests verify (no database required):
+1. ModuleMatrix.rank() matches score_module() for every module, field by field
+2. Ranking, blocked and caution partitions match the per-module path
+3. BrainOrchestrator.run() returns the same result with and without NumPy
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.catalog.wiring import CatalogSnapshot, CatalogWiring, get_catalog
+from bloodwork_engine import brain_orchestrator
+from bloodwork_engine.brain_orchestrator import (
+    BIOMARKER_DEFICIENCY_THRESHOLDS,
+    GOAL_KEYWORDS,
+    INGREDIENT_BIOMARKER_MAP,
+    LIFECYCLE_RECOMMENDATIONS,
+    BrainOrchestrator,
+    build_catalog_modules,
+    detect_deficiencies,
+    score_module,
+)
+
+INGREDIENTS = sorted(
+    set(INGREDIENT_BIOMARKER_MAP)
+    | {kw for kws in GOAL_KEYWORDS.values() for kw in kws}
+    | {"ashwagandha", "niacin", "choline", "iodine", "calcium", "b_complex"}
+)
+CATEGORIES = ["supplement", "Sleep Support", "energy", "immunity", "Heart Health"]
+
+
+def synthetic_rows(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "gx_catalog_id": f"GX-{i:05d}",
+            "product_name": f"Module {i % 97}",  # repeated names exercise tie order
+            "product_url": None,
+            "category": rng.choice(CATEGORIES),
+            "short_description": None,
+            "base_price": 20.0,
+            "evidence_tier": rng.choice(["TIER_1", "TIER_2", "TIER_3"]),
+            "governance_status": "ACTIVE",
+            "ingredient_tags": rng.sample(INGREDIENTS, rng.randint(1, 4)),
+            "sex_target": "",
+            "os_environment": rng.choice(["MAXimo²", "MAXima²"]),
+        }
+        for i in range(n)
+    ]
+
+
+MARKERS = [
+    {"code": "ferritin", "value": 18, "unit": "ng/mL"},
+    {"code": "vitamin_d_25oh", "value": 24, "unit": "ng/mL"},
+    {"code": "hscrp", "value": 3.4, "unit": "mg/L"},
+    {"code": "homocysteine", "value": 12, "unit": "umol/L"},
+    {"code": "magnesium_rbc", "value": 4.0, "unit": "mg/dL"},
+]
+
+CASES = [
+    dict(goals=[], lifecycle_phase=None, confidence_score=1.0, caution=set(), blocked=set()),
+    dict(goals=["energy", "Heart Health", "unknown goal", "energy"], lifecycle_phase="pregnant",
+         confidence_score=0.7, caution={"niacin", "iron"}, blocked={"ashwagandha", "vitamin_k2"}),
+    dict(goals=["sleep", "longevity"], lifecycle_phase="Athletic", confidence_score=0.2,
+         caution={"magnesium"}, blocked={"not_in_catalog"}),
+    dict(goals=["immunity"], lifecycle_phase="hibernating", confidence_score=0.9,
+         caution=set(), blocked={"zinc"}),
+]
+
+
+def reference_rank(modules, deficiencies, case, max_modules):
+    """The pre-matrix path: per-module blocking + score_module + sort."""
+    scored = []
+    for module in modules:
+        blocked_match = module["all_ingredients_lower"].intersection(case["blocked"])
+        scored.append(score_module(
+            module={**module, "is_blocked": len(blocked_match) > 0, "blocked_ingredients": list(blocked_match)},
+            deficiencies=deficiencies,
+            goals=case["goals"],
+            lifecycle_phase=case["lifecycle_phase"],
+            confidence_score=case["confidence_score"],
+            caution_ingredients=case["caution"],
+        ))
+    eligible = [m for m in scored if not m.blocked]
+    eligible.sort(key=lambda m: m.final_score, reverse=True)
+    return (
+        eligible[:max_modules],
+        [m for m in scored if m.blocked],
+        [m for m in scored if m.caution and not m.blocked],
+    )
+
+
+@pytest.fixture(scope="module")
+def catalog_modules():
+    return build_catalog_modules(CatalogSnapshot.from_rows(synthetic_rows(600)))
+
+
+class TestParity:
+
+    @pytest.mark.parametrize("case", CASES)
+    @pytest.mark.parametrize("gender", ["male", "female"])
+    def test_rank_matches_score_module(self, catalog_modules, case, gender):
+        deficiencies = detect_deficiencies(MARKERS, gender)
+        modules = catalog_modules.by_gender[gender]
+        max_modules = len(modules)  # compare the full ranking, not just the top
+
+        expected = reference_rank(modules, deficiencies, case, max_modules)
+        actual = catalog_modules.matrices[gender].rank(
+            deficiencies=deficiencies,
+            goals=case["goals"],
+            lifecycle_phase=case["lifecycle_phase"],
+            confidence_score=case["confidence_score"],
+            caution_ingredients=case["caution"],
+            blocked_ingredients=case["blocked"],
+            max_modules=max_modules,
+        )
+
+        for expected_part, actual_part in zip(expected, actual):
+            assert actual_part == expected_part
+
+    def test_every_lifecycle_phase_and_goal_covered(self, catalog_modules):
+        deficiencies = detect_deficiencies(MARKERS, "female")
+        modules = catalog_modules.by_gender["female"]
+        for phase in LIFECYCLE_RECOMMENDATIONS:
+            case = dict(goals=list(GOAL_KEYWORDS), lifecycle_phase=phase, confidence_score=0.5,
+                        caution=set(), blocked=set())
+            expected = reference_rank(modules, deficiencies, case, 8)
+            actual = catalog_modules.matrices["female"].rank(
+                deficiencies, case["goals"], phase, 0.5, set(), set(), 8
+            )
+            assert actual[0] == expected[0]
+
+    def test_all_markers_deficient(self, catalog_modules):
+        markers = [{"code": code, "value": 0.01 if not cfg.get("inverse") else 999, "unit": ""}
+                   for code, cfg in BIOMARKER_DEFICIENCY_THRESHOLDS.items()]
+        deficiencies = detect_deficiencies(markers, "male")
+        modules = catalog_modules.by_gender["male"]
+        case = CASES[1]
+        expected = reference_rank(modules, deficiencies, case, 6)
+        actual = catalog_modules.matrices["male"].rank(
+            deficiencies, case["goals"], case["lifecycle_phase"], case["confidence_score"],
+            case["caution"], case["blocked"], 6
+        )
+        assert actual == expected
+
+
+class TestRun:
+
+    @pytest.fixture
+    def orchestrator(self, monkeypatch):
+        CatalogWiring.reset()
+        get_catalog()._snapshot = CatalogSnapshot.from_rows(synthetic_rows(300, seed=11))
+        monkeypatch.setattr(brain_orchestrator, "_catalog_modules", None)
+        orchestrator = BrainOrchestrator()
+
+        async def no_store(result):
+            pass
+
+        monkeypatch.setattr(orchestrator, "_store_run_result", no_store)
+        yield orchestrator
+        CatalogWiring.reset()
+
+    def run(self, orchestrator):
+        return asyncio.run(orchestrator.run(
+            submission_id="sub_1", user_id="user_1", markers=MARKERS,
+            blocked_ingredients=["Ashwagandha"], caution_ingredients=["niacin"],
+            gender="female", lifecycle_phase="pregnant", goals=["energy", "sleep"],
+            excluded_ingredients=["zinc"], confidence_score=0.8,
+        ))
+
+    def test_run_matches_without_numpy(self, orchestrator, monkeypatch):
+        vectorized = self.run(orchestrator)
+
+        monkeypatch.setattr(brain_orchestrator, "np", None)
+        monkeypatch.setattr(brain_orchestrator, "_catalog_modules", None)
+        fallback = self.run(orchestrator)
+
+        assert vectorized.status.value == "completed"
+        assert len(vectorized.recommended_modules) == 8
+        assert vectorized.recommended_modules == fallback.recommended_modules
+        assert vectorized.blocked_modules == fallback.blocked_modules
+        assert vectorized.caution_modules == fallback.caution_modules
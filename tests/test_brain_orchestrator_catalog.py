@@ -0,0 +1,133 @@
+"""
+Brain Orchestrator Catalog Tests (in-process catalog wiring snapshots)
+
+Tests verify (no database or network required, catalog snapshots are
+installed directly on the CatalogWiring singleton):
+1. The orchestrator reads CatalogWiring in process, never over HTTP
+2. Module records are derived once per catalog version and rebuilt on swap
+3. Gender/tier partitions and block detection match the previous behavior
+4. An unavailable catalog fails the run instead of serving an empty catalog
+"""
+
+import asyncio
+
+import pytest
+
+from app.catalog.wiring import CatalogSnapshot, CatalogWiring, CatalogWiringError, get_catalog
+from bloodwork_engine import brain_orchestrator
+from bloodwork_engine.brain_orchestrator import (
+    BrainOrchestrator,
+    BrainRunStatus,
+    get_catalog_modules,
+    load_catalog_from_wiring,
+    load_supplement_catalog,
+)
+
+
+def product_row(sku, os_env="MAXimo²", tier="TIER_1", tags=None, name=None):
+    return {
+        "gx_catalog_id": sku,
+        "product_name": name or f"Product {sku}",
+        "product_url": None,
+        "category": "supplement",
+        "short_description": None,
+        "base_price": 29.0,
+        "evidence_tier": tier,
+        "governance_status": "ACTIVE",
+        "ingredient_tags": tags or ["Magnesium"],
+        "sex_target": "male" if os_env == "MAXimo²" else "female",
+        "os_environment": os_env,
+    }
+
+
+ROWS = [
+    product_row("GX-D3", tags=["Vitamin_D3", "vitamin_k2"]),
+    product_row("GX-FE", tags=["iron_bisglycinate"]),
+    product_row("GX-W", os_env="MAXima²", tags=["methylfolate"]),
+    product_row("GX-T3", tier="TIER_3", tags=["zinc"]),
+]
+
+
+def install(rows):
+    get_catalog()._snapshot = CatalogSnapshot.from_rows(rows)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch):
+    CatalogWiring.reset()
+    monkeypatch.setattr(brain_orchestrator, "_catalog_modules", None)
+    install(ROWS)
+    yield get_catalog()
+    CatalogWiring.reset()
+
+
+class TestCatalogModules:
+
+    def test_records_are_derived_from_snapshot(self):
+        modules = {m["sku"]: m for m in run(load_catalog_from_wiring())}
+        d3 = modules["GX-D3"]
+        assert d3["target_biomarkers"] == ["vitamin_d_25oh"]
+        assert d3["all_ingredients_lower"] == {"vitamin_d3", "vitamin_k2"}
+        assert d3["product_line"] == "MAXimo²"
+        assert modules["GX-FE"]["target_biomarkers"] == ["ferritin", "serum_iron", "tibc", "transferrin_sat"]
+
+    def test_built_once_per_version(self, monkeypatch):
+        builds = []
+        real_build = brain_orchestrator.build_catalog_modules
+        monkeypatch.setattr(
+            brain_orchestrator, "build_catalog_modules",
+            lambda snap: builds.append(snap.version) or real_build(snap)
+        )
+
+        first = run(get_catalog_modules())
+        assert run(get_catalog_modules()) is first
+
+        install(ROWS + [product_row("GX-NEW")])
+        second = run(get_catalog_modules())
+        assert second.version != first.version
+        assert "GX-NEW" in {m["sku"] for m in second.modules}
+        assert len(builds) == 2
+
+    def test_gender_and_tier_partitions(self):
+        male = run(load_supplement_catalog("male", set()))
+        female = run(load_supplement_catalog("Female", set()))
+        assert {m["sku"] for m in male} == {"GX-D3", "GX-FE"}
+        assert {m["sku"] for m in female} == {"GX-W"}
+        assert run(load_supplement_catalog("other", set())) == []
+
+    def test_blocked_ingredients_flagged_case_insensitively(self):
+        modules = {m["sku"]: m for m in run(load_supplement_catalog("male", {"vitamin_d3"}))}
+        assert modules["GX-D3"]["is_blocked"] is True
+        assert modules["GX-D3"]["blocked_ingredients"] == ["vitamin_d3"]
+        assert modules["GX-FE"]["is_blocked"] is False
+
+    def test_available_modules_keep_api_shape(self):
+        modules = run(BrainOrchestrator().get_available_modules(sex="female"))
+        assert [m["sku"] for m in modules] == ["GX-W"]
+        assert "all_ingredients_lower" not in modules[0]
+
+
+class TestCatalogUnavailable:
+
+    def test_unloaded_catalog_fails_run(self, monkeypatch):
+        CatalogWiring.reset()
+
+        def unavailable(self):
+            raise CatalogWiringError("CATALOG_DB_ERROR: connection refused")
+
+        monkeypatch.setattr(CatalogWiring, "ensure_loaded", unavailable)
+        with pytest.raises(CatalogWiringError):
+            run(load_catalog_from_wiring())
+
+        orchestrator = BrainOrchestrator()
+        result = run(orchestrator.run(
+            submission_id="sub_1", user_id="user_1",
+            markers=[{"code": "ferritin", "value": 10, "unit": "ng/mL"}],
+            blocked_ingredients=[], caution_ingredients=[], gender="male",
+        ))
+        assert result.status == BrainRunStatus.FAILED
+        assert "CATALOG_DB_ERROR" in result.error_message
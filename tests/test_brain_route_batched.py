@@ -0,0 +1,220 @@
+"""
+Batched Brain Route Tests (/api/v1/brain/route module selection)
+
+Tests verify (no database required: fake cursor evaluating the os_modules
+predicate and ordering in Python):
+1. brain_route returns the same sku_plan, skipped_intents and output_hash
+   with BRAIN_ROUTE_BATCHED on and off
+2. First-match ordering (Core > Adaptive > other, then module_code) and the
+   used_modules dedupe hold in both modes
+3. Batched mode selects modules for all intents in one query
+4. select_route_modules_batched aligns rows to intents by ordinality
+"""
+
+import json
+import re
+
+import api_server
+from api_server import RouteRequest, brain_route, select_route_modules_batched
+
+
+MODULES = [
+    {"module_code": "MOD-CORE-MG2", "os_environment": "MAXimo²", "os_layer": "Core",
+     "ingredient_tags": "magnesium", "shopify_handle": "mg-2"},
+    {"module_code": "MOD-CORE-MG1", "os_environment": "MAXimo²", "os_layer": "Core",
+     "ingredient_tags": "magnesium, zinc", "shopify_handle": "mg-1"},
+    {"module_code": "MOD-ADP-CALM", "os_environment": "MAXimo²", "os_layer": "Adaptive",
+     "ingredient_tags": "l-theanine, magnesium", "shopify_handle": "calm"},
+    {"module_code": "MOD-ADP-OMEGA", "os_environment": "MAXimo²", "os_layer": "Adaptive",
+     "ingredient_tags": "omega-3-epa, fish-gelatin", "shopify_handle": "omega-gel"},
+    {"module_code": "MOD-FND-OMEGA", "os_environment": "MAXimo²", "os_layer": "Foundation",
+     "ingredient_tags": "omega-3-epa", "shopify_handle": "omega"},
+    {"module_code": "MOD-CORE-COQ10", "os_environment": "MAXima²", "os_layer": "Core",
+     "ingredient_tags": "coq10-ubiquinone", "shopify_handle": "coq10"},
+]
+
+LAYER_RANK = {"Core": 1, "Adaptive": 2}
+
+
+def ilike(value, pattern):
+    regex = "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.fullmatch(regex, value, re.IGNORECASE | re.DOTALL) is not None
+
+
+def first_match(os_env, must_patterns, blocked_patterns):
+    """select_route_module()'s WHERE / ORDER BY / LIMIT 1."""
+    candidates = [
+        m for m in MODULES
+        if m["os_environment"] == os_env
+        and any(ilike(m["ingredient_tags"], p) for p in must_patterns)
+        and not any(ilike(m["ingredient_tags"], p) for p in blocked_patterns)
+    ]
+    candidates.sort(key=lambda m: (LAYER_RANK.get(m["os_layer"], 3), m["module_code"]))
+    if not candidates:
+        return None
+    m = candidates[0]
+    return {
+        "module_code": m["module_code"], "product_name": m["module_code"].title(),
+        "os_layer": m["os_layer"], "biological_domain": None,
+        "shopify_store": "genomax", "shopify_handle": m["shopify_handle"],
+    }
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, query, params=()):
+        if "FROM protocol_runs" in query:
+            self.result = [{"run_id": "run-1"}]
+        elif "FROM decision_outputs d" in query:
+            self.result = [{"gender": "male"}]
+        elif "jsonb_array_elements" in query:
+            self.db.module_queries += 1
+            patterns_json, os_env, blocked = params
+            self.result = []
+            for ord_, patterns in enumerate(json.loads(patterns_json), start=1):
+                row = first_match(os_env, patterns, blocked)
+                # LEFT JOIN LATERAL: m.* is all NULL when nothing matched
+                self.result.append({"ord": ord_, **(row or dict.fromkeys(api_server.ROUTE_MODULE_COLUMNS.split(", ")))})
+        elif "FROM os_modules" in query:
+            self.db.module_queries += 1
+            row = first_match(*params)
+            self.result = [row] if row else []
+        elif query.startswith("INSERT INTO decision_outputs"):
+            self.db.outputs.append(params)
+            self.result = []
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return list(self.result)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.module_queries = 0
+        self.outputs = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+INTENTS = [
+    "magnesium_for_sleep",        # Core beats Adaptive; MG1 < MG2
+    "not_a_catalog_intent",       # INTENT_NOT_IN_CATALOG
+    "iron_energy_support",        # BLOCKED_BY_TARGET
+    "coq10_cellular_energy",      # Only a MAXima² module -> NO_MATCHING_MODULE
+    "omega3_brain_support",       # Adaptive module blocked by ingredient -> Foundation
+    "magnesium_stress_support",   # Same module as the first intent -> deduped
+    "glycine_for_sleep",          # l-theanine -> Adaptive module
+    "omega3_cardiovascular",      # Same module as omega3_brain_support -> deduped
+]
+
+
+def route(monkeypatch, batched, intents=INTENTS):
+    conn = FakeConnection()
+    monkeypatch.setattr(api_server, "BRAIN_ROUTE_BATCHED", batched)
+    monkeypatch.setattr(api_server, "get_db", lambda: conn)
+    monkeypatch.setattr(api_server, "_emit_telemetry_for_phase", lambda **kwargs: None)
+    request = RouteRequest(
+        protocol_id="protocol-1",
+        protocol_intents={"supplements": [{"intent_id": i, "target_id": f"t-{i}"} for i in intents]},
+        routing_constraints={"blocked_targets": ["iron_boost"], "blocked_ingredients": ["fish-gelatin"]},
+    )
+    return brain_route(request), conn
+
+
+class TestBatchedParity:
+
+    def test_same_plan_skips_and_hash(self, monkeypatch):
+        batched, batched_conn = route(monkeypatch, batched=True)
+        single, single_conn = route(monkeypatch, batched=False)
+
+        assert batched["sku_plan"] == single["sku_plan"]
+        assert batched["skipped_intents"] == single["skipped_intents"]
+        assert batched["audit"]["output_hash"] == single["audit"]["output_hash"]
+        assert batched_conn.outputs == single_conn.outputs
+
+    def test_first_match_order_and_dedupe(self, monkeypatch):
+        response, _ = route(monkeypatch, batched=True)
+
+        assert [(i["intent_id"], i["sku"]) for i in response["sku_plan"]["items"]] == [
+            ("magnesium_for_sleep", "MOD-CORE-MG1"),
+            ("omega3_brain_support", "MOD-FND-OMEGA"),
+            ("glycine_for_sleep", "MOD-ADP-CALM"),
+        ]
+        assert response["skipped_intents"] == [
+            {"intent_id": "not_a_catalog_intent", "reason": "INTENT_NOT_IN_CATALOG"},
+            {"intent_id": "iron_energy_support", "reason": "BLOCKED_BY_TARGET"},
+            {"intent_id": "coq10_cellular_energy", "reason": "NO_MATCHING_MODULE"},
+        ]
+        assert response["sku_plan"]["items"][0]["shopify_handle"] == "mg-1"
+
+    def test_one_module_query_when_batched(self, monkeypatch):
+        _, batched_conn = route(monkeypatch, batched=True)
+        _, single_conn = route(monkeypatch, batched=False)
+
+        assert batched_conn.module_queries == 1
+        assert single_conn.module_queries == 6  # Routable intents only
+
+    def test_no_routable_intents(self, monkeypatch):
+        intents = ["not_a_catalog_intent", "iron_energy_support"]
+        batched, batched_conn = route(monkeypatch, batched=True, intents=intents)
+        single, _ = route(monkeypatch, batched=False, intents=intents)
+
+        assert batched["sku_plan"] == single["sku_plan"] == {"items": []}
+        assert batched["skipped_intents"] == single["skipped_intents"]
+        assert batched_conn.module_queries == 0
+
+
+class RecordingCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def execute(self, query, params=()):
+        self.executed.append((query, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class TestRowAlignment:
+
+    def test_rows_map_to_inputs_by_ordinality(self):
+        cursor = RecordingCursor([
+            {"ord": 3, "module_code": "MOD-C"},
+            {"ord": 1, "module_code": "MOD-A"},
+            {"ord": 2, "module_code": None},
+        ])
+
+        rows = select_route_modules_batched(cursor, "MAXimo²", [["%a%"], ["%b%"], ["%c%"]], ["%x%"])
+
+        assert [row and row["module_code"] for row in rows] == ["MOD-A", None, "MOD-C"]
+        (_, params), = cursor.executed
+        assert params == (json.dumps([["%a%"], ["%b%"], ["%c%"]]), "MAXimo²", ["%x%"])
+
+    def test_missing_rows_stay_none(self):
+        cursor = RecordingCursor([{"ord": 2, "module_code": "MOD-B"}])
+        assert select_route_modules_batched(cursor, "MAXimo²", [["%a%"], ["%b%"]], ["%x%"]) == [
+            None, {"ord": 2, "module_code": "MOD-B"},
+        ]
+
+    def test_empty_input_skips_query(self):
+        cursor = RecordingCursor([])
+        assert select_route_modules_batched(cursor, "MAXimo²", [], ["%x%"]) == []
+        assert cursor.executed == []
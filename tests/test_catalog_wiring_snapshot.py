@@ -0,0 +1,215 @@
+"""
+Catalog Wiring Snapshot Tests (Issue #15)
+
+Tests verify (no database required, uses a fake pool):
+1. load() builds an immutable snapshot with a content-hash version id
+2. refresh() only rebuilds when the change signal moves or the TTL expires
+3. Reloads swap snapshots atomically; held snapshots never change
+4. A failed refresh keeps serving the previous snapshot
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import psycopg2
+import pytest
+
+from app.catalog import wiring
+from app.catalog.wiring import (
+    CatalogSnapshot,
+    CatalogWiring,
+    CatalogWiringError,
+    get_catalog,
+)
+
+
+def product_row(sku, os_env="MAXimo²", tier="TIER_1", tags=None):
+    return {
+        "gx_catalog_id": sku,
+        "product_name": f"Product {sku}",
+        "product_url": None,
+        "category": "supplement",
+        "short_description": None,
+        "base_price": 29.0,
+        "evidence_tier": tier,
+        "governance_status": "ACTIVE",
+        "ingredient_tags": tags or ["magnesium"],
+        "sex_target": "male",
+        "os_environment": os_env,
+    }
+
+
+# ============================================================================
+# FAKE DATABASE
+# ============================================================================
+
+class FakeCatalogDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.fail = False
+        self.product_queries = 0
+        self.signal_queries = 0
+
+    def touch(self, rows):
+        self.rows = rows
+        self.updated_at += timedelta(seconds=1)
+
+    def acquire(self):
+        if self.fail:
+            raise psycopg2.OperationalError("connection refused")
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+    def close(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._result = None
+
+    def execute(self, sql, params=None):
+        if "COUNT(*)" in sql:
+            self.db.signal_queries += 1
+            self._result = [{"row_count": len(self.db.rows), "last_updated": self.db.updated_at}]
+        else:
+            self.db.product_queries += 1
+            self._result = list(self.db.rows)
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeCatalogDB([product_row("GX-1"), product_row("GX-2", "MAXima²", "TIER_2")])
+    monkeypatch.setattr(wiring, "get_pool", lambda: fake)
+    CatalogWiring.reset()
+    yield fake
+    CatalogWiring.reset()
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+class TestSnapshot:
+
+    def test_load_builds_versioned_snapshot(self, db):
+        catalog = get_catalog()
+        stats = catalog.load()
+
+        snap = catalog.snapshot()
+        assert stats["total_products"] == 2
+        assert stats["catalog_version"] == snap.version
+        assert snap.version.startswith("catalog_")
+        assert snap.maximo_skus == {"GX-1"}
+        assert snap.tier2_skus == {"GX-2"}
+        assert catalog.is_purchasable("GX-1")
+
+    def test_version_independent_of_row_order(self, db):
+        a = CatalogSnapshot.from_rows(db.rows)
+        b = CatalogSnapshot.from_rows(list(reversed(db.rows)))
+        c = CatalogSnapshot.from_rows(db.rows + [product_row("GX-3")])
+        assert a.version == b.version
+        assert a.version != c.version
+
+    def test_snapshot_is_immutable(self, db):
+        get_catalog().load()
+        snap = get_catalog().snapshot()
+        with pytest.raises(TypeError):
+            snap.products["GX-9"] = None
+        # Set accessors hand out copies
+        get_catalog().filter_by_product_line("MAXimo²").add("GX-9")
+        assert "GX-9" not in snap.maximo_skus
+
+    def test_not_loaded_is_empty(self, db):
+        catalog = get_catalog()
+        assert not catalog.is_loaded
+        assert catalog.version is None
+        assert catalog.filter_skus(["GX-1"]) == []
+
+
+class TestRefresh:
+
+    def test_unchanged_signal_skips_rebuild(self, db):
+        catalog = get_catalog()
+        catalog.load()
+        assert catalog.refresh() is False
+        assert db.product_queries == 1
+        assert db.signal_queries == 2
+
+    def test_changed_signal_swaps_snapshot(self, db):
+        catalog = get_catalog()
+        catalog.load()
+        held = catalog.snapshot()
+
+        db.touch(db.rows + [product_row("GX-3")])
+        assert catalog.refresh() is True
+
+        assert catalog.snapshot().version != held.version
+        assert catalog.is_purchasable("GX-3")
+        # A request holding the old snapshot keeps a consistent view
+        assert not held.is_purchasable("GX-3")
+        assert len(held.products) == 2
+
+    def test_ttl_expiry_rebuilds(self, db, monkeypatch):
+        catalog = get_catalog()
+        catalog.load()
+        monkeypatch.setattr(wiring, "CATALOG_TTL_S", 0)
+        catalog.refresh()
+        assert db.product_queries == 2
+
+    def test_failed_refresh_keeps_previous_snapshot(self, db):
+        catalog = get_catalog()
+        catalog.load()
+        version = catalog.version
+
+        db.fail = True
+        with pytest.raises(CatalogWiringError):
+            catalog.refresh()
+        assert catalog.is_loaded
+        assert catalog.version == version
+        assert catalog.get_health()["error"]
+
+    def test_empty_catalog_on_first_load_raises(self, db):
+        db.rows = []
+        with pytest.raises(CatalogWiringError):
+            get_catalog().load()
+        assert get_catalog().status.value == "FAILED"
+
+    def test_readers_never_see_partial_catalog(self, db):
+        catalog = get_catalog()
+        catalog.load()
+        small, large = db.rows, db.rows + [product_row(f"GX-{i}") for i in range(10, 60)]
+        seen = set()
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                seen.add(len(catalog.snapshot().products))
+
+        t = threading.Thread(target=reader)
+        t.start()
+        for i in range(50):
+            db.touch(large if i % 2 == 0 else small)
+            catalog.load(force_reload=True)
+        stop.set()
+        t.join(5)
+
+        assert seen <= {len(small), len(large)}
@@ -0,0 +1,268 @@
+"""
+Shared DB Connection Pool Tests
+
+Tests verify (no database required, uses fake connections):
+1. Connections are reused instead of reopened
+2. Pool is bounded and acquire times out when exhausted
+3. Dirty transactions are rolled back on release
+4. Dead / expired connections are recycled
+5. Stats report usage and waits
+"""
+
+import threading
+import time
+
+import pytest
+from psycopg2 import extensions
+
+from app.shared.db_pool import (
+    ConnectionPool,
+    PoolError,
+    PoolTimeoutError,
+)
+
+
+# ============================================================================
+# FAKE CONNECTIONS
+# ============================================================================
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.conn.tx_status = extensions.TRANSACTION_STATUS_INTRANS
+        self.conn.executed.append(sql)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.broken = False
+        self.tx_status = extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.tx_status
+
+    def commit(self):
+        self.tx_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.tx_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def opened():
+    return []
+
+
+@pytest.fixture
+def make_pool(opened):
+    def factory(**kwargs):
+        def connect(dsn):
+            conn = FakeConnection()
+            opened.append(conn)
+            return conn
+        kwargs.setdefault("dsn", "postgresql://fake")
+        kwargs.setdefault("healthcheck_idle_s", -1)
+        return ConnectionPool(connect=connect, **kwargs)
+    return factory
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+class TestReuse:
+
+    def test_close_returns_connection_to_pool(self, make_pool, opened):
+        pool = make_pool(max_size=2)
+        first = pool.acquire()
+        raw = first.raw
+        first.close()
+
+        second = pool.acquire()
+        assert second.raw is raw
+        assert len(opened) == 1
+        assert raw.closed == 0
+        second.close()
+
+    def test_double_close_is_noop(self, make_pool):
+        pool = make_pool(max_size=1)
+        conn = pool.acquire()
+        conn.close()
+        conn.close()
+        assert pool.stats()["in_use"] == 0
+        assert pool.stats()["idle"] == 1
+
+    def test_use_after_close_raises(self, make_pool):
+        pool = make_pool(max_size=1)
+        conn = pool.acquire()
+        conn.close()
+        with pytest.raises(PoolError):
+            conn.cursor()
+
+    def test_proxy_delegates_attributes(self, make_pool):
+        pool = make_pool(max_size=1)
+        conn = pool.acquire()
+        conn.autocommit = True
+        assert conn.raw.autocommit is True
+        conn.close()
+        # autocommit is reset before reuse
+        assert pool.acquire().autocommit is False
+
+
+class TestBounded:
+
+    def test_acquire_times_out_when_exhausted(self, make_pool):
+        pool = make_pool(max_size=1)
+        held = pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire(timeout_s=0.05)
+        assert pool.stats()["timeouts_total"] == 1
+        held.close()
+
+    def test_waiter_gets_released_connection(self, make_pool):
+        pool = make_pool(max_size=1)
+        held = pool.acquire()
+        result = {}
+
+        def waiter():
+            conn = pool.acquire(timeout_s=2)
+            result["raw"] = conn.raw
+            conn.close()
+
+        t = threading.Thread(target=waiter)
+        t.start()
+        time.sleep(0.05)
+        raw = held.raw
+        held.close()
+        t.join(2)
+
+        assert result["raw"] is raw
+        stats = pool.stats()
+        assert stats["waits_total"] == 1
+        assert stats["max_wait_ms"] > 0
+
+    def test_never_exceeds_max_size(self, make_pool, opened):
+        pool = make_pool(max_size=3)
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    conn = pool.acquire(timeout_s=2)
+                    conn.cursor().execute("SELECT 1")
+                    conn.commit()
+                    conn.close()
+            except Exception as e:  # pragma: no cover - surfaced by assert below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+        assert errors == []
+        assert len(opened) <= 3
+        assert pool.stats()["peak_in_use"] <= 3
+        assert pool.stats()["acquired_total"] == 160
+
+
+class TestRecycling:
+
+    def test_open_transaction_rolled_back_on_release(self, make_pool):
+        pool = make_pool(max_size=1)
+        conn = pool.acquire()
+        conn.cursor().execute("UPDATE x SET y = 1")
+        raw = conn.raw
+        conn.close()
+        assert raw.rollbacks == 1
+        assert raw.tx_status == extensions.TRANSACTION_STATUS_IDLE
+
+    def test_closed_connection_discarded(self, make_pool, opened):
+        pool = make_pool(max_size=1)
+        conn = pool.acquire()
+        conn.raw.closed = 1
+        conn.close()
+        assert pool.stats()["idle"] == 0
+        assert pool.stats()["recycled_total"] == 1
+
+        pool.acquire().close()
+        assert len(opened) == 2
+
+    def test_max_lifetime_recycles(self, make_pool, opened):
+        pool = make_pool(max_size=1, max_lifetime_s=0.01)
+        conn = pool.acquire()
+        time.sleep(0.02)
+        conn.close()
+        assert opened[0].closed == 1
+        assert pool.stats()["recycled_total"] == 1
+
+    def test_failed_healthcheck_reconnects(self, make_pool, opened):
+        pool = make_pool(max_size=1, healthcheck_idle_s=0)
+        pool.acquire().close()
+        opened[0].broken = True
+
+        conn = pool.acquire()
+        assert conn.raw is opened[1]
+        assert pool.stats()["healthcheck_failures"] == 1
+        conn.close()
+
+
+class TestLifecycle:
+
+    def test_warm_up_opens_min_size(self, make_pool, opened):
+        pool = make_pool(min_size=2, max_size=4)
+        assert pool.warm_up() == 2
+        assert pool.stats()["idle"] == 2
+        assert len(opened) == 2
+
+    def test_close_pool_closes_idle_and_rejects_acquire(self, make_pool, opened):
+        pool = make_pool(max_size=2)
+        held = pool.acquire()
+        pool.acquire().close()
+        pool.close()
+
+        assert opened[1].closed == 1
+        with pytest.raises(PoolError):
+            pool.acquire()
+
+        # In-use connection is closed when released after shutdown
+        held.close()
+        assert opened[0].closed == 1
+        assert pool.stats()["open_connections"] == 0
+
+    def test_connect_error_frees_slot(self, opened):
+        calls = {"n": 0}
+
+        def flaky(dsn):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise RuntimeError("connection refused")
+            conn = FakeConnection()
+            opened.append(conn)
+            return conn
+
+        pool = ConnectionPool(dsn="x", max_size=1, connect=flaky, healthcheck_idle_s=-1)
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+        conn = pool.acquire(timeout_s=0.1)
+        assert pool.stats()["connect_errors"] == 1
+        conn.close()
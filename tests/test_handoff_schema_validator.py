@@ -0,0 +1,205 @@
+"""
+Handoff Schema Validator Tests (Bloodwork handoff)
+
+Tests verify:
+1. The jsonschema validator is built (and the meta-schema checked) once per
+   schema version
+2. The compiled fast path agrees with jsonschema on valid and invalid handoffs
+3. Invalid handoffs report every error in one pass
+4. Schemas outside the compiled subset fall back to jsonschema
+"""
+
+import copy
+
+import jsonschema
+import pytest
+
+from app.brain import bloodwork_handoff
+from app.brain.bloodwork_handoff import (
+    UnsupportedSchemaError,
+    collect_handoff_errors,
+    compile_schema_validator,
+    get_handoff_validator,
+    load_handoff_schema,
+    validate_handoff_schema,
+)
+from app.shared.hashing import canonicalize_and_hash
+
+
+def make_handoff(markers=3):
+    payload = {
+        "lab_profile": "GLOBAL_CONSERVATIVE",
+        "sex": "female",
+        "age": 41,
+        "markers": [{"code": f"marker_{n}", "value": 10.5 + n, "unit": "ng/mL"} for n in range(markers)],
+    }
+    output = {
+        "routing_constraints": {
+            "blocked_ingredients": ["iron"],
+            "blocked_categories": [],
+            "caution_flags": ["vitamin_d"],
+            "requirements": ["methylfolate"],
+            "reason_codes": ["BLOCK_IRON", "FLAG_MTHFR"],
+        },
+        "signal_flags": [],
+        "unknown_biomarkers": [],
+        "processed_markers": [
+            {
+                "original_code": m["code"], "canonical_code": m["code"],
+                "original_value": m["value"], "canonical_value": m["value"],
+                "original_unit": m["unit"], "canonical_unit": m["unit"],
+                "status": "VALID", "range_status": "IN_RANGE", "flags": [],
+            }
+            for m in payload["markers"]
+        ],
+        "safety_gates": [{
+            "gate_id": "GATE_001", "description": "Block iron", "trigger_marker": "ferritin",
+            "trigger_value": 400, "threshold": 300, "routing_constraint": "BLOCK_IRON",
+            "exception_active": False, "exception_reason": None,
+        }],
+        "summary": {"total_markers": markers, "valid_markers": markers, "unknown_markers": 0,
+                    "in_range": markers, "out_of_range": 0},
+        "require_review": False,
+    }
+    return {
+        "handoff_version": "bloodwork_handoff.v1",
+        "source": {
+            "service": "bloodwork_engine",
+            "base_url": "https://bloodwork.example",
+            "endpoint": "/api/v1/bloodwork/process",
+            "engine_version": "1.0.0",
+        },
+        "input": payload,
+        "output": output,
+        "audit": {
+            "input_hash": canonicalize_and_hash(payload),
+            "output_hash": canonicalize_and_hash(output),
+            "ruleset_version": "registry_v1.0+ranges_v1.0",
+            "processed_at": "2026-01-01T00:00:00Z",
+        },
+    }
+
+
+def mutate(path, value=None, delete=False):
+    handoff = make_handoff()
+    target = handoff
+    for key in path[:-1]:
+        target = target[key]
+    if delete:
+        del target[path[-1]]
+    else:
+        target[path[-1]] = value
+    return handoff
+
+
+INVALID = [
+    mutate(["handoff_version"], "bloodwork_handoff.v2"),
+    mutate(["source", "engine_version"], "v1"),
+    mutate(["source", "extra"], "x"),
+    mutate(["input", "sex"], "other"),
+    mutate(["input", "age"], 151),
+    mutate(["input", "age"], True),
+    mutate(["input", "age"], 40.5),
+    mutate(["input", "markers"], []),
+    mutate(["input", "markers", 0, "value"], "12"),
+    mutate(["input", "markers", 0, "unit"], delete=True),
+    mutate(["output", "routing_constraints", "reason_codes"], ["A", "A"]),
+    mutate(["output", "routing_constraints", "caution_flags"], [1]),
+    mutate(["output", "safety_gates", 0, "exception_active"], 0),
+    mutate(["output", "summary", "in_range"], 2.5),
+    mutate(["audit", "input_hash"], "sha256:xyz"),
+    mutate(["audit", "processed_at"], delete=True),
+    mutate(["output"], []),
+]
+
+VALID = [
+    make_handoff(),
+    make_handoff(markers=40),
+    mutate(["input", "sex"], None),
+    mutate(["input", "age"], 41.0),
+    mutate(["output", "processed_markers", 0, "extra"], "allowed"),
+    mutate(["output", "summary", "in_range"], 3),
+    mutate(["source", "base_url"], "not a uri"),  # format is not asserted
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_validators(monkeypatch):
+    monkeypatch.setattr(bloodwork_handoff, "_validators", {})
+
+
+class TestValidatorCache:
+
+    def test_meta_schema_checked_once(self, monkeypatch):
+        schema = load_handoff_schema()
+        cls = jsonschema.validators.validator_for(schema)
+        calls = []
+        original = cls.check_schema
+        monkeypatch.setattr(cls, "check_schema", classmethod(lambda c, s, **kw: calls.append(s) or original(s, **kw)))
+
+        for _ in range(25):
+            assert validate_handoff_schema(make_handoff()) == (True, None)
+            validate_handoff_schema(INVALID[0])
+
+        assert len(calls) == 1
+        assert get_handoff_validator() is get_handoff_validator()
+        assert get_handoff_validator().fast_path is not None
+
+    def test_cached_per_schema_version(self):
+        schema = copy.deepcopy(load_handoff_schema())
+        schema["$id"] = "bloodwork_handoff.schema.v2"
+        assert get_handoff_validator(schema) is not get_handoff_validator()
+        assert sorted(bloodwork_handoff._validators) == ["bloodwork_handoff.schema.v1", "bloodwork_handoff.schema.v2"]
+
+
+class TestFastPathParity:
+
+    @pytest.mark.parametrize("handoff", VALID + INVALID)
+    def test_fast_path_matches_jsonschema(self, handoff):
+        compiled = get_handoff_validator()
+        expected = compiled.validator.is_valid(handoff)
+        assert compiled.fast_path(handoff) == expected
+        assert validate_handoff_schema(handoff)[0] == expected
+
+    def test_unsupported_keywords_fall_back(self):
+        with pytest.raises(UnsupportedSchemaError):
+            compile_schema_validator({"type": "object", "patternProperties": {"^x": {}}})
+
+        schema = copy.deepcopy(load_handoff_schema())
+        schema["$id"] = "bloodwork_handoff.schema.oneof"
+        schema["properties"]["input"]["properties"]["age"] = {"oneOf": [{"type": "integer"}, {"type": "null"}]}
+        compiled = get_handoff_validator(schema)
+        assert compiled.fast_path is None
+        assert compiled.validator.is_valid(make_handoff())
+
+    def test_mixed_unique_items_defer_to_jsonschema(self):
+        validate = compile_schema_validator({"type": "array", "uniqueItems": True})
+        assert validate(["a", "b"])
+        assert not validate([1, True])  # Fast path declines; jsonschema decides
+        assert jsonschema.Draft7Validator({"type": "array", "uniqueItems": True}).is_valid([1, True])
+
+
+class TestDiagnostics:
+
+    def test_all_errors_reported(self):
+        handoff = make_handoff()
+        handoff["handoff_version"] = "wrong"
+        handoff["input"]["age"] = -1
+        del handoff["audit"]["output_hash"]
+
+        errors = collect_handoff_errors(handoff)
+        is_valid, message = validate_handoff_schema(handoff)
+
+        assert [e["path"] for e in errors] == [["audit"], ["handoff_version"], ["input", "age"]]
+        assert {e["validator"] for e in errors} == {"required", "const", "minimum"}
+        assert is_valid is False
+        assert message.startswith("Schema validation failed (3 errors):")
+        assert "'output_hash' is a required property" in message
+
+    def test_single_error_message_format(self):
+        is_valid, message = validate_handoff_schema(mutate(["handoff_version"], delete=True))
+        assert is_valid is False
+        assert message == "Schema validation failed: 'handoff_version' is a required property at path []"
+
+    def test_valid_handoff_has_no_errors(self):
+        assert collect_handoff_errors(make_handoff()) == []
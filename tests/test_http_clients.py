@@ -0,0 +1,256 @@
+"""
+Shared HTTP Client Tests (lab, Junction and Shopify upstreams)
+
+Tests verify (offline: httpx.MockTransport and a local HTTP/1.1 server):
+1. One long-lived client per upstream is reused across calls and adapters
+2. Adapters still send their headers, timeouts and error handling
+3. Repeated requests reuse one keep-alive TCP connection
+4. Per-upstream limits/timeouts come from config; unknown upstreams get defaults
+5. close_http_clients() closes every client (sync and async)
+6. Dropped async clients are closed on their own loop, or counted as leaked
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.integrations.shopify_client import ShopifyClient, ShopifyNotFoundError
+from app.shared import http_clients
+from app.shared.http_clients import (
+    UpstreamConfig,
+    close_http_clients,
+    configure_upstream,
+    get_async_client,
+    get_sync_client,
+)
+from bloodwork_engine import junction_client, lab_upload
+from bloodwork_engine.lab_adapters import LabTestingAPIAdapter, VitalAdapter
+
+
+@pytest.fixture(autouse=True)
+def isolated_clients(monkeypatch):
+    monkeypatch.setattr(http_clients, "UPSTREAMS", dict(http_clients.UPSTREAMS))
+    monkeypatch.setattr(http_clients, "_sync_clients", {})
+    monkeypatch.setattr(http_clients, "_async_clients", {})
+    monkeypatch.setattr(http_clients, "_leaked_async_total", 0)
+    yield
+    for client in http_clients._sync_clients.values():
+        client.close()
+
+
+@pytest.fixture
+def seen():
+    """Requests received by mock transports, as (upstream, request)."""
+    return []
+
+
+def mock(name, seen, status=200, body=None):
+    def handler(request):
+        seen.append((name, request))
+        return httpx.Response(status, json=body if body is not None else {"ok": True})
+
+    configure_upstream(name, transport=httpx.MockTransport(handler))
+
+
+class TestClientReuse:
+
+    def test_sync_adapters_share_one_client_per_upstream(self, seen):
+        mock("junction", seen, body=[{"id": 1}])
+        mock("lab_testing_api", seen, body={"tests": []})
+
+        vital = VitalAdapter(api_key="vk", timeout=7)
+        for _ in range(3):
+            assert vital._request("GET", "/lab_tests/labs") == [{"id": 1}]
+        second = VitalAdapter(api_key="vk")
+        second._request("GET", "/lab_tests/labs")
+        LabTestingAPIAdapter(api_key="lk")._request("GET", "/tests")
+
+        assert sorted(http_clients._sync_clients) == ["junction", "lab_testing_api"]
+        assert [name for name, _ in seen] == ["junction"] * 4 + ["lab_testing_api"]
+        request = seen[0][1]
+        assert str(request.url) == "https://api.sandbox.tryvital.io/v3/lab_tests/labs"
+        assert request.headers["x-vital-api-key"] == "vk"
+        assert request.extensions["timeout"]["read"] == 7
+        assert seen[-1][1].headers["Authorization"] == "Bearer lk"
+
+    def test_adapter_errors_still_raise(self, seen):
+        mock("junction", seen, status=500, body={"error": "boom"})
+        with pytest.raises(httpx.HTTPStatusError):
+            VitalAdapter(api_key="vk")._request("GET", "/lab_tests/labs")
+
+    def test_shopify_client_uses_shared_client(self, seen):
+        mock("shopify", seen, body={"shop": {"name": "GenoMAX"}})
+        client = ShopifyClient(base_url="https://genomax.myshopify.com/admin/api/2026-01", access_token="t")
+
+        assert client.get_shop() == {"shop": {"name": "GenoMAX"}}
+        assert client.get_shop() == {"shop": {"name": "GenoMAX"}}
+        assert len(seen) == 2
+        assert seen[0][1].headers["X-Shopify-Access-Token"] == "t"
+        assert list(http_clients._sync_clients) == ["shopify"]
+
+        mock("shopify", seen, status=404, body={"errors": "Not Found"})
+        with pytest.raises(ShopifyNotFoundError):
+            client.get_product(1)
+
+    def test_async_clients_per_upstream(self, seen, monkeypatch):
+        mock("junction", seen, body={"order": {"id": "o1"}})
+        mock("anthropic", seen, body={"content": [{"text": '[{"name": "Ferritin"}]'}]})
+        monkeypatch.setattr(lab_upload, "ANTHROPIC_API_KEY", "ak")
+
+        async def scenario():
+            client = junction_client.JunctionClient()
+            orders = [await client.get_order("o1") for _ in range(3)]
+            markers = await lab_upload.extract_markers_with_llm("Ferritin 80")
+            same = get_async_client("junction") is get_async_client("junction")
+            await close_http_clients()
+            return orders, markers, same
+
+        orders, markers, same = asyncio.run(scenario())
+        assert orders == [{"order": {"id": "o1"}}] * 3
+        assert markers == [{"name": "Ferritin"}]
+        assert same
+        assert [name for name, _ in seen] == ["junction"] * 3 + ["anthropic"]
+        assert http_clients._async_clients == {}
+
+    def test_junction_error_maps_to_http_exception(self, seen):
+        mock("junction", seen, status=404, body={"detail": "missing"})
+
+        async def scenario():
+            with pytest.raises(HTTPException) as exc:
+                await junction_client.JunctionClient().get_order("nope")
+            return exc.value.status_code
+
+        assert asyncio.run(scenario()) == 404
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers = []
+
+    def do_GET(self):
+        KeepAliveHandler.peers.append(self.client_address)
+        body = json.dumps({"tests": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestKeepAlive:
+
+    def test_requests_reuse_one_connection(self):
+        KeepAliveHandler.peers = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            adapter = LabTestingAPIAdapter(api_key="lk")
+            adapter.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+            for _ in range(5):
+                assert adapter._request("GET", "/tests") == {"tests": []}
+        finally:
+            get_sync_client("lab_testing_api").close()
+            server.shutdown()
+            server.server_close()
+
+        assert len(KeepAliveHandler.peers) == 5
+        assert len(set(KeepAliveHandler.peers)) == 1
+
+
+class TestConfig:
+
+    def test_env_overrides_per_upstream(self, monkeypatch):
+        monkeypatch.setenv("HTTP_SHOPIFY_TIMEOUT_S", "12")
+        monkeypatch.setenv("HTTP_SHOPIFY_MAX_CONNECTIONS", "4")
+        config = UpstreamConfig.from_env("shopify")
+        assert (config.timeout_s, config.max_connections) == (12.0, 4)
+        assert config.http2 is http_clients.HTTP2_AVAILABLE
+
+        kwargs = config.client_kwargs()
+        assert kwargs["timeout"].read == 12.0
+        assert kwargs["limits"].max_connections == 4
+
+    def test_configured_limits_reach_the_client(self):
+        configure_upstream("shopify", timeout_s=3.0)
+        assert get_sync_client("shopify").timeout.read == 3.0
+        assert http_clients.UPSTREAMS["anthropic"].timeout_s == 60.0
+
+    def test_unknown_upstream_gets_defaults(self):
+        client = get_sync_client("partner_api")
+        assert client.timeout.read == http_clients.HTTP_CLIENT_TIMEOUT_S
+        assert "partner_api" in http_clients.UPSTREAMS
+
+    def test_reconfigure_replaces_client(self):
+        first = get_sync_client("shopify")
+        configure_upstream("shopify", timeout_s=5.0)
+        assert first.is_closed
+        assert get_sync_client("shopify") is not first
+
+    def test_close_http_clients(self):
+        sync = get_sync_client("shopify")
+
+        async def scenario():
+            client = get_async_client("junction")
+            await close_http_clients()
+            return client
+
+        assert asyncio.run(scenario()).is_closed
+        assert sync.is_closed
+        assert http_clients.get_http_client_stats()["sync"] == []
+
+
+@pytest.fixture
+def other_loop():
+    """An event loop running in a background thread."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def run_on(loop, coro):
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(5)
+
+
+async def async_client(name):
+    return get_async_client(name)
+
+
+class TestDroppedAsyncClients:
+
+    def test_reconfigure_closes_async_client_on_its_loop(self, other_loop):
+        first = run_on(other_loop, async_client("junction"))
+        configure_upstream("junction", timeout_s=5.0)
+        run_on(other_loop, asyncio.sleep(0.05))
+
+        assert first.is_closed
+        assert http_clients.get_http_client_stats()["leaked_async_total"] == 0
+
+    def test_client_replaced_by_another_loop_is_closed(self, other_loop):
+        first = run_on(other_loop, async_client("junction"))
+        second = asyncio.run(async_client("junction"))
+        run_on(other_loop, asyncio.sleep(0.05))
+
+        assert first is not second
+        assert first.is_closed
+        assert not second.is_closed
+        assert http_clients._async_clients["junction"][1] is second
+
+    def test_client_of_closed_loop_is_counted(self):
+        asyncio.run(async_client("junction"))
+        asyncio.run(async_client("junction"))
+        configure_upstream("junction", timeout_s=5.0)
+
+        assert http_clients.get_http_client_stats()["leaked_async_total"] == 2
@@ -0,0 +1,221 @@
+"""
+Lab Upload Extraction Cache Tests (keyed by upload hash)
+
+Tests verify (no database, OCR or LLM required - asyncpg pool is faked):
+1. Re-uploading the same file skips OCR and the LLM (memory, then DB tier)
+2. A new prompt version re-extracts but reuses the cached OCR text
+3. A new normalizer version re-normalizes cached raw markers without the LLM
+4. Placeholder OCR, empty extractions and cache failures are never cached
+5. POST /api/v1/lab/upload reports cached responses with identical markers
+"""
+
+import asyncio
+import hashlib
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bloodwork_engine import lab_upload
+from bloodwork_engine.lab_upload import get_extraction
+
+REPORT = b"%PDF-1.7 synthetic lab report"
+FILE_HASH = hashlib.sha256(REPORT).hexdigest()
+RAW_MARKERS = [
+    {"name": "Ferritin", "value": 85, "unit": "ng/mL", "reference_low": 30, "reference_high": 400, "flag": "N"},
+    {"name": "Zn", "value": 90, "unit": "ug/dL", "flag": "N"},
+    {"name": "Hemoglobin A1c", "value": 5.4, "unit": "%", "flag": "N"},
+]
+
+
+class FakeConnection:
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def fetchrow(self, sql, *args):
+        assert sql.strip().startswith("UPDATE lab_extraction_cache")
+        self.pool.check()
+        file_hash, prompt_version = args
+        rows = [row for key, row in self.pool.cache.items() if key[0] == file_hash]
+        if not rows:
+            return None
+        rows.sort(key=lambda row: row["prompt_version"] == prompt_version, reverse=True)
+        rows[0]["hit_count"] += 1
+        return dict(rows[0])
+
+    async def execute(self, sql, *args):
+        self.pool.check()
+        if "INSERT INTO lab_extraction_cache" in sql:
+            file_hash, prompt_version, raw_text, raw_markers, normalizer_version, normalized = args
+            self.pool.cache[(file_hash, prompt_version)] = {
+                "raw_text": raw_text, "prompt_version": prompt_version, "raw_markers": raw_markers,
+                "normalizer_version": normalizer_version, "normalized_markers": normalized, "hit_count": 0,
+            }
+        elif "INSERT INTO bloodwork_submissions" in sql:
+            self.pool.submissions.append(args)
+        else:
+            raise AssertionError(f"unexpected SQL: {sql}")
+
+
+class FakePool:
+
+    def __init__(self):
+        self.cache = {}
+        self.submissions = []
+        self.fail = False
+
+    def check(self):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                return FakeConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"ocr": 0, "llm": 0}
+
+    async def fake_ocr(content, content_type):
+        calls["ocr"] += 1
+        return "Ferritin 85 ng/mL\nZinc 90 ug/dL\nHbA1c 5.4 %"
+
+    async def fake_llm(text):
+        calls["llm"] += 1
+        return [dict(m) for m in RAW_MARKERS]
+
+    monkeypatch.setattr(lab_upload, "perform_ocr", fake_ocr)
+    monkeypatch.setattr(lab_upload, "extract_markers_with_llm", fake_llm)
+    monkeypatch.setattr(lab_upload, "_extraction_cache", lab_upload.OrderedDict())
+    return calls
+
+
+def extract(pool):
+    return asyncio.run(get_extraction(pool, FILE_HASH, REPORT, "application/pdf"))
+
+
+def clear_memory(monkeypatch):
+    monkeypatch.setattr(lab_upload, "_extraction_cache", lab_upload.OrderedDict())
+
+
+class TestCacheTiers:
+
+    def test_repeat_upload_served_from_memory_then_db(self, calls, monkeypatch):
+        pool = FakePool()
+        first = extract(pool)
+        assert first.source == "extracted"
+        assert calls == {"ocr": 1, "llm": 1}
+
+        second = extract(pool)
+        assert second.source == "memory"
+        assert second.markers == first.markers
+
+        clear_memory(monkeypatch)
+        third = extract(pool)
+        assert third.source == "database"
+        assert third.markers == first.markers
+        assert third.raw_text == first.raw_text
+        assert calls == {"ocr": 1, "llm": 1}
+        assert pool.cache[(FILE_HASH, lab_upload.PROMPT_VERSION)]["hit_count"] == 1
+
+    def test_new_prompt_version_reuses_ocr_text(self, calls, monkeypatch):
+        pool = FakePool()
+        extract(pool)
+        clear_memory(monkeypatch)
+        monkeypatch.setattr(lab_upload, "PROMPT_VERSION", "prompt-v2")
+
+        result = extract(pool)
+        assert result.source == "extracted"
+        assert calls == {"ocr": 1, "llm": 2}
+        assert (FILE_HASH, "prompt-v2") in pool.cache
+
+    def test_new_normalizer_renormalizes_without_llm(self, calls, monkeypatch):
+        pool = FakePool()
+        extract(pool)
+        clear_memory(monkeypatch)
+        monkeypatch.setattr(lab_upload, "NORMALIZER_FINGERPRINT", "normalizer-v2")
+        monkeypatch.setitem(lab_upload.BIOMARKER_ALIASES, "zn", "zinc_serum")
+
+        result = extract(pool)
+        assert result.source == "renormalized"
+        assert [m.code for m in result.markers] == ["ferritin", "zinc_serum", "hba1c"]
+        assert calls == {"ocr": 1, "llm": 1}
+        row = pool.cache[(FILE_HASH, lab_upload.PROMPT_VERSION)]
+        assert row["normalizer_version"] == "normalizer-v2"
+        assert json.loads(row["normalized_markers"])[1]["code"] == "zinc_serum"
+
+    def test_memory_cache_is_bounded(self, calls, monkeypatch):
+        monkeypatch.setattr(lab_upload, "EXTRACTION_CACHE_SIZE", 2)
+        for n in range(3):
+            asyncio.run(get_extraction(None, f"hash{n}", REPORT, "application/pdf"))
+        assert [key[0] for key in lab_upload._extraction_cache] == ["hash1", "hash2"]
+
+
+class TestNotCached:
+
+    def test_placeholder_ocr_not_cached(self, calls, monkeypatch):
+        async def placeholder(content, content_type):
+            return "[PDF content - implement Cloud Vision OCR]"
+
+        monkeypatch.setattr(lab_upload, "perform_ocr", placeholder)
+        pool = FakePool()
+        result = extract(pool)
+        assert [m.code for m in result.markers] == ["ferritin", "vitamin_d_25oh", "vitamin_b12", "hba1c"]
+        assert pool.cache == {}
+        assert extract(pool).source == "extracted"
+
+    def test_empty_extraction_not_cached(self, calls, monkeypatch):
+        async def nothing(text):
+            return []
+
+        monkeypatch.setattr(lab_upload, "extract_markers_with_llm", nothing)
+        pool = FakePool()
+        extract(pool)
+        assert pool.cache == {}
+        assert len(lab_upload._extraction_cache) == 0
+
+    def test_database_failure_falls_back_to_extraction(self, calls):
+        pool = FakePool()
+        pool.fail = True
+        assert extract(pool).source == "extracted"
+        assert extract(pool).source == "memory"
+        assert calls == {"ocr": 1, "llm": 1}
+
+
+class TestUploadEndpoint:
+
+    def test_repeat_upload_is_cached(self, calls, monkeypatch):
+        pool = FakePool()
+
+        async def get_pool():
+            return pool
+
+        monkeypatch.setattr(lab_upload, "get_db_pool", get_pool)
+        app = FastAPI()
+        app.include_router(lab_upload.router)
+        client = TestClient(app)
+
+        upload = {"file": ("report.pdf", REPORT, "application/pdf")}
+        first = client.post("/api/v1/lab/upload", files=upload).json()
+        second = client.post("/api/v1/lab/upload", files=upload).json()
+
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert second["markers"] == first["markers"]
+        assert second["confidence_score"] == first["confidence_score"]
+        assert second["submission_id"] != first["submission_id"]
+        assert len(pool.submissions) == 2
+        assert calls == {"ocr": 1, "llm": 1}
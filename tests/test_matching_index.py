@@ -0,0 +1,160 @@
+"""
+Matching Ingredient Index Tests (Issue #7)
+
+Tests verify (no database required):
+1. Posting-list matching gives the same candidates, unmatched intents,
+   requirements and protocol as the all-pairs comparison
+2. Duplicate sku_ids keep last-wins tags, as the candidates dict did
+3. Indexes are reused per catalog version and dropped when it changes
+"""
+
+import random
+
+import pytest
+
+from app.matching import match
+from app.matching.match import (
+    SkuIngredientIndex,
+    build_protocol,
+    calculate_match_score,
+    fulfill_requirements,
+    get_sku_index,
+    match_intents_to_skus,
+)
+from app.matching.models import AllowedSKUInput, IntentInput, MatchingResult
+
+TAGS = ["magnesium", "zinc", "b12", "Iron", "omega3", "vitamin_d3", " folate ", "coq10", "ashwagandha"]
+
+
+def make_skus(n, seed=3):
+    rng = random.Random(seed)
+    return [
+        AllowedSKUInput(
+            sku_id=f"S{i % (n - 3) if n > 3 else i}",  # a few repeated ids
+            product_name=f"Product {i}",
+            ingredient_tags=rng.sample(TAGS, rng.randint(0, 3)),
+            caution_flags=["niacin"] if i % 7 == 0 else [],
+        )
+        for i in range(n)
+    ]
+
+
+def make_intents(n, seed=5):
+    rng = random.Random(seed)
+    return [
+        IntentInput(
+            code=f"INTENT_{i}",
+            priority=rng.randint(1, 5),
+            ingredient_targets=rng.sample(TAGS + ["unknown_tag", "IRON "], rng.randint(0, 3)),
+        )
+        for i in range(n)
+    ]
+
+
+def all_pairs_match(skus, intents):
+    """The pre-index implementation of match_intents_to_skus."""
+    candidates = {}
+    sku_ingredients = {}
+    for sku in skus:
+        sku_ingredients[sku.sku_id] = {tag.lower().strip() for tag in sku.ingredient_tags}
+        candidates[sku.sku_id] = match.MatchCandidate(sku=sku)
+    unmatched = []
+    for intent in sorted(intents, key=lambda x: x.priority):
+        targets = {t.lower().strip() for t in intent.ingredient_targets}
+        if not targets:
+            unmatched.append(intent)
+            continue
+        matched_any = False
+        for sku_id, sku_ings in sku_ingredients.items():
+            score, overlap = calculate_match_score(sku_ings, targets)
+            if score > 0:
+                matched_any = True
+                candidates[sku_id].intents.append(intent)
+                candidates[sku_id].matched_ingredients.update(overlap)
+        if not matched_any:
+            unmatched.append(intent)
+    return candidates, unmatched
+
+
+def snapshot(candidates):
+    return [
+        (sku_id, c.sku.product_name, [i.code for i in c.intents], sorted(c.matched_ingredients),
+         c.is_requirement, sorted(c.requirement_ingredients))
+        for sku_id, c in candidates.items()
+    ]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(match, "_sku_index_version", None)
+    monkeypatch.setattr(match, "_sku_index_cache", match.OrderedDict())
+
+
+class TestParity:
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_matches_all_pairs(self, seed):
+        skus, intents = make_skus(40, seed), make_intents(25, seed)
+        requirements = ["B12", "selenium", " iron"]
+
+        expected, expected_unmatched = all_pairs_match(skus, intents)
+        expected_reqs = fulfill_requirements(expected, requirements)
+
+        index = SkuIngredientIndex.build(skus)
+        actual, actual_unmatched = match_intents_to_skus(skus, intents, index=index)
+        actual_reqs = fulfill_requirements(actual, requirements, index=index)
+
+        assert snapshot(actual) == snapshot(expected)
+        assert [i.code for i in actual_unmatched] == [i.code for i in expected_unmatched]
+        assert actual_reqs == expected_reqs
+
+        expected_protocol = build_protocol(expected)
+        actual_protocol = build_protocol(actual)
+        assert actual_protocol == expected_protocol
+        assert MatchingResult.compute_hash(actual_protocol, []) == MatchingResult.compute_hash(expected_protocol, [])
+
+    def test_duplicate_sku_id_last_wins(self):
+        skus = [
+            AllowedSKUInput(sku_id="S1", product_name="Old", ingredient_tags=["zinc"]),
+            AllowedSKUInput(sku_id="S2", product_name="Other", ingredient_tags=["iron"]),
+            AllowedSKUInput(sku_id="S1", product_name="New", ingredient_tags=["magnesium"]),
+        ]
+        intents = [IntentInput(code="SLEEP", priority=1, ingredient_targets=["magnesium", "zinc"])]
+        candidates, _ = match_intents_to_skus(skus, intents)
+        assert list(candidates) == ["S1", "S2"]
+        assert candidates["S1"].sku.product_name == "New"
+        assert candidates["S1"].matched_ingredients == {"magnesium"}
+
+    def test_posting_lists_only_visit_candidates(self):
+        index = SkuIngredientIndex.build(make_skus(40))
+        positions = index.candidates({"b12"})
+        assert positions == sorted(positions)
+        assert all("b12" in index.tags[p] for p in positions)
+        assert index.candidates({"unknown_tag"}) == []
+
+
+class TestIndexCache:
+
+    def test_reused_within_catalog_version(self):
+        skus = make_skus(20)
+        first = get_sku_index(skus, "catalog_a")
+        assert get_sku_index(list(skus), "catalog_a") is first
+        assert get_sku_index(skus[:-1], "catalog_a") is not first
+
+    def test_dropped_on_version_change(self):
+        skus = make_skus(20)
+        first = get_sku_index(skus, "catalog_a")
+        assert get_sku_index(skus, "catalog_b") is not first
+        assert len(match._sku_index_cache) == 1
+
+    def test_no_catalog_version_builds_fresh(self):
+        skus = make_skus(20)
+        assert get_sku_index(skus) is not get_sku_index(skus)
+        assert len(match._sku_index_cache) == 0
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(match, "SKU_INDEX_CACHE_SIZE", 2)
+        skus = make_skus(20)
+        for n in (5, 6, 7):
+            get_sku_index(skus[:n], "catalog_a")
+        assert len(match._sku_index_cache) == 2
@@ -0,0 +1,177 @@
+"""
+OCR Page Pipeline Tests (page-parallel OCR, streamed markers)
+
+Tests verify (offline, against FakeVisionClient):
+1. Pages of multi-page documents are OCRed concurrently, bounded by the pool
+2. Page events stream as soon as each page is parsed, before later pages finish
+3. The merged result matches parsing the whole document text at once
+4. Failing pages are reported without losing the other pages
+5. /ocr/parse and /ocr/parse/stream serve the pipeline (NDJSON for stream)
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bloodwork_engine import ocr_pipeline
+from bloodwork_engine.api import register_bloodwork_endpoints
+from bloodwork_engine.ocr_parser import OCRParser, parse_text_fallback
+from bloodwork_engine.ocr_pipeline import (
+    FakeVisionClient,
+    iter_ocr_events,
+    parse_document,
+)
+
+PAGES = [
+    "Quest Diagnostics\nCollected 03/02/2025\nFerritin 80 ng/mL 30-400\nTSH 2.1 mIU/L",
+    "Homocysteine <10 umol/L\nFerritin 95 ng/mL",
+    "Ordering Physician: Dr. Miles\nCreatinine 0.9 mg/dL",
+    "Platelet Count 1,250 x10^3/µL\nMagnesium 2.1 mg/dL",
+]
+
+
+@pytest.fixture(autouse=True)
+def pool(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=3)
+    monkeypatch.setattr(ocr_pipeline, "_executor", executor)
+    yield executor
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def markers_of(result):
+    return [(m.code, m.value, m.unit, m.confidence) for m in result.markers]
+
+
+class GatedVisionClient(FakeVisionClient):
+    """Holds each page request until the test releases that page."""
+
+    def __init__(self, pages):
+        super().__init__(pages=pages)
+        self.gates = {page: threading.Event() for page in range(1, len(pages) + 1)}
+
+    def batch_annotate_files(self, requests):
+        self.gates[requests[0]["pages"][0]].wait(timeout=5)
+        return super().batch_annotate_files(requests)
+
+
+class TestPageParallelism:
+
+    def test_pages_run_concurrently_within_pool_bound(self):
+        client = FakeVisionClient(pages=PAGES * 3, delay_s=0.05)
+        started = time.perf_counter()
+        result = parse_document(b"%PDF", "application/pdf", client=client)
+        elapsed = time.perf_counter() - started
+
+        assert sorted(client.requested_pages) == list(range(1, 13))
+        assert client.peak_concurrency == 3
+        assert elapsed < 12 * 0.05
+        assert result.parse_stats["total_pages"] == 12
+        assert result.parse_stats["parsed_pages"] == 12
+
+    def test_page_events_stream_before_document_completes(self):
+        client = GatedVisionClient(PAGES)
+        events = iter_ocr_events(b"%PDF", "application/pdf", client=client)
+
+        client.gates[1].set()
+        first = next(events)
+        assert (first["type"], first["page"], first["total_pages"]) == ("page", 1, 4)
+        assert client.requested_pages == [1]
+
+        client.gates[3].set()
+        third = next(events)
+        assert third["page"] == 3
+        assert [m["code"] for m in third["markers"]] == ["creatinine"]
+
+        for page in (2, 4):
+            client.gates[page].set()
+        rest = list(events)
+        assert sorted(e["page"] for e in rest if e["type"] == "page") == [2, 4]
+        assert rest[-1]["type"] == "summary"
+
+
+class TestMerge:
+
+    def test_matches_whole_document_parse(self):
+        result = parse_document(b"%PDF", "application/pdf", client=FakeVisionClient(pages=PAGES))
+        whole = parse_text_fallback("\n".join(PAGES))
+
+        assert markers_of(result) == markers_of(whole)
+        assert result.lab_name == whole.lab_name == "Quest Diagnostics"
+        assert result.report_date == whole.report_date
+        pages = {m.code: m.page for m in result.markers}
+        assert (pages["ferritin"], pages["homocysteine"]) == (1, 2)  # ties keep the earliest page
+        assert result.errors is None
+
+    def test_failed_page_reported(self):
+        client = FakeVisionClient(pages=PAGES, failing_pages={3})
+        events = list(iter_ocr_events(b"%PDF", "application/pdf", client=client))
+
+        failed = [e for e in events if e["type"] == "page" and e["status"] == "error"]
+        assert [e["page"] for e in failed] == [3]
+        summary = events[-1]
+        assert summary["status"] == "ok"
+        assert summary["errors"] == ["Page 3: Google Cloud Vision error: Fake Vision error on page 3"]
+        assert "creatinine" not in {m["code"] for m in summary["markers"]}
+        assert "ferritin" in {m["code"] for m in summary["markers"]}
+
+    def test_all_pages_failed_raises(self):
+        client = FakeVisionClient(pages=PAGES, failing_pages={1})
+        with pytest.raises(RuntimeError, match="page 1"):
+            parse_document(b"%PDF", "application/pdf", client=client)
+
+    def test_parse_image_delegates_to_pipeline(self, monkeypatch):
+        monkeypatch.setattr(ocr_pipeline, "OCR_FAKE_VISION", True)
+        result = OCRParser().parse_image("\f".join(PAGES).encode("utf-8"), "application/pdf")
+        assert markers_of(result) == markers_of(parse_text_fallback("\n".join(PAGES)))
+
+    def test_page_cap(self, monkeypatch):
+        monkeypatch.setattr(ocr_pipeline, "OCR_MAX_PAGES", 2)
+        client = FakeVisionClient(pages=PAGES)
+        result = parse_document(b"%PDF", "application/pdf", client=client)
+        assert sorted(client.requested_pages) == [1, 2]
+        assert result.errors == ["Only the first 2 of 4 pages were processed"]
+
+    def test_single_image_uses_text_detection(self):
+        client = FakeVisionClient()
+        result = parse_document(b"Ferritin 80 ng/mL", "image/png", client=client)
+        assert markers_of(result) == [("ferritin", 80.0, "ng/mL", 1.0)]
+        assert client.requested_pages == [1]
+
+
+class TestEndpoints:
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(ocr_pipeline, "OCR_FAKE_VISION", True)
+        app = FastAPI()
+        register_bloodwork_endpoints(app)
+        return TestClient(app)
+
+    def upload(self):
+        return {"file": ("report.pdf", "\f".join(PAGES).encode("utf-8"), "application/pdf")}
+
+    def test_stream_endpoint_emits_pages_then_summary(self, client):
+        response = client.post("/api/v1/bloodwork/ocr/parse/stream", files=self.upload())
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        assert sorted(line["page"] for line in lines[:-1]) == [1, 2, 3, 4]
+        summary = lines[-1]
+        assert summary["type"] == "summary"
+        assert summary["lab_name"] == "Quest Diagnostics"
+        assert summary["engine_result"]["markers"] == len(summary["markers"])
+
+    def test_parse_endpoint_merges_pages(self, client):
+        body = client.post("/api/v1/bloodwork/ocr/parse", files=self.upload()).json()
+
+        assert body["status"] == "success"
+        assert body["ocr_result"]["parse_stats"]["total_pages"] == 4
+        assert [m["code"] for m in body["ocr_result"]["raw_markers"]] == \
+            [code for code, *_ in markers_of(parse_text_fallback("\n".join(PAGES)))]
+        assert body["engine_result"] is not None
@@ -0,0 +1,148 @@
+"""
+OCR Marker Recognizer Tests (compiled single-pass scan)
+
+Tests verify (no OCR client or credentials required):
+1. FirstMatchRecognizer returns the first matching pattern in table order,
+   exactly like re.search over each pattern in turn
+2. Overlapping names keep their priority (Hemoglobin A1c, mg/dL vs g/dL)
+3. Literal anchors are derived per alternative; unanchored patterns are
+   always searched
+4. Parsed reports are unchanged and subclasses compile their own tables
+"""
+
+import random
+import re
+
+import pytest
+
+from bloodwork_engine.ocr_parser import (
+    FirstMatchRecognizer,
+    OCRParser,
+    _literal_prefix,
+    _split_alternatives,
+    parse_text_fallback,
+)
+
+WORDS = (
+    "ferritin iron serum hemoglobin hgb hb vitamin d 25 hydroxy 25-oh b12 cobalamin folate "
+    "alt ast ggt sgpt sgot egfr gfr glucose fasting fbg hba1c a1c insulin crp hs-crp c-reactive "
+    "calcium k+ tsh free t3 ft4 ldl hdl ldl-c apo b lp(a) testosterone total e2 dhea-s shbg "
+    "uric acid platelets omega-3 index ng/mL mg/dL g/dL ug/L umol/L mL/min/1.73m2 x10^3/µL "
+    "K/uL IU/L U/L % µg/dL mcg/L mEq/L"
+).split()
+NOISE = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 -/+%^µ().,:<>"
+
+
+def per_pattern(patterns, text, flags=0):
+    """The pre-recognizer lookup: re.search for each pattern in turn."""
+    for pattern, label in patterns.items():
+        if re.search(pattern, text, flags):
+            return label
+    return None
+
+
+def random_lines(n, seed):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield " ".join(
+            rng.choice(WORDS) if rng.random() < 0.7
+            else "".join(rng.choice(NOISE) for _ in range(rng.randint(1, 6)))
+            for _ in range(rng.randint(1, 6))
+        )
+
+
+class TestFirstMatchParity:
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_markers_and_units_match_per_pattern(self, seed):
+        markers, units, _ = OCRParser._recognizers()
+        for line in random_lines(5000, seed):
+            assert markers.match(line) == per_pattern(OCRParser.MARKER_PATTERNS, line)
+            assert units.match(line) == per_pattern(OCRParser.UNIT_PATTERNS, line, re.IGNORECASE)
+
+    @pytest.mark.parametrize("line,code", [
+        ("Hemoglobin A1c 5.4 %", "hemoglobin"),
+        ("HbA1c 5.4 %", "hba1c"),
+        ("Glycated HbA1c", "hba1c"),
+        ("LDL-C 120 mg/dL", "ldl_cholesterol"),
+        ("Free Testosterone 9.1 pg/mL", "free_testosterone"),
+        ("Iron Saturation 31 %", "iron"),
+        ("ALT (SGPT) 22 U/L", "alt"),
+        ("Platelets 250 K/uL", "platelet_count"),
+        ("Potassium 4.1 mmol/L", "potassium"),
+        ("Patient address line 12", None),
+    ])
+    def test_priority_semantics(self, line, code):
+        assert OCRParser._recognizers()[0].match(line) == code
+        assert per_pattern(OCRParser.MARKER_PATTERNS, line) == code
+
+    @pytest.mark.parametrize("line,unit", [
+        ("Creatinine 0.9 mg/dL", "mg/dL"),
+        ("Hemoglobin 14 g/dL", "g/dL"),
+        ("TSH 1.2 mIU/L", "mIU/L"),
+        ("Vitamin B12 500 PG/ML", "pg/mL"),
+        ("Platelets 250 x10^3/µL", "x10^3/µL"),
+    ])
+    def test_unit_priority(self, line, unit):
+        assert OCRParser._recognizers()[1].match(line) == unit
+
+
+class TestAnchors:
+
+    def test_split_respects_groups_and_classes(self):
+        assert _split_alternatives(r"iron(?:\s+serum|x)?|hb\b") == [r"iron(?:\s+serum|x)?", r"hb\b"]
+        assert _split_alternatives(r"a[|]b|c") == [r"a[|]b", "c"]
+
+    @pytest.mark.parametrize("branch,anchor", [
+        (r"\balt\b", "alt"),
+        (r"vitamin\s*d.*25", "vitamin"),
+        (r"hs-?crp", "hs"),
+        (r"lp\(?a\)?", "lp"),
+        (r"k\+", "k+"),
+        (r"x10\^?3/µL", "x10"),
+        (r"triglycerides?", "triglyceride"),
+        (r"\d+ mg", ""),
+        (r".*", ""),
+    ])
+    def test_literal_prefix(self, branch, anchor):
+        assert _literal_prefix(branch) == anchor
+
+    def test_unanchored_patterns_always_searched(self):
+        recognizer = FirstMatchRecognizer({r"\d+\s*iu": "numeric", r"(?i)vitamin": "vitamin"})
+        assert recognizer.always == {0}
+        assert recognizer.match("Vitamin A 5000 IU") == "vitamin"
+        assert recognizer.match("5000 iu") == "numeric"
+        assert recognizer.match("nothing here") is None
+
+    def test_case_insensitive_anchor_scan(self):
+        recognizer = FirstMatchRecognizer({r"ng/mL": "ng/mL"}, re.IGNORECASE)
+        assert recognizer.match("Ferritin 80 NG/ML") == "ng/mL"
+
+
+class TestParser:
+
+    REPORT = "\n".join([
+        "Quest Diagnostics   Collected 03/02/2025",
+        "Ferritin            80     ng/mL    30-400",
+        "Homocysteine        <10    umol/L",
+        "TSH                 2.1    mIU/L",
+        "Ordering Physician: Dr. Miles",
+        "Platelet Count      1,250  x10^3/µL",
+    ])
+
+    def test_report_parse(self):
+        result = parse_text_fallback(self.REPORT)
+        assert result.lab_name == "Quest Diagnostics"
+        assert [(m.code, m.value, m.unit, m.confidence) for m in result.markers] == [
+            ("ferritin", 80.0, "ng/mL", 1.0),
+            ("homocysteine", 5.0, "µmol/L", 0.7999999999999999),
+            ("tsh", 2.1, "mIU/L", 1.0),
+            ("platelet_count", 1250.0, "x10^3/µL", 1.0),
+        ]
+
+    def test_subclass_tables_compiled_separately(self):
+        class CustomParser(OCRParser):
+            MARKER_PATTERNS = {r"(?i)selenium": "selenium", **OCRParser.MARKER_PATTERNS}
+
+        assert CustomParser()._parse_line("Selenium 120 ug/L", 1).code == "selenium"
+        assert OCRParser()._parse_line("Selenium 120 ug/L", 1) is None
@@ -0,0 +1,134 @@
+"""
+Reference Range Index Tests (Bloodwork Engine v2)
+
+Tests verify:
+1. Indexed get_reference_range() returns exactly what the linear scan returns
+   for every marker / lab profile / sex / age combination
+2. Fallback semantics (profile -> GLOBAL_CONSERVATIVE -> sex "both") hold for
+   age-restricted and profile-specific ranges
+3. process_markers() output_hash is identical with indexed and scan lookups
+"""
+
+import copy
+import random
+
+import pytest
+
+from bloodwork_engine.engine_v2 import (
+    BloodworkDataLoader,
+    BloodworkEngineV2,
+)
+
+
+SEXES = [None, "", "male", "female", "other"]
+AGES = [None, 5, 17, 18, 30, 45, 64, 65, 90]
+
+
+@pytest.fixture
+def loader():
+    BloodworkDataLoader.reset()
+    yield BloodworkDataLoader()
+    BloodworkDataLoader.reset()
+
+
+@pytest.fixture
+def synthetic_loader(loader):
+    """Loader with extra profile-specific, age-bounded and sex-less ranges."""
+    ranges = loader._reference_ranges["ranges"]
+    base = {r["marker_code"]: r for r in ranges}
+    extra = []
+
+    ferritin = copy.deepcopy(base["ferritin"])
+    ferritin.update({"lab_profile": "US_QUEST", "sex": "male", "age_min": 18, "age_max": 64})
+    ferritin["genomax_optimal"] = {"low": 60, "high": 180}
+    extra.append(ferritin)
+
+    ferritin_senior = copy.deepcopy(ferritin)
+    ferritin_senior.update({"age_min": 65, "age_max": None})
+    extra.append(ferritin_senior)
+
+    for code, r in list(base.items())[:6]:
+        young = copy.deepcopy(r)
+        young.update({"lab_profile": "GLOBAL_CONSERVATIVE", "sex": None, "age_max": 17})
+        ranges.insert(0, young)
+        eu = copy.deepcopy(r)
+        eu.update({"lab_profile": "EU_GENERIC", "sex": "female", "age_min": 40})
+        extra.append(eu)
+
+    ranges.extend(extra)
+    loader._build_range_index()
+    return loader
+
+
+def _all_combinations(loader):
+    codes = sorted({r["marker_code"] for r in loader.reference_ranges["ranges"]})
+    profiles = list(loader.lab_profiles) + ["UNKNOWN_PROFILE"]
+    for code in codes + ["not_a_marker"]:
+        for profile in profiles:
+            for sex in SEXES:
+                for age in AGES:
+                    yield code, profile, sex, age
+
+
+class TestIndexParity:
+
+    def test_matches_scan_on_shipped_ranges(self, loader):
+        for code, profile, sex, age in _all_combinations(loader):
+            indexed = loader.get_reference_range(code, profile, sex, age)
+            scanned = loader.get_reference_range_scan(code, profile, sex, age)
+            assert indexed[0] is scanned[0], (code, profile, sex, age)
+            assert indexed[1:] == scanned[1:], (code, profile, sex, age)
+
+    def test_matches_scan_on_synthetic_ranges(self, synthetic_loader):
+        loader = synthetic_loader
+        for code, profile, sex, age in _all_combinations(loader):
+            indexed = loader.get_reference_range(code, profile, sex, age)
+            scanned = loader.get_reference_range_scan(code, profile, sex, age)
+            assert indexed[0] is scanned[0], (code, profile, sex, age)
+            assert indexed[1:] == scanned[1:], (code, profile, sex, age)
+
+    def test_profile_specific_range_preferred(self, synthetic_loader):
+        r, profile, fallback = synthetic_loader.get_reference_range("ferritin", "US_QUEST", "male", 30)
+        assert profile == "US_QUEST"
+        assert fallback is False
+        assert r["genomax_optimal"] == {"low": 60, "high": 180}
+
+    def test_falls_back_to_global_conservative(self, synthetic_loader):
+        r, profile, fallback = synthetic_loader.get_reference_range("ferritin", "US_QUEST", "female", 30)
+        assert profile == "GLOBAL_CONSERVATIVE"
+        assert fallback is True
+        assert r["sex"] == "female"
+
+
+class TestOutputHashDeterminism:
+
+    def _random_panels(self, loader, n):
+        rng = random.Random(1234)
+        codes = sorted({r["marker_code"] for r in loader.reference_ranges["ranges"]})
+        panels = []
+        for _ in range(n):
+            markers = []
+            for code in rng.sample(codes, k=rng.randint(3, len(codes))):
+                marker_def = loader.get_marker_definition(code)
+                markers.append({
+                    "code": code,
+                    "value": round(rng.uniform(0.1, 600), 2),
+                    "unit": marker_def["canonical_unit"],
+                })
+            panels.append((markers, rng.choice(SEXES), rng.choice(AGES)))
+        return panels
+
+    @pytest.mark.parametrize("profile", ["GLOBAL_CONSERVATIVE", "US_QUEST", "EU_GENERIC"])
+    def test_output_hash_identical_to_scan(self, synthetic_loader, monkeypatch, profile):
+        loader = synthetic_loader
+        engine = BloodworkEngineV2(lab_profile=profile)
+        panels = self._random_panels(loader, 60)
+
+        indexed = [engine.process_markers(m, sex=s, age=a) for m, s, a in panels]
+        monkeypatch.setattr(loader, "get_reference_range", loader.get_reference_range_scan)
+        scanned = [engine.process_markers(m, sex=s, age=a) for m, s, a in panels]
+
+        for a, b in zip(indexed, scanned):
+            assert a.output_hash == b.output_hash
+            assert [m.reference_range for m in a.markers] == [m.reference_range for m in b.markers]
+            assert [m.lab_profile_used for m in a.markers] == [m.lab_profile_used for m in b.markers]
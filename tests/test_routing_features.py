@@ -0,0 +1,197 @@
+"""
+Routing SKU Feature Store Tests (Issue #6)
+
+Tests verify (no database required):
+1. Routing through precompiled SkuFeatures gives the same allowed/blocked
+   partition, reason codes, blocked_by and audit as per-SKU derivation
+2. Pregnancy/lactation flags match the contraindication keyword checks
+3. Batch routing equals one apply_routing_constraints() call per user
+4. Feature stores are reused per catalog version and dropped when it changes
+"""
+
+import random
+
+import pytest
+
+from app.routing import apply
+from app.routing.apply import (
+    SkuFeatures,
+    aggregate_contraindications,
+    apply_routing_constraints,
+    apply_routing_constraints_batch,
+    check_lactation_contraindication,
+    check_pregnancy_contraindication,
+    get_sku_feature_store,
+)
+from app.routing.models import RoutingConstraints, SkuInput
+
+INGREDIENTS = ["iron", "Vitamin_C", "vitamin_d3", "Zinc", "niacin", "ashwagandha", "folate", "kava"]
+CATEGORIES = ["minerals", "Vitamins", "adaptogens", "hepatotoxic"]
+RISK_TAGS = ["blocked_ingredient", "AUTO_BLOCKED", "low_evidence"]
+CONTRAINDICATIONS = [
+    "Avoid during pregnancy",
+    "Not for breastfeeding women",
+    "May cause nausea",
+    "Possible teratogenic effects; nursing mothers should consult a doctor",
+]
+
+
+def make_skus(n, seed=4):
+    rng = random.Random(seed)
+    skus = []
+    for i in range(n):
+        extra = {}
+        if i % 9 == 0:
+            extra["contraindications"] = "Contraindicated in pregnancy"
+        skus.append(SkuInput(
+            sku_id=f"sku-{i:03d}",
+            product_name=f"Product {i}",
+            ingredient_tags=rng.sample(INGREDIENTS, rng.randint(0, 3)),
+            category_tags=rng.sample(CATEGORIES, rng.randint(0, 2)),
+            risk_tags=rng.sample(RISK_TAGS, rng.randint(0, 1)) if i % 4 == 0 else [],
+            gender_line=rng.choice(["MAXimo2", "MAXima2", "UNISEX"]),
+            ingredient_contraindications=rng.sample(CONTRAINDICATIONS, rng.randint(0, 2)) or None,
+            **extra,
+        ))
+    return skus
+
+
+def make_constraints(n, seed=8):
+    rng = random.Random(seed)
+    return [
+        RoutingConstraints(
+            blocked_ingredients=rng.sample(INGREDIENTS, rng.randint(0, 2)),
+            blocked_categories=rng.sample(CATEGORIES, rng.randint(0, 1)),
+            caution_flags=rng.sample(INGREDIENTS, rng.randint(0, 2)),
+            requirements=rng.sample(INGREDIENTS + ["selenium"], rng.randint(0, 3)),
+            biological_state=rng.choice(["GENERAL", "PREGNANT", "BREASTFEEDING"]),
+        )
+        for _ in range(n)
+    ]
+
+
+def reference_decisions(skus, constraints):
+    """Per-SKU block decisions derived from the raw SKU on every call."""
+    decisions = {}
+    blocked_ingredients = {i.lower() for i in constraints.blocked_ingredients}
+    blocked_categories = {c.lower() for c in constraints.blocked_categories}
+    for sku in skus:
+        risk = {t.lower() for t in sku.risk_tags}
+        contraindications = aggregate_contraindications(sku)
+        metadata = [code for tag, code in (("blocked_ingredient", "BLOCKED_BY_EVIDENCE"),
+                                           ("auto_blocked", "AUTO_BLOCKED_METADATA")) if tag in risk]
+        blood = [f"BLOCK_INGREDIENT_{i.upper()}" for i in blocked_ingredients & {t.lower() for t in sku.ingredient_tags}]
+        category = [f"BLOCK_CATEGORY_{c.upper()}" for c in blocked_categories & {t.lower() for t in sku.category_tags}]
+        pregnancy = (constraints.biological_state == "PREGNANT"
+                     and check_pregnancy_contraindication(contraindications))
+        lactation = (constraints.biological_state == "BREASTFEEDING"
+                     and check_lactation_contraindication(contraindications))
+        reasons = metadata + blood + category
+        reasons += ["BLOCK_PREGNANCY_CONTRAINDICATION"] if pregnancy else []
+        reasons += ["BLOCK_LACTATION_CONTRAINDICATION"] if lactation else []
+        if not reasons:
+            decisions[sku.sku_id] = None
+            continue
+        blocked_by = ("pregnancy" if pregnancy else "lactation" if lactation else
+                      "metadata" if metadata else "blood" if blood else "category")
+        decisions[sku.sku_id] = (blocked_by, sorted(reasons))
+    return decisions
+
+
+def comparable(result):
+    data = result.model_dump()
+    data["audit"].pop("processed_at")
+    return data
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(apply, "_feature_store_version", None)
+    monkeypatch.setattr(apply, "_feature_store_cache", apply.OrderedDict())
+
+
+class TestParity:
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_decisions_match_per_sku_derivation(self, seed):
+        skus = make_skus(60, seed)
+        for constraints in make_constraints(12, seed):
+            result = apply_routing_constraints(skus, constraints, catalog_version="supliful_v1")
+            actual = {s.sku_id: None for s in result.allowed_skus}
+            actual.update({s.sku_id: (s.blocked_by, s.reason_codes) for s in result.blocked_skus})
+            assert actual == reference_decisions(skus, constraints)
+
+    def test_cached_store_matches_fresh_build(self):
+        skus = make_skus(40)
+        for constraints in make_constraints(6):
+            cached = apply_routing_constraints(skus, constraints, catalog_version="supliful_v1")
+            fresh = apply_routing_constraints(skus, constraints)
+            assert comparable(cached) == comparable(fresh)
+
+    def test_contraindication_flags(self):
+        for sku in make_skus(40):
+            text = aggregate_contraindications(sku)
+            features = SkuFeatures.from_sku(sku)
+            assert features.pregnancy_contraindicated == check_pregnancy_contraindication(text)
+            assert features.lactation_contraindicated == check_lactation_contraindication(text)
+
+    def test_pregnancy_block_takes_priority(self):
+        sku = SkuInput(
+            sku_id="kava-1", product_name="Kava", ingredient_tags=["kava"], risk_tags=["auto_blocked"],
+            contraindications="Not for use during pregnancy",
+        )
+        constraints = RoutingConstraints(blocked_ingredients=["Kava"], biological_state="PREGNANT")
+        blocked = apply_routing_constraints([sku], constraints).blocked_skus[0]
+        assert blocked.blocked_by == "pregnancy"
+        assert blocked.reason_codes == [
+            "AUTO_BLOCKED_METADATA", "BLOCK_INGREDIENT_KAVA", "BLOCK_PREGNANCY_CONTRAINDICATION"
+        ]
+
+
+class TestBatch:
+
+    def test_batch_equals_individual_calls(self):
+        skus = make_skus(50)
+        constraints_list = make_constraints(10)
+        batch = apply_routing_constraints_batch(skus, constraints_list, catalog_version="supliful_v1")
+        individual = [apply_routing_constraints(skus, c) for c in constraints_list]
+        assert [comparable(r) for r in batch] == [comparable(r) for r in individual]
+
+    def test_batch_compiles_features_once(self, monkeypatch):
+        calls = []
+        real_from_sku = SkuFeatures.from_sku.__func__
+        monkeypatch.setattr(
+            SkuFeatures, "from_sku",
+            classmethod(lambda cls, sku: calls.append(sku.sku_id) or real_from_sku(cls, sku))
+        )
+        skus = make_skus(20)
+        apply_routing_constraints_batch(skus, make_constraints(5))
+        assert len(calls) == 20
+
+
+class TestFeatureStoreCache:
+
+    def test_reused_within_catalog_version(self):
+        skus = make_skus(20)
+        first = get_sku_feature_store(skus, "catalog_a")
+        assert get_sku_feature_store([s.model_copy() for s in skus], "catalog_a") is first
+        changed = skus[:-1] + [skus[-1].model_copy(update={"risk_tags": ["auto_blocked"]})]
+        assert get_sku_feature_store(changed, "catalog_a") is not first
+
+    def test_dropped_on_version_change(self):
+        skus = make_skus(20)
+        first = get_sku_feature_store(skus, "catalog_a")
+        assert get_sku_feature_store(skus, "catalog_b") is not first
+        assert len(apply._feature_store_cache) == 1
+
+    def test_no_catalog_version_builds_fresh(self):
+        skus = make_skus(20)
+        assert get_sku_feature_store(skus) is not get_sku_feature_store(skus)
+        assert len(apply._feature_store_cache) == 0
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(apply, "SKU_FEATURE_CACHE_SIZE", 2)
+        skus = make_skus(20)
+        for n in (5, 6, 7):
+            get_sku_feature_store(skus[:n], "catalog_a")
+        assert len(apply._feature_store_cache) == 2
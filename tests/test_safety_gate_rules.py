@@ -0,0 +1,179 @@
+"""
+Safety Gate Rule Table Tests (Bloodwork Engine v2)
+
+Tests verify:
+1. Every gate definition compiles into a rule
+2. Table-driven evaluation emits exactly the gates the per-tier if-chains emit
+   (order, thresholds, trigger markers, ingredients, exceptions)
+3. process_markers() output_hash is unchanged
+4. NumPy batch evaluation matches per-panel evaluation
+"""
+
+import random
+from dataclasses import asdict
+
+import pytest
+
+from bloodwork_engine.engine_v2 import (
+    BloodworkDataLoader,
+    BloodworkEngineV2,
+    ComputedMarker,
+    ProcessedMarker,
+    SafetyGateEvaluator,
+    compile_gate_rules,
+)
+
+
+SEXES = [None, "male", "female", "other"]
+AGES = [None, 0, 25, 39, 40, 70]
+
+# Ranges straddling each gate threshold
+NUMERIC_MARKERS = {
+    "ferritin": (5, 450), "hs_crp": (0.1, 8), "calcium_serum": (8, 11.5),
+    "alt": (10, 90), "ast": (10, 90), "egfr": (30, 120), "creatinine": (0.5, 2.0),
+    "potassium": (3.0, 6.0), "tsh": (0.1, 8), "vitamin_b12": (150, 900),
+    "folate_serum": (2, 20), "homocysteine": (4, 20), "uric_acid": (3, 10),
+    "platelet_count": (80, 400), "omega3_index": (2, 12), "zinc_copper_ratio": (0.5, 2.0),
+    "homa_ir": (0.5, 5), "fasting_insulin": (2, 25), "hemoglobin": (9, 17),
+    "triglycerides": (50, 600), "cortisol_am": (3, 30), "dhea_s": (50, 400),
+    "rt3_ft3_ratio": (5, 30), "free_t3": (1.5, 4.5), "total_testosterone": (150, 900),
+    "free_testosterone": (2, 25), "estradiol_progesterone_ratio": (2, 30),
+    "apolipoprotein_b": (50, 150), "lp_a": (5, 150), "ggt": (10, 90),
+}
+GENOTYPES = {
+    "mthfr_c677t": ["CC", "CT", "TT", None],
+    "mthfr_a1298c": ["AA", "AC", "CC", None],
+}
+
+
+@pytest.fixture(scope="module")
+def loader():
+    BloodworkDataLoader.reset()
+    yield BloodworkDataLoader()
+    BloodworkDataLoader.reset()
+
+
+@pytest.fixture(scope="module")
+def engine(loader):
+    return BloodworkEngineV2()
+
+
+def _random_values(rng):
+    values = {}
+    for code, (low, high) in NUMERIC_MARKERS.items():
+        roll = rng.random()
+        if roll < 0.25:
+            continue
+        if roll < 0.3:
+            values[code] = 0
+        else:
+            values[code] = round(rng.uniform(low, high), 2)
+    for code, options in GENOTYPES.items():
+        value = rng.choice(options)
+        if value is not None:
+            values[code] = value
+    return values
+
+
+def _threshold_values(loader):
+    """Panels whose markers sit exactly on each gate threshold."""
+    panels = []
+    for gate in loader.get_all_gates_flat().values():
+        for key, value in gate.items():
+            if "threshold" in key and isinstance(value, (int, float)):
+                panels.append({code: value for code in NUMERIC_MARKERS})
+    return panels
+
+
+def _split(values):
+    processed = []
+    computed = []
+    for code, value in values.items():
+        if code.endswith("_ratio") or code == "homa_ir":
+            computed.append(ComputedMarker(code=code, name=code, value=value, unit="ratio", formula="", source_markers=[]))
+        else:
+            processed.append(ProcessedMarker(
+                original_code=code, canonical_code=code, original_value=value,
+                canonical_value=value, original_unit="", canonical_unit="", status="VALID", range_status="IN_RANGE",
+            ))
+    return processed, computed
+
+
+def _panels(loader, n=200):
+    rng = random.Random(42)
+    return [_random_values(rng) for _ in range(n)] + _threshold_values(loader)
+
+
+class TestCompilation:
+
+    def test_all_gates_compile(self, loader):
+        rules = compile_gate_rules(loader.get_all_gates_flat())
+        assert len(rules) == len(loader.get_all_gates_flat())
+        assert loader.gate_evaluator is not None
+
+    def test_missing_spec_rejected(self, loader):
+        defs = dict(loader.get_all_gates_flat())
+        defs["GATE_999"] = dict(defs["GATE_002"], gate_id="GATE_999")
+        with pytest.raises(ValueError):
+            compile_gate_rules(defs)
+
+    def test_missing_threshold_rejected(self, loader):
+        defs = dict(loader.get_all_gates_flat())
+        defs["GATE_002"] = {k: v for k, v in defs["GATE_002"].items() if k != "threshold"}
+        with pytest.raises(ValueError):
+            compile_gate_rules(defs)
+
+
+class TestParity:
+
+    def test_gates_identical_to_legacy(self, loader, engine):
+        for values in _panels(loader):
+            processed, computed = _split(values)
+            for sex in SEXES:
+                for age in AGES:
+                    table = engine._evaluate_all_safety_gates(processed, computed, sex, age)
+                    legacy = engine._evaluate_all_safety_gates_legacy(processed, computed, sex, age)
+                    assert [asdict(g) for g in table] == [asdict(g) for g in legacy], (values, sex, age)
+
+    def test_output_hash_identical_to_legacy(self, loader, engine, monkeypatch):
+        rng = random.Random(7)
+        panels = []
+        for _ in range(50):
+            values = _random_values(rng)
+            markers = [
+                {"code": code, "value": value, "unit": loader.get_marker_definition(code)["canonical_unit"]}
+                for code, value in values.items()
+                if loader.get_marker_definition(code)
+            ]
+            panels.append((markers, rng.choice(SEXES), rng.choice(AGES)))
+
+        table = [engine.process_markers(m, sex=s, age=a) for m, s, a in panels]
+        monkeypatch.setattr(engine, "_evaluate_all_safety_gates", engine._evaluate_all_safety_gates_legacy)
+        legacy = [engine.process_markers(m, sex=s, age=a) for m, s, a in panels]
+
+        for a, b in zip(table, legacy):
+            assert a.output_hash == b.output_hash
+            assert a.routing_constraints == b.routing_constraints
+
+
+class TestBatch:
+
+    def test_batch_matches_single_panel(self, loader):
+        evaluator = loader.gate_evaluator
+        rng = random.Random(99)
+        panels = _panels(loader, 300)
+        sexes = [rng.choice(SEXES) for _ in panels]
+        ages = [rng.choice(AGES) for _ in panels]
+
+        result = evaluator.evaluate_batch(evaluator.build_columns(panels), sexes, ages)
+
+        for i, values in enumerate(panels):
+            gates = evaluator.evaluate(values, sexes[i], ages[i])
+            assert result.panel_gate_ids(i) == [g.gate_id for g in gates]
+            expected = sorted({g.routing_constraint for g in gates if not g.exception_active})
+            assert result.panel_routing_constraints(i) == expected
+
+    def test_empty_columns(self, loader):
+        evaluator = SafetyGateEvaluator(loader.gate_evaluator.rules)
+        result = evaluator.evaluate_batch(evaluator.build_columns([{}, {}]), ["male", None], [30, None])
+        assert not result.triggered.any()
@@ -0,0 +1,248 @@
+"""
+Shopify Incremental Sync Tests (content-hash diff publish)
+
+Tests verify (offline: FakeShopifyAPI transport, in-memory publish state):
+1. Publish records a payload hash per module (state + audit row)
+2. Diff mode skips unchanged modules without any API call
+3. Changed modules PUT only the changed fields and upsert only the changed
+   metafields with metafieldsSet, against Shopify's PUT semantics
+4. Products deleted in Shopify and rejected metafields fall back safely
+5. POST /export/publish with diff=true reports unchanged modules
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.integrations import shopify_router
+from app.integrations.shopify_client import AsyncShopifyClient, FakeShopifyAPI, LeakyBucket
+from app.integrations.shopify_router import (
+    PublishAction,
+    build_metafields_payload,
+    build_shopify_product_payload,
+    compute_publish_hash,
+    diff_publish_payload,
+    publish_modules,
+)
+from app.shared import http_clients
+
+BASE_URL = "https://genomax-test.myshopify.com/admin/api/2026-01"
+
+
+def make_module(n, **overrides):
+    module = {
+        "module_code": f"MOD-{n:03d}",
+        "product_name": f"Module {n}",
+        "shopify_handle": f"module-{n}",
+        "os_environment": "MAXimo²",
+        "os_layer": "Core",
+        "tier": "TIER_1",
+        "biological_domain": "Energy",
+        "net_quantity": "60 capsules",
+        "fda_disclaimer": "These statements have not been evaluated by the FDA.",
+        "back_label_text": "Take two daily.",
+        "front_label_text": "Module",
+        "suggested_use_full": "Take two capsules daily with food.",
+        "dosing_protocol": "2 caps AM",
+        "supplier_status": "ACTIVE",
+        "is_launch_v1": True,
+    }
+    module.update(overrides)
+    return module
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """In-memory shopify_publish_state_v1 plus captured audit rows."""
+    store = {"state": {}, "audit": []}
+
+    def save_publish_state(**row):
+        store["state"][row["module_code"]] = row
+
+    def load_publish_state(module_codes):
+        return {code: dict(store["state"][code]) for code in module_codes if code in store["state"]}
+
+    monkeypatch.setattr(shopify_router, "save_publish_state", save_publish_state)
+    monkeypatch.setattr(shopify_router, "load_publish_state", load_publish_state)
+    monkeypatch.setattr(shopify_router, "log_publish_audit", lambda **row: store["audit"].append(row))
+    return store
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(http_clients, "UPSTREAMS", dict(http_clients.UPSTREAMS))
+    monkeypatch.setattr(http_clients, "_sync_clients", {})
+    monkeypatch.setattr(http_clients, "_async_clients", {})
+    fake = FakeShopifyAPI(capacity=40, leak_rate=500)
+    http_clients.configure_upstream("shopify", transport=fake)
+    return fake
+
+
+@pytest.fixture
+def client():
+    return AsyncShopifyClient(base_url=BASE_URL, access_token="token", bucket=LeakyBucket(leak_rate=500))
+
+
+def publish(modules, client, **kwargs):
+    return asyncio.run(publish_modules(modules, "batch-1", client, **kwargs))
+
+
+CATALOG = [make_module(n) for n in range(20)]
+
+
+class TestPayloadHash:
+
+    def test_hash_is_stable_and_content_sensitive(self):
+        module = make_module(1)
+        payload, metafields = build_shopify_product_payload(module), build_metafields_payload(module)
+        assert compute_publish_hash(payload, metafields) == compute_publish_hash(dict(payload), list(metafields))
+        assert compute_publish_hash(payload, metafields).startswith("sha256:")
+
+        changed = make_module(1, net_quantity="90 capsules")
+        assert compute_publish_hash(payload, metafields) != compute_publish_hash(
+            build_shopify_product_payload(changed), build_metafields_payload(changed)
+        )
+
+    def test_diff_lists_only_changes(self):
+        before = make_module(1)
+        after = make_module(1, product_name="Module One", safety_notes="Not for children.")
+        state = {
+            "product_payload": build_shopify_product_payload(before),
+            "metafields": build_metafields_payload(before),
+        }
+
+        fields, metafields = diff_publish_payload(
+            state, build_shopify_product_payload(after), build_metafields_payload(after)
+        )
+
+        assert fields == {"title": "Module One"}
+        assert [mf["key"] for mf in metafields] == ["safety_notes"]
+
+
+class TestDiffPublish:
+
+    def test_publish_records_state_and_hash(self, fake, client, store):
+        publish(CATALOG, client)
+
+        state = store["state"]["MOD-003"]
+        assert state["shopify_product_id"] == str(fake.products["module-3"]["id"])
+        module = CATALOG[3]
+        assert state["payload_hash"] == compute_publish_hash(
+            build_shopify_product_payload(module), build_metafields_payload(module)
+        )
+        created = [row for row in store["audit"] if row["action"] == PublishAction.CREATE]
+        assert all(row["payload_hash"].startswith("sha256:") for row in created)
+
+    def test_unchanged_catalog_makes_no_calls(self, fake, client, store):
+        publish(CATALOG, client)
+        calls = len(fake.requests)
+
+        results = publish(CATALOG, client, diff=True)
+
+        assert len(results["unchanged"]) == 20
+        assert len(fake.requests) == calls
+        assert results["throughput"]["api_calls"] == 0
+        unchanged = [row for row in store["audit"] if row["action"] == PublishAction.UNCHANGED]
+        assert len(unchanged) == 20
+
+    def test_changed_modules_put_only_changed_fields(self, fake, client, store):
+        publish(CATALOG, client)
+        fake.requests.clear()
+        fake.writes.clear()
+        catalog = list(CATALOG)
+        catalog[4] = make_module(4, product_name="Module Four")
+        catalog[9] = make_module(9, net_quantity="90 capsules")
+
+        results = publish(catalog, client, diff=True)
+
+        assert [e["module_code"] for e in results["updated"]] == ["MOD-004", "MOD-009"]
+        assert [e["changed_fields"] for e in results["updated"]] == [["title"], ["net_quantity"]]
+        assert len(results["unchanged"]) == 18
+        assert sorted(method for method, _ in fake.requests) == ["POST", "PUT", "PUT"]
+        module_4, module_9 = fake.products["module-4"]["id"], fake.products["module-9"]["id"]
+        assert sorted(fake.writes, key=lambda w: w["id"]) == [
+            {"id": module_4, "title": "Module Four"},
+            {"id": module_9},
+        ]
+        assert fake.metafield_sets == [[{
+            "ownerId": f"gid://shopify/Product/{module_9}",
+            "namespace": "genomax",
+            "key": "net_quantity",
+            "value": "90 capsules",
+            "type": "single_line_text_field",
+        }]]
+        assert fake.products["module-9"]["metafields"][("genomax", "net_quantity")] == "90 capsules"
+        assert fake.products["module-9"]["title"] == "Module 9"
+
+        again = publish(catalog, client, diff=True)
+        assert len(again["unchanged"]) == 20
+
+    def test_metafield_change_is_upserted(self, fake, client, store):
+        publish(CATALOG[:3], client)
+        catalog = [CATALOG[0], make_module(1, dosing_protocol="1 cap AM"), CATALOG[2]]
+
+        results = publish(catalog, client, diff=True)
+
+        assert [e["changed_fields"] for e in results["updated"]] == [["dosing_protocol"]]
+        assert "metafield_error" not in results["updated"][0]
+        assert fake.products["module-1"]["metafields"][("genomax", "dosing_protocol")] == "1 cap AM"
+        assert store["state"]["MOD-001"]["metafields"] == build_metafields_payload(catalog[1])
+
+        calls = len(fake.requests)
+        again = publish(catalog, client, diff=True)
+        assert len(again["unchanged"]) == 3
+        assert len(fake.requests) == calls
+
+    def test_full_mode_still_republishes_everything(self, fake, client, store):
+        publish(CATALOG, client)
+        results = publish(CATALOG, client)
+        assert len(results["updated"]) == 20
+        assert results["unchanged"] == []
+
+    def test_product_deleted_in_shopify_is_recreated(self, fake, client, store):
+        publish(CATALOG[:3], client)
+        del fake.products["module-1"]
+        catalog = [CATALOG[0], make_module(1, product_name="Module Uno"), CATALOG[2]]
+
+        results = publish(catalog, client, diff=True)
+
+        assert [e["module_code"] for e in results["created"]] == ["MOD-001"]
+        assert fake.products["module-1"]["title"] == "Module Uno"
+        assert store["state"]["MOD-001"]["shopify_product_id"] == str(fake.products["module-1"]["id"])
+
+    def test_rejected_metafields_are_retried_next_diff(self, fake, client, store):
+        fake.reject_metafield_keys = {"tier"}
+        publish(CATALOG[:1], client)
+        assert store["state"]["MOD-000"]["metafields"] == []
+
+        fake.reject_metafield_keys = set()
+        results = publish(CATALOG[:1], client, diff=True)
+
+        assert len(results["updated"]) == 1
+        assert ("genomax", "tier") in fake.products["module-0"]["metafields"]
+        assert len(publish(CATALOG[:1], client, diff=True)["unchanged"]) == 1
+
+
+class TestEndpoint:
+
+    def test_diff_publish_endpoint(self, fake, client, store, monkeypatch):
+        monkeypatch.setattr(shopify_router, "get_async_shopify_client", lambda: client)
+        monkeypatch.setattr(shopify_router, "ensure_audit_table", lambda: True)
+        catalog = list(CATALOG)
+        monkeypatch.setattr(shopify_router, "fetch_modules_for_export",
+                            lambda limit, only_active: catalog[:limit])
+        app = FastAPI()
+        app.include_router(shopify_router.router)
+        http = TestClient(app)
+
+        http.post("/api/v1/shopify/export/publish?confirm=true", json={"limit": 20})
+        catalog[0] = make_module(0, dosing_protocol="1 cap AM")
+        body = http.post("/api/v1/shopify/export/publish?confirm=true", json={"limit": 20, "diff": True}).json()
+
+        assert body["diff"] is True
+        assert body["summary"]["updated"] == 1
+        assert body["summary"]["unchanged"] == 19
+        assert body["updated"][0]["changed_fields"] == ["dosing_protocol"]
+        assert body["throughput"]["api_calls"] == 2
@@ -0,0 +1,234 @@
+"""
+Shopify Concurrent Publisher Tests (leaky-bucket rate limiting)
+
+Tests verify (offline, against FakeShopifyAPI as the shopify transport):
+1. Products publish concurrently, two API calls each (metafields batched);
+   re-publishes PUT the product and upsert metafields with metafieldsSet
+2. The leaky bucket paces requests under the call limit; 429s pause and retry
+3. Not-ready modules are skipped; rejected metafields do not block products
+4. PROGRESS audit rows report per-batch throughput
+5. POST /export/publish runs the async publisher end to end
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.integrations import shopify_router
+from app.integrations.shopify_client import (
+    AsyncShopifyClient,
+    FakeShopifyAPI,
+    LeakyBucket,
+    RateLimitInfo,
+    ShopifyValidationError,
+)
+from app.integrations.shopify_router import PublishAction, publish_modules
+from app.shared import http_clients
+
+BASE_URL = "https://genomax-test.myshopify.com/admin/api/2026-01"
+
+
+def make_module(n, **overrides):
+    module = {
+        "module_code": f"MOD-{n:03d}",
+        "product_name": f"Module {n}",
+        "shopify_handle": f"module-{n}",
+        "os_environment": "MAXimo²",
+        "os_layer": "Core",
+        "tier": "TIER_1",
+        "biological_domain": "Energy",
+        "net_quantity": "60 capsules",
+        "fda_disclaimer": "These statements have not been evaluated by the FDA.",
+        "back_label_text": "Take two daily.",
+        "front_label_text": "Module",
+        "suggested_use_full": "Take two capsules daily with food.",
+        "supplier_status": "ACTIVE",
+        "is_launch_v1": True,
+    }
+    module.update(overrides)
+    return module
+
+
+@pytest.fixture
+def audit(monkeypatch):
+    rows = []
+    monkeypatch.setattr(shopify_router, "log_publish_audit", lambda **row: rows.append(row))
+    monkeypatch.setattr(shopify_router, "save_publish_state", lambda **state: None)
+    return rows
+
+
+@pytest.fixture
+def install(monkeypatch):
+    """Route the shared shopify HTTP client to a FakeShopifyAPI."""
+    monkeypatch.setattr(http_clients, "UPSTREAMS", dict(http_clients.UPSTREAMS))
+    monkeypatch.setattr(http_clients, "_sync_clients", {})
+    monkeypatch.setattr(http_clients, "_async_clients", {})
+
+    def install(**fake_kwargs):
+        fake = FakeShopifyAPI(**fake_kwargs)
+        http_clients.configure_upstream("shopify", transport=fake)
+        return fake
+
+    return install
+
+
+def make_client(**bucket_kwargs):
+    return AsyncShopifyClient(base_url=BASE_URL, access_token="token", bucket=LeakyBucket(**bucket_kwargs))
+
+
+def publish(modules, client, **kwargs):
+    return asyncio.run(publish_modules(modules, "batch-1", client, **kwargs))
+
+
+class TestPublish:
+
+    def test_concurrent_publish_batches_metafields(self, install, audit):
+        fake = install(capacity=40, leak_rate=200, latency_s=0.01)
+        client = make_client(leak_rate=200)
+        modules = [make_module(n) for n in range(30)]
+
+        results = publish(modules, client, concurrency=4)
+
+        assert [e["module_code"] for e in results["created"]] == [m["module_code"] for m in modules]
+        assert results["errors"] == []
+        assert client.calls == len(fake.requests) == 60
+        assert {method for method, _ in fake.requests} == {"GET", "POST"}
+        assert not any("metafields" in path for _, path in fake.requests)
+        assert 1 < fake.peak_in_flight <= 4
+        assert fake.throttled == 0
+        stored = fake.products["module-7"]["metafields"]
+        assert stored[("genomax", "net_quantity")] == "60 capsules"
+        assert stored[("genomax", "suggested_use")] == "Take two capsules daily with food."
+
+    def test_republish_updates(self, install, audit):
+        fake = install(capacity=40, leak_rate=200)
+        client = make_client(leak_rate=200)
+        publish([make_module(n) for n in range(5)], client)
+        fake.requests.clear()
+
+        results = publish([make_module(n, net_quantity="90 capsules") for n in range(5)], client)
+
+        assert len(results["updated"]) == 5
+        assert not any("metafield_error" in entry for entry in results["updated"])
+        assert [p["id"] for p in fake.products.values()] == [1001, 1002, 1003, 1004, 1005]
+        assert fake.products["module-2"]["metafields"][("genomax", "net_quantity")] == "90 capsules"
+        assert sorted(fake.requests) == sorted(
+            [("GET", "/admin/api/2026-01/products.json")] * 5
+            + [("PUT", f"/admin/api/2026-01/products/{1001 + n}.json") for n in range(5)]
+            + [("POST", "/admin/api/2026-01/graphql.json")] * 5
+        )
+        assert not any("metafields" in write for write in fake.writes[-5:])
+
+    def test_republish_keeps_updating_metafields(self, install, audit):
+        fake = install(capacity=40, leak_rate=200)
+        client = make_client(leak_rate=200)
+        for net_quantity in ("60 capsules", "90 capsules", "120 capsules"):
+            results = publish([make_module(0, net_quantity=net_quantity)], client)
+            assert "metafield_error" not in (results["created"] + results["updated"])[0]
+            assert fake.products["module-0"]["metafields"][("genomax", "net_quantity")] == net_quantity
+
+    def test_fake_put_rejects_existing_metafield_keys(self, install, audit):
+        install(capacity=40, leak_rate=200)
+        client = make_client(leak_rate=200)
+        publish([make_module(0)], client)
+        metafield = {"namespace": "genomax", "key": "tier", "value": "TIER_2", "type": "single_line_text_field"}
+
+        with pytest.raises(ShopifyValidationError, match="must be unique"):
+            asyncio.run(client.arequest(
+                "PUT", "/products/1001.json", data={"product": {"id": 1001, "metafields": [metafield]}}
+            ))
+
+    def test_skipped_and_rejected_metafields(self, install, audit):
+        fake = install(capacity=40, leak_rate=200, reject_metafield_keys=("tier",))
+        client = make_client(leak_rate=200)
+        modules = [make_module(0), make_module(1, net_quantity=None)]
+
+        results = publish(modules, client)
+
+        assert [e["module_code"] for e in results["created"]] == ["MOD-000"]
+        assert "tier is invalid" in results["created"][0]["metafield_error"]
+        assert fake.products["module-0"]["metafields"] == {}
+        assert results["skipped"][0]["reasons"] == ["missing_net_quantity"]
+        actions = {(row["module_code"], row["action"]) for row in audit}
+        assert ("MOD-001", PublishAction.SKIP) in actions
+        assert ("MOD-000", PublishAction.CREATE) in actions
+
+    def test_progress_rows_report_throughput(self, install, audit):
+        install(capacity=40, leak_rate=200)
+        results = publish([make_module(n) for n in range(25)], make_client(leak_rate=200),
+                          concurrency=5, progress_every=10)
+
+        progress = [row["response_body"] for row in audit if row["action"] == PublishAction.PROGRESS]
+        assert [p["completed"] for p in progress] == [10, 20, 25]
+        assert progress[-1] == results["throughput"]
+        assert progress[-1]["api_calls"] == 50
+        assert progress[-1]["modules_per_s"] > 0
+        assert all(row["batch_id"] == "batch-1" for row in audit)
+
+
+class TestRateLimiting:
+
+    def test_bucket_paces_under_call_limit(self, install, audit):
+        fake = install(capacity=8, leak_rate=100)
+        client = make_client(leak_rate=100, headroom=1)
+
+        results = publish([make_module(n) for n in range(20)], client, concurrency=8)
+
+        assert len(results["created"]) == 20
+        assert fake.throttled == 0
+        assert client.bucket.capacity == 8
+        assert client.bucket.waited_s > 0
+
+    def test_429_pauses_and_retries(self, install, audit):
+        # Client believes the shop leaks far faster than it does
+        fake = install(capacity=6, leak_rate=60, retry_after_s=0.05)
+        client = make_client(leak_rate=10000, headroom=0)
+        client.MAX_RETRIES = 6
+
+        results = publish([make_module(n) for n in range(20)], client, concurrency=8)
+
+        assert len(results["created"]) == 20
+        assert fake.throttled > 0
+        assert results["throughput"]["rate_limited"] == client.bucket.throttled > 0
+
+    def test_wait_time_model(self):
+        bucket = LeakyBucket(capacity=10, leak_rate=2.0, headroom=2)
+        now = time.monotonic()
+        bucket.level, bucket._updated = 8.0, now
+        assert bucket.wait_time(now) == pytest.approx(0.5)
+        assert bucket.wait_time(now + 1.0) <= 0
+
+        bucket.in_flight = 2
+        bucket.release(RateLimitInfo(current=3, max=40))
+        assert (bucket.capacity, bucket.level, bucket.in_flight) == (40, 4.0, 1)
+
+        bucket.pause(5)
+        assert bucket.wait_time(time.monotonic()) > 4
+
+
+class TestEndpoint:
+
+    def test_publish_endpoint(self, install, audit, monkeypatch):
+        fake = install(capacity=40, leak_rate=200)
+        client = make_client(leak_rate=200)
+        modules = [make_module(n) for n in range(12)]
+        monkeypatch.setattr(shopify_router, "get_async_shopify_client", lambda: client)
+        monkeypatch.setattr(shopify_router, "ensure_audit_table", lambda: True)
+        monkeypatch.setattr(shopify_router, "fetch_modules_for_export",
+                            lambda limit, only_active: modules[:limit])
+        app = FastAPI()
+        app.include_router(shopify_router.router)
+
+        body = TestClient(app).post(
+            "/api/v1/shopify/export/publish?confirm=true",
+            json={"limit": 10, "concurrency": 3},
+        ).json()
+
+        assert body["summary"] == {"created": 10, "updated": 0, "unchanged": 0, "skipped": 0, "errors": 0,
+                                   "total_processed": 10}
+        assert body["throughput"]["concurrency"] == 3
+        assert body["throughput"]["api_calls"] == 20
+        assert len(fake.products) == 10
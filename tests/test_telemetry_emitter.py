@@ -0,0 +1,245 @@
+"""
+Telemetry Emitter Tests (batched background flusher)
+
+Tests verify (no database required, uses a fake pool):
+1. Emissions return without touching the database
+2. Queued records are written with multi-row INSERTs in one transaction
+3. Table DDL runs once, not per run
+4. Full queue drops records and counts them
+5. Shutdown flushes everything queued
+6. record_run() upserts the run row on (run_id, phase) and writes its events
+   in one round trip
+"""
+
+import threading
+
+import pytest
+
+from app.telemetry import emitter as emitter_module
+from app.telemetry.derive import EventRecord, RunSummary
+from app.telemetry.emitter import TelemetryEmitter
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if self.conn.pool.fail_writes and "INSERT" in sql:
+            raise RuntimeError("write failed")
+        self.conn.pool.executes += 1
+        # Record each statement of a multi-statement execute with its params
+        params = list(params or [])
+        for statement in sql.split(";"):
+            statement = " ".join(statement.split())
+            if not statement or statement.startswith("--"):
+                continue
+            n = statement.count("%s")
+            self.conn.pool.statements.append((statement, params[:n]))
+            params = params[n:]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.pool.commits += 1
+
+    def rollback(self):
+        self.pool.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.statements = []
+        self.executes = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.acquired = 0
+        self.fail_writes = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def acquire(self):
+        self.gate.wait(5)
+        self.acquired += 1
+        return FakeConnection(self)
+
+    def sql(self, prefix):
+        return [(sql, params) for sql, params in self.statements if sql.startswith(prefix)]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake = FakePool()
+    monkeypatch.setattr(emitter_module, "get_pool", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def make_emitter(monkeypatch, pool):
+    def factory(**env):
+        monkeypatch.setenv("DATABASE_URL", "postgresql://fake")
+        monkeypatch.setenv("TELEMETRY_FLUSH_INTERVAL_S", "0.05")
+        for key, value in env.items():
+            monkeypatch.setenv(key, str(value))
+        TelemetryEmitter.reset()
+        return TelemetryEmitter.get_instance()
+    yield factory
+    TelemetryEmitter.reset()
+
+
+def _emit_run(emitter, run_id, blocks=2):
+    emitter.start_run(run_id=run_id, sex="male", age=40)
+    emitter.complete_run(run_id=run_id, intents_count=3, confidence_level="high")
+    for i in range(blocks):
+        emitter.emit_routing_block(run_id, f"BLOCK_{i}")
+
+
+def _summary(run_id, phase, intents_count=3):
+    return RunSummary(run_id=run_id, phase=phase, sex="female", age_bucket="35-44",
+                      intents_count=intents_count, confidence_level="high")
+
+
+RUN_A = "00000000-0000-0000-0000-00000000000a"
+RUN_B = "00000000-0000-0000-0000-00000000000b"
+
+
+class TestBatching:
+
+    def test_emit_does_not_touch_database(self, make_emitter, pool):
+        pool.gate.clear()  # flusher blocks on acquire
+        emitter = make_emitter()
+        _emit_run(emitter, RUN_A)
+        assert pool.statements == []
+        assert emitter.stats()["enqueued_total"] == 4
+        pool.gate.set()
+        assert emitter.flush()
+
+    def test_records_written_with_multi_row_inserts(self, make_emitter, pool):
+        emitter = make_emitter()
+        _emit_run(emitter, RUN_A, blocks=3)
+        _emit_run(emitter, RUN_B, blocks=2)
+        assert emitter.flush()
+
+        run_inserts = pool.sql("INSERT INTO telemetry_runs")
+        event_inserts = pool.sql("INSERT INTO telemetry_events")
+        updates = pool.sql("UPDATE telemetry_runs")
+        assert len(run_inserts) == 1 and len(event_inserts) == 1 and len(updates) == 1
+        assert len(run_inserts[0][1]) == 2 * 7
+        assert len(event_inserts[0][1]) == 5 * 5
+        assert pool.commits == 2  # DDL + one batch
+        assert emitter.stats()["written_total"] == 9
+
+    def test_ddl_runs_once(self, make_emitter, pool):
+        emitter = make_emitter()
+        for _ in range(3):
+            _emit_run(emitter, RUN_A)
+            assert emitter.flush()
+        assert len(pool.sql("CREATE TABLE IF NOT EXISTS telemetry_runs")) == 1
+
+    def test_insert_after_update_of_same_run_is_ordered(self, make_emitter, pool):
+        pool.gate.clear()
+        emitter = make_emitter()
+        _emit_run(emitter, RUN_A, blocks=0)
+        _emit_run(emitter, RUN_A, blocks=0)
+        pool.gate.set()
+        assert emitter.flush()
+
+        kinds = [sql.split()[0] for sql, _ in pool.statements if not sql.startswith("CREATE")]
+        assert kinds == ["INSERT", "UPDATE", "INSERT", "UPDATE"]
+
+    def test_disabled_emitter_enqueues_nothing(self, make_emitter, pool):
+        emitter = make_emitter(TELEMETRY_ENABLED="false")
+        assert emitter.start_run(run_id=RUN_A) is None
+        emitter.emit_routing_block(RUN_A, "BLOCK_IRON")
+        assert emitter.stats()["enqueued_total"] == 0
+
+
+class TestRecordRun:
+
+    def test_run_and_events_in_one_round_trip(self, make_emitter, pool):
+        emitter = make_emitter()
+        assert emitter.flush()  # nothing queued; DDL not yet run
+        events = [
+            EventRecord(event_type="ROUTING_BLOCK", code="BLOCK_IRON", metadata={"layer": "routing", "user": "x"}),
+            EventRecord(event_type="LOW_CONFIDENCE", code="LOW_CONFIDENCE"),
+        ]
+        assert emitter.record_run(_summary(RUN_A, "route"), events) is True
+        assert emitter.flush()
+
+        assert pool.executes == 2  # DDL + one write
+        upsert, = pool.sql("INSERT INTO telemetry_runs")
+        assert "ON CONFLICT (run_id, phase) DO UPDATE" in upsert[0]
+        assert upsert[1][1:3] == [RUN_A, "route"]
+        event_insert, = pool.sql("INSERT INTO telemetry_events")
+        assert event_insert[1][:5] == [RUN_A, "ROUTING_BLOCK", "BLOCK_IRON", 1, '{"layer": "routing"}']
+        assert event_insert[1][9] is None
+
+    def test_repeated_phase_in_batch_keeps_last(self, make_emitter, pool):
+        pool.gate.clear()
+        emitter = make_emitter()
+        emitter.record_run(_summary(RUN_A, "route", intents_count=1), [])
+        emitter.record_run(_summary(RUN_A, "route", intents_count=5), [])
+        emitter.record_run(_summary(RUN_A, "compose", intents_count=2), [])
+        pool.gate.set()
+        assert emitter.flush()
+
+        upsert, = pool.sql("INSERT INTO telemetry_runs")
+        rows = [upsert[1][i:i + 15] for i in range(0, len(upsert[1]), 15)]
+        assert [(r[2], r[8]) for r in rows] == [("route", 5), ("compose", 2)]
+
+    def test_invalid_run_id_rejected(self, make_emitter, pool):
+        emitter = make_emitter()
+        assert emitter.record_run(_summary("unknown", "route"), []) is False
+        emitter.emit_routing_block("not-a-uuid", "BLOCK_IRON")
+        assert emitter.stats()["rejected_total"] == 2
+        assert emitter.stats()["enqueued_total"] == 0
+
+
+class TestBackPressure:
+
+    def test_full_queue_drops_and_counts(self, make_emitter, pool):
+        pool.gate.clear()
+        emitter = make_emitter(TELEMETRY_QUEUE_MAX=3, TELEMETRY_FLUSH_BATCH=1)
+        for i in range(10):
+            emitter.emit_routing_block(RUN_A, f"BLOCK_{i}")
+        stats = emitter.stats()
+        assert stats["dropped_total"] >= 6
+        assert stats["enqueued_total"] + stats["dropped_total"] == 10
+        pool.gate.set()
+        assert emitter.flush()
+
+    def test_write_failure_is_counted_not_raised(self, make_emitter, pool):
+        pool.fail_writes = True
+        emitter = make_emitter()
+        _emit_run(emitter, RUN_A)
+        assert emitter.flush()
+        stats = emitter.stats()
+        assert stats["write_failures_total"] == 4
+        assert stats["flush_errors_total"] == 1
+        assert pool.rollbacks == 1
+
+
+class TestShutdown:
+
+    def test_shutdown_flushes_queue(self, make_emitter, pool):
+        emitter = make_emitter(TELEMETRY_FLUSH_INTERVAL_S=30)
+        _emit_run(emitter, RUN_A, blocks=5)
+        emitter.shutdown(timeout_s=2)
+
+        assert emitter.stats()["written_total"] == 7
+        assert emitter.stats()["running"] is False
+        # Emissions after shutdown are ignored
+        emitter.emit_routing_block(RUN_A, "BLOCK_LATE")
+        assert emitter.stats()["enqueued_total"] == 7
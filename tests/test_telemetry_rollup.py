@@ -0,0 +1,237 @@
+"""
+Telemetry Rollup Tests (Issue #9)
+
+Tests verify (no database required, uses a fake cursor):
+1. Ranges split into whole rolled-up hours and raw remainders at the watermark
+2. Incremental passes recompute only hours since the watermark, in
+   half-open created_at ranges, and advance the watermark per chunk
+3. Readers combine rollup and raw rows and aggregate like the old queries
+4. The rollup trigger rejects an unparseable rebuild_from with a 400
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.telemetry import admin, rollup
+from app.telemetry.rollup import (
+    daily_trends,
+    query_run_cube,
+    run_incremental_rollup,
+    split_range,
+    summarize_runs,
+    top_codes,
+)
+
+
+UTC = timezone.utc
+
+
+def ts(day, hour=0, minute=0):
+    return datetime(2025, 1, day, hour, minute, tzinfo=UTC)
+
+
+# ============================================================================
+# FAKE DATABASE
+# ============================================================================
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = conn
+        self._one = None
+        self._all = []
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((" ".join(sql.split()), params))
+        if "SELECT watermark FROM telemetry_rollup_state" in sql:
+            self._one = {"watermark": self.conn.watermark} if self.conn.state_exists else None
+        elif "LEAST(" in sql:
+            self._one = {"first_row": self.conn.first_row}
+        elif sql.strip().startswith("UPDATE telemetry_rollup_state"):
+            self.conn.watermark = params[0]
+        elif "INSERT INTO telemetry_rollup_state" in sql:
+            self.conn.state_exists = True
+        self._all = []
+
+    def fetchone(self):
+        return self._one
+
+    def fetchall(self):
+        return self._all
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, watermark=None, first_row=None):
+        self.watermark = watermark
+        self.first_row = first_row
+        self.state_exists = False
+        self.executed = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def statements(self, prefix):
+        return [(sql, params) for sql, params in self.executed if sql.startswith(prefix)]
+
+
+@pytest.fixture(autouse=True)
+def tables_ready(monkeypatch):
+    monkeypatch.setattr(rollup, "_tables_ready", True)
+    monkeypatch.setattr(rollup, "ROLLUP_LAG", timedelta(minutes=2))
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+class TestSplitRange:
+
+    def test_no_watermark_reads_raw(self):
+        (r_start, r_end), raw = split_range(ts(1), ts(8), None)
+        assert r_start >= r_end
+        assert raw == [(ts(1), ts(8))]
+
+    def test_whole_hours_before_watermark_are_rolled_up(self):
+        (r_start, r_end), raw = split_range(ts(1, 10, 30), ts(8), ts(5, 14, 20))
+        assert (r_start, r_end) == (ts(1, 11), ts(5, 14))
+        assert raw == [(ts(1, 10, 30), ts(1, 11)), (ts(5, 14), ts(8))]
+
+    def test_range_inside_watermark_hour_is_raw(self):
+        (r_start, r_end), raw = split_range(ts(5, 14, 1), ts(5, 14, 50), ts(5, 14, 20))
+        assert r_start >= r_end
+        assert raw == [(ts(5, 14, 1), ts(5, 14, 50))]
+
+    def test_open_end_reads_tail_raw(self):
+        (r_start, r_end), raw = split_range(ts(1), rollup.FAR_FUTURE, ts(3, 9, 5))
+        assert (r_start, r_end) == (ts(1), ts(3, 9))
+        assert raw[-1] == (ts(3, 9), rollup.FAR_FUTURE)
+
+
+class TestIncrementalRollup:
+
+    def test_empty_tables_noop(self):
+        conn = FakeConnection(first_row=None)
+        result = run_incremental_rollup(conn, now=ts(2))
+        assert result["hours_recomputed"] == 0
+        assert conn.statements("DELETE") == []
+
+    def test_first_pass_starts_at_first_row_hour(self):
+        conn = FakeConnection(first_row=ts(1, 9, 42))
+        run_incremental_rollup(conn, now=ts(1, 12, 30))
+
+        deletes = conn.statements("DELETE FROM telemetry_hourly_run_rollups")
+        assert [p for _, p in deletes] == [(ts(1, 9), ts(1, 13))]
+        inserts = conn.statements("INSERT INTO telemetry_hourly_run_rollups")
+        assert "created_at >= %s AND created_at < %s" in inserts[0][0]
+        assert "DATE(created_at)" not in inserts[0][0]
+        assert conn.watermark == ts(1, 12, 28)
+
+    def test_resumes_from_watermark(self):
+        conn = FakeConnection(watermark=ts(1, 12, 28))
+        result = run_incremental_rollup(conn, now=ts(1, 14, 5))
+
+        deletes = conn.statements("DELETE FROM telemetry_hourly_event_rollups")
+        assert [p for _, p in deletes] == [(ts(1, 12), ts(1, 15))]
+        assert result["hours_recomputed"] == 3
+        assert result["days_refreshed"] == ["2025-01-01"]
+        assert conn.watermark == ts(1, 14, 3)
+
+    def test_caught_up_does_nothing(self):
+        conn = FakeConnection(watermark=ts(1, 12, 0))
+        run_incremental_rollup(conn, now=ts(1, 12, 1))
+        assert conn.statements("DELETE") == []
+        assert conn.watermark == ts(1, 12, 0)
+
+    def test_backfill_commits_per_chunk(self):
+        conn = FakeConnection(first_row=ts(1, 0, 5))
+        result = run_incremental_rollup(conn, now=ts(4, 6))
+
+        deletes = conn.statements("DELETE FROM telemetry_hourly_run_rollups")
+        assert len(deletes) == 4
+        assert deletes[0][1] == (ts(1), ts(2, 1))
+        assert all(end - start <= timedelta(hours=25) for _, (start, end) in deletes)
+        assert result["days_refreshed"] == ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]
+        assert conn.watermark == ts(4, 5, 58)
+
+    def test_rebuild_resets_watermark(self):
+        conn = FakeConnection(watermark=ts(3, 10))
+        run_incremental_rollup(conn, now=ts(3, 10, 30), rebuild_from=ts(2, 7, 45))
+        deletes = conn.statements("DELETE FROM telemetry_hourly_run_rollups")
+        assert deletes[0][1][0] == ts(2, 7)
+
+
+class TestReaders:
+
+    def test_run_cube_params_follow_watermark(self):
+        conn = FakeConnection(watermark=ts(5, 14, 20))
+        conn.state_exists = True
+        query_run_cube(conn.cursor(), ts(1), ts(8))
+        sql, params = conn.executed[-1]
+        assert "telemetry_hourly_run_rollups" in sql
+        assert params == [ts(1), ts(5, 14), ts(1), ts(1), ts(5, 14), ts(8)]
+
+    def test_summarize_runs_matches_old_aggregates(self):
+        rows = [
+            {"sex": "male", "age_bucket": "30-39", "confidence_level": "low", "has_bloodwork": True,
+             "runs": 3, "unmatched_intents": 4, "blocked_skus": 2, "caution_flags": 1},
+            {"sex": "", "age_bucket": "30-39", "confidence_level": "high", "has_bloodwork": False,
+             "runs": 2, "unmatched_intents": 0, "blocked_skus": 5, "caution_flags": 0},
+        ]
+        summary = summarize_runs(rows)
+        assert summary["total_runs"] == 5
+        assert summary["runs_with_bloodwork"] == 3
+        assert summary["runs_low_confidence"] == 3
+        assert summary["total_blocks"] == 7
+        assert summary["by_sex"] == {"male": 3}
+        assert summary["by_age_bucket"] == {"30-39": 5}
+        assert summary["by_confidence"] == {"low": 3, "high": 2}
+
+    def test_top_codes_merges_event_types(self):
+        rows = [
+            {"event_type": "ROUTING_BLOCK", "code": "IRON", "total": 4},
+            {"event_type": "CATALOG_AUTO_BLOCK", "code": "IRON", "total": 3},
+            {"event_type": "ROUTING_BLOCK", "code": "B6", "total": 5},
+            {"event_type": "UNKNOWN_INGREDIENT", "code": "X", "total": 50},
+        ]
+        assert top_codes(rows, rollup.BLOCK_EVENT_TYPES) == [("IRON", 7), ("B6", 5)]
+        assert top_codes(rows, ("ROUTING_BLOCK",), limit=1) == [("B6", 5)]
+
+    def test_daily_trends_newest_first(self):
+        rows = [
+            {"day": date(2025, 1, 1), "confidence_level": "low", "has_bloodwork": False,
+             "runs": 2, "unmatched_intents": 2, "blocked_skus": 0},
+            {"day": date(2025, 1, 2), "confidence_level": "high", "has_bloodwork": True,
+             "runs": 4, "unmatched_intents": 2, "blocked_skus": 8},
+        ]
+        trends = daily_trends(rows)
+        assert [t["day"] for t in trends] == ["2025-01-02", "2025-01-01"]
+        assert trends[0]["avg_blocked"] == 2.0
+        assert trends[1]["low_confidence"] == 2
+
+
+# ============================================================================
+# ROLLUP TRIGGER
+# ============================================================================
+
+class TestRollupTrigger:
+
+    def test_invalid_rebuild_from_is_bad_request(self, monkeypatch):
+        monkeypatch.setattr(admin, "verify_admin_key", lambda key: None)
+        monkeypatch.setattr(admin, "get_db", lambda: pytest.fail("no DB before params are valid"))
+
+        with pytest.raises(HTTPException) as exc_info:
+            admin.run_daily_rollup(rebuild_from="yesterday", x_admin_api_key="key")
+
+        assert exc_info.value.status_code == 400
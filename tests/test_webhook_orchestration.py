@@ -0,0 +1,155 @@
+"""
+Webhook Orchestration Dispatch Tests (in-process orchestrate/v2)
+
+Tests verify (no database or network required):
+1. Webhook results call orchestrate/v2 in process, not over HTTP
+2. orchestrate/v2 rejections map to orchestration_failed: 5xx is retried by
+   the queue, 4xx (including malformed bloodwork_input) is dead-lettered
+3. Concurrent webhook runs are bounded by the orchestration semaphore
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+import api_server
+from app.webhooks import processor
+from app.webhooks.processor import WebhookProcessor
+from app.webhooks.queue import PermanentWebhookError
+
+
+BLOODWORK_INPUT = {
+    "markers": [{"code": "ferritin", "value": 80.0, "unit": "ng/mL"}],
+    "lab_profile": "GLOBAL_CONSERVATIVE",
+    "sex": "male",
+    "age": 40,
+}
+
+
+def fake_output(request):
+    return api_server.OrchestrateOutputV2(
+        run_id="run-1",
+        signal_id="bloodwork_input_run-1",
+        signal_hash="sha256:abc",
+        hash_verified=True,
+        routing_constraints={"blocked_targets": ["iron"]},
+        blocked_targets=["iron"],
+        caution_targets=[],
+        assessment_context=request.assessment_context,
+        selected_goals=request.selected_goals,
+        chain_of_custody=[],
+    )
+
+
+def trigger():
+    return asyncio.run(WebhookProcessor()._trigger_orchestration(
+        user_id="user-1", bloodwork_input=BLOODWORK_INPUT, source="junction", order_id="ord-1"
+    ))
+
+
+@pytest.fixture
+def slots(monkeypatch):
+    semaphore = threading.BoundedSemaphore(2)
+    monkeypatch.setattr(processor, "_orchestration_slots", semaphore)
+    return semaphore
+
+
+class TestInProcessDispatch:
+
+    def test_calls_service_directly(self, monkeypatch, slots):
+        calls = []
+
+        def service(request):
+            calls.append(request)
+            return fake_output(request)
+
+        monkeypatch.setattr(api_server, "orchestrate_v2", service)
+        result = trigger()
+
+        assert result["status"] == "orchestration_triggered"
+        assert result["run_id"] == "run-1"
+        assert result["routing_constraints"] == {"blocked_targets": ["iron"]}
+        assert result["markers_processed"] == 1
+        assert calls[0].bloodwork_input.markers[0].code == "ferritin"
+        assert calls[0].assessment_context == {"gender": "male", "age": 40}
+
+    def test_service_rejection_is_orchestration_failed(self, monkeypatch, slots):
+        def service(request):
+            raise HTTPException(status_code=503, detail={"error": "BLOODWORK_UNAVAILABLE"})
+
+        monkeypatch.setattr(api_server, "orchestrate_v2", service)
+        result = trigger()
+
+        assert result["status"] == "orchestration_failed"
+        assert result["status_code"] == 503
+        assert "BLOODWORK_UNAVAILABLE" in result["error"]
+        with pytest.raises(RuntimeError):
+            processor._orchestration_result(result)
+
+    @pytest.mark.parametrize("status_code", [400, 422])
+    def test_client_error_is_permanent(self, monkeypatch, slots, status_code):
+        def service(request):
+            raise HTTPException(status_code=status_code, detail={"error": "INVALID_BLOODWORK_INPUT"})
+
+        monkeypatch.setattr(api_server, "orchestrate_v2", service)
+        result = trigger()
+
+        assert result["status_code"] == status_code
+        with pytest.raises(PermanentWebhookError, match="INVALID_BLOODWORK_INPUT"):
+            processor._orchestration_result(result)
+
+    def test_invalid_input_is_permanent(self, monkeypatch, slots):
+        monkeypatch.setattr(api_server, "orchestrate_v2", fake_output)
+        result = asyncio.run(WebhookProcessor()._trigger_orchestration(
+            user_id="user-1", bloodwork_input={"markers": "not-a-list"},
+            source="junction", order_id="ord-1"
+        ))
+
+        assert result["status"] == "orchestration_failed"
+        assert result["status_code"] == 422
+        with pytest.raises(PermanentWebhookError):
+            processor._orchestration_result(result)
+
+    def test_rate_limited_is_retried(self):
+        result = {"status": "orchestration_failed", "status_code": 429, "error": "{}"}
+        with pytest.raises(RuntimeError):
+            processor._orchestration_result(result)
+
+    def test_no_free_slot_is_orchestration_error(self, monkeypatch, slots):
+        monkeypatch.setattr(processor, "ORCHESTRATION_ACQUIRE_TIMEOUT_S", 0.01)
+        monkeypatch.setattr(api_server, "orchestrate_v2", fake_output)
+        slots.acquire()
+        slots.acquire()
+        try:
+            result = trigger()
+        finally:
+            slots.release()
+            slots.release()
+        assert result["status"] == "orchestration_error"
+
+
+class TestConcurrencyBound:
+
+    def test_runs_never_exceed_semaphore(self, monkeypatch, slots):
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def service(request):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return fake_output(request)
+
+        monkeypatch.setattr(api_server, "orchestrate_v2", service)
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda _: trigger(), range(6)))
+
+        assert all(r["status"] == "orchestration_triggered" for r in results)
+        assert active["peak"] == 2
@@ -0,0 +1,385 @@
+"""
+Webhook Queue Tests (durable lab webhook ingestion)
+
+Tests verify (no database required, uses an in-memory webhook_events fake):
+1. Receivers verify, enqueue and answer 202 without processing inline
+2. Duplicate deliveries (same provider event id) are dropped
+3. Workers mark events processed, retry with backoff, and dead-letter
+   (including events whose worker died mid-event)
+4. Queue metrics report depth and lag
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.webhooks import queue
+from app.webhooks.queue import (
+    PermanentWebhookError,
+    backoff_seconds,
+    enqueue,
+    get_queue_metrics,
+    provider_event_id_for,
+    register_handler,
+)
+
+
+# ============================================================================
+# FAKE webhook_events TABLE
+# ============================================================================
+
+class FakeQueueDB:
+    def __init__(self):
+        self.rows = []
+        self.now = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+
+    def acquire(self):
+        return FakeConnection(self)
+
+    def by_id(self, row_id):
+        return next(r for r in self.rows if r["id"] == row_id)
+
+    def is_stale(self, row, visibility_s):
+        return row["status"] == "processing" and row["locked_at"] < self.now - timedelta(seconds=visibility_s)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=()):
+        sql = " ".join(sql.split())
+        db = self.db
+        if sql.startswith("INSERT INTO webhook_events"):
+            (provider, event_type, raw, order_id, user_id, sig, sig_valid, ip,
+             status, provider_event_id, handler) = params
+            if any(r["queue_handler"] == handler and r["provider_event_id"] == provider_event_id
+                   for r in db.rows):
+                self.result = []
+                return
+            import json
+            row = {
+                "id": len(db.rows) + 1, "event_id": uuid.uuid4(), "provider": provider,
+                "event_type": event_type, "raw_payload": json.loads(raw),
+                "parsed_order_id": order_id, "parsed_user_id": user_id,
+                "signature_valid": sig_valid, "status": status, "retry_count": 0,
+                "provider_event_id": provider_event_id, "queue_handler": handler,
+                "next_attempt_at": None, "received_at": db.now, "error_message": None,
+                "result_data": None, "locked_at": None, "locked_by": None,
+            }
+            db.rows.append(row)
+            self.result = [{"event_id": row["event_id"]}]
+        elif sql.startswith("SELECT event_id, status FROM webhook_events"):
+            handler, provider_event_id = params
+            self.result = [
+                {"event_id": r["event_id"], "status": r["status"]} for r in db.rows
+                if r["queue_handler"] == handler and r["provider_event_id"] == provider_event_id
+            ]
+        elif sql.startswith("UPDATE webhook_events SET status = 'dead_letter'"):
+            handlers, visibility_s, max_attempts = params
+            lost = [
+                r for r in db.rows
+                if r["queue_handler"] in handlers and db.is_stale(r, visibility_s)
+                and r["retry_count"] + 1 >= max_attempts
+            ]
+            self.result = []
+            for r in lost:
+                self.result.append({"event_id": r["event_id"], "locked_by": r["locked_by"]})
+                r.update(status="dead_letter", retry_count=r["retry_count"] + 1,
+                         error_message="Worker lost", locked_at=None, locked_by=None)
+        elif sql.startswith("UPDATE webhook_events SET status = 'processing'"):
+            worker_id, handlers, visibility_s, limit = params
+            ready = [
+                r for r in db.rows
+                if r["queue_handler"] in handlers and (
+                    (r["status"] in ("received", "failed")
+                     and (r["next_attempt_at"] is None or r["next_attempt_at"] <= db.now))
+                    or db.is_stale(r, visibility_s)
+                )
+            ][:limit]
+            for r in ready:
+                if r["status"] == "processing":
+                    r["retry_count"] += 1
+                r.update(status="processing", locked_at=db.now, locked_by=worker_id)
+            self.result = [dict(r) for r in ready]
+        elif sql.startswith("UPDATE webhook_events SET status = 'processed'"):
+            result, row_id = params
+            row = db.by_id(row_id)
+            row.update(status="processed", result_data=result)
+        elif sql.startswith("UPDATE webhook_events SET status = %s, retry_count"):
+            status, attempts, error, delay, _, _, row_id = params
+            row = db.by_id(row_id)
+            row.update(
+                status=status, retry_count=attempts, error_message=error,
+                next_attempt_at=db.now + timedelta(seconds=delay) if delay is not None else None,
+            )
+        elif sql.startswith("SELECT status, COUNT(*)"):
+            groups = {}
+            for r in db.rows:
+                if r["status"] in ("received", "failed", "processing", "dead_letter"):
+                    g = groups.setdefault(r["status"], {"status": r["status"], "n": 0, "oldest": None, "ready": 0})
+                    g["n"] += 1
+                    g["oldest"] = min(filter(None, [g["oldest"], r["received_at"]]))
+                    if r["next_attempt_at"] is None or r["next_attempt_at"] <= db.now:
+                        g["ready"] += 1
+            self.result = list(groups.values())
+        else:
+            raise AssertionError(f"unexpected SQL: {sql}")
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeQueueDB()
+    monkeypatch.setattr(queue, "get_pool", lambda: fake)
+    monkeypatch.setattr(queue, "_handlers", {})
+    return fake
+
+
+@pytest.fixture
+def worker():
+    return queue.WebhookWorkerPool()
+
+
+def enqueue_test_event(handler="test", provider_event_id="evt_1", process=True):
+    return enqueue(
+        queue_handler=handler,
+        provider="junction",
+        event_type="results.ready",
+        payload={"data": {"order_id": "ord_1"}},
+        provider_event_id=provider_event_id,
+        parsed_order_id="ord_1",
+        process=process,
+    )
+
+
+def junction_body(order_id):
+    return {
+        "event_type": "labtest.results.ready",
+        "team_id": "team_1",
+        "timestamp": "2025-01-01T12:00:00Z",
+        "data": {"order_id": order_id, "results": []},
+    }
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+class TestEnqueue:
+
+    def test_duplicate_delivery_is_dropped(self, db):
+        first = enqueue_test_event()
+        second = enqueue_test_event()
+        assert not first.duplicate
+        assert second.duplicate
+        assert second.event_id == first.event_id
+        assert len(db.rows) == 1
+
+    def test_unprocessed_events_are_recorded_as_ignored(self, db):
+        result = enqueue_test_event(process=False)
+        assert result.status == "ignored"
+
+    def test_provider_event_id_precedence(self):
+        body = b'{"a": 1}'
+        assert provider_event_id_for({"Svix-Id": "msg_1"}, {"event_id": "e"}, body) == "msg_1"
+        assert provider_event_id_for({}, {"event_id": "e"}, body) == "e"
+        assert provider_event_id_for({}, {}, body).startswith("sha256:")
+        assert provider_event_id_for({}, {}, body) == provider_event_id_for({}, {}, body)
+
+
+class TestReceiver:
+
+    def test_junction_receiver_enqueues_and_returns_202(self, db, monkeypatch):
+        from app.webhooks import receiver
+        monkeypatch.setattr(receiver, "JUNCTION_WEBHOOK_SECRET", "")
+        app = FastAPI()
+        app.include_router(receiver.router)
+        client = TestClient(app)
+
+        body = junction_body("ord_9")
+        headers = {"webhook-id": "msg_42"}
+        first = client.post("/api/v1/webhooks/junction", json=body, headers=headers)
+        second = client.post("/api/v1/webhooks/junction", json=body, headers=headers)
+
+        assert first.status_code == 202
+        assert first.json()["status"] == "received"
+        assert second.json()["status"] == "duplicate"
+        assert len(db.rows) == 1
+        assert db.rows[0]["status"] == "received"
+        assert db.rows[0]["queue_handler"] == "orchestrate_junction"
+
+    def test_bloodwork_vital_receiver_enqueues(self, db, monkeypatch):
+        from bloodwork_engine.api_webhook_endpoints import register_webhook_endpoints
+        monkeypatch.delenv("VITAL_WEBHOOK_SECRET", raising=False)
+        monkeypatch.setenv("VITAL_ENVIRONMENT", "sandbox")
+        app = FastAPI()
+        register_webhook_endpoints(app)
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/v1/webhooks/vital",
+            json={"event_type": "results.ready", "data": {"order_id": "ord_7"}},
+            headers={"X-Vital-Signature": "sandbox"},
+        )
+        assert response.status_code == 202
+        assert response.json()["order_id"] == "ord_7"
+        assert db.rows[0]["queue_handler"] == "bloodwork_vital"
+        assert db.rows[0]["status"] == "received"
+
+    def test_queue_unavailable_returns_503(self, monkeypatch):
+        from app.webhooks import receiver
+        from app.shared.db_pool import PoolError
+
+        def no_pool():
+            raise PoolError("pool closed")
+
+        monkeypatch.setattr(queue, "get_pool", no_pool)
+        monkeypatch.setattr(receiver, "JUNCTION_WEBHOOK_SECRET", "")
+        app = FastAPI()
+        app.include_router(receiver.router)
+        response = TestClient(app).post(
+            "/api/v1/webhooks/junction",
+            json=junction_body("ord_9"),
+        )
+        assert response.status_code == 503
+
+
+class TestWorkers:
+
+    def test_success_marks_processed(self, db, worker):
+        register_handler("test", lambda event: {"order": event["parsed_order_id"]})
+        enqueue_test_event()
+
+        assert worker.run_once("w1") is True
+        assert db.rows[0]["status"] == "processed"
+        assert '"ord_1"' in db.rows[0]["result_data"]
+        assert worker.run_once("w1") is False
+        assert worker.stats()["processed_total"] == 1
+
+    def test_failure_schedules_retry_with_backoff(self, db, worker, monkeypatch):
+        monkeypatch.setattr(queue, "backoff_seconds", lambda attempts: 5.0 * attempts)
+
+        def flaky(event):
+            raise RuntimeError("upstream timeout")
+
+        register_handler("test", flaky)
+        enqueue_test_event()
+
+        worker.run_once("w1")
+        row = db.rows[0]
+        assert row["status"] == "failed"
+        assert row["retry_count"] == 1
+        assert row["next_attempt_at"] == db.now + timedelta(seconds=5)
+        # Not ready again until the backoff has elapsed
+        assert worker.run_once("w1") is False
+        db.now += timedelta(seconds=6)
+        assert worker.run_once("w1") is True
+        assert row["retry_count"] == 2
+
+    def test_dead_letter_after_max_attempts(self, db, worker, monkeypatch):
+        monkeypatch.setattr(queue, "WEBHOOK_MAX_ATTEMPTS", 3)
+        monkeypatch.setattr(queue, "backoff_seconds", lambda attempts: 0.0)
+        register_handler("test", lambda event: 1 / 0)
+        enqueue_test_event()
+
+        for _ in range(5):
+            worker.run_once("w1")
+        row = db.rows[0]
+        assert row["status"] == "dead_letter"
+        assert row["retry_count"] == 3
+        assert "ZeroDivisionError" in row["error_message"]
+        assert worker.stats()["dead_lettered_total"] == 1
+
+    def test_permanent_error_dead_letters_immediately(self, db, worker):
+        def bad_payload(event):
+            raise PermanentWebhookError("invalid payload")
+
+        register_handler("test", bad_payload)
+        enqueue_test_event()
+        worker.run_once("w1")
+        assert db.rows[0]["status"] == "dead_letter"
+        assert db.rows[0]["retry_count"] == 1
+
+    def test_stale_processing_row_is_reclaimed_as_a_retry(self, db, monkeypatch):
+        monkeypatch.setattr(queue, "WEBHOOK_VISIBILITY_TIMEOUT_S", 60)
+        enqueue_test_event()
+        (event,) = queue.claim("w1", ["test"])  # w1 dies mid-event
+        assert event["retry_count"] == 0
+
+        assert queue.claim("w2", ["test"]) == []  # Still within the visibility timeout
+        db.now += timedelta(seconds=61)
+        (event,) = queue.claim("w2", ["test"])
+        assert event["retry_count"] == 1
+        assert db.rows[0]["locked_by"] == "w2"
+
+    def test_event_that_keeps_killing_its_worker_is_dead_lettered(self, db, monkeypatch):
+        monkeypatch.setattr(queue, "WEBHOOK_VISIBILITY_TIMEOUT_S", 60)
+        monkeypatch.setattr(queue, "WEBHOOK_MAX_ATTEMPTS", 3)
+        enqueue_test_event()
+
+        claims = 0
+        for _ in range(5):
+            claims += len(queue.claim("w1", ["test"]))
+            db.now += timedelta(seconds=61)
+        queue.claim("w1", ["test"])
+
+        row = db.rows[0]
+        assert claims == 3
+        assert row["status"] == "dead_letter"
+        assert row["retry_count"] == 3
+        assert row["locked_by"] is None
+
+    def test_only_registered_handlers_are_claimed(self, db, worker):
+        register_handler("test", lambda event: {})
+        enqueue_test_event(handler="other_process")
+        assert worker.run_once("w1") is False
+        assert db.rows[0]["status"] == "received"
+
+    def test_backoff_is_exponential_and_capped(self, monkeypatch):
+        monkeypatch.setattr(queue, "WEBHOOK_BACKOFF_BASE_S", 5)
+        monkeypatch.setattr(queue, "WEBHOOK_BACKOFF_MAX_S", 60)
+        delays = [backoff_seconds(n, jitter=False) for n in range(1, 6)]
+        assert delays == [5, 10, 20, 40, 60]
+
+
+class TestMetrics:
+
+    def test_depth_and_lag(self, db, worker):
+        enqueue_test_event(provider_event_id="a")
+        db.now += timedelta(seconds=30)
+        enqueue_test_event(provider_event_id="b")
+        db.rows[1]["status"] = "dead_letter"
+
+        metrics = get_queue_metrics()
+        assert metrics["depth"] == 1
+        assert metrics["dead_letter"] == 1
+        assert metrics["lag_seconds"] > 0
+        assert metrics["oldest_waiting_at"] == db.rows[0]["received_at"].isoformat()